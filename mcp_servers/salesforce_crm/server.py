@@ -6,10 +6,17 @@ Transport: stdio (notebooks) / SSE (hosted deployment).
 
 from __future__ import annotations
 
+import inspect
 import logging
 import os
+from types import ModuleType
+from typing import TYPE_CHECKING
 
 from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp.exceptions import ToolError
+
+if TYPE_CHECKING:
+    from shared.async_salesforce_client import AsyncSalesforceClient
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +35,25 @@ async def health_check(request):  # noqa: ARG001
 
     return JSONResponse({"status": "ok", "server": "salesforce-crm"})
 
+
+@mcp.custom_route("/metrics", methods=["GET"])
+async def metrics(request):  # noqa: ARG001
+    """Connection pool, request governor, query cache and snapshot metrics for replica sizing."""
+    from starlette.responses import JSONResponse
+
+    from shared.client_registry import get_registry
+    from shared.opportunity_snapshot import snapshot_stats
+    from shared.rate_limiter import get_governor
+    from shared.salesforce_client import get_query_cache
+
+    return JSONResponse({
+        "server": "salesforce-crm",
+        "clients": get_registry().stats(),
+        "governor": get_governor().metrics(),
+        "query_cache": get_query_cache().stats(),
+        "opportunity_snapshots": snapshot_stats(),
+    })
+
 # Tool registration imports — must come AFTER mcp is defined
 # Each module uses the @mcp.tool() decorator to self-register
 def _register_tools() -> None:
@@ -40,10 +66,38 @@ def _register_tools() -> None:
     import mcp_servers.salesforce_crm.tools.opportunities  # noqa: F401
     import mcp_servers.salesforce_crm.tools.users  # noqa: F401
 
+    if _use_async_tools():
+        from mcp_servers.salesforce_crm import tools
+
+        _register_async_variants(
+            tools.accounts,
+            tools.activities,
+            tools.cases,
+            tools.contacts,
+            tools.leads,
+            tools.opportunities,
+            tools.users,
+        )
+
 
 def _get_sf_client():
-    """Get a SalesforceClient instance from environment variables."""
-    from shared.salesforce_client import SalesforceClient
+    """Get a pooled SalesforceClient for the credentials in environment variables."""
+    from shared.client_registry import get_registry
+
+    instance_url = os.environ.get("SF_INSTANCE_URL", "")
+    access_token = os.environ.get("SF_ACCESS_TOKEN", "")
+
+    if not instance_url or not access_token:
+        raise RuntimeError(
+            "SF_INSTANCE_URL and SF_ACCESS_TOKEN environment variables are required."
+        )
+
+    return get_registry().get_client(instance_url, access_token)
+
+
+def _get_async_sf_client() -> AsyncSalesforceClient:
+    """Get a pooled AsyncSalesforceClient for the credentials in environment variables."""
+    from shared.client_registry import get_registry
 
     instance_url = os.environ.get("SF_INSTANCE_URL", "")
     access_token = os.environ.get("SF_ACCESS_TOKEN", "")
@@ -53,7 +107,35 @@ def _get_sf_client():
             "SF_INSTANCE_URL and SF_ACCESS_TOKEN environment variables are required."
         )
 
-    return SalesforceClient(instance_url=instance_url, access_token=access_token)
+    return get_registry().get_async_client(instance_url, access_token)
+
+
+def _use_async_tools() -> bool:
+    """Whether to serve native-async tool variants (MCP_ASYNC_TOOLS=true)."""
+    return os.environ.get("MCP_ASYNC_TOOLS", "false").lower() in ("1", "true", "yes")
+
+
+def _register_async_variants(*modules: ModuleType) -> None:
+    """Replace registered sync tools with their ``<name>_async`` coroutine variants.
+
+    The sync tool stays importable (tests, notebooks); only the MCP registration
+    is swapped so the SSE event loop is never blocked on a Salesforce round trip.
+    Private helpers and coroutines without a registered sync tool are left alone.
+    """
+    for module in modules:
+        for attr, fn in vars(module).items():
+            if attr.startswith("_") or not (attr.endswith("_async") and inspect.iscoroutinefunction(fn)):
+                continue
+            tool_name = attr.removesuffix("_async")
+            sync_fn = getattr(module, tool_name, None)
+            if sync_fn is None:
+                continue
+            try:
+                mcp.remove_tool(tool_name)
+            except ToolError:
+                logger.debug("No registered tool %s; not swapping in %s", tool_name, attr)
+                continue
+            mcp.add_tool(fn, name=tool_name, description=inspect.getdoc(sync_fn))
 
 
 # Tool registrations will be added as tools are implemented in tools/ modules.
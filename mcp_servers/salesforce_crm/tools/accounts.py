@@ -9,27 +9,29 @@ from __future__ import annotations
 import logging
 from typing import Any
 
-from mcp_servers.salesforce_crm.server import _get_sf_client, mcp
+from mcp_servers.salesforce_crm.server import _get_async_sf_client, _get_sf_client, mcp
+from shared.mappers import RecordMapper
 from shared.models import AccountSummary, ErrorResponse
 from shared.salesforce_client import SalesforceClientError
+from shared.soql import InvalidSoqlValueError, SoqlQuery, eq, id_eq, like_contains
 
 logger = logging.getLogger(__name__)
 
 
-def _record_to_account(record: dict[str, Any]) -> AccountSummary:
-    """Transform a Salesforce Account record to AccountSummary."""
-    owner = record.get("Owner") or {}
-    return AccountSummary(
-        id=record["Id"],
-        name=record["Name"],
-        industry=record.get("Industry"),
-        type=record.get("Type"),
-        annual_revenue=record.get("AnnualRevenue"),
-        billing_city=record.get("BillingCity"),
-        billing_state=record.get("BillingState"),
-        owner_name=owner.get("Name") if isinstance(owner, dict) else None,
-        description=record.get("Description"),
-    )
+ACCOUNT_MAPPER = RecordMapper(
+    AccountSummary,
+    {
+        "id": "Id",
+        "name": "Name",
+        "industry": "Industry",
+        "type": "Type",
+        "annual_revenue": "AnnualRevenue",
+        "billing_city": "BillingCity",
+        "billing_state": "BillingState",
+        "owner_name": "Owner.Name",
+        "description": "Description",
+    },
+)
 
 
 ACCOUNT_FIELDS = (
@@ -37,6 +39,41 @@ ACCOUNT_FIELDS = (
     "BillingCity, BillingState, Owner.Name, Description"
 )
 
+ACCOUNT_QUERY = SoqlQuery("Account").select(ACCOUNT_FIELDS)
+
+
+def _account_lookup_soql(account_id: str | None, account_name: str | None) -> str:
+    """Build the SOQL for an exact ID lookup or a fuzzy name search."""
+    if account_id:
+        return ACCOUNT_QUERY.where(id_eq("Id", account_id)).limit(1).build()
+    return ACCOUNT_QUERY.where(like_contains("Name", account_name or "")).limit(5).build()
+
+
+def _account_lookup_result(
+    records: list[dict[str, Any]],
+    account_id: str | None,
+    account_name: str | None,
+) -> dict[str, Any]:
+    """Shape get_account output from the lookup query records."""
+    if not records:
+        message = (
+            f"Account with ID '{account_id}' not found."
+            if account_id
+            else f"No accounts found matching '{account_name}'."
+        )
+        return ErrorResponse(code="NOT_FOUND", message=message).model_dump()
+
+    if account_id or len(records) == 1:
+        return {"account": ACCOUNT_MAPPER(records[0]), "match_count": 1, "matches": []}
+
+    # Multiple matches — disambiguation
+    matches = [{"id": r["Id"], "name": r["Name"]} for r in records]
+    return {
+        "account": None,
+        "match_count": len(matches),
+        "matches": matches,
+    }
+
 
 @mcp.tool()
 def get_account(
@@ -57,49 +94,64 @@ def get_account(
 
     try:
         sf = _get_sf_client()
+        records = sf.query(_account_lookup_soql(account_id, account_name))
+        return _account_lookup_result(records, account_id, account_name)
 
-        if account_id:
-            # Exact lookup by ID
-            soql = f"SELECT {ACCOUNT_FIELDS} FROM Account WHERE Id = '{account_id}' LIMIT 1"
-            records = sf.query(soql)
-            if not records:
-                return ErrorResponse(
-                    code="NOT_FOUND",
-                    message=f"Account with ID '{account_id}' not found.",
-                ).model_dump()
-            account = _record_to_account(records[0])
-            return {"account": account.model_dump(), "match_count": 1, "matches": []}
-
-        # Fuzzy search by name
-        safe_name = account_name.replace("'", "\\'") if account_name else ""
-        soql = (
-            f"SELECT {ACCOUNT_FIELDS} FROM Account "
-            f"WHERE Name LIKE '%{safe_name}%' LIMIT 5"
-        )
-        records = sf.query(soql)
-
-        if not records:
-            return ErrorResponse(
-                code="NOT_FOUND",
-                message=f"No accounts found matching '{account_name}'.",
-            ).model_dump()
-
-        if len(records) == 1:
-            account = _record_to_account(records[0])
-            return {"account": account.model_dump(), "match_count": 1, "matches": []}
-
-        # Multiple matches — disambiguation
-        matches = [{"id": r["Id"], "name": r["Name"]} for r in records]
-        return {
-            "account": None,
-            "match_count": len(matches),
-            "matches": matches,
-        }
-
-    except SalesforceClientError as e:
+    except (SalesforceClientError, InvalidSoqlValueError) as e:
         return e.to_error_response()
 
 
+async def get_account_async(
+    account_id: str | None = None,
+    account_name: str | None = None,
+) -> dict[str, Any]:
+    """Native-async variant of get_account."""
+    if not account_id and not account_name:
+        return ErrorResponse(
+            code="INVALID_INPUT",
+            message="Either account_id or account_name is required.",
+        ).model_dump()
+
+    try:
+        sf = _get_async_sf_client()
+        records = await sf.query(_account_lookup_soql(account_id, account_name))
+        return _account_lookup_result(records, account_id, account_name)
+
+    except (SalesforceClientError, InvalidSoqlValueError) as e:
+        return e.to_error_response()
+
+
+def _search_accounts_soql(
+    query: str,
+    industry: str | None,
+    owner_id: str | None,
+    limit: int,
+) -> str:
+    """Build the search_accounts SOQL, fetching one extra row to detect has_more."""
+    conditions = [like_contains("Name", query)]
+    if industry:
+        conditions.append(eq("Industry", industry))
+    if owner_id:
+        conditions.append(id_eq("OwnerId", owner_id))
+
+    return ACCOUNT_QUERY.where(*conditions).order_by("Name ASC").limit(limit + 1).build()
+
+
+def _search_accounts_result(records: list[dict[str, Any]], limit: int) -> dict[str, Any]:
+    """Shape search_accounts output, trimming the look-ahead row."""
+    has_more = len(records) > limit
+    if has_more:
+        records = records[:limit]
+
+    accounts = ACCOUNT_MAPPER.many(records)
+
+    return {
+        "accounts": accounts,
+        "total_count": len(accounts),
+        "has_more": has_more,
+    }
+
+
 @mcp.tool()
 def search_accounts(
     query: str,
@@ -119,35 +171,26 @@ def search_accounts(
 
     try:
         sf = _get_sf_client()
+        records = sf.query(_search_accounts_soql(query, industry, owner_id, limit))
+        return _search_accounts_result(records, limit)
 
-        safe_query = query.replace("'", "\\'")
-        conditions = [f"Name LIKE '%{safe_query}%'"]
-
-        if industry:
-            safe_industry = industry.replace("'", "\\'")
-            conditions.append(f"Industry = '{safe_industry}'")
-
-        if owner_id:
-            conditions.append(f"OwnerId = '{owner_id}'")
-
-        where_clause = " AND ".join(conditions)
-        soql = (
-            f"SELECT {ACCOUNT_FIELDS} FROM Account "
-            f"WHERE {where_clause} ORDER BY Name ASC LIMIT {limit + 1}"
-        )
-        records = sf.query(soql)
+    except (SalesforceClientError, InvalidSoqlValueError) as e:
+        return e.to_error_response()
 
-        has_more = len(records) > limit
-        if has_more:
-            records = records[:limit]
 
-        accounts = [_record_to_account(r).model_dump() for r in records]
+async def search_accounts_async(
+    query: str,
+    industry: str | None = None,
+    owner_id: str | None = None,
+    limit: int = 25,
+) -> dict[str, Any]:
+    """Native-async variant of search_accounts."""
+    limit = max(1, min(50, limit))
 
-        return {
-            "accounts": accounts,
-            "total_count": len(accounts),
-            "has_more": has_more,
-        }
+    try:
+        sf = _get_async_sf_client()
+        records = await sf.query(_search_accounts_soql(query, industry, owner_id, limit))
+        return _search_accounts_result(records, limit)
 
-    except SalesforceClientError as e:
+    except (SalesforceClientError, InvalidSoqlValueError) as e:
         return e.to_error_response()
@@ -10,9 +10,11 @@ import logging
 from datetime import date, timedelta
 from typing import Any
 
-from mcp_servers.salesforce_crm.server import _get_sf_client, mcp
+from mcp_servers.salesforce_crm.server import _get_async_sf_client, _get_sf_client, mcp
+from shared.mappers import RecordMapper, Source
 from shared.models import ActivitySummary
 from shared.salesforce_client import SalesforceClientError, WriteBackConfirmationError
+from shared.soql import InvalidSoqlValueError, SoqlQuery, any_of, gte, id_eq
 
 logger = logging.getLogger(__name__)
 
@@ -20,20 +22,62 @@ logger = logging.getLogger(__name__)
 TASK_FIELDS = "Id, Subject, ActivityDate, Status, Owner.Name"
 EVENT_FIELDS = "Id, Subject, ActivityDate, Owner.Name"
 
+TASK_QUERY = SoqlQuery("Task").select(TASK_FIELDS).order_by("ActivityDate DESC")
+EVENT_QUERY = SoqlQuery("Event").select(EVENT_FIELDS).order_by("ActivityDate DESC")
 
-def _record_to_activity(record: dict[str, Any], activity_type: str) -> ActivitySummary:
-    """Transform a Salesforce Task/Event record to ActivitySummary."""
-    owner = record.get("Owner") or {}
-    return ActivitySummary(
-        id=record["Id"],
-        type=activity_type,
-        subject=record.get("Subject", ""),
-        date=date.fromisoformat(record["ActivityDate"]) if record.get("ActivityDate") else None,
-        status=record.get("Status") if activity_type == "Task" else None,
-        owner_name=owner.get("Name") if isinstance(owner, dict) else None,
+
+_ACTIVITY_SOURCES: dict[str, Source] = {
+    "id": "Id",
+    "subject": ("Subject", ""),
+    "date": "ActivityDate",
+    "owner_name": "Owner.Name",
+}
+TASK_MAPPER = RecordMapper(ActivitySummary, {**_ACTIVITY_SOURCES, "type": lambda _: "Task", "status": "Status"})
+EVENT_MAPPER = RecordMapper(ActivitySummary, {**_ACTIVITY_SOURCES, "type": lambda _: "Event"})
+
+
+def _activity_soql(base: SoqlQuery, related_to_id: str, cutoff_date: date, limit: int) -> str:
+    """Build the SOQL for recent Tasks or Events related to a record."""
+    return (
+        base.where(
+            any_of(id_eq("WhatId", related_to_id), id_eq("WhoId", related_to_id)),
+            gte("ActivityDate", cutoff_date),
+        )
+        .limit(limit)
+        .build()
     )
 
 
+def _activity_queries(related_to_id: str, cutoff_date: date, limit: int) -> dict[str, str]:
+    """Build the Task and Event queries for one Composite Batch request."""
+    return {
+        "tasks": _activity_soql(TASK_QUERY, related_to_id, cutoff_date, limit),
+        "events": _activity_soql(EVENT_QUERY, related_to_id, cutoff_date, limit),
+    }
+
+
+def _merge_activities(results: dict[str, list[dict[str, Any]]], limit: int) -> list[dict[str, Any]]:
+    """Combine batched Task and Event records, with Events filling what Tasks leave of the limit."""
+    activities = TASK_MAPPER.many(results["tasks"])
+    remaining = limit - len(activities)
+    activities.extend(EVENT_MAPPER.many(results["events"][: max(remaining, 0)]))
+    return activities
+
+
+def _activities_result(activities: list[dict[str, Any]], limit: int) -> dict[str, Any]:
+    """Shape get_recent_activities output, newest first."""
+    # Sort by date descending
+    activities.sort(
+        key=lambda a: a.get("date") or date.min,
+        reverse=True,
+    )
+
+    return {
+        "activities": activities[:limit],
+        "total_count": len(activities),
+    }
+
+
 @mcp.tool()
 def get_recent_activities(
     related_to_id: str,
@@ -49,54 +93,39 @@ def get_recent_activities(
     """
     days = max(1, min(90, days))
     limit = max(1, min(50, limit))
-    cutoff_date = (date.today() - timedelta(days=days)).isoformat()
+    cutoff_date = date.today() - timedelta(days=days)
 
     try:
         sf = _get_sf_client()
-        activities: list[dict[str, Any]] = []
-
-        # Query Tasks
-        task_soql = (
-            f"SELECT {TASK_FIELDS} FROM Task "
-            f"WHERE (WhatId = '{related_to_id}' OR WhoId = '{related_to_id}') "
-            f"AND ActivityDate >= {cutoff_date} "
-            f"ORDER BY ActivityDate DESC LIMIT {limit}"
-        )
-        try:
-            task_records = sf.query(task_soql)
-            for r in task_records:
-                activities.append(_record_to_activity(r, "Task").model_dump())
-        except SalesforceClientError:
-            logger.debug("Unable to query tasks for %s", related_to_id)
-
-        # Query Events
-        remaining = limit - len(activities)
-        if remaining > 0:
-            event_soql = (
-                f"SELECT {EVENT_FIELDS} FROM Event "
-                f"WHERE (WhatId = '{related_to_id}' OR WhoId = '{related_to_id}') "
-                f"AND ActivityDate >= {cutoff_date} "
-                f"ORDER BY ActivityDate DESC LIMIT {remaining}"
-            )
-            try:
-                event_records = sf.query(event_soql)
-                for r in event_records:
-                    activities.append(_record_to_activity(r, "Event").model_dump())
-            except SalesforceClientError:
-                logger.debug("Unable to query events for %s", related_to_id)
-
-        # Sort by date descending
-        activities.sort(
-            key=lambda a: a.get("date") or "0000-00-00",
-            reverse=True,
+
+        # Tasks and Events in one round trip; either may be inaccessible
+        results = sf.query_batch(_activity_queries(related_to_id, cutoff_date, limit), optional=("tasks", "events"))
+
+        return _activities_result(_merge_activities(results, limit), limit)
+
+    except (SalesforceClientError, InvalidSoqlValueError) as e:
+        return e.to_error_response()
+
+
+async def get_recent_activities_async(
+    related_to_id: str,
+    days: int = 30,
+    limit: int = 25,
+) -> dict[str, Any]:
+    """Native-async variant of get_recent_activities."""
+    days = max(1, min(90, days))
+    limit = max(1, min(50, limit))
+    cutoff_date = date.today() - timedelta(days=days)
+
+    try:
+        sf = _get_async_sf_client()
+        results = await sf.query_batch(
+            _activity_queries(related_to_id, cutoff_date, limit), optional=("tasks", "events")
         )
 
-        return {
-            "activities": activities[:limit],
-            "total_count": len(activities),
-        }
+        return _activities_result(_merge_activities(results, limit), limit)
 
-    except SalesforceClientError as e:
+    except (SalesforceClientError, InvalidSoqlValueError) as e:
         return e.to_error_response()
 
 
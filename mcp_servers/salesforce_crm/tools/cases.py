@@ -7,12 +7,14 @@ Contract: contracts/mcp-salesforce-crm.md
 from __future__ import annotations
 
 import logging
-from datetime import UTC
+from datetime import UTC, datetime, timedelta
 from typing import Any
 
-from mcp_servers.salesforce_crm.server import _get_sf_client, mcp
+from mcp_servers.salesforce_crm.server import _get_async_sf_client, _get_sf_client, mcp
+from shared.mappers import RecordMapper
 from shared.models import CaseSummary, ErrorResponse
-from shared.salesforce_client import SalesforceClientError, WriteBackConfirmationError
+from shared.salesforce_client import SalesforceClientError, WriteBackConfirmationError, is_relationship_error
+from shared.soql import InvalidSoqlValueError, SoqlQuery, child_records, eq, gte, id_eq
 
 logger = logging.getLogger(__name__)
 
@@ -22,24 +24,58 @@ CASE_FIELDS = (
     "CreatedDate, Owner.Name, Account.Name"
 )
 
+CASE_QUERY = SoqlQuery("Case").select(CASE_FIELDS).limit(1)
+CASE_WITH_COMMENTS_QUERY = CASE_QUERY.with_children(
+    SoqlQuery("CaseComments").select("CommentBody").order_by("CreatedDate DESC").limit(5)
+)
+
+
+def _comment_bodies(record: dict[str, Any]) -> list[str]:
+    """Extract non-empty comment bodies from a case's CaseComments subquery rows."""
+    return [c.get("CommentBody", "") for c in child_records(record, "CaseComments") if c.get("CommentBody")]
+
+
+CASE_MAPPER = RecordMapper(
+    CaseSummary,
+    {
+        "id": "Id",
+        "case_number": ("CaseNumber", ""),
+        "subject": ("Subject", ""),
+        "description": "Description",
+        "status": ("Status", ""),
+        "priority": ("Priority", ""),
+        "type": "Type",
+        "created_date": ("CreatedDate", ""),
+        "owner_name": "Owner.Name",
+        "account_name": "Account.Name",
+        "recent_comments": _comment_bodies,
+    },
+)
+
+
+def _case_lookup_soql(
+    case_id: str | None,
+    case_number: str | None,
+    *,
+    with_comments: bool = True,
+) -> str:
+    """Build the SOQL for a case lookup by ID or case number.
+
+    The five most recent comments come back in the same query through the
+    CaseComments relationship subquery unless with_comments is False.
+    """
+    query = CASE_WITH_COMMENTS_QUERY if with_comments else CASE_QUERY
+    lookup = id_eq("Id", case_id) if case_id else eq("CaseNumber", case_number or "")
+    return query.where(lookup).build()
 
-def _record_to_case(record: dict[str, Any]) -> CaseSummary:
-    """Transform a Salesforce Case record to CaseSummary."""
-    owner = record.get("Owner") or {}
-    account = record.get("Account") or {}
-    return CaseSummary(
-        id=record["Id"],
-        case_number=record.get("CaseNumber", ""),
-        subject=record.get("Subject", ""),
-        description=record.get("Description"),
-        status=record.get("Status", ""),
-        priority=record.get("Priority", ""),
-        type=record.get("Type"),
-        created_date=record.get("CreatedDate", ""),
-        owner_name=owner.get("Name") if isinstance(owner, dict) else None,
-        account_name=account.get("Name") if isinstance(account, dict) else None,
-        recent_comments=[],
-    )
+
+def _case_not_found(case_id: str | None, case_number: str | None) -> dict[str, Any]:
+    """Return the NOT_FOUND response for a case lookup."""
+    identifier = case_id or case_number
+    return ErrorResponse(
+        code="NOT_FOUND",
+        message=f"Case '{identifier}' not found.",
+    ).model_dump()
 
 
 @mcp.tool()
@@ -62,39 +98,51 @@ def get_case(
     try:
         sf = _get_sf_client()
 
-        if case_id:
-            soql = f"SELECT {CASE_FIELDS} FROM Case WHERE Id = '{case_id}' LIMIT 1"
-        else:
-            safe_number = (case_number or "").replace("'", "\\'")
-            soql = f"SELECT {CASE_FIELDS} FROM Case WHERE CaseNumber = '{safe_number}' LIMIT 1"
-
-        records = sf.query(soql)
+        # Case and its recent comments in one query
+        try:
+            records = sf.query(_case_lookup_soql(case_id, case_number))
+        except SalesforceClientError as e:
+            if not is_relationship_error(e):
+                raise
+            # CaseComment may not be accessible; look the case up without comments
+            logger.debug("Case lookup with comments failed, retrying without them")
+            records = sf.query(_case_lookup_soql(case_id, case_number, with_comments=False))
         if not records:
-            identifier = case_id or case_number
-            return ErrorResponse(
-                code="NOT_FOUND",
-                message=f"Case '{identifier}' not found.",
-            ).model_dump()
+            return _case_not_found(case_id, case_number)
+
+        return {"case": CASE_MAPPER(records[0])}
+
+    except (SalesforceClientError, InvalidSoqlValueError) as e:
+        return e.to_error_response()
+
+
+async def get_case_async(
+    case_id: str | None = None,
+    case_number: str | None = None,
+) -> dict[str, Any]:
+    """Native-async variant of get_case."""
+    if not case_id and not case_number:
+        return ErrorResponse(
+            code="INVALID_INPUT",
+            message="Either case_id or case_number is required.",
+        ).model_dump()
 
-        case = _record_to_case(records[0])
+    try:
+        sf = _get_async_sf_client()
 
-        # Fetch recent case comments
         try:
-            comments_soql = (
-                f"SELECT CommentBody FROM CaseComment "
-                f"WHERE ParentId = '{records[0]['Id']}' "
-                f"ORDER BY CreatedDate DESC LIMIT 5"
-            )
-            comment_records = sf.query(comments_soql)
-            case.recent_comments = [
-                c.get("CommentBody", "") for c in comment_records if c.get("CommentBody")
-            ]
-        except SalesforceClientError:
-            logger.debug("Unable to fetch case comments")
+            records = await sf.query(_case_lookup_soql(case_id, case_number))
+        except SalesforceClientError as e:
+            if not is_relationship_error(e):
+                raise
+            logger.debug("Case lookup with comments failed, retrying without them")
+            records = await sf.query(_case_lookup_soql(case_id, case_number, with_comments=False))
+        if not records:
+            return _case_not_found(case_id, case_number)
 
-        return {"case": case.model_dump()}
+        return {"case": CASE_MAPPER(records[0])}
 
-    except SalesforceClientError as e:
+    except (SalesforceClientError, InvalidSoqlValueError) as e:
         return e.to_error_response()
 
 
@@ -156,7 +204,7 @@ def create_case(
             ),
         }
 
-    except SalesforceClientError as e:
+    except (SalesforceClientError, InvalidSoqlValueError) as e:
         return e.to_error_response()
 
 
@@ -239,6 +287,122 @@ def update_case(
         return e.to_error_response()
 
 
+# Aging bucket upper bounds in hours; older cases fall into "14d+" (SLA breach)
+AGING_BUCKETS: tuple[tuple[str, int], ...] = (
+    ("0-24h", 24),
+    ("1-3d", 72),
+    ("3-7d", 168),
+    ("7-14d", 336),
+)
+SLA_BREACH_BUCKET = "14d+"
+
+
+CASE_QUEUE_QUERY = (
+    SoqlQuery("Case")
+    .select("Status status, Priority priority, COUNT(Id) caseCount")
+    .group_by("Status", "Priority")
+)
+CASE_COUNT_QUERY = SoqlQuery("Case").select("COUNT(Id) caseCount")
+
+
+def _case_queue_scope(owner_id: str | None, queue_name: str | None) -> list[str]:
+    """Build the WHERE conditions for open cases in a queue summary."""
+    conditions = [eq("IsClosed", False)]
+    if owner_id:
+        conditions.append(id_eq("OwnerId", owner_id))
+    if queue_name:
+        conditions.append(eq("Owner.Name", queue_name))
+    return conditions
+
+
+def _case_queue_soql(owner_id: str | None, queue_name: str | None) -> str:
+    """Build the aggregate SOQL counting open cases by status and priority."""
+    return CASE_QUEUE_QUERY.where(*_case_queue_scope(owner_id, queue_name)).build()
+
+
+def _case_aging_soqls(
+    owner_id: str | None,
+    queue_name: str | None,
+    now: datetime,
+) -> list[str]:
+    """Build one COUNT query per aging bucket, bounded by a CreatedDate cutoff.
+
+    Each query counts the cases created within the bucket's upper bound, so
+    the counts are cumulative; ``_case_queue_result`` differences them.
+    """
+    scoped = CASE_COUNT_QUERY.where(*_case_queue_scope(owner_id, queue_name))
+    return [
+        scoped.where(gte("CreatedDate", now - timedelta(hours=hours))).build()
+        for _, hours in AGING_BUCKETS
+    ]
+
+
+def _case_queue_queries(owner_id: str | None, queue_name: str | None) -> dict[str, str]:
+    """Build the status/priority aggregate and aging counts for one Composite Batch request."""
+    # Bucket edges come from the exact instant; rounding it would move cases across an edge
+    aging = _case_aging_soqls(owner_id, queue_name, datetime.now(UTC))
+    return {
+        "groups": _case_queue_soql(owner_id, queue_name),
+        **{label: soql for (label, _), soql in zip(AGING_BUCKETS, aging, strict=True)},
+    }
+
+
+def _case_queue_batch_result(results: dict[str, list[dict[str, Any]]]) -> dict[str, Any]:
+    """Summarize the records returned for ``_case_queue_queries``."""
+    return _case_queue_result(results["groups"], [_aggregate_count(results[label]) for label, _ in AGING_BUCKETS])
+
+
+def _aggregate_count(records: list[dict[str, Any]]) -> int:
+    """Read the ``caseCount`` alias from a single-row aggregate result."""
+    return int(records[0].get("caseCount") or 0) if records else 0
+
+
+def _case_queue_result(
+    groups: list[dict[str, Any]],
+    aging_counts: list[int],
+) -> dict[str, Any]:
+    """Combine status/priority aggregates and cumulative aging counts into a summary.
+
+    Args:
+        groups: Rows from ``_case_queue_soql``, one per (status, priority) pair.
+        aging_counts: Results of ``_case_aging_soqls``, in bucket order.
+    """
+    by_status: dict[str, int] = {}
+    by_priority: dict[str, int] = {}
+    total = 0
+    for group in groups:
+        count = int(group.get("caseCount") or 0)
+        status = group.get("status") or "Unknown"
+        priority = group.get("priority") or "Unknown"
+        by_status[status] = by_status.get(status, 0) + count
+        by_priority[priority] = by_priority.get(priority, 0) + count
+        total += count
+
+    # Cumulative counts -> per-bucket counts. The queries run moments apart,
+    # so clamp at zero rather than report a negative bucket.
+    aging_buckets: dict[str, int] = {}
+    previous = 0
+    for (label, _), cumulative in zip(AGING_BUCKETS, aging_counts, strict=True):
+        aging_buckets[label] = max(cumulative - previous, 0)
+        previous = max(cumulative, previous)
+    aging_buckets[SLA_BREACH_BUCKET] = max(total - previous, 0)
+
+    # SLA compliance (cases older than 14 days are SLA breaches)
+    sla_breached = aging_buckets[SLA_BREACH_BUCKET]
+    sla_compliance_pct = (
+        round((total - sla_breached) / total * 100, 1) if total > 0 else 100.0
+    )
+
+    return {
+        "total_open": total,
+        "by_status": by_status,
+        "by_priority": by_priority,
+        "aging_distribution": aging_buckets,
+        "sla_compliance_pct": sla_compliance_pct,
+        "sla_breached_count": sla_breached,
+    }
+
+
 @mcp.tool()
 def get_case_queue_summary(
     owner_id: str | None = None,
@@ -252,77 +416,21 @@ def get_case_queue_summary(
     """
     try:
         sf = _get_sf_client()
+        # Status/priority totals and aging counts in one round trip
+        return _case_queue_batch_result(sf.query_batch(_case_queue_queries(owner_id, queue_name)))
 
-        conditions = ["IsClosed = false"]
-        if owner_id:
-            conditions.append(f"OwnerId = '{owner_id}'")
-        if queue_name:
-            safe_name = queue_name.replace("'", "\\'")
-            conditions.append(f"Owner.Name = '{safe_name}'")
-
-        where_clause = " AND ".join(conditions)
-        soql = (
-            f"SELECT Id, Status, Priority, CreatedDate, Owner.Name "
-            f"FROM Case WHERE {where_clause} "
-            f"ORDER BY CreatedDate ASC LIMIT 500"
-        )
-        records = sf.query(soql)
-
-        from datetime import datetime
-
-        now = datetime.now(UTC)
-
-        # Aggregate by status
-        by_status: dict[str, int] = {}
-        by_priority: dict[str, int] = {}
-        aging_buckets: dict[str, int] = {
-            "0-24h": 0,
-            "1-3d": 0,
-            "3-7d": 0,
-            "7-14d": 0,
-            "14d+": 0,
-        }
+    except (SalesforceClientError, InvalidSoqlValueError) as e:
+        return e.to_error_response()
 
-        for record in records:
-            status = record.get("Status", "Unknown")
-            priority = record.get("Priority", "Unknown")
-            by_status[status] = by_status.get(status, 0) + 1
-            by_priority[priority] = by_priority.get(priority, 0) + 1
-
-            # Calculate aging
-            created_str = record.get("CreatedDate", "")
-            if created_str:
-                try:
-                    created = datetime.fromisoformat(created_str.replace("+0000", "+00:00"))
-                    age_hours = (now - created).total_seconds() / 3600
-                    if age_hours <= 24:
-                        aging_buckets["0-24h"] += 1
-                    elif age_hours <= 72:
-                        aging_buckets["1-3d"] += 1
-                    elif age_hours <= 168:
-                        aging_buckets["3-7d"] += 1
-                    elif age_hours <= 336:
-                        aging_buckets["7-14d"] += 1
-                    else:
-                        aging_buckets["14d+"] += 1
-                except (ValueError, TypeError):
-                    aging_buckets["14d+"] += 1
-
-        # SLA compliance (cases older than 14 days are SLA breaches)
-        sla_breached = aging_buckets.get("14d+", 0)
-        total = len(records)
-        sla_compliance_pct = (
-            round((total - sla_breached) / total * 100, 1) if total > 0 else 100.0
-        )
 
-        return {
-            "total_open": total,
-            "by_status": by_status,
-            "by_priority": by_priority,
-            "aging_distribution": aging_buckets,
-            "sla_compliance_pct": sla_compliance_pct,
-            "sla_breached_count": sla_breached,
-        }
+async def get_case_queue_summary_async(
+    owner_id: str | None = None,
+    queue_name: str | None = None,
+) -> dict[str, Any]:
+    """Native-async variant of get_case_queue_summary."""
+    try:
+        sf = _get_async_sf_client()
+        return _case_queue_batch_result(await sf.query_batch(_case_queue_queries(owner_id, queue_name)))
 
-    except SalesforceClientError as e:
+    except (SalesforceClientError, InvalidSoqlValueError) as e:
         return e.to_error_response()
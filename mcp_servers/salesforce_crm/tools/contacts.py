@@ -9,26 +9,65 @@ from __future__ import annotations
 import logging
 from typing import Any
 
-from mcp_servers.salesforce_crm.server import _get_sf_client, mcp
+from mcp_servers.salesforce_crm.server import _get_async_sf_client, _get_sf_client, mcp
+from shared.mappers import RecordMapper
 from shared.models import ContactSummary
-from shared.salesforce_client import SalesforceClientError
+from shared.salesforce_client import SalesforceClientError, is_relationship_error
+from shared.soql import InvalidSoqlValueError, SoqlQuery, child_records, eq, id_eq, ne
 
 logger = logging.getLogger(__name__)
 
 
 CONTACT_FIELDS = "Id, Name, Title, Email, Phone"
 
+CONTACT_QUERY = SoqlQuery("Contact").select(CONTACT_FIELDS).order_by("Name ASC")
+CONTACT_WITH_ROLES_QUERY = CONTACT_QUERY.with_children(
+    SoqlQuery("OpportunityContactRoles")
+    .select("Role")
+    .where(eq("Opportunity.IsClosed", False), ne("Role", None))
+    .order_by("IsPrimary DESC")
+    .limit(1)
+)
+
+
+def _contact_role(record: dict[str, Any]) -> str | None:
+    """Return the role from a contact's OpportunityContactRoles subquery rows, if any."""
+    roles = child_records(record, "OpportunityContactRoles")
+    return roles[0].get("Role") if roles else None
+
+
+CONTACT_MAPPER = RecordMapper(
+    ContactSummary,
+    {
+        "id": "Id",
+        "name": "Name",
+        "title": "Title",
+        "email": "Email",
+        "phone": "Phone",
+        "role": _contact_role,
+    },
+)
+
+
+def _contacts_soql(account_id: str, limit: int, *, with_roles: bool = True) -> str:
+    """Build the SOQL listing contacts for an account.
+
+    Each contact's primary open-opportunity contact role comes back in the
+    same query through the OpportunityContactRoles relationship subquery
+    unless with_roles is False.
+    """
+    query = CONTACT_WITH_ROLES_QUERY if with_roles else CONTACT_QUERY
+    return query.where(id_eq("AccountId", account_id)).limit(limit).build()
+
 
-def _record_to_contact(record: dict[str, Any], role: str | None = None) -> ContactSummary:
-    """Transform a Salesforce Contact record to ContactSummary."""
-    return ContactSummary(
-        id=record["Id"],
-        name=record["Name"],
-        title=record.get("Title"),
-        email=record.get("Email"),
-        phone=record.get("Phone"),
-        role=role,
-    )
+def _contacts_result(records: list[dict[str, Any]]) -> dict[str, Any]:
+    """Shape get_contacts_for_account output."""
+    contacts = CONTACT_MAPPER.many(records)
+
+    return {
+        "contacts": contacts,
+        "total_count": len(contacts),
+    }
 
 
 @mcp.tool()
@@ -47,46 +86,40 @@ def get_contacts_for_account(
     try:
         sf = _get_sf_client()
 
-        # Get contacts for the account
-        soql = (
-            f"SELECT {CONTACT_FIELDS} FROM Contact "
-            f"WHERE AccountId = '{account_id}' "
-            f"ORDER BY Name ASC LIMIT {limit}"
-        )
-        records = sf.query(soql)
-
-        # Get opportunity contact roles for these contacts
-        contact_ids = [r["Id"] for r in records]
-        roles_map: dict[str, str] = {}
-
-        if contact_ids:
-            ids_clause = "', '".join(contact_ids)
-            roles_soql = (
-                f"SELECT ContactId, Role FROM OpportunityContactRole "
-                f"WHERE ContactId IN ('{ids_clause}') "
-                f"AND Opportunity.IsClosed = false"
-            )
-            try:
-                role_records = sf.query(roles_soql)
-                for rr in role_records:
-                    cid = rr.get("ContactId", "")
-                    role = rr.get("Role")
-                    if cid and role and cid not in roles_map:
-                        # Keep first role found (primary)
-                        roles_map[cid] = role
-            except SalesforceClientError:
-                # OpportunityContactRole may not be accessible; continue without roles
-                logger.debug("Unable to retrieve contact roles, continuing without them")
-
-        contacts = [
-            _record_to_contact(r, roles_map.get(r["Id"])).model_dump()
-            for r in records
-        ]
-
-        return {
-            "contacts": contacts,
-            "total_count": len(contacts),
-        }
-
-    except SalesforceClientError as e:
+        # Contacts and their opportunity contact roles in one query
+        try:
+            records = sf.query(_contacts_soql(account_id, limit))
+        except SalesforceClientError as e:
+            if not is_relationship_error(e):
+                raise
+            # OpportunityContactRole may not be accessible; continue without roles
+            logger.debug("Unable to retrieve contact roles, continuing without them")
+            records = sf.query(_contacts_soql(account_id, limit, with_roles=False))
+
+        return _contacts_result(records)
+
+    except (SalesforceClientError, InvalidSoqlValueError) as e:
+        return e.to_error_response()
+
+
+async def get_contacts_for_account_async(
+    account_id: str,
+    limit: int = 25,
+) -> dict[str, Any]:
+    """Native-async variant of get_contacts_for_account."""
+    limit = max(1, min(50, limit))
+
+    try:
+        sf = _get_async_sf_client()
+        try:
+            records = await sf.query(_contacts_soql(account_id, limit))
+        except SalesforceClientError as e:
+            if not is_relationship_error(e):
+                raise
+            logger.debug("Unable to retrieve contact roles, continuing without them")
+            records = await sf.query(_contacts_soql(account_id, limit, with_roles=False))
+
+        return _contacts_result(records)
+
+    except (SalesforceClientError, InvalidSoqlValueError) as e:
         return e.to_error_response()
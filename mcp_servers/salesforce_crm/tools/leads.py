@@ -9,34 +9,62 @@ from __future__ import annotations
 import logging
 from typing import Any
 
-from mcp_servers.salesforce_crm.server import _get_sf_client, mcp
+from mcp_servers.salesforce_crm.server import _get_async_sf_client, _get_sf_client, mcp
+from shared.mappers import RecordMapper
 from shared.models import LeadSummary
 from shared.salesforce_client import SalesforceClientError, WriteBackConfirmationError
+from shared.soql import InvalidSoqlValueError, SoqlQuery, eq, id_eq
 
 logger = logging.getLogger(__name__)
 
 
 LEAD_FIELDS = (
-    "Id, FirstName, LastName, Company, Title, Email, Phone, "
+    "Id, Name, Company, Title, Email, Phone, "
     "Status, LeadSource, Owner.Name, CreatedDate"
 )
 
+LEAD_QUERY = SoqlQuery("Lead").select(LEAD_FIELDS).order_by("CreatedDate DESC")
+
+LEAD_MAPPER = RecordMapper(
+    LeadSummary,
+    {
+        "id": "Id",
+        "name": ("Name", ""),
+        "company": ("Company", ""),
+        "status": ("Status", ""),
+        "lead_source": "LeadSource",
+        "email": "Email",
+        "owner_name": "Owner.Name",
+    },
+)
+
+
+def _leads_soql(
+    owner_id: str | None,
+    status: str | None,
+    lead_source: str | None,
+    limit: int,
+) -> str:
+    """Build the SOQL listing unconverted leads with optional filters."""
+    conditions = [eq("IsConverted", False)]
+    if owner_id:
+        conditions.append(id_eq("OwnerId", owner_id))
+    if status:
+        conditions.append(eq("Status", status))
+    if lead_source:
+        conditions.append(eq("LeadSource", lead_source))
+
+    return LEAD_QUERY.where(*conditions).limit(limit).build()
+
 
-def _record_to_lead(record: dict[str, Any]) -> LeadSummary:
-    """Transform a Salesforce Lead record to LeadSummary."""
-    owner = record.get("Owner") or {}
-    return LeadSummary(
-        id=record["Id"],
-        first_name=record.get("FirstName", ""),
-        last_name=record.get("LastName", ""),
-        company=record.get("Company", ""),
-        title=record.get("Title"),
-        email=record.get("Email"),
-        phone=record.get("Phone"),
-        status=record.get("Status", ""),
-        lead_source=record.get("LeadSource"),
-        owner_name=owner.get("Name") if isinstance(owner, dict) else None,
-    )
+def _leads_result(records: list[dict[str, Any]]) -> dict[str, Any]:
+    """Shape get_leads output."""
+    leads = LEAD_MAPPER.many(records)
+
+    return {
+        "leads": leads,
+        "total_count": len(leads),
+    }
 
 
 @mcp.tool()
@@ -58,32 +86,28 @@ def get_leads(
 
     try:
         sf = _get_sf_client()
+        records = sf.query(_leads_soql(owner_id, status, lead_source, limit))
+        return _leads_result(records)
 
-        conditions: list[str] = ["IsConverted = false"]
-        if owner_id:
-            conditions.append(f"OwnerId = '{owner_id}'")
-        if status:
-            safe_status = status.replace("'", "\\'")
-            conditions.append(f"Status = '{safe_status}'")
-        if lead_source:
-            safe_source = lead_source.replace("'", "\\'")
-            conditions.append(f"LeadSource = '{safe_source}'")
-
-        where_clause = " AND ".join(conditions)
-        soql = (
-            f"SELECT {LEAD_FIELDS} FROM Lead "
-            f"WHERE {where_clause} "
-            f"ORDER BY CreatedDate DESC LIMIT {limit}"
-        )
-        records = sf.query(soql)
-        leads = [_record_to_lead(r).model_dump() for r in records]
+    except (SalesforceClientError, InvalidSoqlValueError) as e:
+        return e.to_error_response()
 
-        return {
-            "leads": leads,
-            "total_count": len(leads),
-        }
 
-    except SalesforceClientError as e:
+async def get_leads_async(
+    owner_id: str | None = None,
+    status: str | None = None,
+    lead_source: str | None = None,
+    limit: int = 25,
+) -> dict[str, Any]:
+    """Native-async variant of get_leads."""
+    limit = max(1, min(50, limit))
+
+    try:
+        sf = _get_async_sf_client()
+        records = await sf.query(_leads_soql(owner_id, status, lead_source, limit))
+        return _leads_result(records)
+
+    except (SalesforceClientError, InvalidSoqlValueError) as e:
         return e.to_error_response()
 
 
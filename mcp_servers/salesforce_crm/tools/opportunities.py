@@ -2,19 +2,41 @@
 
 Implements: get_opportunities, get_pipeline_summary
 Contract: contracts/mcp-salesforce-crm.md
+
+With SF_OPP_SNAPSHOT_ENABLED=true, open-deal reads are answered from the
+caller's local opportunity snapshot (shared/opportunity_snapshot.py) and
+fall back to live SOQL when it is unavailable. In that mode the pipeline
+summary and activity gaps consider every open deal in scope.
 """
 
 from __future__ import annotations
 
 import logging
-from datetime import date
+from datetime import date, timedelta
 from typing import Any
 
-import yaml
-
-from mcp_servers.salesforce_crm.server import _get_sf_client, mcp
+from mcp_servers.salesforce_crm.server import _get_async_sf_client, _get_sf_client, mcp
+from shared.config import RiskThresholds, get_risk_thresholds
+from shared.mappers import RecordMapper
 from shared.models import OpportunitySummary
+from shared.opportunity_snapshot import SnapshotView, get_opportunity_snapshot
 from shared.salesforce_client import SalesforceClientError
+from shared.soql import (
+    InvalidSoqlValueError,
+    SoqlQuery,
+    all_of,
+    any_of,
+    eq,
+    gt,
+    gte,
+    id_eq,
+    in_,
+    in_subquery,
+    lt,
+    lte,
+    parse_date,
+    validate_id,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -24,83 +46,160 @@ OPP_FIELDS = (
     "Owner.Name, Account.Name, LastActivityDate"
 )
 
+OPP_QUERY = SoqlQuery("Opportunity").select(OPP_FIELDS).order_by("CloseDate ASC")
+PIPELINE_GROUPS_QUERY = (
+    SoqlQuery("Opportunity")
+    .select("StageName stage, OwnerId ownerId, Owner.Name ownerName, COUNT(Id) dealCount, SUM(Amount) totalValue")
+    .group_by("StageName", "OwnerId", "Owner.Name")
+)
+AT_RISK_GROUPS_QUERY = (
+    SoqlQuery("Opportunity")
+    .select("OwnerId ownerId, Owner.Name ownerName, COUNT(Id) dealCount")
+    .group_by("OwnerId", "Owner.Name")
+)
+# Detail rows returned for at-risk deals; counts always cover every at-risk deal
+AT_RISK_DEALS_LIMIT = 200
+
+
+def _load_risk_thresholds() -> RiskThresholds:
+    """Return the shared risk thresholds, cached and reloaded when the YAML file changes."""
+    return get_risk_thresholds()
+
+
+def _close_date(record: dict[str, Any]) -> date:
+    """CloseDate is required on Opportunity; treat a missing one as today."""
+    close_date = record.get("CloseDate")
+    return date.fromisoformat(close_date) if close_date else date.today()
+
+
+OPPORTUNITY_MAPPER = RecordMapper(
+    OpportunitySummary,
+    {
+        "id": "Id",
+        "name": "Name",
+        "amount": "Amount",
+        "stage": ("StageName", ""),
+        "close_date": _close_date,
+        "probability": "Probability",
+        "owner_name": "Owner.Name",
+        "account_name": "Account.Name",
+        "last_activity_date": "LastActivityDate",
+    },
+)
 
-def _load_risk_thresholds() -> dict[str, Any]:
-    """Load risk thresholds from config/risk_thresholds.yaml."""
-    try:
-        with open("config/risk_thresholds.yaml") as f:
-            return yaml.safe_load(f) or {}
-    except FileNotFoundError:
-        logger.warning("risk_thresholds.yaml not found, using defaults")
-        return {
-            "stage_stagnation_days": 30,
-            "inactivity_days": 14,
-            "low_probability_threshold": 30,
-            "overdue_close_date": {"enabled": True},
-            "late_stages": ["Negotiation/Review", "Proposal/Price Quote"],
-            "minimum_amount_for_risk": 10000,
-        }
-
-
-def _record_to_opportunity(record: dict[str, Any]) -> OpportunitySummary:
-    """Transform a Salesforce Opportunity record to OpportunitySummary."""
-    owner = record.get("Owner") or {}
-    account = record.get("Account") or {}
-    close_date_str = record.get("CloseDate", "")
-    last_activity_str = record.get("LastActivityDate")
-
-    return OpportunitySummary(
-        id=record["Id"],
-        name=record["Name"],
-        amount=record.get("Amount"),
-        stage=record.get("StageName", ""),
-        close_date=date.fromisoformat(close_date_str) if close_date_str else date.today(),
-        probability=record.get("Probability"),
-        owner_name=owner.get("Name") if isinstance(owner, dict) else None,
-        account_name=account.get("Name") if isinstance(account, dict) else None,
-        last_activity_date=(
-            date.fromisoformat(last_activity_str) if last_activity_str else None
-        ),
-        risk_flags=[],
-    )
 
+def _apply_risk_flags(
+    opp: dict[str, Any], thresholds: RiskThresholds, today: date | None = None
+) -> dict[str, Any]:
+    """Apply risk flags to a mapped opportunity based on thresholds.
 
-def _apply_risk_flags(opp: OpportunitySummary, thresholds: dict[str, Any]) -> OpportunitySummary:
-    """Apply risk flags to an opportunity based on thresholds."""
+    This is the reference for the rules; shared/risk_engine.py evaluates
+    the same rules over whole columns and is tested against it.
+    """
     flags: list[str] = []
-    today = date.today()
+    today = today or date.today()
 
     # Overdue close date
-    overdue_config = thresholds.get("overdue_close_date", {})
-    if overdue_config.get("enabled", True) and opp.close_date < today:
+    if thresholds.overdue_enabled and opp["close_date"] < today:
         flags.append("Overdue close date")
 
     # Inactivity
-    inactivity_days = thresholds.get("inactivity_days", 14)
-    if opp.last_activity_date:
-        days_since_activity = (today - opp.last_activity_date).days
+    inactivity_days = thresholds.inactivity_days
+    if opp["last_activity_date"]:
+        days_since_activity = (today - opp["last_activity_date"]).days
         if days_since_activity > inactivity_days:
             flags.append(f"No activity in {days_since_activity} days")
     else:
         flags.append("No recorded activity")
 
     # Low probability
-    low_prob = thresholds.get("low_probability_threshold", 30)
-    if opp.probability is not None and opp.probability < low_prob:
-        flags.append(f"Low probability ({opp.probability}%)")
+    low_prob = thresholds.low_probability_threshold
+    if opp["probability"] is not None and opp["probability"] < low_prob:
+        flags.append(f"Low probability ({opp['probability']}%)")
 
     # Stage stagnation — late stages approaching close
-    late_stages = thresholds.get("late_stages", [])
-    stagnation_days = thresholds.get("stage_stagnation_days", 30)
-    if opp.stage in late_stages:
-        days_to_close = (opp.close_date - today).days
+    stagnation_days = thresholds.stage_stagnation_days
+    if opp["stage"] in thresholds.late_stages:
+        days_to_close = (opp["close_date"] - today).days
         if days_to_close < stagnation_days and days_to_close > 0:
             flags.append(f"Late stage with {days_to_close} days to close")
 
-    opp.risk_flags = flags
+    opp["risk_flags"] = flags
     return opp
 
 
+def _opportunities_soql(
+    owner_id: str | None,
+    account_id: str | None,
+    stage: str | None,
+    close_date_from: str | None,
+    close_date_to: str | None,
+    include_closed: bool,
+    limit: int,
+) -> str:
+    """Build the SOQL listing opportunities with optional filters."""
+    conditions: list[str] = []
+    if not include_closed:
+        conditions.append(eq("IsClosed", False))
+
+    if owner_id:
+        conditions.append(id_eq("OwnerId", owner_id))
+    if account_id:
+        conditions.append(id_eq("AccountId", account_id))
+    if stage:
+        conditions.append(eq("StageName", stage))
+    if close_date_from:
+        conditions.append(gte("CloseDate", parse_date(close_date_from, "close_date_from")))
+    if close_date_to:
+        conditions.append(lte("CloseDate", parse_date(close_date_to, "close_date_to")))
+
+    return OPP_QUERY.where(*conditions).limit(limit).build()
+
+
+def _snapshot_view(sf: Any) -> SnapshotView | None:
+    """The caller's opportunity snapshot view, or None to query live."""
+    snapshot = get_opportunity_snapshot(sf)
+    return snapshot.view(sf) if snapshot is not None else None
+
+
+async def _async_snapshot_view(sf: Any) -> SnapshotView | None:
+    """Async counterpart of ``_snapshot_view``."""
+    snapshot = get_opportunity_snapshot(sf)
+    return await snapshot.view_async(sf) if snapshot is not None else None
+
+
+def _snapshot_opportunities(
+    view: SnapshotView,
+    owner_id: str | None,
+    account_id: str | None,
+    stage: str | None,
+    close_date_from: str | None,
+    close_date_to: str | None,
+    limit: int,
+) -> list[dict[str, Any]]:
+    """Answer get_opportunities filters from the snapshot, validating inputs as the SOQL path does."""
+    return view.opportunities(
+        owner_id=validate_id(owner_id, "OwnerId") if owner_id else None,
+        account_id=validate_id(account_id, "AccountId") if account_id else None,
+        stage=stage,
+        close_date_from=parse_date(close_date_from, "close_date_from") if close_date_from else None,
+        close_date_to=parse_date(close_date_to, "close_date_to") if close_date_to else None,
+        limit=limit,
+    )
+
+
+def _opportunities_result(records: list[dict[str, Any]]) -> dict[str, Any]:
+    """Shape get_opportunities output."""
+    opportunities = OPPORTUNITY_MAPPER.many(records)
+    total_value = sum(o.get("amount") or 0 for o in opportunities)
+
+    return {
+        "opportunities": opportunities,
+        "total_count": len(opportunities),
+        "total_value": total_value,
+    }
+
+
 @mcp.tool()
 def get_opportunities(
     owner_id: str | None = None,
@@ -128,44 +227,213 @@ def get_opportunities(
 
     try:
         sf = _get_sf_client()
-
-        conditions: list[str] = []
-        if not include_closed:
-            conditions.append("IsClosed = false")
-
-        if owner_id:
-            conditions.append(f"OwnerId = '{owner_id}'")
-        if account_id:
-            conditions.append(f"AccountId = '{account_id}'")
-        if stage:
-            safe_stage = stage.replace("'", "\\'")
-            conditions.append(f"StageName = '{safe_stage}'")
-        if close_date_from:
-            conditions.append(f"CloseDate >= {close_date_from}")
-        if close_date_to:
-            conditions.append(f"CloseDate <= {close_date_to}")
-
-        where_clause = " AND ".join(conditions) if conditions else "IsClosed = false"
-        soql = (
-            f"SELECT {OPP_FIELDS} FROM Opportunity "
-            f"WHERE {where_clause} "
-            f"ORDER BY CloseDate ASC LIMIT {limit}"
+        view = None if include_closed else _snapshot_view(sf)
+        if view is not None:
+            return _opportunities_result(
+                _snapshot_opportunities(view, owner_id, account_id, stage, close_date_from, close_date_to, limit)
+            )
+        soql = _opportunities_soql(
+            owner_id, account_id, stage, close_date_from, close_date_to, include_closed, limit
         )
-        records = sf.query(soql)
+        return _opportunities_result(sf.query(soql))
 
-        opportunities = [_record_to_opportunity(r).model_dump() for r in records]
-        total_value = sum(o.get("amount") or 0 for o in opportunities)
+    except (SalesforceClientError, InvalidSoqlValueError) as e:
+        return e.to_error_response()
 
-        return {
-            "opportunities": opportunities,
-            "total_count": len(opportunities),
-            "total_value": total_value,
-        }
 
-    except SalesforceClientError as e:
+async def get_opportunities_async(
+    owner_id: str | None = None,
+    account_id: str | None = None,
+    stage: str | None = None,
+    close_date_from: str | None = None,
+    close_date_to: str | None = None,
+    include_closed: bool = False,
+    limit: int = 25,
+) -> dict[str, Any]:
+    """Native-async variant of get_opportunities."""
+    limit = max(1, min(50, limit))
+
+    try:
+        sf = _get_async_sf_client()
+        view = None if include_closed else await _async_snapshot_view(sf)
+        if view is not None:
+            return _opportunities_result(
+                _snapshot_opportunities(view, owner_id, account_id, stage, close_date_from, close_date_to, limit)
+            )
+        soql = _opportunities_soql(
+            owner_id, account_id, stage, close_date_from, close_date_to, include_closed, limit
+        )
+        return _opportunities_result(await sf.query(soql))
+
+    except (SalesforceClientError, InvalidSoqlValueError) as e:
         return e.to_error_response()
 
 
+def _pipeline_scope(owner_id: str | None, manager_id: str | None) -> list[str]:
+    """Build the WHERE conditions for open opportunities, optionally scoped to owners.
+
+    A manager's team is selected with a semi-join on User, so no separate
+    round trip is needed to list the direct reports first.
+    """
+    conditions = [eq("IsClosed", False)]
+    if owner_id:
+        conditions.append(id_eq("OwnerId", owner_id))
+    elif manager_id:
+        team = SoqlQuery("User").select("Id").where(id_eq("ManagerId", manager_id), eq("IsActive", True))
+        conditions.append(in_subquery("OwnerId", team))
+    return conditions
+
+
+def _pipeline_aggregate_soql(scope: list[str]) -> str:
+    """Build the aggregate SOQL totalling open opportunities by stage and owner.
+
+    Salesforce does the counting, so totals stay exact however many deals
+    are open; one row comes back per (stage, owner) pair.
+    """
+    return PIPELINE_GROUPS_QUERY.where(*scope).build()
+
+
+def _at_risk_conditions(scope: list[str], thresholds: RiskThresholds) -> list[str]:
+    """Build the WHERE conditions selecting the open deals that carry a risk flag.
+
+    Mirrors the rules in ``_apply_risk_flags`` as server-side filters, plus
+    ``minimum_amount_for_risk``, so Salesforce can both list and count the
+    at-risk deals. The flags themselves are still applied locally.
+    """
+    today = date.today()
+    inactivity_days = thresholds.inactivity_days
+    low_prob = thresholds.low_probability_threshold
+    stagnation_days = thresholds.stage_stagnation_days
+    min_amount = thresholds.minimum_amount_for_risk
+
+    risk_conditions = [
+        eq("LastActivityDate", None),
+        lt("LastActivityDate", today - timedelta(days=inactivity_days)),
+        lt("Probability", low_prob),
+    ]
+    if thresholds.overdue_enabled:
+        risk_conditions.append(lt("CloseDate", today))
+    late_stages = thresholds.late_stages
+    if late_stages:
+        risk_conditions.append(
+            all_of(
+                in_("StageName", late_stages),
+                gt("CloseDate", today),
+                lt("CloseDate", today + timedelta(days=stagnation_days)),
+            )
+        )
+
+    conditions = [*scope, any_of(*risk_conditions)]
+    if min_amount > 0:
+        conditions.append(gte("Amount", min_amount))
+    return conditions
+
+
+def _at_risk_candidates_soql(scope: list[str], thresholds: RiskThresholds) -> str:
+    """Build the SOQL listing at-risk deals, soonest close first, up to the detail cap."""
+    return OPP_QUERY.where(*_at_risk_conditions(scope, thresholds)).limit(AT_RISK_DEALS_LIMIT).build()
+
+
+def _at_risk_counts_soql(scope: list[str], thresholds: RiskThresholds) -> str:
+    """Build the aggregate SOQL counting at-risk deals per owner, however many there are."""
+    return AT_RISK_GROUPS_QUERY.where(*_at_risk_conditions(scope, thresholds)).build()
+
+
+def _pipeline_queries(
+    owner_id: str | None,
+    manager_id: str | None,
+    thresholds: RiskThresholds,
+) -> dict[str, str]:
+    """Build the aggregate, at-risk count and at-risk detail queries for one Composite Batch request."""
+    scope = _pipeline_scope(owner_id, manager_id)
+    return {
+        "groups": _pipeline_aggregate_soql(scope),
+        "at_risk_groups": _at_risk_counts_soql(scope, thresholds),
+        "candidates": _at_risk_candidates_soql(scope, thresholds),
+    }
+
+
+def _snapshot_pipeline(
+    view: SnapshotView,
+    owner_id: str | None,
+    manager_id: str | None,
+    thresholds: RiskThresholds,
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """Stage/owner groups and at-risk candidates from the snapshot, in the live queries' shape."""
+    return view.pipeline(
+        thresholds,
+        owner_id=validate_id(owner_id, "OwnerId") if owner_id else None,
+        manager_id=validate_id(manager_id, "ManagerId") if manager_id else None,
+    )
+
+
+def _pipeline_result(
+    groups: list[dict[str, Any]],
+    candidates: list[dict[str, Any]],
+    thresholds: RiskThresholds,
+    manager_id: str | None,
+    at_risk_groups: list[dict[str, Any]] | None = None,
+) -> dict[str, Any]:
+    """Combine stage/owner aggregates with risk flags applied to candidate deals.
+
+    ``at_risk_groups`` are per-owner at-risk counts from the aggregate query;
+    without them (snapshot reads, where candidates are complete) the counts
+    come from the flagged candidates. At most ``AT_RISK_DEALS_LIMIT`` deals
+    are listed, and ``at_risk_has_more`` reports when the list is cut short.
+    """
+    # At-risk deals
+    today = date.today()
+    at_risk: list[dict[str, Any]] = []
+    for opp in OPPORTUNITY_MAPPER.many(candidates):
+        if _apply_risk_flags(opp, thresholds, today)["risk_flags"]:
+            at_risk.append(opp)
+
+    at_risk_by_owner: dict[str, int] = {}
+    if at_risk_groups is None:
+        for opp in at_risk:
+            name = opp["owner_name"] or "Unknown"
+            at_risk_by_owner[name] = at_risk_by_owner.get(name, 0) + 1
+    else:
+        for group in at_risk_groups:
+            name = group.get("ownerName") or "Unknown"
+            at_risk_by_owner[name] = at_risk_by_owner.get(name, 0) + int(group.get("dealCount") or 0)
+    total_at_risk = max(sum(at_risk_by_owner.values()), len(at_risk))
+
+    # Aggregate by stage (and by owner when manager_id used)
+    by_stage: dict[str, dict[str, int | float]] = {}
+    owner_breakdown: dict[str, dict[str, str | int | float]] = {}
+    total_deals = 0
+    total_value = 0.0
+    for group in groups:
+        count = int(group.get("dealCount") or 0)
+        value = float(group.get("totalValue") or 0)
+        total_deals += count
+        total_value += value
+
+        stage = by_stage.setdefault(group.get("stage") or "", {"count": 0, "value": 0.0})
+        stage["count"] += count
+        stage["value"] += value
+
+        if manager_id:
+            oid = group.get("ownerName") or "Unknown"
+            owner = owner_breakdown.setdefault(
+                oid,
+                {"owner_name": oid, "deal_count": 0, "total_value": 0.0, "at_risk_count": at_risk_by_owner.get(oid, 0)},
+            )
+            owner["deal_count"] = int(owner["deal_count"]) + count
+            owner["total_value"] = float(owner["total_value"]) + value
+
+    return {
+        "total_deals": total_deals,
+        "total_value": total_value,
+        "by_stage": by_stage,
+        "at_risk_deals": at_risk[:AT_RISK_DEALS_LIMIT],
+        "total_at_risk": total_at_risk,
+        "at_risk_has_more": total_at_risk > AT_RISK_DEALS_LIMIT,
+        "owner_breakdown": owner_breakdown if manager_id else None,
+    }
+
+
 @mcp.tool()
 def get_pipeline_summary(
     manager_id: str | None = None,
@@ -184,90 +452,126 @@ def get_pipeline_summary(
         sf = _get_sf_client()
         thresholds = _load_risk_thresholds()
 
-        # Determine which owner(s) to query
-        owner_ids: list[str] = []
-        if owner_id:
-            owner_ids = [owner_id]
-        elif manager_id:
-            # Get direct reports
-            team_soql = (
-                f"SELECT Id FROM User WHERE ManagerId = '{manager_id}' AND IsActive = true"
-            )
-            team_records = sf.query(team_soql)
-            owner_ids = [r["Id"] for r in team_records]
-            if not owner_ids:
-                return {
-                    "total_deals": 0,
-                    "total_value": 0.0,
-                    "by_stage": {},
-                    "at_risk_deals": [],
-                    "owner_breakdown": {},
-                }
-
-        # Build query
-        conditions = ["IsClosed = false"]
-        if owner_ids:
-            ids_clause = "', '".join(owner_ids)
-            conditions.append(f"OwnerId IN ('{ids_clause}')")
-
-        where_clause = " AND ".join(conditions)
-        soql = (
-            f"SELECT {OPP_FIELDS} FROM Opportunity "
-            f"WHERE {where_clause} "
-            f"ORDER BY CloseDate ASC LIMIT 200"
+        view = _snapshot_view(sf)
+        if view is not None:
+            groups, candidates = _snapshot_pipeline(view, owner_id, manager_id, thresholds)
+            return _pipeline_result(groups, candidates, thresholds, manager_id)
+
+        # Stage/owner totals, at-risk counts and at-risk deals in one round trip
+        results = sf.query_batch(_pipeline_queries(owner_id, manager_id, thresholds))
+        return _pipeline_result(
+            results["groups"], results["candidates"], thresholds, manager_id, results["at_risk_groups"]
         )
-        records = sf.query(soql)
-
-        # Transform and apply risk flags
-        opps = [_record_to_opportunity(r) for r in records]
-        min_amount = thresholds.get("minimum_amount_for_risk", 10000)
-        for opp in opps:
-            if (opp.amount or 0) >= min_amount:
-                _apply_risk_flags(opp, thresholds)
-
-        # Aggregate by stage
-        by_stage: dict[str, dict[str, int | float]] = {}
-        for opp in opps:
-            stage_name = opp.stage
-            if stage_name not in by_stage:
-                by_stage[stage_name] = {"count": 0, "value": 0.0}
-            by_stage[stage_name]["count"] += 1
-            by_stage[stage_name]["value"] += opp.amount or 0
-
-        # At-risk deals
-        at_risk = [opp for opp in opps if opp.risk_flags]
-
-        # Owner breakdown (when manager_id used)
-        owner_breakdown: dict[str, dict[str, str | int | float]] = {}
-        if manager_id:
-            for opp in opps:
-                oid = opp.owner_name or "Unknown"
-                if oid not in owner_breakdown:
-                    owner_breakdown[oid] = {
-                        "owner_name": oid,
-                        "deal_count": 0,
-                        "total_value": 0.0,
-                        "at_risk_count": 0,
-                    }
-                owner_breakdown[oid]["deal_count"] = int(owner_breakdown[oid]["deal_count"]) + 1
-                owner_breakdown[oid]["total_value"] = float(owner_breakdown[oid]["total_value"]) + (opp.amount or 0)
-                if opp.risk_flags:
-                    owner_breakdown[oid]["at_risk_count"] = int(owner_breakdown[oid]["at_risk_count"]) + 1
-
-        total_value = sum(opp.amount or 0 for opp in opps)
-
-        return {
-            "total_deals": len(opps),
-            "total_value": total_value,
-            "by_stage": by_stage,
-            "at_risk_deals": [opp.model_dump() for opp in at_risk],
-            "owner_breakdown": owner_breakdown if manager_id else None,
-        }
 
-    except SalesforceClientError as e:
+    except (SalesforceClientError, InvalidSoqlValueError) as e:
         return e.to_error_response()
 
 
+async def get_pipeline_summary_async(
+    manager_id: str | None = None,
+    owner_id: str | None = None,
+) -> dict[str, Any]:
+    """Native-async variant of get_pipeline_summary."""
+    try:
+        sf = _get_async_sf_client()
+        thresholds = _load_risk_thresholds()
+
+        view = await _async_snapshot_view(sf)
+        if view is not None:
+            groups, candidates = _snapshot_pipeline(view, owner_id, manager_id, thresholds)
+            return _pipeline_result(groups, candidates, thresholds, manager_id)
+
+        results = await sf.query_batch(_pipeline_queries(owner_id, manager_id, thresholds))
+        return _pipeline_result(
+            results["groups"], results["candidates"], thresholds, manager_id, results["at_risk_groups"]
+        )
+
+    except (SalesforceClientError, InvalidSoqlValueError) as e:
+        return e.to_error_response()
+
+
+def _activity_gaps_soql(owner_id: str | None, limit: int) -> str:
+    """Build the SOQL listing open opportunities to classify for activity gaps."""
+    conditions = [eq("IsClosed", False)]
+    if owner_id:
+        conditions.append(id_eq("OwnerId", owner_id))
+    return OPP_QUERY.where(*conditions).limit(limit * 2).build()
+
+
+def _activity_gaps_result(
+    records: list[dict[str, Any]],
+    thresholds: RiskThresholds,
+    threshold_days: int,
+    limit: int,
+) -> dict[str, Any]:
+    """Classify deals into overdue, inactive and approaching buckets by urgency."""
+    today = date.today()
+    opps = OPPORTUNITY_MAPPER.many(records)
+
+    # Classify each deal
+    overdue: list[dict[str, Any]] = []
+    inactive: list[dict[str, Any]] = []
+    approaching: list[dict[str, Any]] = []
+
+    for opp in opps:
+        _apply_risk_flags(opp, thresholds, today)
+        days_since_activity = (
+            (today - opp["last_activity_date"]).days if opp["last_activity_date"] else None
+        )
+        days_to_close = (opp["close_date"] - today).days
+
+        entry = {
+            **opp,
+            "days_since_activity": days_since_activity,
+            "days_to_close": days_to_close,
+            "urgency": "",
+            "recommended_action": "",
+        }
+
+        if days_to_close < 0:
+            entry["urgency"] = "urgent"
+            entry["recommended_action"] = (
+                f"Overdue by {abs(days_to_close)} days — re-engage decision maker "
+                f"or revise close date"
+            )
+            overdue.append(entry)
+        elif days_since_activity is not None and days_since_activity > threshold_days:
+            entry["urgency"] = "high"
+            entry["recommended_action"] = (
+                f"No activity in {days_since_activity} days — schedule follow-up"
+            )
+            inactive.append(entry)
+        elif days_since_activity is None:
+            entry["urgency"] = "high"
+            entry["recommended_action"] = "No recorded activity — initiate outreach"
+            inactive.append(entry)
+        elif 0 <= days_to_close <= 7:
+            entry["urgency"] = "medium"
+            entry["recommended_action"] = (
+                f"Closing in {days_to_close} days — verify next steps"
+            )
+            approaching.append(entry)
+
+    # Sort inactive by longest gap first
+    inactive.sort(
+        key=lambda x: x.get("days_since_activity") or 9999, reverse=True
+    )
+
+    # Combine in priority order and trim to limit
+    prioritized = (overdue + inactive + approaching)[:limit]
+
+    return {
+        "deals": prioritized,
+        "total_count": len(prioritized),
+        "summary": {
+            "overdue": len(overdue),
+            "inactive": len(inactive),
+            "approaching": len(approaching),
+        },
+        "threshold_days": threshold_days,
+    }
+
+
 @mcp.tool()
 def get_deal_activity_gaps(
     owner_id: str | None = None,
@@ -289,84 +593,42 @@ def get_deal_activity_gaps(
     try:
         sf = _get_sf_client()
         thresholds = _load_risk_thresholds()
-        threshold_days = inactivity_threshold_days or thresholds.get("inactivity_days", 14)
-        today = date.today()
-
-        conditions = ["IsClosed = false"]
-        if owner_id:
-            conditions.append(f"OwnerId = '{owner_id}'")
-
-        where_clause = " AND ".join(conditions)
-        soql = (
-            f"SELECT {OPP_FIELDS} FROM Opportunity "
-            f"WHERE {where_clause} "
-            f"ORDER BY CloseDate ASC LIMIT {limit * 2}"
-        )
-        records = sf.query(soql)
-        opps = [_record_to_opportunity(r) for r in records]
-
-        # Classify each deal
-        overdue: list[dict[str, Any]] = []
-        inactive: list[dict[str, Any]] = []
-        approaching: list[dict[str, Any]] = []
-
-        for opp in opps:
-            _apply_risk_flags(opp, thresholds)
-            days_since_activity = (
-                (today - opp.last_activity_date).days if opp.last_activity_date else None
+        threshold_days = inactivity_threshold_days or thresholds.inactivity_days
+
+        view = _snapshot_view(sf)
+        if view is not None:
+            records = view.activity_gap_candidates(
+                threshold_days, owner_id=validate_id(owner_id, "OwnerId") if owner_id else None
             )
-            days_to_close = (opp.close_date - today).days
-
-            entry = {
-                **opp.model_dump(),
-                "days_since_activity": days_since_activity,
-                "days_to_close": days_to_close,
-                "urgency": "",
-                "recommended_action": "",
-            }
-
-            if days_to_close < 0:
-                entry["urgency"] = "urgent"
-                entry["recommended_action"] = (
-                    f"Overdue by {abs(days_to_close)} days — re-engage decision maker "
-                    f"or revise close date"
-                )
-                overdue.append(entry)
-            elif days_since_activity is not None and days_since_activity > threshold_days:
-                entry["urgency"] = "high"
-                entry["recommended_action"] = (
-                    f"No activity in {days_since_activity} days — schedule follow-up"
-                )
-                inactive.append(entry)
-            elif days_since_activity is None:
-                entry["urgency"] = "high"
-                entry["recommended_action"] = "No recorded activity — initiate outreach"
-                inactive.append(entry)
-            elif 0 <= days_to_close <= 7:
-                entry["urgency"] = "medium"
-                entry["recommended_action"] = (
-                    f"Closing in {days_to_close} days — verify next steps"
-                )
-                approaching.append(entry)
-
-        # Sort inactive by longest gap first
-        inactive.sort(
-            key=lambda x: x.get("days_since_activity") or 9999, reverse=True
-        )
+        else:
+            records = sf.query(_activity_gaps_soql(owner_id, limit))
+        return _activity_gaps_result(records, thresholds, threshold_days, limit)
 
-        # Combine in priority order and trim to limit
-        prioritized = (overdue + inactive + approaching)[:limit]
-
-        return {
-            "deals": prioritized,
-            "total_count": len(prioritized),
-            "summary": {
-                "overdue": len(overdue),
-                "inactive": len(inactive),
-                "approaching": len(approaching),
-            },
-            "threshold_days": threshold_days,
-        }
+    except (SalesforceClientError, InvalidSoqlValueError) as e:
+        return e.to_error_response()
+
+
+async def get_deal_activity_gaps_async(
+    owner_id: str | None = None,
+    inactivity_threshold_days: int | None = None,
+    limit: int = 20,
+) -> dict[str, Any]:
+    """Native-async variant of get_deal_activity_gaps."""
+    limit = max(1, min(50, limit))
+
+    try:
+        sf = _get_async_sf_client()
+        thresholds = _load_risk_thresholds()
+        threshold_days = inactivity_threshold_days or thresholds.inactivity_days
+
+        view = await _async_snapshot_view(sf)
+        if view is not None:
+            records = view.activity_gap_candidates(
+                threshold_days, owner_id=validate_id(owner_id, "OwnerId") if owner_id else None
+            )
+        else:
+            records = await sf.query(_activity_gaps_soql(owner_id, limit))
+        return _activity_gaps_result(records, thresholds, threshold_days, limit)
 
-    except SalesforceClientError as e:
+    except (SalesforceClientError, InvalidSoqlValueError) as e:
         return e.to_error_response()
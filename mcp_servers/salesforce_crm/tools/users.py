@@ -9,25 +9,46 @@ from __future__ import annotations
 import logging
 from typing import Any
 
-from mcp_servers.salesforce_crm.server import _get_sf_client, mcp
+from mcp_servers.salesforce_crm.server import _get_async_sf_client, _get_sf_client, mcp
+from shared.mappers import RecordMapper
 from shared.models import TeamMember
 from shared.salesforce_client import SalesforceClientError
+from shared.soql import InvalidSoqlValueError, SoqlQuery, eq, id_eq
 
 logger = logging.getLogger(__name__)
 
 
 USER_FIELDS = "Id, Name, IsActive, Profile.Name"
 
+TEAM_MEMBERS_QUERY = (
+    SoqlQuery("User").select(USER_FIELDS).where(eq("IsActive", True)).order_by("Name ASC")
+)
 
-def _record_to_team_member(record: dict[str, Any]) -> TeamMember:
-    """Transform a Salesforce User record to TeamMember."""
-    profile = record.get("Profile") or {}
-    return TeamMember(
-        id=record["Id"],
-        name=record["Name"],
-        is_active=record.get("IsActive", True),
-        profile_name=profile.get("Name") if isinstance(profile, dict) else None,
-    )
+
+TEAM_MEMBER_MAPPER = RecordMapper(
+    TeamMember,
+    {
+        "id": "Id",
+        "name": "Name",
+        "is_active": ("IsActive", True),
+        "profile_name": "Profile.Name",
+    },
+)
+
+
+def _team_members_soql(manager_id: str) -> str:
+    """Build the SOQL listing active direct reports of a manager."""
+    return TEAM_MEMBERS_QUERY.where(id_eq("ManagerId", manager_id)).build()
+
+
+def _team_members_result(records: list[dict[str, Any]]) -> dict[str, Any]:
+    """Shape get_team_members output."""
+    team_members = TEAM_MEMBER_MAPPER.many(records)
+
+    return {
+        "team_members": team_members,
+        "count": len(team_members),
+    }
 
 
 @mcp.tool()
@@ -41,20 +62,21 @@ def get_team_members(
     """
     try:
         sf = _get_sf_client()
+        records = sf.query(_team_members_soql(manager_id))
+        return _team_members_result(records)
 
-        soql = (
-            f"SELECT {USER_FIELDS} FROM User "
-            f"WHERE ManagerId = '{manager_id}' AND IsActive = true "
-            f"ORDER BY Name ASC"
-        )
-        records = sf.query(soql)
+    except (SalesforceClientError, InvalidSoqlValueError) as e:
+        return e.to_error_response()
 
-        team_members = [_record_to_team_member(r).model_dump() for r in records]
 
-        return {
-            "team_members": team_members,
-            "count": len(team_members),
-        }
+async def get_team_members_async(
+    manager_id: str,
+) -> dict[str, Any]:
+    """Native-async variant of get_team_members."""
+    try:
+        sf = _get_async_sf_client()
+        records = await sf.query(_team_members_soql(manager_id))
+        return _team_members_result(records)
 
-    except SalesforceClientError as e:
+    except (SalesforceClientError, InvalidSoqlValueError) as e:
         return e.to_error_response()
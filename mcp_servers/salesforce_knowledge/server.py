@@ -6,10 +6,17 @@ Transport: stdio (notebooks) / SSE (hosted deployment).
 
 from __future__ import annotations
 
+import inspect
 import logging
 import os
+from types import ModuleType
+from typing import TYPE_CHECKING
 
 from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp.exceptions import ToolError
+
+if TYPE_CHECKING:
+    from shared.async_salesforce_client import AsyncSalesforceClient
 
 logger = logging.getLogger(__name__)
 
@@ -29,9 +36,41 @@ async def health_check(request):  # noqa: ARG001
     return JSONResponse({"status": "ok", "server": "salesforce-knowledge"})
 
 
+@mcp.custom_route("/metrics", methods=["GET"])
+async def metrics(request):  # noqa: ARG001
+    """Connection pool, request governor and query cache metrics for replica sizing."""
+    from starlette.responses import JSONResponse
+
+    from shared.client_registry import get_registry
+    from shared.rate_limiter import get_governor
+    from shared.salesforce_client import get_query_cache
+
+    return JSONResponse({
+        "server": "salesforce-knowledge",
+        "clients": get_registry().stats(),
+        "governor": get_governor().metrics(),
+        "query_cache": get_query_cache().stats(),
+    })
+
+
 def _get_sf_client():
-    """Get a SalesforceClient instance from environment variables."""
-    from shared.salesforce_client import SalesforceClient
+    """Get a pooled SalesforceClient for the credentials in environment variables."""
+    from shared.client_registry import get_registry
+
+    instance_url = os.environ.get("SF_INSTANCE_URL", "")
+    access_token = os.environ.get("SF_ACCESS_TOKEN", "")
+
+    if not instance_url or not access_token:
+        raise RuntimeError(
+            "SF_INSTANCE_URL and SF_ACCESS_TOKEN environment variables are required."
+        )
+
+    return get_registry().get_client(instance_url, access_token)
+
+
+def _get_async_sf_client() -> AsyncSalesforceClient:
+    """Get a pooled AsyncSalesforceClient for the credentials in environment variables."""
+    from shared.client_registry import get_registry
 
     instance_url = os.environ.get("SF_INSTANCE_URL", "")
     access_token = os.environ.get("SF_ACCESS_TOKEN", "")
@@ -41,7 +80,35 @@ def _get_sf_client():
             "SF_INSTANCE_URL and SF_ACCESS_TOKEN environment variables are required."
         )
 
-    return SalesforceClient(instance_url=instance_url, access_token=access_token)
+    return get_registry().get_async_client(instance_url, access_token)
+
+
+def _use_async_tools() -> bool:
+    """Whether to serve native-async tool variants (MCP_ASYNC_TOOLS=true)."""
+    return os.environ.get("MCP_ASYNC_TOOLS", "false").lower() in ("1", "true", "yes")
+
+
+def _register_async_variants(*modules: ModuleType) -> None:
+    """Replace registered sync tools with their ``<name>_async`` coroutine variants.
+
+    The sync tool stays importable (tests, notebooks); only the MCP registration
+    is swapped so the SSE event loop is never blocked on a Salesforce round trip.
+    Private helpers and coroutines without a registered sync tool are left alone.
+    """
+    for module in modules:
+        for attr, fn in vars(module).items():
+            if attr.startswith("_") or not (attr.endswith("_async") and inspect.iscoroutinefunction(fn)):
+                continue
+            tool_name = attr.removesuffix("_async")
+            sync_fn = getattr(module, tool_name, None)
+            if sync_fn is None:
+                continue
+            try:
+                mcp.remove_tool(tool_name)
+            except ToolError:
+                logger.debug("No registered tool %s; not swapping in %s", tool_name, attr)
+                continue
+            mcp.add_tool(fn, name=tool_name, description=inspect.getdoc(sync_fn))
 
 
 # Tool registration imports — must come AFTER mcp is defined
@@ -49,6 +116,11 @@ def _register_tools() -> None:
     """Import tool modules to trigger registration."""
     import mcp_servers.salesforce_knowledge.tools.articles  # noqa: F401
 
+    if _use_async_tools():
+        from mcp_servers.salesforce_knowledge import tools
+
+        _register_async_variants(tools.articles)
+
 
 if __name__ == "__main__":
     import sys as _sys
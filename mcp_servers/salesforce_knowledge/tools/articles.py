@@ -7,12 +7,14 @@ Contract: contracts/mcp-salesforce-knowledge.md
 from __future__ import annotations
 
 import logging
-import re
 from typing import Any
 
-from mcp_servers.salesforce_knowledge.server import _get_sf_client, mcp
+from mcp_servers.salesforce_knowledge.server import _get_async_sf_client, _get_sf_client, mcp
+from shared.article_content import fetch_article_bodies, fetch_article_bodies_async, html_to_text
+from shared.mappers import RecordMapper
 from shared.models import ErrorResponse, KnowledgeArticle
 from shared.salesforce_client import SalesforceClientError
+from shared.soql import InvalidSoqlValueError, SoqlQuery, eq, id_eq, like_contains, sosl_escape
 
 logger = logging.getLogger(__name__)
 
@@ -21,33 +23,113 @@ ARTICLE_FIELDS = (
     "Id, Title, Summary, UrlName, LastPublishedDate, ArticleType"
 )
 
-ARTICLE_BODY_FIELDS = (
-    "Id, Title, Summary, UrlName, LastPublishedDate, ArticleType"
+PUBLISHED_ARTICLES = (
+    SoqlQuery("KnowledgeArticleVersion")
+    .select(ARTICLE_FIELDS)
+    .where(eq("PublishStatus", "Online"), eq("IsLatestVersion", True))
+)
+ARTICLE_QUERY = PUBLISHED_ARTICLES.order_by("LastPublishedDate DESC")
+
+
+ARTICLE_MAPPER = RecordMapper(
+    KnowledgeArticle,
+    {
+        "id": ("Id", ""),
+        "title": ("Title", ""),
+        "summary": "Summary",
+        "url_name": "UrlName",
+        "last_published": "LastPublishedDate",
+        "article_type": "ArticleType",
+    },
 )
+ARTICLE_WITH_BODY_MAPPER = RecordMapper(
+    KnowledgeArticle,
+    {**ARTICLE_MAPPER.sources, "body": lambda record: html_to_text(record.get("ArticleBody", ""))},
+)
+
 
+def _article_sosl(query: str, language: str, limit: int) -> str:
+    """Build the SOSL full-text search for published articles."""
+    returning = ARTICLE_QUERY.where(eq("Language", language)).limit(limit).returning()
+    return f"FIND {{{sosl_escape(query)}}} IN ALL FIELDS RETURNING {returning}"
 
-def _strip_html(html: str) -> str:
-    """Strip HTML tags and return plain text."""
-    if not html:
-        return ""
-    text = re.sub(r"<[^>]+>", " ", html)
-    text = re.sub(r"\s+", " ", text).strip()
-    return text
-
-
-def _record_to_article(record: dict[str, Any], include_body: bool = False) -> KnowledgeArticle:
-    """Transform a Salesforce KnowledgeArticleVersion record to KnowledgeArticle."""
-    return KnowledgeArticle(
-        id=record.get("Id", ""),
-        title=record.get("Title", ""),
-        summary=record.get("Summary"),
-        url_name=record.get("UrlName"),
-        last_published=record.get("LastPublishedDate"),
-        article_type=record.get("ArticleType"),
-        body=_strip_html(record.get("ArticleBody", "")) if include_body else None,
+
+def _article_fallback_soql(query: str, language: str, limit: int) -> str:
+    """Build the SOQL title search used when SOSL is unavailable."""
+    return (
+        ARTICLE_QUERY.where(like_contains("Title", query), eq("Language", language))
+        .limit(limit)
+        .build()
     )
 
 
+def _article_by_id_soql(article_id: str) -> str:
+    """Build the SOQL fetching one published article by ID."""
+    return PUBLISHED_ARTICLES.where(id_eq("Id", article_id)).limit(1).build()
+
+
+def _search_articles_error(e: SalesforceClientError) -> dict[str, Any]:
+    """Map a search failure to KNOWLEDGE_DISABLED when Knowledge is not enabled."""
+    error_msg = str(e.message) if hasattr(e, "message") else str(e)
+    if "Knowledge" in error_msg or "KnowledgeArticle" in error_msg:
+        return ErrorResponse(
+            code="KNOWLEDGE_DISABLED",
+            message="Salesforce Knowledge is not enabled or accessible. "
+            "Please contact your Salesforce admin to enable Knowledge.",
+        ).model_dump()
+    return e.to_error_response()
+
+
+def _get_article_error(e: SalesforceClientError) -> dict[str, Any]:
+    """Map an article fetch failure to KNOWLEDGE_DISABLED when Knowledge is not enabled."""
+    error_msg = str(e.message) if hasattr(e, "message") else str(e)
+    if "Knowledge" in error_msg:
+        return ErrorResponse(
+            code="KNOWLEDGE_DISABLED",
+            message="Salesforce Knowledge is not enabled or accessible.",
+        ).model_dump()
+    return e.to_error_response()
+
+
+def _article_bodies(sf: Any, records: list[dict[str, Any]]) -> dict[str, str]:
+    """Fetch body HTML for get_article_by_id, returning none if the article type or field is unreadable."""
+    if not records:
+        return {}
+    try:
+        return fetch_article_bodies(sf, records)
+    except SalesforceClientError as e:
+        logger.warning("Returning article %s without its body: %s", records[0].get("Id"), e)
+        return {}
+
+
+async def _article_bodies_async(sf: Any, records: list[dict[str, Any]]) -> dict[str, str]:
+    """Async counterpart of ``_article_bodies``."""
+    if not records:
+        return {}
+    try:
+        return await fetch_article_bodies_async(sf, records)
+    except SalesforceClientError as e:
+        logger.warning("Returning article %s without its body: %s", records[0].get("Id"), e)
+        return {}
+
+
+def _article_by_id_result(
+    records: list[dict[str, Any]], article_id: str, bodies: dict[str, str] | None = None
+) -> dict[str, Any]:
+    """Shape get_article_by_id output; ``bodies`` holds body HTML read from the article type's rich-text fields."""
+    if not records:
+        return ErrorResponse(
+            code="NOT_FOUND",
+            message=f"Knowledge article '{article_id}' not found or not published.",
+        ).model_dump()
+
+    record = records[0]
+    body = (bodies or {}).get(record.get("Id", ""))
+    if body:
+        record = {**record, "ArticleBody": body}
+    return {"article": ARTICLE_WITH_BODY_MAPPER(record)}
+
+
 @mcp.tool()
 def search_articles(
     query: str,
@@ -71,34 +153,13 @@ def search_articles(
         # Try SOSL first for relevance-ranked results
         search_method = "sosl"
         try:
-            safe_query = query.replace("'", "\\'").replace("\\", "\\\\")
-            sosl = (
-                f"FIND {{{safe_query}}} IN ALL FIELDS "
-                f"RETURNING KnowledgeArticleVersion("
-                f"{ARTICLE_FIELDS} "
-                f"WHERE PublishStatus = 'Online' "
-                f"AND Language = '{language}' "
-                f"AND IsLatestVersion = true "
-                f"ORDER BY LastPublishedDate DESC "
-                f"LIMIT {limit})"
-            )
-            records = sf.search(sosl)
+            records = sf.search(_article_sosl(query, language, limit))
         except SalesforceClientError:
             # Fallback to SOQL
             search_method = "soql"
-            safe_query = query.replace("'", "\\'")
-            soql = (
-                f"SELECT {ARTICLE_FIELDS} FROM KnowledgeArticleVersion "
-                f"WHERE Title LIKE '%{safe_query}%' "
-                f"AND PublishStatus = 'Online' "
-                f"AND Language = '{language}' "
-                f"AND IsLatestVersion = true "
-                f"ORDER BY LastPublishedDate DESC "
-                f"LIMIT {limit}"
-            )
-            records = sf.query(soql)
-
-        articles = [_record_to_article(r).model_dump() for r in records]
+            records = sf.query(_article_fallback_soql(query, language, limit))
+
+        articles = ARTICLE_MAPPER.many(records)
 
         return {
             "articles": articles,
@@ -107,14 +168,37 @@ def search_articles(
         }
 
     except SalesforceClientError as e:
-        error_msg = str(e.message) if hasattr(e, "message") else str(e)
-        if "Knowledge" in error_msg or "KnowledgeArticle" in error_msg:
-            return ErrorResponse(
-                code="KNOWLEDGE_DISABLED",
-                message="Salesforce Knowledge is not enabled or accessible. "
-                "Please contact your Salesforce admin to enable Knowledge.",
-            ).model_dump()
-        return e.to_error_response()
+        return _search_articles_error(e)
+
+
+async def search_articles_async(
+    query: str,
+    language: str = "en_US",
+    limit: int = 10,
+) -> dict[str, Any]:
+    """Native-async variant of search_articles."""
+    limit = max(1, min(25, limit))
+
+    try:
+        sf = _get_async_sf_client()
+
+        search_method = "sosl"
+        try:
+            records = await sf.search(_article_sosl(query, language, limit))
+        except SalesforceClientError:
+            search_method = "soql"
+            records = await sf.query(_article_fallback_soql(query, language, limit))
+
+        articles = ARTICLE_MAPPER.many(records)
+
+        return {
+            "articles": articles,
+            "total_count": len(articles),
+            "search_method": search_method,
+        }
+
+    except SalesforceClientError as e:
+        return _search_articles_error(e)
 
 
 @mcp.tool()
@@ -129,31 +213,28 @@ def get_article_by_id(
     try:
         sf = _get_sf_client()
 
-        # Query the article with body content
-        soql = (
-            f"SELECT {ARTICLE_FIELDS} FROM KnowledgeArticleVersion "
-            f"WHERE Id = '{article_id}' "
-            f"AND PublishStatus = 'Online' "
-            f"AND IsLatestVersion = true "
-            f"LIMIT 1"
-        )
-        records = sf.query(soql)
+        # The body lives in the article type's rich-text fields, not on KnowledgeArticleVersion
+        records = sf.query(_article_by_id_soql(article_id))
+        bodies = _article_bodies(sf, records)
+        return _article_by_id_result(records, article_id, bodies)
 
-        if not records:
-            return ErrorResponse(
-                code="NOT_FOUND",
-                message=f"Knowledge article '{article_id}' not found or not published.",
-            ).model_dump()
+    except SalesforceClientError as e:
+        return _get_article_error(e)
+    except InvalidSoqlValueError as e:
+        return e.to_error_response()
 
-        article = _record_to_article(records[0], include_body=True)
 
-        return {"article": article.model_dump()}
+async def get_article_by_id_async(
+    article_id: str,
+) -> dict[str, Any]:
+    """Native-async variant of get_article_by_id."""
+    try:
+        sf = _get_async_sf_client()
+        records = await sf.query(_article_by_id_soql(article_id))
+        bodies = await _article_bodies_async(sf, records)
+        return _article_by_id_result(records, article_id, bodies)
 
     except SalesforceClientError as e:
-        error_msg = str(e.message) if hasattr(e, "message") else str(e)
-        if "Knowledge" in error_msg:
-            return ErrorResponse(
-                code="KNOWLEDGE_DISABLED",
-                message="Salesforce Knowledge is not enabled or accessible.",
-            ).model_dump()
+        return _get_article_error(e)
+    except InvalidSoqlValueError as e:
         return e.to_error_response()
@@ -0,0 +1,260 @@
+"""Knowledge article body extraction and chunking.
+
+Article bodies do not live on KnowledgeArticleVersion: they are rich-text
+fields on each article type's ``__kav`` object (``FAQ__kav.Answer__c``,
+``Knowledge__kav.Details__c``, ...). ``fetch_article_bodies`` describes each
+article type once, finds its rich-text fields, and reads them for a whole
+batch of articles with one query per type:
+
+    bodies = fetch_article_bodies(sf, records)     # {version Id: HTML}
+    text = html_to_text(bodies[record["Id"]])
+    chunks = chunk_text(text, max_tokens=512, overlap_tokens=64)
+
+HTML is converted with the stdlib's incremental ``HTMLParser``, which keeps
+block structure (paragraphs, list items, headings) as line breaks and drops
+scripts and styles. Token counts use ``tiktoken`` when it is installed and
+an approximate word/punctuation count otherwise.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable, Iterator, Mapping
+from html.parser import HTMLParser
+from typing import Any
+
+from shared.soql import SoqlQuery, id_in
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - exercised only without tiktoken
+    tiktoken = None
+
+# Article IDs per body query; keeps the IN list well under SOQL's length limit
+BODY_QUERY_CHUNK = 200
+DEFAULT_CHUNK_TOKENS = 512
+DEFAULT_CHUNK_OVERLAP_TOKENS = 64
+
+# ArticleType is interpolated into SOQL as an object name, so it must look like one
+_ARTICLE_TYPE = re.compile(r"^[A-Za-z][A-Za-z0-9_]*__kav$")
+
+_BLOCK_TAGS = frozenset(
+    {
+        "address", "article", "aside", "blockquote", "br", "dd", "div", "dl", "dt", "figcaption",
+        "figure", "footer", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li", "main",
+        "ol", "p", "pre", "section", "table", "tbody", "td", "th", "thead", "tr", "ul",
+    }
+)  # fmt: skip
+_SKIPPED_TAGS = frozenset({"script", "style", "head", "title", "noscript", "template"})
+
+
+class _TextExtractor(HTMLParser):
+    """Collects the text of an HTML fragment, one line per block element."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self._lines: list[str] = []
+        self._current: list[str] = []
+        self._skip_depth = 0
+
+    def _break(self) -> None:
+        line = " ".join("".join(self._current).split())
+        if line:
+            self._lines.append(line)
+        self._current = []
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag in _SKIPPED_TAGS:
+            self._skip_depth += 1
+        elif tag in _BLOCK_TAGS:
+            self._break()
+            if tag == "li":
+                self._current.append("- ")
+
+    def handle_startendtag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag in _BLOCK_TAGS:
+            self._break()
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in _SKIPPED_TAGS:
+            self._skip_depth = max(self._skip_depth - 1, 0)
+        elif tag in _BLOCK_TAGS:
+            self._break()
+
+    def handle_data(self, data: str) -> None:
+        if not self._skip_depth:
+            self._current.append(data)
+
+    def text(self) -> str:
+        self.close()
+        self._break()
+        return "\n".join(self._lines)
+
+
+def html_to_text(html: str | Iterable[str] | None) -> str:
+    """Convert rich-text HTML to plain text, one line per paragraph or list item.
+
+    Args:
+        html: An HTML string, or an iterable of string pieces fed to the
+              parser as they arrive.
+    """
+    if not html:
+        return ""
+    parser = _TextExtractor()
+    for piece in [html] if isinstance(html, str) else html:
+        parser.feed(piece)
+    return parser.text()
+
+
+def rich_text_fields(describe: Mapping[str, Any]) -> tuple[str, ...]:
+    """Names of the rich-text fields in an object's describe result, in describe order."""
+    return tuple(
+        f["name"]
+        for f in describe.get("fields", [])
+        if f.get("type") == "textarea" and f.get("extraTypeInfo") == "richtextarea"
+    )
+
+
+def _ids_by_article_type(articles: Iterable[Mapping[str, Any]]) -> dict[str, list[str]]:
+    groups: dict[str, list[str]] = {}
+    for article in articles:
+        article_type = article.get("ArticleType") or ""
+        if _ARTICLE_TYPE.match(article_type):
+            groups.setdefault(article_type, []).append(article["Id"])
+    return groups
+
+
+def _body_queries(article_type: str, fields: tuple[str, ...], ids: list[str]) -> Iterator[str]:
+    query = SoqlQuery(article_type).select("Id", *fields)
+    for i in range(0, len(ids), BODY_QUERY_CHUNK):
+        yield query.where(id_in("Id", ids[i : i + BODY_QUERY_CHUNK])).build()
+
+
+def _join_body(record: Mapping[str, Any], fields: tuple[str, ...]) -> str:
+    return "\n".join(record[name] for name in fields if record.get(name))
+
+
+def fetch_article_bodies(sf: Any, articles: Iterable[Mapping[str, Any]]) -> dict[str, str]:
+    """Read the rich-text body HTML of a batch of articles.
+
+    Args:
+        sf: A SalesforceClient.
+        articles: KnowledgeArticleVersion records with ``Id`` and ``ArticleType``.
+
+    Returns:
+        Version Id -> body HTML (the article type's rich-text fields joined in
+        describe order). Articles whose type has no rich-text fields are omitted.
+    """
+    bodies: dict[str, str] = {}
+    for article_type, ids in _ids_by_article_type(articles).items():
+        fields = rich_text_fields(sf.describe(article_type))
+        if not fields:
+            continue
+        for soql in _body_queries(article_type, fields, ids):
+            for record in sf.query(soql):
+                bodies[record["Id"]] = _join_body(record, fields)
+    return bodies
+
+
+async def fetch_article_bodies_async(sf: Any, articles: Iterable[Mapping[str, Any]]) -> dict[str, str]:
+    """Async counterpart of ``fetch_article_bodies`` for an AsyncSalesforceClient."""
+    bodies: dict[str, str] = {}
+    for article_type, ids in _ids_by_article_type(articles).items():
+        fields = rich_text_fields(await sf.describe(article_type))
+        if not fields:
+            continue
+        for soql in _body_queries(article_type, fields, ids):
+            for record in await sf.query(soql):
+                bodies[record["Id"]] = _join_body(record, fields)
+    return bodies
+
+
+# Fallback tokenizer: words and individual punctuation marks, close to BPE counts for English prose
+_TOKEN = re.compile(r"\w+|[^\w\s]")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+_encoding: Any = None
+
+
+def _tiktoken_encoding() -> Any:
+    global _encoding
+    if _encoding is None and tiktoken is not None:
+        _encoding = tiktoken.get_encoding("cl100k_base")
+    return _encoding
+
+
+def count_tokens(text: str) -> int:
+    """Number of tokens in ``text`` (exact with tiktoken, approximate without)."""
+    encoding = _tiktoken_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return len(_TOKEN.findall(text))
+
+
+def _split_by_tokens(text: str, max_tokens: int) -> list[str]:
+    """Hard-split text that has no sentence break into ``max_tokens`` pieces."""
+    encoding = _tiktoken_encoding()
+    if encoding is not None:
+        tokens = encoding.encode(text)
+        return [encoding.decode(tokens[i : i + max_tokens]).strip() for i in range(0, len(tokens), max_tokens)]
+    starts = [m.start() for m in _TOKEN.finditer(text)]
+    cuts = [*starts[::max_tokens], len(text)]
+    return [text[a:b].strip() for a, b in zip(cuts, cuts[1:], strict=False) if text[a:b].strip()]
+
+
+def _units(text: str, max_tokens: int) -> Iterator[tuple[str, int]]:
+    """Paragraphs, or sentences of paragraphs that are too long, or token slices of sentences that still are."""
+    for paragraph in text.split("\n"):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        tokens = count_tokens(paragraph)
+        if tokens <= max_tokens:
+            yield paragraph, tokens
+            continue
+        for sentence in _SENTENCE_END.split(paragraph):
+            tokens = count_tokens(sentence)
+            if tokens <= max_tokens:
+                yield sentence, tokens
+            else:
+                for piece in _split_by_tokens(sentence, max_tokens):
+                    yield piece, count_tokens(piece)
+
+
+def chunk_text(
+    text: str,
+    max_tokens: int = DEFAULT_CHUNK_TOKENS,
+    overlap_tokens: int = DEFAULT_CHUNK_OVERLAP_TOKENS,
+) -> list[str]:
+    """Split text into chunks of at most ``max_tokens`` tokens for embedding.
+
+    Chunks break at paragraph ends where possible, then at sentence ends,
+    and only split inside a sentence that is longer than a chunk. Each chunk
+    after the first repeats the trailing paragraphs or sentences of the
+    previous one, up to ``overlap_tokens``, so context is not lost at the seams.
+
+    Raises:
+        ValueError: If ``overlap_tokens`` is not smaller than ``max_tokens``.
+    """
+    if not 0 <= overlap_tokens < max_tokens:
+        raise ValueError("overlap_tokens must be at least 0 and smaller than max_tokens")
+
+    chunks: list[str] = []
+    current: list[tuple[str, int]] = []
+    size = 0
+    for unit, tokens in _units(text, max_tokens):
+        if current and size + tokens > max_tokens:
+            chunks.append("\n".join(u for u, _ in current))
+            # Carry the tail of the finished chunk over as overlap, if it leaves room for this unit
+            carried: list[tuple[str, int]] = []
+            carried_size = 0
+            for prev, prev_tokens in reversed(current):
+                if carried_size + prev_tokens > overlap_tokens or carried_size + prev_tokens + tokens > max_tokens:
+                    break
+                carried.insert(0, (prev, prev_tokens))
+                carried_size += prev_tokens
+            current, size = carried, carried_size
+        current.append((unit, tokens))
+        size += tokens
+    if current:
+        chunks.append("\n".join(u for u, _ in current))
+    return chunks
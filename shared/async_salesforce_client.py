@@ -0,0 +1,582 @@
+"""Native asyncio Salesforce REST API client.
+
+Async counterpart of SalesforceClient built on httpx.AsyncClient, so MCP
+tools running on the FastMCP event loop (SSE transport) can overlap many
+in-flight Salesforce requests over one pooled, optionally HTTP/2 connection
+instead of blocking the loop for each round trip.
+
+Shares error mapping, rate-limit policy and usage tracking with the sync client.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import logging
+from collections.abc import AsyncIterator, Callable, Collection, Mapping
+from contextlib import AbstractAsyncContextManager, asynccontextmanager, nullcontext
+from typing import TYPE_CHECKING, Any, TypeVar
+
+import httpx
+
+from shared import json_codec
+from shared.cache import MemoryCacheBackend
+from shared.salesforce_client import (
+    API_VERSION,
+    COMPOSITE_BATCH_MAX_SUBREQUESTS,
+    MAX_QUERY_RESULTS,
+    MIN_QUERY_BATCH_SIZE,
+    QUERY_PAGE_SIZE,
+    ApiUsageTracker,
+    QueryCache,
+    SalesforceClientError,
+    WriteBackConfirmationError,
+    check_rate_limit,
+    composite_batch_payload,
+    composite_payload,
+    map_salesforce_error,
+    strip_attributes,
+    subrequest_records,
+    sync_usage_from_header,
+    token_fingerprint,
+)
+from shared.singleflight import AsyncSingleFlight
+
+if TYPE_CHECKING:
+    from shared.rate_limiter import RequestGovernor
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Connection pool defaults — one process should be able to keep hundreds of
+# requests in flight; HTTP/2 multiplexes them over a handful of connections.
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+DEFAULT_TIMEOUT = 30.0
+
+
+def http2_available() -> bool:
+    """Return True if the optional ``h2`` package needed for HTTP/2 is installed."""
+    return importlib.util.find_spec("h2") is not None
+
+
+class AsyncSalesforceClient:
+    """Async Salesforce REST client with rate tracking and error handling.
+
+    Each instance represents a per-user authenticated session and owns an
+    httpx.AsyncClient connection pool. Close it with ``aclose()`` or use it
+    as an async context manager.
+    """
+
+    def __init__(
+        self,
+        instance_url: str,
+        access_token: str,
+        api_version: str = API_VERSION,
+        *,
+        http2: bool = True,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+        timeout: float = DEFAULT_TIMEOUT,
+        transport: httpx.AsyncBaseTransport | None = None,
+        usage_tracker: ApiUsageTracker | None = None,
+        limits_refresh_seconds: float | None = None,
+        governor: RequestGovernor | None = None,
+        query_cache: QueryCache | None = None,
+    ) -> None:
+        """Initialize client with per-user credentials.
+
+        Args:
+            instance_url: Salesforce instance URL
+            access_token: OAuth access token for the user
+            api_version: Salesforce REST API version
+            http2: Negotiate HTTP/2 when the ``h2`` package is installed
+            max_connections: Maximum concurrent connections in the pool
+            max_keepalive_connections: Idle connections kept open for reuse
+            keepalive_expiry: Seconds an idle connection is kept open
+            timeout: Request timeout in seconds
+            transport: Optional httpx transport (used by tests to mock Salesforce)
+            usage_tracker: Optional shared tracker. Defaults to a private tracker.
+            limits_refresh_seconds: If set, re-read DailyApiRequests from the
+                                    /limits resource at most this often.
+            governor: Optional request governor shared with the sync clients.
+            query_cache: Optional read-through result cache shared with the sync clients.
+        """
+        self._instance_url = instance_url.rstrip("/")
+        self._api_version = api_version
+        self._base_path = f"/services/data/v{api_version}"
+        self._usage = usage_tracker if usage_tracker is not None else ApiUsageTracker()
+        self._limits_refresh_seconds = limits_refresh_seconds
+        self._governor = governor
+        self._user_key = token_fingerprint(access_token)
+        self._in_flight = 0
+        self._cache = query_cache
+        # Identical queries/searches issued concurrently share one API call
+        self._flights = AsyncSingleFlight()
+        self._describes: dict[str, dict[str, Any]] = {}
+
+        use_http2 = http2 and http2_available()
+        if http2 and not use_http2:
+            logger.debug("h2 not installed — AsyncSalesforceClient falling back to HTTP/1.1")
+
+        self._http = httpx.AsyncClient(
+            base_url=self._instance_url,
+            headers={
+                "Authorization": f"Bearer {access_token}",
+                "Accept": "application/json",
+            },
+            http2=use_http2,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            timeout=timeout,
+            transport=transport,
+        )
+
+    async def __aenter__(self) -> AsyncSalesforceClient:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+    @property
+    def usage(self) -> ApiUsageTracker:
+        """Access the API usage tracker."""
+        return self._usage
+
+    @property
+    def instance_url(self) -> str:
+        """Salesforce instance URL this client is bound to."""
+        return self._instance_url
+
+    @property
+    def user_key(self) -> str:
+        """Stable, non-reversible identity of the user this client acts for."""
+        return self._user_key
+
+    @property
+    def in_flight(self) -> int:
+        """Requests currently queued on the governor or being sent through this client."""
+        return self._in_flight
+
+    async def aclose(self) -> None:
+        """Close the underlying connection pool."""
+        await self._http.aclose()
+
+    async def refresh_limits(self) -> dict[str, Any]:
+        """Re-seed the usage tracker from the org's ``/limits`` resource.
+
+        Failures are logged and ignored; the tracker keeps its last figures.
+
+        Returns:
+            Current usage status dict.
+        """
+        try:
+            response = await self._http.get(f"{self._base_path}/limits/")
+            response.raise_for_status()
+            daily = json_codec.loads(response.content).get("DailyApiRequests") or {}
+            total = int(daily["Max"])
+            self._usage.sync(total - int(daily["Remaining"]), total)
+        except (httpx.HTTPError, KeyError, TypeError, ValueError):
+            logger.warning("Failed to refresh Salesforce API limits for %s", self._instance_url, exc_info=True)
+        return self._usage.get_status()
+
+    async def _check_rate_limit(self) -> dict[str, Any] | None:
+        """Check rate limit status and return warning if needed."""
+        if self._limits_refresh_seconds is not None and self._usage.claim_refresh(self._limits_refresh_seconds):
+            await self.refresh_limits()
+        return check_rate_limit(self._usage)
+
+    @asynccontextmanager
+    async def _slot(self) -> AsyncIterator[None]:
+        """Hold a governor slot for one request and count the call once it has been sent."""
+        governor_slot: AbstractAsyncContextManager[None] = (
+            nullcontext() if self._governor is None else self._governor.slot_async(self._instance_url, self._user_key)
+        )
+        self._in_flight += 1
+        try:
+            async with governor_slot:
+                try:
+                    yield
+                finally:
+                    self._usage.record_call()
+        finally:
+            self._in_flight -= 1
+
+    async def _cache_get(self, kind: str, statement: str) -> list[dict[str, Any]] | None:
+        """Return cached results for this user, if a cache is configured."""
+        if self._cache is None:
+            return None
+        return await self._off_loop(self._cache.get, self._user_key, kind, statement)
+
+    async def _cache_put(self, kind: str, statement: str, records: list[dict[str, Any]]) -> None:
+        if self._cache is not None:
+            await self._off_loop(self._cache.put, self._user_key, kind, statement, records)
+
+    async def _invalidate(self, sobject: str) -> None:
+        if self._cache is not None:
+            await self._off_loop(self._cache.invalidate, sobject)
+
+    async def _off_loop(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run a cache call in a worker thread unless its backend is in-process memory.
+
+        The sqlite and Redis backends do blocking file/socket I/O, which must
+        not stall every other coroutine on the event loop.
+        """
+        assert self._cache is not None
+        if isinstance(self._cache.backend, MemoryCacheBackend):
+            return fn(*args)
+        return await asyncio.to_thread(fn, *args)
+
+    def _flight_key(self, kind: str, statement: str) -> tuple[str, str, str]:
+        """Identity under which identical concurrent reads are coalesced."""
+        return (self._user_key, kind, QueryCache.normalize(statement))
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        *,
+        operation: str,
+        sobject: str = "",
+        record_id: str = "",
+        params: dict[str, Any] | None = None,
+        json: Any = None,
+        headers: dict[str, str] | None = None,
+    ) -> httpx.Response:
+        """Send one REST request, counting it and mapping failures to SalesforceClientError."""
+        await self._check_rate_limit()
+
+        try:
+            async with self._slot():
+                response = await self._http.request(method, path, params=params, json=json, headers=headers)
+        except httpx.HTTPError as e:
+            raise SalesforceClientError("SF_API_ERROR", f"Salesforce request failed: {e}") from e
+
+        sync_usage_from_header(self._usage, response.headers.get("Sforce-Limit-Info"))
+        if response.status_code >= 300:
+            raise map_salesforce_error(
+                f"{response.status_code} {response.text}",
+                operation=operation,
+                sobject=sobject,
+                record_id=record_id,
+            )
+        return response
+
+    async def query(self, soql: str) -> list[dict[str, Any]]:
+        """Execute a SOQL query and return the first page of records.
+
+        Args:
+            soql: SOQL query string
+
+        Returns:
+            List of record dicts.
+
+        Raises:
+            SalesforceClientError: On query failure or rate limiting.
+        """
+        cached = await self._cache_get("query", soql)
+        if cached is not None:
+            return cached
+        return await self._flights.do(self._flight_key("query", soql), lambda: self._run_query(soql))
+
+    async def _run_query(self, soql: str) -> list[dict[str, Any]]:
+        response = await self._request("GET", f"{self._base_path}/query/", operation="query", params={"q": soql})
+        records: list[dict[str, Any]] = strip_attributes(json_codec.loads(response.content).get("records", []))
+        await self._cache_put("query", soql, records)
+        return records
+
+    async def iter_query(
+        self,
+        soql: str,
+        *,
+        max_results: int | None = None,
+        include_deleted: bool = False,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Stream the records of a SOQL query, following pagination lazily.
+
+        Async counterpart of ``SalesforceClient.iter_query``: the next page is
+        requested only once the current one is consumed, and fetching stops at
+        max_results.
+
+        Args:
+            soql: SOQL query string
+            max_results: Stop after this many records (default: no cap).
+            include_deleted: Use queryAll to include deleted/archived records.
+
+        Yields:
+            Record dicts with ``attributes`` stripped.
+        """
+        if max_results is not None and max_results <= 0:
+            return
+
+        headers: dict[str, str] | None = None
+        if max_results is not None and max_results < QUERY_PAGE_SIZE:
+            headers = {"Sforce-Query-Options": f"batchSize={max(max_results, MIN_QUERY_BATCH_SIZE)}"}
+
+        endpoint = "queryAll" if include_deleted else "query"
+        response = await self._request(
+            "GET", f"{self._base_path}/{endpoint}/", operation="query", params={"q": soql}, headers=headers
+        )
+        yielded = 0
+        while True:
+            page = json_codec.loads(response.content)
+            for record in strip_attributes(page.get("records", [])):
+                yield record
+                yielded += 1
+                if max_results is not None and yielded >= max_results:
+                    return
+
+            next_url = page.get("nextRecordsUrl")
+            if page.get("done") or not next_url:
+                return
+            response = await self._request("GET", next_url, operation="query")
+
+    async def query_all(self, soql: str, *, max_results: int = MAX_QUERY_RESULTS) -> list[dict[str, Any]]:
+        """Execute a SOQL query following ``nextRecordsUrl`` pagination.
+
+        Built on ``iter_query``, so pages beyond max_results are never fetched.
+
+        Args:
+            soql: SOQL query string
+            max_results: Maximum records to return (default: 2000).
+
+        Returns:
+            List of all record dicts.
+        """
+        cache_kind = f"query_all:{max_results}"
+        cached = await self._cache_get(cache_kind, soql)
+        if cached is not None:
+            return cached
+
+        records = [record async for record in self.iter_query(soql, max_results=max_results)]
+        await self._cache_put(cache_kind, soql, records)
+        return records
+
+    async def query_batch(
+        self,
+        queries: Mapping[str, str],
+        *,
+        optional: Collection[str] = (),
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Run independent SOQL queries in a single Composite Batch round trip.
+
+        Async counterpart of ``SalesforceClient.query_batch``.
+
+        Args:
+            queries: SOQL keyed by a caller-chosen name.
+            optional: Names whose failure yields an empty list instead of raising.
+
+        Returns:
+            Records keyed by query name.
+        """
+        results: dict[str, list[dict[str, Any]]] = {}
+        pending: dict[str, str] = {}
+        for name, soql in queries.items():
+            cached = await self._cache_get("query", soql)
+            if cached is None:
+                pending[name] = soql
+            else:
+                results[name] = cached
+
+        names = list(pending)
+        for start in range(0, len(names), COMPOSITE_BATCH_MAX_SUBREQUESTS):
+            chunk = names[start : start + COMPOSITE_BATCH_MAX_SUBREQUESTS]
+            response = await self._request(
+                "POST",
+                f"{self._base_path}/composite/batch",
+                operation="query",
+                json=composite_batch_payload([pending[name] for name in chunk], self._api_version),
+            )
+            for name, item in zip(chunk, json_codec.loads(response.content).get("results", []), strict=False):
+                try:
+                    records = subrequest_records(item.get("statusCode", 500), item.get("result"))
+                except SalesforceClientError:
+                    if name not in optional:
+                        raise
+                    logger.debug("Optional batched query %r failed", name, exc_info=True)
+                    records = []
+                else:
+                    await self._cache_put("query", pending[name], records)
+                results[name] = records
+
+        return {name: results.get(name, []) for name in queries}
+
+    async def query_composite(
+        self,
+        queries: Mapping[str, str],
+        *,
+        optional: Collection[str] = (),
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Run chained SOQL queries in a single Composite round trip.
+
+        Async counterpart of ``SalesforceClient.query_composite``; later queries
+        may reference earlier results with ``@{name.records[0].Id}``.
+
+        Args:
+            queries: SOQL keyed by reference ID, in execution order (at most 5).
+            optional: Names whose failure yields an empty list instead of raising.
+
+        Returns:
+            First-page records keyed by reference ID.
+        """
+        response = await self._request(
+            "POST",
+            f"{self._base_path}/composite",
+            operation="query",
+            json=composite_payload(queries, self._api_version),
+        )
+        results: dict[str, list[dict[str, Any]]] = {}
+        for item in json_codec.loads(response.content).get("compositeResponse", []):
+            name = item.get("referenceId", "")
+            try:
+                results[name] = subrequest_records(item.get("httpStatusCode", 500), item.get("body"))
+            except SalesforceClientError:
+                if name not in optional:
+                    raise
+                logger.debug("Optional composite query %r failed", name, exc_info=True)
+                results[name] = []
+        return {name: results.get(name, []) for name in queries}
+
+    async def search(self, sosl: str) -> list[dict[str, Any]]:
+        """Execute a SOSL search and return results.
+
+        Args:
+            sosl: SOSL search string
+
+        Returns:
+            List of search result records.
+        """
+        cached = await self._cache_get("search", sosl)
+        if cached is not None:
+            return cached
+        return await self._flights.do(self._flight_key("search", sosl), lambda: self._run_search(sosl))
+
+    async def _run_search(self, sosl: str) -> list[dict[str, Any]]:
+        response = await self._request("GET", f"{self._base_path}/search/", operation="search", params={"q": sosl})
+        records: list[dict[str, Any]] = strip_attributes(json_codec.loads(response.content).get("searchRecords", []))
+        await self._cache_put("search", sosl, records)
+        return records
+
+    async def create_record(
+        self,
+        sobject: str,
+        data: dict[str, Any],
+        *,
+        confirmed: bool = False,
+    ) -> dict[str, Any]:
+        """Create a Salesforce record.
+
+        Args:
+            sobject: Salesforce object type (e.g., 'Case', 'Task')
+            data: Record field values
+            confirmed: Whether the user has confirmed this write operation
+
+        Returns:
+            Dict with id, success, and errors fields.
+
+        Raises:
+            WriteBackConfirmationError: If confirmed=False for write operations.
+            SalesforceClientError: On API failure.
+        """
+        if not confirmed:
+            raise WriteBackConfirmationError(
+                operation=f"create_{sobject.lower()}",
+                details={"object": sobject, "data": data},
+            )
+
+        response = await self._request(
+            "POST",
+            f"{self._base_path}/sobjects/{sobject}/",
+            operation="create",
+            sobject=sobject,
+            json=data,
+        )
+        result: dict[str, Any] = json_codec.loads(response.content)
+        await self._invalidate(sobject)
+        logger.info("Created %s record: %s", sobject, result.get("id"))
+        return result
+
+    async def update_record(
+        self,
+        sobject: str,
+        record_id: str,
+        data: dict[str, Any],
+        *,
+        confirmed: bool = False,
+    ) -> bool:
+        """Update a Salesforce record.
+
+        Args:
+            sobject: Salesforce object type
+            record_id: Salesforce record ID (18-char)
+            data: Field updates
+            confirmed: Whether the user has confirmed this write operation
+
+        Returns:
+            True if update succeeded.
+
+        Raises:
+            WriteBackConfirmationError: If confirmed=False.
+            SalesforceClientError: On API failure.
+        """
+        if not confirmed:
+            raise WriteBackConfirmationError(
+                operation=f"update_{sobject.lower()}",
+                details={"object": sobject, "record_id": record_id, "data": data},
+            )
+
+        await self._request(
+            "PATCH",
+            f"{self._base_path}/sobjects/{sobject}/{record_id}",
+            operation="update",
+            sobject=sobject,
+            record_id=record_id,
+            json=data,
+        )
+        await self._invalidate(sobject)
+        logger.info("Updated %s record: %s", sobject, record_id)
+        return True
+
+    async def describe(self, sobject: str) -> dict[str, Any]:
+        """Return an object's describe metadata, fetched once per client.
+
+        Args:
+            sobject: Salesforce object API name
+
+        Returns:
+            The describe result (``fields``, ``name``, ...).
+        """
+        cached = self._describes.get(sobject)
+        if cached is None:
+            response = await self._request(
+                "GET", f"{self._base_path}/sobjects/{sobject}/describe/", operation="describe", sobject=sobject
+            )
+            cached = self._describes[sobject] = json_codec.loads(response.content)
+        return cached
+
+    async def get_record(self, sobject: str, record_id: str) -> dict[str, Any]:
+        """Retrieve a single record by ID.
+
+        Args:
+            sobject: Salesforce object type
+            record_id: Salesforce record ID
+
+        Returns:
+            Record dict.
+        """
+        response = await self._request(
+            "GET",
+            f"{self._base_path}/sobjects/{sobject}/{record_id}",
+            operation="get",
+            sobject=sobject,
+            record_id=record_id,
+        )
+        result: dict[str, Any] = json_codec.loads(response.content)
+        result.pop("attributes", None)
+        return result
@@ -0,0 +1,437 @@
+"""Pluggable cache backends shared by the Salesforce client and tools.
+
+A backend stores opaque byte values under string keys with a TTL and a set
+of tags, and can drop every key carrying a tag. Three implementations:
+
+- MemoryCacheBackend: per-process LRU (default, no dependencies)
+- SqliteCacheBackend: on-disk file shared by processes on one host
+- RedisCacheBackend: any Redis-protocol server, shared across replicas
+
+Values are packed with msgpack when installed (JSON via shared.json_codec
+otherwise), which is cheaper to decode than a Salesforce round trip and safe
+to read back from a shared store.
+"""
+
+from __future__ import annotations
+
+import logging
+import socket
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+from urllib.parse import unquote, urlparse
+
+from shared import json_codec
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - exercised only without msgpack
+    msgpack = None
+
+logger = logging.getLogger(__name__)
+
+
+def pack(value: Any) -> bytes:
+    """Serialize a cache value (JSON-compatible data) to bytes."""
+    if msgpack is not None:
+        return bytes(msgpack.packb(value, use_bin_type=True))
+    return json_codec.dumps(value)
+
+
+def unpack(data: bytes) -> Any:
+    """Deserialize bytes produced by ``pack``."""
+    if msgpack is not None:
+        return msgpack.unpackb(data, raw=False)
+    return json_codec.loads(data)
+
+
+class CacheBackend(ABC):
+    """Byte-oriented key/value store with TTLs and tag invalidation."""
+
+    @abstractmethod
+    def get(self, key: str) -> bytes | None:
+        """Return the stored value, or None if missing or expired."""
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl_seconds: float, tags: Iterable[str] = ()) -> None:
+        """Store a value for ttl_seconds and index it under each tag."""
+
+    @abstractmethod
+    def invalidate_tag(self, tag: str) -> int:
+        """Drop every key indexed under tag. Returns the number dropped, if known."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Drop every entry."""
+
+    def size(self) -> int | None:
+        """Number of live entries, or None if the backend cannot tell cheaply."""
+        return None
+
+    def close(self) -> None:  # noqa: B027 - optional hook
+        """Release any connections or file handles."""
+
+
+@dataclass
+class _MemoryEntry:
+    value: bytes
+    tags: frozenset[str]
+    expires_at: float
+
+
+class MemoryCacheBackend(CacheBackend):
+    """In-process LRU cache bounded by entry count."""
+
+    def __init__(self, max_entries: int = 1000) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, _MemoryEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry.value
+
+    def set(self, key: str, value: bytes, ttl_seconds: float, tags: Iterable[str] = ()) -> None:
+        entry = _MemoryEntry(value, frozenset(tags), time.monotonic() + ttl_seconds)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_tag(self, tag: str) -> int:
+        with self._lock:
+            stale = [k for k, e in self._entries.items() if tag in e.tags]
+            for key in stale:
+                del self._entries[key]
+        return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def size(self) -> int | None:
+        with self._lock:
+            return len(self._entries)
+
+
+class SqliteCacheBackend(CacheBackend):
+    """On-disk cache in a sqlite file, shared by every process on the host.
+
+    Expiry uses wall-clock time so it is consistent across processes. When
+    max_entries is exceeded the oldest-written entries are dropped first.
+    """
+
+    def __init__(self, path: str, max_entries: int = 10_000) -> None:
+        self._path = path
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=5.0, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache_entries ("
+            " key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache_tags ( tag TEXT NOT NULL, key TEXT NOT NULL, PRIMARY KEY (tag, key))"
+        )
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM cache_entries WHERE key = ? AND expires_at > ?", (key, time.time())
+            ).fetchone()
+        return bytes(row[0]) if row else None
+
+    def set(self, key: str, value: bytes, ttl_seconds: float, tags: Iterable[str] = ()) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Re-inserting moves the row to the end of rowid order (newest)
+                self._conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+                self._conn.execute(
+                    "INSERT INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, value, now + ttl_seconds),
+                )
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO cache_tags (tag, key) VALUES (?, ?)", [(t, key) for t in tags]
+                )
+                expired = self._conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (now,)).rowcount
+                # rowids only grow, so this keeps at most max_entries of the newest rows
+                evicted = self._conn.execute(
+                    "DELETE FROM cache_entries WHERE rowid <= (SELECT MAX(rowid) FROM cache_entries) - ?",
+                    (self._max_entries,),
+                ).rowcount
+                if expired or evicted:
+                    self._conn.execute("DELETE FROM cache_tags WHERE key NOT IN (SELECT key FROM cache_entries)")
+                self._conn.execute("COMMIT")
+            except sqlite3.Error:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def invalidate_tag(self, tag: str) -> int:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                cursor = self._conn.execute(
+                    "DELETE FROM cache_entries WHERE key IN (SELECT key FROM cache_tags WHERE tag = ?)", (tag,)
+                )
+                self._conn.execute("DELETE FROM cache_tags WHERE tag = ?", (tag,))
+                self._conn.execute("COMMIT")
+            except sqlite3.Error:
+                self._conn.execute("ROLLBACK")
+                raise
+        return cursor.rowcount
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache_entries")
+            self._conn.execute("DELETE FROM cache_tags")
+
+    def size(self) -> int | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM cache_entries WHERE expires_at > ?", (time.time(),)
+            ).fetchone()
+        return int(row[0])
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class RedisProtocolError(Exception):
+    """Raised when a Redis-protocol server returns an error reply."""
+
+
+# Failures callers should treat as a cache miss rather than a request failure
+CACHE_BACKEND_ERRORS: tuple[type[Exception], ...] = (OSError, sqlite3.Error, RedisProtocolError, ValueError)
+
+
+class RedisCacheBackend(CacheBackend):
+    """Cache backed by a Redis-protocol server (Redis, Azure Cache for Redis, etc.).
+
+    Speaks RESP directly over one socket per backend, so no client library is
+    required. Each tag is a Redis set of member keys carrying the same TTL.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        *,
+        prefix: str = "sfcache:",
+        timeout: float = 2.0,
+        tag_ttl_seconds: float = 86_400.0,
+    ) -> None:
+        """Initialize the backend.
+
+        Args:
+            url: ``redis://[:password@]host[:port][/db]`` or ``rediss://`` for TLS
+            prefix: Key prefix so several apps can share one server
+            timeout: Socket timeout in seconds
+            tag_ttl_seconds: Lifetime of tag index sets; must outlive any entry TTL
+        """
+        parsed = urlparse(url)
+        self._host = parsed.hostname or "localhost"
+        self._port = parsed.port or 6379
+        self._tls = parsed.scheme == "rediss"
+        self._password = unquote(parsed.password) if parsed.password else None
+        self._username = unquote(parsed.username) if parsed.username else None
+        self._db = int(parsed.path.lstrip("/") or 0)
+        self._prefix = prefix
+        self._timeout = timeout
+        self._tag_ttl_seconds = tag_ttl_seconds
+        self._lock = threading.Lock()
+        self._sock: socket.socket | None = None
+        self._reader: Any = None
+
+    # --- CacheBackend ---
+
+    def get(self, key: str) -> bytes | None:
+        value = self._command(b"GET", self._key(key))
+        return value if isinstance(value, bytes) else None
+
+    def set(self, key: str, value: bytes, ttl_seconds: float, tags: Iterable[str] = ()) -> None:
+        ttl_ms = max(int(ttl_seconds * 1000), 1)
+        tag_ttl_ms = str(max(ttl_ms, int(self._tag_ttl_seconds * 1000))).encode()
+        full_key = self._key(key)
+        commands: list[tuple[bytes, ...]] = [(b"SET", full_key, value, b"PX", str(ttl_ms).encode())]
+        for tag in tags:
+            tag_key = self._tag_key(tag)
+            commands.append((b"SADD", tag_key, full_key))
+            commands.append((b"PEXPIRE", tag_key, tag_ttl_ms))
+        self._pipeline(commands)
+
+    def invalidate_tag(self, tag: str) -> int:
+        tag_key = self._tag_key(tag)
+        members = self._command(b"SMEMBERS", tag_key) or []
+        dropped = int(self._command(b"DEL", *members)) if members else 0
+        self._command(b"DEL", tag_key)
+        return dropped
+
+    def clear(self) -> None:
+        cursor = b"0"
+        while True:
+            cursor, keys = self._command(b"SCAN", cursor, b"MATCH", self._prefix.encode() + b"*", b"COUNT", b"500")
+            if keys:
+                self._command(b"DEL", *keys)
+            if cursor == b"0":
+                break
+
+    def ping(self) -> bool:
+        """Return True if the server answers PING."""
+        try:
+            return bool(self._command(b"PING") == b"PONG")
+        except (OSError, RedisProtocolError):
+            return False
+
+    def close(self) -> None:
+        with self._lock:
+            self._disconnect()
+
+    # --- RESP plumbing ---
+
+    def _key(self, key: str) -> bytes:
+        return f"{self._prefix}{key}".encode()
+
+    def _tag_key(self, tag: str) -> bytes:
+        return f"{self._prefix}tag:{tag}".encode()
+
+    def _connect(self) -> None:
+        sock = socket.create_connection((self._host, self._port), timeout=self._timeout)
+        if self._tls:
+            import ssl
+
+            sock = ssl.create_default_context().wrap_socket(sock, server_hostname=self._host)
+        self._sock = sock
+        self._reader = sock.makefile("rb")
+        if self._password:
+            auth = (self._username, self._password) if self._username else (self._password,)
+            self._send(tuple([b"AUTH", *(a.encode() for a in auth)]))
+            _raise_first_error([self._read_reply()])
+        if self._db:
+            self._send((b"SELECT", str(self._db).encode()))
+            _raise_first_error([self._read_reply()])
+
+    def _disconnect(self) -> None:
+        if self._sock is not None:
+            try:
+                self._reader.close()
+                self._sock.close()
+            except OSError:
+                pass
+        self._sock = None
+        self._reader = None
+
+    def _command(self, *args: bytes) -> Any:
+        return self._pipeline([args])[0]
+
+    def _pipeline(self, commands: list[tuple[bytes, ...]]) -> list[Any]:
+        """Send several commands in one write and read their replies in order.
+
+        All replies are read before an error reply is raised, so the connection
+        stays in step; any other failure mid-stream drops the connection.
+        """
+        with self._lock:
+            for attempt in (1, 2):
+                try:
+                    if self._sock is None:
+                        self._connect()
+                    self._send(*commands)
+                    replies = [self._read_reply() for _ in commands]
+                except OSError:
+                    # Stale connection — reconnect once, then give up
+                    self._disconnect()
+                    if attempt == 2:
+                        raise
+                    continue
+                except BaseException:
+                    # Unknown stream position — later commands would read stale replies
+                    self._disconnect()
+                    raise
+                _raise_first_error(replies)
+                return replies
+        return []  # pragma: no cover
+
+    def _send(self, *commands: tuple[bytes, ...]) -> None:
+        assert self._sock is not None
+        parts: list[bytes] = []
+        for args in commands:
+            parts.append(b"*%d\r\n" % len(args))
+            for arg in args:
+                parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+        self._sock.sendall(b"".join(parts))
+
+    def _read_reply(self) -> Any:
+        """Read one reply; error replies are returned as ``RedisProtocolError`` instances."""
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("Redis connection closed")
+        prefix, payload = line[:1], line[1:-2]
+        if prefix == b"+":
+            return payload
+        if prefix == b"-":
+            return RedisProtocolError(payload.decode(errors="replace"))
+        if prefix == b":":
+            return int(payload)
+        if prefix == b"$":
+            length = int(payload)
+            if length == -1:
+                return None
+            data = self._reader.read(length + 2)
+            return data[:-2]
+        if prefix == b"*":
+            count = int(payload)
+            if count == -1:
+                return None
+            return [self._read_reply() for _ in range(count)]
+        raise RedisProtocolError(f"Unexpected reply: {line!r}")
+
+
+def _raise_first_error(replies: list[Any]) -> None:
+    """Raise the first error reply in a fully-read batch of Redis replies."""
+    for reply in replies:
+        if isinstance(reply, RedisProtocolError):
+            raise reply
+
+
+def create_cache_backend(kind: str, *, max_entries: int, sqlite_path: str = "", redis_url: str = "") -> CacheBackend:
+    """Build a cache backend from configuration values.
+
+    Args:
+        kind: 'memory', 'sqlite' or 'redis'
+        max_entries: Entry bound for the memory and sqlite backends
+        sqlite_path: Database file for the sqlite backend
+        redis_url: Server URL for the redis backend
+
+    Returns:
+        The configured backend.
+
+    Raises:
+        ValueError: For an unknown kind or missing location.
+    """
+    if kind == "memory":
+        return MemoryCacheBackend(max_entries)
+    if kind == "sqlite":
+        if not sqlite_path:
+            raise ValueError("A sqlite_path is required for the sqlite cache backend")
+        return SqliteCacheBackend(sqlite_path, max_entries)
+    if kind == "redis":
+        if not redis_url:
+            raise ValueError("A redis_url is required for the redis cache backend")
+        return RedisCacheBackend(redis_url)
+    raise ValueError(f"Unknown cache backend '{kind}' (expected memory, sqlite or redis)")
@@ -0,0 +1,311 @@
+"""Process-wide registry of pooled Salesforce clients.
+
+Hands out one long-lived SalesforceClient per (instance URL, token identity)
+so MCP tool calls reuse a keep-alive HTTP connection pool instead of paying
+TCP+TLS setup to the Salesforce instance on every invocation.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from shared.async_salesforce_client import AsyncSalesforceClient
+from shared.config import SalesforcePoolConfig, load_pool_config
+from shared.rate_limiter import get_governor
+from shared.salesforce_client import (
+    SalesforceClient,
+    get_org_usage_tracker,
+    get_query_cache,
+    token_fingerprint,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class _TrackedSession(requests.Session):
+    """A requests session that counts the requests it is currently sending."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.in_flight = 0
+        self._in_flight_lock = threading.Lock()
+
+    def request(self, *args: Any, **kwargs: Any) -> requests.Response:
+        with self._in_flight_lock:
+            self.in_flight += 1
+        try:
+            return super().request(*args, **kwargs)
+        finally:
+            with self._in_flight_lock:
+                self.in_flight -= 1
+
+
+@dataclass
+class _PooledClient:
+    """A registry entry: the client plus bookkeeping for eviction and health checks."""
+
+    client: SalesforceClient
+    session: _TrackedSession
+    created_at: float
+    last_used: float
+    last_health_check: float
+
+    @property
+    def busy(self) -> bool:
+        """Whether the client is in the middle of a request."""
+        return self.session.in_flight > 0
+
+
+@dataclass
+class _PooledAsyncClient:
+    """A registry entry for an async client."""
+
+    client: AsyncSalesforceClient
+    last_used: float
+
+    @property
+    def busy(self) -> bool:
+        """Whether the client is in the middle of a request."""
+        return self.client.in_flight > 0
+
+
+def _schedule_aclose(client: AsyncSalesforceClient) -> None:
+    """Close an evicted async client on the running loop, if there is one."""
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    loop.create_task(client.aclose())
+
+
+def _close(client: SalesforceClient | AsyncSalesforceClient) -> None:
+    """Close a sync client now, or an async client on the running loop."""
+    if isinstance(client, AsyncSalesforceClient):
+        _schedule_aclose(client)
+    else:
+        client.close()
+
+
+def _build_session(config: SalesforcePoolConfig) -> _TrackedSession:
+    """Create a requests session backed by a sized keep-alive connection pool."""
+    session = _TrackedSession()
+    adapter = HTTPAdapter(
+        pool_connections=config.pool_connections,
+        pool_maxsize=config.pool_maxsize,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class ClientRegistry:
+    """Thread-safe registry of pooled SalesforceClient instances.
+
+    Clients are keyed by instance URL and a fingerprint of the access token,
+    evicted after a configurable idle period, and health-checked before reuse
+    at most once per health-check interval. A client dropped from the registry
+    while it still has requests in flight is retired rather than closed, and
+    closed by a later eviction pass once those requests finish.
+    """
+
+    def __init__(self, config: SalesforcePoolConfig | None = None) -> None:
+        """Initialize the registry.
+
+        Args:
+            config: Pool settings. Defaults to values from SF_POOL_* env vars.
+        """
+        self._config = config or load_pool_config()
+        self._clients: dict[tuple[str, str], _PooledClient] = {}
+        self._async_clients: dict[tuple[str, str], _PooledAsyncClient] = {}
+        self._retired: list[_PooledClient | _PooledAsyncClient] = []
+        self._lock = threading.Lock()
+
+    @property
+    def config(self) -> SalesforcePoolConfig:
+        """Pool settings used by this registry."""
+        return self._config
+
+    def get_client(self, instance_url: str, access_token: str) -> SalesforceClient:
+        """Return a pooled client for the given credentials, creating it if needed.
+
+        Args:
+            instance_url: Salesforce instance URL
+            access_token: OAuth access token for the user
+
+        Returns:
+            A long-lived SalesforceClient sharing a keep-alive connection pool.
+        """
+        key = (instance_url.rstrip("/"), token_fingerprint(access_token))
+        now = time.monotonic()
+
+        with self._lock:
+            self._evict_idle_locked(now)
+            entry = self._clients.get(key)
+            if entry is None:
+                entry = self._create_entry_locked(key, instance_url, access_token, now)
+            entry.last_used = now
+            needs_check = now - entry.last_health_check >= self._config.health_check_interval_seconds
+
+        if needs_check:
+            # Network I/O happens outside the lock so other checkouts are not serialized
+            healthy = entry.client.ping()
+            with self._lock:
+                entry.last_health_check = time.monotonic()
+                # Another checkout may have rebuilt or evicted the entry while we pinged
+                current = self._clients.get(key)
+                if not healthy and current is entry:
+                    logger.warning("Pooled Salesforce client for %s failed health check, rebuilding", key[0])
+                    self._retire_locked(self._clients.pop(key))
+                    current = None
+                if current is None:
+                    current = self._create_entry_locked(key, instance_url, access_token, time.monotonic())
+                entry = current
+
+        return entry.client
+
+    def get_async_client(self, instance_url: str, access_token: str) -> AsyncSalesforceClient:
+        """Return a pooled AsyncSalesforceClient for the given credentials.
+
+        Async clients own an httpx connection pool bound to the running event
+        loop, so they are tracked separately from the sync clients.
+
+        Args:
+            instance_url: Salesforce instance URL
+            access_token: OAuth access token for the user
+
+        Returns:
+            A long-lived AsyncSalesforceClient.
+        """
+        key = (instance_url.rstrip("/"), token_fingerprint(access_token))
+        now = time.monotonic()
+
+        with self._lock:
+            self._evict_idle_locked(now)
+            entry = self._async_clients.get(key)
+            if entry is None:
+                if len(self._async_clients) >= self._config.max_clients:
+                    lru_key = min(self._async_clients, key=lambda k: self._async_clients[k].last_used)
+                    self._retire_locked(self._async_clients.pop(lru_key))
+                entry = _PooledAsyncClient(
+                    client=AsyncSalesforceClient(
+                        instance_url=instance_url,
+                        access_token=access_token,
+                        max_connections=self._config.pool_maxsize,
+                        usage_tracker=get_org_usage_tracker(instance_url),
+                        limits_refresh_seconds=self._config.limits_refresh_seconds,
+                        governor=get_governor(),
+                        query_cache=get_query_cache(),
+                    ),
+                    last_used=now,
+                )
+                self._async_clients[key] = entry
+            entry.last_used = now
+            return entry.client
+
+    def evict_idle(self) -> int:
+        """Close and drop clients that have been idle longer than the idle timeout.
+
+        Returns:
+            Number of clients evicted.
+        """
+        with self._lock:
+            return self._evict_idle_locked(time.monotonic())
+
+    def close_all(self) -> None:
+        """Close every pooled client and empty the registry."""
+        with self._lock:
+            for entry in self._clients.values():
+                entry.client.close()
+            self._clients.clear()
+            for async_entry in self._async_clients.values():
+                _schedule_aclose(async_entry.client)
+            self._async_clients.clear()
+            for retired_entry in self._retired:
+                _close(retired_entry.client)
+            self._retired.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Return registry size and pool settings for diagnostics."""
+        with self._lock:
+            return {
+                "clients": len(self._clients),
+                "async_clients": len(self._async_clients),
+                "retired_clients": len(self._retired),
+                "max_clients": self._config.max_clients,
+                "pool_maxsize": self._config.pool_maxsize,
+                "idle_timeout_seconds": self._config.idle_timeout_seconds,
+            }
+
+    def _create_entry_locked(
+        self,
+        key: tuple[str, str],
+        instance_url: str,
+        access_token: str,
+        now: float,
+    ) -> _PooledClient:
+        """Build a new pooled client and store it under key. Caller holds the lock."""
+        if key not in self._clients and len(self._clients) >= self._config.max_clients:
+            lru_key = min(self._clients, key=lambda k: self._clients[k].last_used)
+            self._retire_locked(self._clients.pop(lru_key))
+
+        session = _build_session(self._config)
+        client = SalesforceClient(
+            instance_url=instance_url,
+            access_token=access_token,
+            session=session,
+            usage_tracker=get_org_usage_tracker(instance_url),
+            limits_refresh_seconds=self._config.limits_refresh_seconds,
+            governor=get_governor(),
+            query_cache=get_query_cache(),
+        )
+        entry = _PooledClient(client=client, session=session, created_at=now, last_used=now, last_health_check=now)
+        self._clients[key] = entry
+        return entry
+
+    def _retire_locked(self, entry: _PooledClient | _PooledAsyncClient) -> None:
+        """Close a client dropped from the registry, or defer it while requests are in flight. Caller holds the lock."""
+        if entry.busy:
+            self._retired.append(entry)
+        else:
+            _close(entry.client)
+
+    def _evict_idle_locked(self, now: float) -> int:
+        """Evict idle clients and close retired ones that have drained. Caller holds the lock."""
+        retired, self._retired = self._retired, []
+        for retired_entry in retired:
+            self._retire_locked(retired_entry)
+
+        # Long-running requests keep a client in use past its last checkout
+        idle_timeout = self._config.idle_timeout_seconds
+        expired = [k for k, e in self._clients.items() if now - e.last_used > idle_timeout and not e.busy]
+        for key in expired:
+            self._clients.pop(key).client.close()
+        expired_async = [k for k, e in self._async_clients.items() if now - e.last_used > idle_timeout and not e.busy]
+        for key in expired_async:
+            _schedule_aclose(self._async_clients.pop(key).client)
+        evicted = len(expired) + len(expired_async)
+        if evicted:
+            logger.info("Evicted %d idle Salesforce client(s)", evicted)
+        return evicted
+
+
+_registry: ClientRegistry | None = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> ClientRegistry:
+    """Return the process-wide client registry, creating it on first use."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ClientRegistry()
+    return _registry
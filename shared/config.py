@@ -5,7 +5,11 @@ Loads environment variables from .env files and validates required configuration
 
 from __future__ import annotations
 
+import logging
 import os
+import threading
+import time
+from collections.abc import Callable, Mapping
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
@@ -13,6 +17,10 @@ from typing import Any
 import yaml
 from dotenv import load_dotenv
 
+logger = logging.getLogger(__name__)
+
+DEFAULT_RISK_THRESHOLDS_PATH = Path(__file__).parent.parent / "config" / "risk_thresholds.yaml"
+
 
 @dataclass(frozen=True)
 class AzureConfig:
@@ -46,6 +54,102 @@ class SalesforceConfig:
         return bool(self.access_token)
 
 
+@dataclass(frozen=True)
+class SalesforcePoolConfig:
+    """Keep-alive connection pool settings for the Salesforce client registry."""
+
+    pool_connections: int = 10
+    pool_maxsize: int = 50
+    max_clients: int = 100
+    idle_timeout_seconds: float = 300.0
+    health_check_interval_seconds: float = 60.0
+    limits_refresh_seconds: float = 300.0
+
+
+@dataclass(frozen=True)
+class RateLimitConfig:
+    """Client-side request governor settings, applied per org and per user.
+
+    Salesforce caps concurrent long-running requests at 25 per org, so the
+    default org in-flight limit stays at that ceiling.
+    """
+
+    enabled: bool = True
+    org_requests_per_second: float = 25.0
+    org_burst: int = 50
+    org_max_in_flight: int = 25
+    user_requests_per_second: float = 5.0
+    user_burst: int = 10
+    user_max_in_flight: int = 5
+    max_queue_depth: int = 100
+    max_wait_seconds: float = 10.0
+
+
+@dataclass(frozen=True)
+class QueryCacheConfig:
+    """Read-through SOQL result cache settings.
+
+    TTLs are per sObject; a query touching several objects uses the shortest.
+    Reference data (users, profiles) changes rarely, pipeline data often.
+    """
+
+    enabled: bool = True
+    backend: str = "memory"  # memory | sqlite | redis
+    sqlite_path: str = ""
+    redis_url: str = ""
+    max_entries: int = 1000
+    default_ttl_seconds: float = 60.0
+    ttl_seconds: dict[str, float] = field(
+        default_factory=lambda: {
+            "User": 900.0,
+            "Profile": 3600.0,
+            "UserRole": 3600.0,
+            "Account": 300.0,
+            "Contact": 300.0,
+            "KnowledgeArticleVersion": 600.0,
+            "Lead": 60.0,
+            "Opportunity": 30.0,
+            "OpportunityContactRole": 120.0,
+            "Case": 30.0,
+            "CaseComment": 30.0,
+            "Task": 30.0,
+            "Event": 30.0,
+        }
+    )
+
+
+@dataclass(frozen=True)
+class OpportunitySnapshotConfig:
+    """Local open-Opportunity snapshot settings (see shared/opportunity_snapshot.py).
+
+    Deltas are pulled once the snapshot is older than ``refresh_seconds``; if
+    that fails and it is older than ``max_staleness_seconds``, tools fall back
+    to live SOQL.
+    """
+
+    enabled: bool = False
+    refresh_seconds: float = 60.0
+    max_staleness_seconds: float = 900.0
+    max_snapshots: int = 8
+
+
+@dataclass(frozen=True)
+class KnowledgeIndexConfig:
+    """Knowledge index chunking and embedding settings (see shared/embeddings.py).
+
+    ``embedding_provider`` is ``azure_openai`` (the default) or ``hashing``
+    (deterministic, local word-overlap vectors; for tests and offline runs).
+    """
+
+    embedding_provider: str = "azure_openai"
+    embedding_dimensions: int = 1536
+    azure_openai_endpoint: str = ""
+    azure_openai_embedding_deployment: str = "text-embedding-3-small"
+    azure_openai_api_key: str = ""
+    chunk_tokens: int = 512
+    chunk_overlap_tokens: int = 64
+
+
 @dataclass(frozen=True)
 class McpConfig:
     """MCP server configuration."""
@@ -64,9 +168,7 @@ class RiskThresholds:
     inactivity_days: int = 14
     overdue_enabled: bool = True
     low_probability_threshold: int = 30
-    late_stages: list[str] = field(
-        default_factory=lambda: ["Negotiation/Review", "Proposal/Price Quote"]
-    )
+    late_stages: tuple[str, ...] = ("Negotiation/Review", "Proposal/Price Quote")
     minimum_amount_for_risk: float = 10000.0
 
 
@@ -78,6 +180,11 @@ class AppConfig:
     salesforce: SalesforceConfig
     mcp: McpConfig
     risk_thresholds: RiskThresholds
+    salesforce_pool: SalesforcePoolConfig = field(default_factory=SalesforcePoolConfig)
+    rate_limit: RateLimitConfig = field(default_factory=RateLimitConfig)
+    query_cache: QueryCacheConfig = field(default_factory=QueryCacheConfig)
+    opportunity_snapshot: OpportunitySnapshotConfig = field(default_factory=OpportunitySnapshotConfig)
+    knowledge_index: KnowledgeIndexConfig = field(default_factory=KnowledgeIndexConfig)
 
 
 class ConfigValidationError(Exception):
@@ -97,6 +204,140 @@ def _require_env(key: str) -> str:
     return value
 
 
+def load_pool_config() -> SalesforcePoolConfig:
+    """Load Salesforce connection pool settings from environment variables.
+
+    Returns:
+        SalesforcePoolConfig with values from SF_POOL_* variables or defaults.
+    """
+    defaults = SalesforcePoolConfig()
+    return SalesforcePoolConfig(
+        pool_connections=int(_get_env("SF_POOL_CONNECTIONS", str(defaults.pool_connections))),
+        pool_maxsize=int(_get_env("SF_POOL_MAXSIZE", str(defaults.pool_maxsize))),
+        max_clients=int(_get_env("SF_POOL_MAX_CLIENTS", str(defaults.max_clients))),
+        idle_timeout_seconds=float(
+            _get_env("SF_POOL_IDLE_TIMEOUT_SECONDS", str(defaults.idle_timeout_seconds))
+        ),
+        health_check_interval_seconds=float(
+            _get_env("SF_POOL_HEALTH_CHECK_SECONDS", str(defaults.health_check_interval_seconds))
+        ),
+        limits_refresh_seconds=float(
+            _get_env("SF_LIMITS_REFRESH_SECONDS", str(defaults.limits_refresh_seconds))
+        ),
+    )
+
+
+def load_rate_limit_config() -> RateLimitConfig:
+    """Load request governor settings from environment variables.
+
+    Returns:
+        RateLimitConfig with values from SF_RATE_* variables or defaults.
+    """
+    defaults = RateLimitConfig()
+    return RateLimitConfig(
+        enabled=_get_env("SF_RATE_LIMIT_ENABLED", "true").lower() in ("1", "true", "yes"),
+        org_requests_per_second=float(
+            _get_env("SF_RATE_ORG_PER_SECOND", str(defaults.org_requests_per_second))
+        ),
+        org_burst=int(_get_env("SF_RATE_ORG_BURST", str(defaults.org_burst))),
+        org_max_in_flight=int(_get_env("SF_RATE_ORG_MAX_IN_FLIGHT", str(defaults.org_max_in_flight))),
+        user_requests_per_second=float(
+            _get_env("SF_RATE_USER_PER_SECOND", str(defaults.user_requests_per_second))
+        ),
+        user_burst=int(_get_env("SF_RATE_USER_BURST", str(defaults.user_burst))),
+        user_max_in_flight=int(_get_env("SF_RATE_USER_MAX_IN_FLIGHT", str(defaults.user_max_in_flight))),
+        max_queue_depth=int(_get_env("SF_RATE_MAX_QUEUE_DEPTH", str(defaults.max_queue_depth))),
+        max_wait_seconds=float(_get_env("SF_RATE_MAX_WAIT_SECONDS", str(defaults.max_wait_seconds))),
+    )
+
+
+def load_query_cache_config() -> QueryCacheConfig:
+    """Load query cache settings from environment variables.
+
+    SF_QUERY_CACHE_TTLS overrides per-object TTLs as a comma-separated list,
+    e.g. ``User=1800,Opportunity=15``.
+
+    Returns:
+        QueryCacheConfig with values from SF_QUERY_CACHE_* variables or defaults.
+    """
+    defaults = QueryCacheConfig()
+    ttls = dict(defaults.ttl_seconds)
+    for item in _get_env("SF_QUERY_CACHE_TTLS").split(","):
+        sobject, sep, seconds = item.partition("=")
+        if sep and sobject.strip():
+            ttls[sobject.strip()] = float(seconds)
+    return QueryCacheConfig(
+        enabled=_get_env("SF_QUERY_CACHE_ENABLED", "true").lower() in ("1", "true", "yes"),
+        backend=_get_env("SF_QUERY_CACHE_BACKEND", defaults.backend).lower(),
+        sqlite_path=_get_env("SF_QUERY_CACHE_SQLITE_PATH"),
+        redis_url=_get_env("SF_QUERY_CACHE_REDIS_URL"),
+        max_entries=int(_get_env("SF_QUERY_CACHE_MAX_ENTRIES", str(defaults.max_entries))),
+        default_ttl_seconds=float(
+            _get_env("SF_QUERY_CACHE_DEFAULT_TTL_SECONDS", str(defaults.default_ttl_seconds))
+        ),
+        ttl_seconds=ttls,
+    )
+
+
+def load_opportunity_snapshot_config() -> OpportunitySnapshotConfig:
+    """Load opportunity snapshot settings from environment variables.
+
+    Returns:
+        OpportunitySnapshotConfig with values from SF_OPP_SNAPSHOT_* variables or defaults.
+    """
+    defaults = OpportunitySnapshotConfig()
+    return OpportunitySnapshotConfig(
+        enabled=_get_env("SF_OPP_SNAPSHOT_ENABLED", "false").lower() in ("1", "true", "yes"),
+        refresh_seconds=float(_get_env("SF_OPP_SNAPSHOT_REFRESH_SECONDS", str(defaults.refresh_seconds))),
+        max_staleness_seconds=float(
+            _get_env("SF_OPP_SNAPSHOT_MAX_STALENESS_SECONDS", str(defaults.max_staleness_seconds))
+        ),
+        max_snapshots=int(_get_env("SF_OPP_SNAPSHOT_MAX_SNAPSHOTS", str(defaults.max_snapshots))),
+    )
+
+
+def load_knowledge_index_config() -> KnowledgeIndexConfig:
+    """Load knowledge index settings from environment variables.
+
+    Returns:
+        KnowledgeIndexConfig with values from KNOWLEDGE_* and AZURE_OPENAI_* variables or defaults.
+    """
+    defaults = KnowledgeIndexConfig()
+    return KnowledgeIndexConfig(
+        embedding_provider=_get_env("KNOWLEDGE_EMBEDDING_PROVIDER", defaults.embedding_provider).lower(),
+        embedding_dimensions=int(_get_env("KNOWLEDGE_EMBEDDING_DIMENSIONS", str(defaults.embedding_dimensions))),
+        azure_openai_endpoint=_get_env("AZURE_OPENAI_ENDPOINT"),
+        azure_openai_embedding_deployment=_get_env(
+            "AZURE_OPENAI_EMBEDDING_DEPLOYMENT", defaults.azure_openai_embedding_deployment
+        ),
+        azure_openai_api_key=_get_env("AZURE_OPENAI_API_KEY"),
+        chunk_tokens=int(_get_env("KNOWLEDGE_CHUNK_TOKENS", str(defaults.chunk_tokens))),
+        chunk_overlap_tokens=int(_get_env("KNOWLEDGE_CHUNK_OVERLAP_TOKENS", str(defaults.chunk_overlap_tokens))),
+    )
+
+
+def _parse_risk_thresholds(data: Mapping[str, Any]) -> RiskThresholds:
+    """Build RiskThresholds from parsed YAML.
+
+    Settings live under a top-level ``risk_thresholds:`` key; a flat mapping
+    is accepted too. ``overdue_close_date: {enabled: ...}`` is read as the
+    older spelling of ``overdue_enabled``.
+    """
+    section: Mapping[str, Any] = data.get("risk_thresholds", data) or {}
+    defaults = RiskThresholds()
+    overdue_enabled = section.get("overdue_enabled")
+    if overdue_enabled is None:
+        overdue_enabled = (section.get("overdue_close_date") or {}).get("enabled", defaults.overdue_enabled)
+    return RiskThresholds(
+        stage_stagnation_days=int(section.get("stage_stagnation_days", defaults.stage_stagnation_days)),
+        inactivity_days=int(section.get("inactivity_days", defaults.inactivity_days)),
+        overdue_enabled=bool(overdue_enabled),
+        low_probability_threshold=int(section.get("low_probability_threshold", defaults.low_probability_threshold)),
+        late_stages=tuple(section.get("late_stages", defaults.late_stages) or ()),
+        minimum_amount_for_risk=float(section.get("minimum_amount_for_risk", defaults.minimum_amount_for_risk)),
+    )
+
+
 def load_risk_thresholds(config_path: str | Path | None = None) -> RiskThresholds:
     """Load risk thresholds from YAML configuration file.
 
@@ -107,27 +348,91 @@ def load_risk_thresholds(config_path: str | Path | None = None) -> RiskThreshold
     Returns:
         RiskThresholds with loaded values.
     """
-    if config_path is None:
-        # Default to project root / config / risk_thresholds.yaml
-        project_root = Path(__file__).parent.parent
-        config_path = project_root / "config" / "risk_thresholds.yaml"
-
-    config_path = Path(config_path)
+    config_path = Path(config_path) if config_path is not None else DEFAULT_RISK_THRESHOLDS_PATH
     if not config_path.exists():
         return RiskThresholds()
 
     with open(config_path) as f:
         data: dict[str, Any] = yaml.safe_load(f) or {}
 
-    thresholds = data.get("risk_thresholds", {})
-    return RiskThresholds(
-        stage_stagnation_days=thresholds.get("stage_stagnation_days", 30),
-        inactivity_days=thresholds.get("inactivity_days", 14),
-        overdue_enabled=thresholds.get("overdue_enabled", True),
-        low_probability_threshold=thresholds.get("low_probability_threshold", 30),
-        late_stages=thresholds.get("late_stages", ["Negotiation/Review", "Proposal/Price Quote"]),
-        minimum_amount_for_risk=float(thresholds.get("minimum_amount_for_risk", 10000)),
-    )
+    return _parse_risk_thresholds(data)
+
+
+class RiskThresholdsLoader:
+    """Cached RiskThresholds that reload when the YAML file changes.
+
+    ``get()`` returns the parsed thresholds from memory and stats the file at
+    most once per ``check_interval_seconds``; the file is re-read only when
+    its mtime or size changed. A missing file yields the defaults, and an
+    unparseable edit keeps the last good thresholds.
+    """
+
+    def __init__(
+        self,
+        config_path: str | Path | None = None,
+        check_interval_seconds: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the loader; nothing is read until the first ``get()``.
+
+        Args:
+            config_path: Path to the YAML file. Defaults to config/risk_thresholds.yaml
+                         in the project root.
+            check_interval_seconds: Minimum time between checks of the file for changes.
+            clock: Monotonic time source, injectable for tests.
+        """
+        self._path = Path(config_path) if config_path is not None else DEFAULT_RISK_THRESHOLDS_PATH
+        self._interval = check_interval_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._thresholds = RiskThresholds()
+        self._stamp: tuple[int, int] | None = None
+        self._next_check: float | None = None
+
+    @property
+    def path(self) -> Path:
+        """YAML file the thresholds are loaded from."""
+        return self._path
+
+    def get(self) -> RiskThresholds:
+        """Return the current thresholds, reloading them if the file changed."""
+        now = self._clock()
+        if self._next_check is not None and now < self._next_check:
+            return self._thresholds
+        with self._lock:
+            if self._next_check is None or now >= self._next_check:
+                self._refresh()
+                self._next_check = now + self._interval
+            return self._thresholds
+
+    def _refresh(self) -> None:
+        try:
+            stat = self._path.stat()
+        except FileNotFoundError:
+            if self._stamp is not None or self._next_check is None:
+                logger.warning("%s not found, using default risk thresholds", self._path)
+            self._thresholds, self._stamp = RiskThresholds(), None
+            return
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp == self._stamp:
+            return
+        try:
+            with open(self._path) as f:
+                data = yaml.safe_load(f) or {}
+            self._thresholds = _parse_risk_thresholds(data)
+        except (OSError, yaml.YAMLError, TypeError, ValueError, AttributeError):
+            logger.warning("Failed to load %s, keeping previous risk thresholds", self._path, exc_info=True)
+        else:
+            logger.info("Loaded risk thresholds from %s", self._path)
+        self._stamp = stamp
+
+
+_risk_thresholds_loader = RiskThresholdsLoader()
+
+
+def get_risk_thresholds() -> RiskThresholds:
+    """Return the process-wide cached risk thresholds (hot-reloaded from config/risk_thresholds.yaml)."""
+    return _risk_thresholds_loader.get()
 
 
 def load_config(env_file: str | Path | None = None) -> AppConfig:
@@ -182,4 +487,9 @@ def load_config(env_file: str | Path | None = None) -> AppConfig:
         salesforce=salesforce,
         mcp=mcp,
         risk_thresholds=risk_thresholds,
+        salesforce_pool=load_pool_config(),
+        rate_limit=load_rate_limit_config(),
+        query_cache=load_query_cache_config(),
+        opportunity_snapshot=load_opportunity_snapshot_config(),
+        knowledge_index=load_knowledge_index_config(),
     )
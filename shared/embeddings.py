@@ -0,0 +1,154 @@
+"""Text embedding models for the knowledge index.
+
+Anything with a ``dimensions`` attribute and an async ``embed(texts)``
+method returning one vector per text is an ``Embedder``. Two ship here:
+
+- ``HashingEmbedder``: deterministic feature hashing, no network or model
+  download. Vectors only capture word overlap, which is enough for tests
+  and offline runs, not for production retrieval.
+- ``AzureOpenAIEmbedder``: an Azure OpenAI embeddings deployment.
+
+``create_embedder()`` picks one from KNOWLEDGE_EMBEDDING_PROVIDER, which
+defaults to ``azure_openai``; selecting ``hashing`` logs a warning.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import math
+import re
+from collections.abc import Sequence
+from typing import Protocol
+
+import httpx
+
+from shared import json_codec
+from shared.config import KnowledgeIndexConfig, load_knowledge_index_config
+
+logger = logging.getLogger(__name__)
+
+AZURE_OPENAI_API_VERSION = "2024-10-21"
+# Inputs per embeddings request
+AZURE_OPENAI_EMBEDDING_BATCH = 64
+
+_WORD = re.compile(r"\w+")
+
+
+class Embedder(Protocol):
+    """A text embedding model."""
+
+    @property
+    def dimensions(self) -> int: ...
+
+    async def embed(self, texts: Sequence[str]) -> list[list[float]]:
+        """Return one ``dimensions``-long vector per text, in order."""
+        ...
+
+
+class HashingEmbedder:
+    """Deterministic bag-of-words embedder using signed feature hashing.
+
+    Each lower-cased word is hashed to a dimension and a sign; vectors are
+    L2-normalized, so texts sharing words have positive cosine similarity.
+    """
+
+    def __init__(self, dimensions: int = 256) -> None:
+        if dimensions <= 0:
+            raise ValueError("dimensions must be positive")
+        self._dimensions = dimensions
+
+    @property
+    def dimensions(self) -> int:
+        return self._dimensions
+
+    def _vector(self, text: str) -> list[float]:
+        vector = [0.0] * self._dimensions
+        for word in _WORD.findall(text.lower()):
+            digest = int.from_bytes(hashlib.blake2b(word.encode(), digest_size=8).digest(), "big")
+            vector[digest % self._dimensions] += 1.0 if digest >> 63 else -1.0
+        norm = math.sqrt(sum(v * v for v in vector))
+        return [v / norm for v in vector] if norm else vector
+
+    async def embed(self, texts: Sequence[str]) -> list[list[float]]:
+        return [self._vector(text) for text in texts]
+
+
+class AzureOpenAIEmbedder:
+    """Embeddings from an Azure OpenAI deployment, requested in batches."""
+
+    def __init__(
+        self,
+        endpoint: str,
+        deployment: str,
+        api_key: str,
+        dimensions: int,
+        *,
+        batch_size: int = AZURE_OPENAI_EMBEDDING_BATCH,
+        timeout: float = 60.0,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        """Configure the embedder.
+
+        Args:
+            endpoint: Azure OpenAI resource endpoint (https://<name>.openai.azure.com).
+            deployment: Embeddings deployment name.
+            api_key: Azure OpenAI API key.
+            dimensions: Vector size; sent to models that support shortening.
+            batch_size: Inputs per embeddings request.
+            timeout: Request timeout in seconds.
+            transport: Optional httpx transport (used by tests to mock Azure OpenAI).
+        """
+        self._url = (
+            f"{endpoint.rstrip('/')}/openai/deployments/{deployment}/embeddings?api-version={AZURE_OPENAI_API_VERSION}"
+        )
+        self._headers = {"Content-Type": "application/json", "api-key": api_key}
+        self._dimensions = dimensions
+        self._batch_size = max(batch_size, 1)
+        self._timeout = timeout
+        self._transport = transport
+
+    @property
+    def dimensions(self) -> int:
+        return self._dimensions
+
+    async def embed(self, texts: Sequence[str]) -> list[list[float]]:
+        """Embed texts, one request per ``batch_size`` inputs.
+
+        Raises:
+            httpx.HTTPStatusError: If the service rejects a request.
+        """
+        vectors: list[list[float]] = []
+        async with httpx.AsyncClient(timeout=self._timeout, transport=self._transport) as client:
+            for i in range(0, len(texts), self._batch_size):
+                payload = {"input": list(texts[i : i + self._batch_size]), "dimensions": self._dimensions}
+                response = await client.post(self._url, headers=self._headers, content=json_codec.dumps(payload))
+                response.raise_for_status()
+                data = json_codec.loads(response.content)["data"]
+                vectors.extend(item["embedding"] for item in sorted(data, key=lambda item: item["index"]))
+        return vectors
+
+
+def create_embedder(config: KnowledgeIndexConfig | None = None) -> Embedder:
+    """Build the embedder selected by KNOWLEDGE_EMBEDDING_PROVIDER.
+
+    Raises:
+        ValueError: For an unknown provider or missing Azure OpenAI settings.
+    """
+    config = config or load_knowledge_index_config()
+    if config.embedding_provider == "hashing":
+        logger.warning(
+            "KNOWLEDGE_EMBEDDING_PROVIDER=hashing: indexing word-overlap vectors, not semantic embeddings. "
+            "Use azure_openai outside tests and offline runs."
+        )
+        return HashingEmbedder(config.embedding_dimensions)
+    if config.embedding_provider == "azure_openai":
+        if not config.azure_openai_endpoint or not config.azure_openai_api_key:
+            raise ValueError("AZURE_OPENAI_ENDPOINT and AZURE_OPENAI_API_KEY are required for azure_openai embeddings")
+        return AzureOpenAIEmbedder(
+            config.azure_openai_endpoint,
+            config.azure_openai_embedding_deployment,
+            config.azure_openai_api_key,
+            config.embedding_dimensions,
+        )
+    raise ValueError(f"Unknown KNOWLEDGE_EMBEDDING_PROVIDER: {config.embedding_provider!r}")
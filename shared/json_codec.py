@@ -0,0 +1,66 @@
+"""JSON encoding and decoding with an optional orjson fast path.
+
+Salesforce REST responses are decoded, and payloads the services build
+themselves are encoded, through ``loads``/``dumps`` here. With orjson
+installed both run several times faster than the stdlib ``json`` module;
+without it they fall back to ``json`` with identical output.
+
+``dumps`` handles the values tool results and models carry — ``date``,
+``datetime``, ``Decimal``, sets and Pydantic models — natively, so callers
+do not need a ``model_dump(mode="json")`` pass first.
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any
+
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None  # type: ignore[assignment]
+
+
+def fast_codec_available() -> bool:
+    """Return True if the optional ``orjson`` package is installed."""
+    return orjson is not None
+
+
+def _default(value: Any) -> Any:
+    """Encode the non-JSON types tool results carry."""
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def loads(data: bytes | bytearray | memoryview | str) -> Any:
+    """Decode a JSON document."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(bytes(data) if isinstance(data, memoryview) else data)
+
+
+def dumps(value: Any, *, indent: bool = False) -> bytes:
+    """Encode a value as UTF-8 JSON bytes.
+
+    Args:
+        value: JSON-compatible data, which may also contain dates, datetimes,
+               Decimals, sets and Pydantic models.
+        indent: Pretty-print with two-space indentation.
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(value, default=_default, option=option)
+    if indent:
+        return json.dumps(value, default=_default, ensure_ascii=False, indent=2).encode()
+    return json.dumps(value, default=_default, ensure_ascii=False, separators=(",", ":")).encode()
@@ -0,0 +1,82 @@
+"""Local manifest of what the knowledge index currently holds.
+
+Every document the sync has indexed is recorded as ``(key, article_id,
+content_hash)`` in a sqlite file next to the sync state. The sync hashes
+each document it builds and only uploads (and embeds) those whose hash
+differs from the manifest. Documents in the manifest that are no longer
+produced are deleted from the index. These are chunks past an article's
+new end, and every chunk of an article that was archived, unpublished or
+superseded by a newer version.
+
+The manifest describes the index, so it must be thrown away with it:
+delete the file to make the next sync re-upload everything.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from collections.abc import Iterable, Mapping
+
+# Article IDs per lookup; stays under sqlite's default bound-parameter limit
+LOOKUP_CHUNK = 500
+
+
+class KnowledgeManifest:
+    """Content hashes of indexed knowledge documents, grouped by source article."""
+
+    def __init__(self, path: str) -> None:
+        self._conn = sqlite3.connect(path, timeout=5.0, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS documents ("
+            " key TEXT PRIMARY KEY, article_id TEXT NOT NULL, content_hash TEXT NOT NULL) WITHOUT ROWID"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS documents_article ON documents (article_id)")
+
+    def hashes(self, article_ids: Iterable[str]) -> dict[str, dict[str, str]]:
+        """Indexed documents of the given articles: article ID -> {document key: content hash}.
+
+        Articles with nothing indexed are absent from the result.
+        """
+        ids = list(dict.fromkeys(article_ids))
+        found: dict[str, dict[str, str]] = {}
+        for i in range(0, len(ids), LOOKUP_CHUNK):
+            chunk = ids[i : i + LOOKUP_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._conn.execute(
+                f"SELECT article_id, key, content_hash FROM documents WHERE article_id IN ({placeholders})", chunk
+            )
+            for article_id, key, content_hash in rows:
+                found.setdefault(article_id, {})[key] = content_hash
+        return found
+
+    def article_ids(self) -> set[str]:
+        """Every article with at least one indexed document."""
+        return {row[0] for row in self._conn.execute("SELECT DISTINCT article_id FROM documents")}
+
+    def apply(self, upserts: Mapping[str, tuple[str, str]], deletes: Iterable[str] = ()) -> None:
+        """Record indexed documents (key -> (article ID, hash)) and drop deleted keys, in one transaction."""
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO documents (key, article_id, content_hash) VALUES (?, ?, ?)",
+                [(key, article_id, content_hash) for key, (article_id, content_hash) in upserts.items()],
+            )
+            self._conn.executemany("DELETE FROM documents WHERE key = ?", [(key,) for key in deletes])
+            self._conn.execute("COMMIT")
+        except sqlite3.Error:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def __len__(self) -> int:
+        return int(self._conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0])
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> KnowledgeManifest:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
@@ -7,25 +7,105 @@ Supports:
 - Full sync (initial load)
 - Incremental sync (delta changes since last sync)
 - Scheduled execution via cron or manual trigger
+
+Incremental syncs resume from a high-water mark: the newest
+``SystemModstamp`` actually seen, not the wall clock at the end of the
+run, so edits made while a sync is running are picked up next time. The
+next query uses ``SystemModstamp >=`` the mark and skips the records
+already seen at that boundary, so frequent runs neither miss nor repeat
+work.
+
+Uploads are pipelined: Salesforce pages stream through a bounded queue of
+index batches while several upload workers post batches concurrently, so
+a full re-sync overlaps fetching and indexing instead of doing one after
+the other. Batches close at ``batch_size`` documents or ``max_batch_bytes``
+of encoded JSON, whichever comes first, keeping every request under the
+Azure AI Search 16 MB limit.
+
+Throttled batches (429/503) and transient per-document failures reported
+in a 207 response are retried with jittered exponential backoff, honoring
+``Retry-After``; only the failed documents are re-sent. Documents that
+still fail are recorded as dead letters in the sync state and re-fetched
+on the next run.
+
+Every built document is hashed and compared against a local manifest of
+what the index holds (see ``shared.knowledge_manifest``); unchanged
+documents are neither embedded nor uploaded, so a full sync of an
+unchanged knowledge base writes nothing. The hash leaves out
+``lastModifiedDate``, which moves on edits to fields that are not indexed,
+so the indexed value is the date of the last content change. Chunks past
+an article's new end are deleted. Full syncs, and incremental syncs at
+most once per ``removal_check_interval``, list the Online article IDs and
+delete the documents of articles that have dropped out (archived,
+unpublished, or superseded by a new version).
 """
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import json
 import logging
 import os
+import random
+import sqlite3
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Iterator
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
-from typing import Any
+from email.utils import parsedate_to_datetime
+from itertools import islice
+from typing import Any, NamedTuple, TypeVar
+
+import httpx
+
+from shared import json_codec
+from shared.article_content import chunk_text, fetch_article_bodies, html_to_text
+from shared.config import KnowledgeIndexConfig, load_knowledge_index_config
+from shared.embeddings import Embedder, create_embedder
+from shared.knowledge_manifest import KnowledgeManifest
+from shared.salesforce_client import SalesforceClientError
+from shared.soql import SoqlQuery, eq, gte, id_in
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 # Azure AI Search index schema for Knowledge Articles
 KNOWLEDGE_INDEX_NAME = "salesforce-knowledge-articles"
+SEARCH_API_VERSION = "2024-07-01"
+
+# Azure AI Search rejects index requests over 16 MB
+MAX_UPLOAD_BATCH_BYTES = 16 * 1024 * 1024
+DEFAULT_UPLOAD_BATCH_SIZE = 100
+DEFAULT_UPLOAD_CONCURRENCY = 4
+# Batches buffered ahead of the upload workers; bounds memory during full syncs
+UPLOAD_QUEUE_BATCHES = 8
+UPLOAD_TIMEOUT = 60.0
+# Records pulled from the (blocking) Salesforce iterator per worker-thread hop
+SOURCE_CHUNK_SIZE = 200
+
+# Request statuses worth retrying the whole batch for
+RETRYABLE_BATCH_STATUSES = frozenset({429, 503})
+# Per-document statuses in a 207 response that are transient
+# (version conflict, index temporarily unavailable, service unavailable)
+RETRYABLE_DOCUMENT_STATUSES = frozenset({409, 422, 503})
+MAX_UPLOAD_ATTEMPTS = 5
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 30.0
+# Dead-lettered article IDs re-fetched per SOQL query on the next run
+DEAD_LETTER_QUERY_CHUNK = 200
+# Most recent error messages kept in the persisted sync state
+MAX_STATE_ERRORS = 20
+# Listing every Online article ID costs one API call per 2000 articles, so
+# incremental runs look for removed articles at most this often
+DEFAULT_REMOVAL_CHECK_INTERVAL = 3600.0
+
+VECTOR_SEARCH_PROFILE = "knowledge-hnsw"
+
+# Left out of content hashes: moves on edits that leave the indexed content unchanged
+_UNHASHED_FIELDS = frozenset({"lastModifiedDate", "contentVector"})
 
-KNOWLEDGE_INDEX_SCHEMA = {
-    "name": KNOWLEDGE_INDEX_NAME,
-    "fields": [
+_KNOWLEDGE_FIELDS: list[dict[str, Any]] = [
         {"name": "id", "type": "Edm.String", "key": True, "filterable": True},
         {"name": "knowledgeArticleId", "type": "Edm.String", "filterable": True},
         {"name": "title", "type": "Edm.String", "searchable": True, "retrievable": True},
@@ -72,43 +152,219 @@ KNOWLEDGE_INDEX_SCHEMA = {
             "filterable": True,
             "retrievable": True,
         },
-    ],
-}
+        # One document per body chunk; parentId is the article version Id
+        {"name": "parentId", "type": "Edm.String", "filterable": True, "retrievable": True},
+        {"name": "chunkIndex", "type": "Edm.Int32", "filterable": True, "sortable": True, "retrievable": True},
+        {"name": "chunkCount", "type": "Edm.Int32", "retrievable": True},
+]
+
+
+def knowledge_index_schema(dimensions: int) -> dict[str, Any]:
+    """Index definition for knowledge article chunks with ``dimensions``-long content vectors."""
+    return {
+        "name": KNOWLEDGE_INDEX_NAME,
+        "fields": [
+            *_KNOWLEDGE_FIELDS,
+            {
+                "name": "contentVector",
+                "type": "Collection(Edm.Single)",
+                "searchable": True,
+                "retrievable": False,
+                "dimensions": dimensions,
+                "vectorSearchProfile": VECTOR_SEARCH_PROFILE,
+            },
+        ],
+        "vectorSearch": {
+            "algorithms": [{"name": "knowledge-hnsw-config", "kind": "hnsw"}],
+            "profiles": [{"name": VECTOR_SEARCH_PROFILE, "algorithm": "knowledge-hnsw-config"}],
+        },
+    }
+
+
+KNOWLEDGE_INDEX_SCHEMA = knowledge_index_schema(KnowledgeIndexConfig().embedding_dimensions)
 
 # SOQL query for fetching KnowledgeArticleVersion records
-KNOWLEDGE_SOQL_BASE = (
-    "SELECT Id, KnowledgeArticleId, Title, Summary, "
-    "ArticleNumber, UrlName, PublishStatus, Language, ArticleType, "
-    "LastModifiedDate, LastPublishedDate, VersionNumber "
-    "FROM KnowledgeArticleVersion "
-    "WHERE PublishStatus = 'Online' AND Language = 'en_US' "
-    "AND IsLatestVersion = true"
+KNOWLEDGE_QUERY = (
+    SoqlQuery("KnowledgeArticleVersion")
+    .select(
+        "Id, KnowledgeArticleId, Title, Summary, "
+        "ArticleNumber, UrlName, PublishStatus, Language, ArticleType, "
+        "LastModifiedDate, LastPublishedDate, VersionNumber, SystemModstamp"
+    )
+    .where(eq("PublishStatus", "Online"), eq("Language", "en_US"), eq("IsLatestVersion", True))
+    .order_by("SystemModstamp ASC")
+)
+
+# IDs of every article the sync should have indexed; anything else in the manifest is deleted
+ONLINE_ARTICLE_IDS_QUERY = (
+    SoqlQuery("KnowledgeArticleVersion")
+    .select("Id")
+    .where(eq("PublishStatus", "Online"), eq("Language", "en_US"), eq("IsLatestVersion", True))
 )
 
 
+@dataclass
+class DeadLetter:
+    """A document the index would not accept after all retries.
+
+    ``id`` is the index document key; ``article_id`` the article version it
+    was built from, which is what the next sync re-fetches.
+    """
+
+    id: str
+    status_code: int | None
+    error: str
+    attempts: int = 1
+    failed_at: str | None = None
+    article_id: str | None = None
+
+    @property
+    def source_id(self) -> str:
+        """Article version Id to re-fetch (documents from before chunking were keyed by it)."""
+        return self.article_id or self.id
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "status_code": self.status_code,
+            "error": self.error,
+            "attempts": self.attempts,
+            "failed_at": self.failed_at,
+            "article_id": self.article_id,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> DeadLetter:
+        return cls(
+            id=data["id"],
+            status_code=data.get("status_code"),
+            error=data.get("error", ""),
+            attempts=data.get("attempts", 1),
+            failed_at=data.get("failed_at"),
+            article_id=data.get("article_id"),
+        )
+
+
+@dataclass
+class UploadResult:
+    """Outcome of one upload run."""
+
+    uploaded: int = 0
+    failed: list[DeadLetter] = field(default_factory=list)
+    deleted: int = 0
+
+
 @dataclass
 class SyncState:
-    """Tracks the last successful sync timestamp for incremental syncs."""
+    """Tracks where incremental syncs resume.
+
+    ``high_water_mark`` is the newest ``SystemModstamp`` seen, truncated to
+    the second (SOQL datetime literals have no milliseconds), and
+    ``boundary`` maps the IDs seen from that second onwards to their
+    ``SystemModstamp``; the next sync queries ``>=`` the mark and skips
+    those exact records. ``last_sync_timestamp`` records when the last
+    successful sync finished. ``dead_letters`` holds documents that failed
+    to index; the next sync re-fetches them before the incremental query.
+    ``last_removal_check`` records when articles no longer Online were last
+    looked for. ``errors`` keeps the last ``MAX_STATE_ERRORS`` failure messages.
+    """
 
     last_sync_timestamp: str | None = None
     total_synced: int = 0
     errors: list[str] = field(default_factory=list)
+    dead_letters: list[DeadLetter] = field(default_factory=list)
+    high_water_mark: str | None = None
+    boundary: dict[str, str] = field(default_factory=dict)
+    last_removal_check: str | None = None
 
     def to_dict(self) -> dict[str, Any]:
         return {
             "last_sync_timestamp": self.last_sync_timestamp,
             "total_synced": self.total_synced,
             "errors": self.errors,
+            "dead_letters": [letter.to_dict() for letter in self.dead_letters],
+            "high_water_mark": self.high_water_mark,
+            "boundary": self.boundary,
+            "last_removal_check": self.last_removal_check,
         }
 
+    def add_error(self, message: str) -> None:
+        """Record a failure, dropping the oldest messages past ``MAX_STATE_ERRORS``."""
+        self.errors.append(message)
+        del self.errors[:-MAX_STATE_ERRORS]
+
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> SyncState:
         return cls(
             last_sync_timestamp=data.get("last_sync_timestamp"),
             total_synced=data.get("total_synced", 0),
-            errors=data.get("errors", []),
+            errors=data.get("errors", [])[-MAX_STATE_ERRORS:],
+            dead_letters=[DeadLetter.from_dict(letter) for letter in data.get("dead_letters", [])],
+            # State files from before the high-water mark resume from the last sync time,
+            # a safe lower bound since SystemModstamp >= LastModifiedDate
+            high_water_mark=data.get("high_water_mark", data.get("last_sync_timestamp")),
+            boundary=data.get("boundary", {}),
+            last_removal_check=data.get("last_removal_check"),
         )
 
+    def removal_check_due(self, interval: float, now: datetime) -> bool:
+        """Whether ``interval`` seconds have passed since articles no longer Online were looked for."""
+        if self.last_removal_check is None:
+            return True
+        return (now - _parse_stamp(self.last_removal_check)).total_seconds() >= interval
+
+
+# Failures that abort a sync while streaming articles out of Salesforce
+_SOURCE_ERRORS = (SalesforceClientError, httpx.HTTPError, sqlite3.Error, ValueError)
+
+
+class _SyncStageError(Exception):
+    """A source failure labelled with the sync stage it happened in."""
+
+    def __init__(self, stage: str, error: Exception) -> None:
+        super().__init__(f"{stage} failed: {error}")
+        self.stage = stage
+
+
+class _HighWaterTracker:
+    """Follows the SystemModstamps streamed in one run and filters out records seen at the old boundary."""
+
+    def __init__(self, mark: str | None, boundary: dict[str, str]) -> None:
+        self._mark = _parse_stamp(mark) if mark else None
+        self._boundary = boundary
+        self._top = self._mark
+        self._top_ids: dict[str, str] = {}
+
+    def seen(self, record: dict[str, Any]) -> bool:
+        """True if the record was already synced at the previous boundary."""
+        return self._boundary.get(record["Id"]) == record.get("SystemModstamp")
+
+    def observe(self, record: dict[str, Any]) -> None:
+        stamp = record.get("SystemModstamp")
+        if not stamp:
+            return
+        second = _parse_stamp(stamp).replace(microsecond=0)
+        if self._top is None or second > self._top:
+            self._top, self._top_ids = second, {}
+        if second == self._top:
+            self._top_ids[record["Id"]] = stamp
+
+    def advance(self, state: SyncState) -> None:
+        """Move the state's mark and boundary past everything observed."""
+        if self._top is None:
+            return
+        if self._top == self._mark:
+            state.boundary = {**self._boundary, **self._top_ids}
+        else:
+            state.boundary = self._top_ids
+        state.high_water_mark = self._top.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _parse_stamp(value: str) -> datetime:
+    """Parse a Salesforce datetime (``2025-01-01T00:00:00.000+0000``) or a stored mark as aware UTC."""
+    stamp = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return stamp.replace(tzinfo=UTC) if stamp.tzinfo is None else stamp.astimezone(UTC)
+
 
 def _load_sync_state(state_file: str) -> SyncState:
     """Load sync state from a JSON file."""
@@ -124,66 +380,214 @@ def _save_sync_state(state: SyncState, state_file: str) -> None:
         json.dump(state.to_dict(), f, indent=2)
 
 
-def _build_soql_query(last_sync_timestamp: str | None = None) -> str:
-    """Build SOQL query for knowledge articles, optionally filtering by last modified date."""
-    query = KNOWLEDGE_SOQL_BASE
-    if last_sync_timestamp:
-        query += f" AND LastModifiedDate > {last_sync_timestamp}"
-    query += " ORDER BY LastModifiedDate ASC"
-    return query
+def _manifest_path(state_file: str) -> str:
+    """Default manifest location: beside the sync state file."""
+    return f"{os.path.splitext(state_file)[0]}.manifest.sqlite3"
+
+
+def _build_soql_query(high_water_mark: str | None = None) -> str:
+    """Build SOQL query for knowledge articles, optionally from a SystemModstamp high-water mark on."""
+    query = KNOWLEDGE_QUERY
+    if high_water_mark:
+        query = query.where(gte("SystemModstamp", _parse_stamp(high_water_mark)))
+    return query.build()
+
 
+def _build_replay_queries(article_ids: Iterable[str]) -> list[str]:
+    """Build SOQL queries re-fetching dead-lettered articles by version ID."""
+    ids = sorted(set(article_ids))
+    return [
+        KNOWLEDGE_QUERY.where(id_in("Id", ids[i : i + DEAD_LETTER_QUERY_CHUNK])).build()
+        for i in range(0, len(ids), DEAD_LETTER_QUERY_CHUNK)
+    ]
 
-def _transform_article_to_document(article: dict[str, Any]) -> dict[str, Any]:
-    """Transform a Salesforce KnowledgeArticleVersion record to an Azure AI Search document."""
+
+def _int_field(value: Any, default: int) -> int:
+    """An integer field from a REST (number) or Bulk API (CSV string) record."""
+    if value is None or value == "":
+        return default
+    return int(float(value)) if isinstance(value, str) else int(value)
+
+
+def _datetime_field(value: Any) -> str | None:
+    """A datetime field in the REST form; Bulk API CSV writes UTC as ``Z`` rather than ``+0000``."""
+    if isinstance(value, str) and value.endswith("Z"):
+        return value[:-1] + "+0000"
+    return value or None
+
+
+def _transform_article_to_document(article: dict[str, Any], body: str = "") -> dict[str, Any]:
+    """Transform a Salesforce KnowledgeArticleVersion record to an Azure AI Search document.
+
+    Records may come from REST or from Bulk API CSV (all strings); typed fields
+    are normalized so both produce the same document and content hash.
+    """
     return {
         "id": article["Id"],
         "knowledgeArticleId": article.get("KnowledgeArticleId", ""),
         "title": article.get("Title", ""),
         "summary": article.get("Summary", ""),
-        "articleBody": "",  # Body requires a separate API call for rich text fields
+        "articleBody": body,
         "articleNumber": article.get("ArticleNumber", ""),
         "urlName": article.get("UrlName", ""),
         "publishStatus": article.get("PublishStatus", ""),
         "language": article.get("Language", "en_US"),
         "articleType": article.get("ArticleType", ""),
-        "lastModifiedDate": article.get("LastModifiedDate"),
-        "lastPublishedDate": article.get("LastPublishedDate"),
-        "versionNumber": article.get("VersionNumber", 1),
+        "lastModifiedDate": _datetime_field(article.get("LastModifiedDate")),
+        "lastPublishedDate": _datetime_field(article.get("LastPublishedDate")),
+        "versionNumber": _int_field(article.get("VersionNumber"), 1),
         "categoryGroups": [],
     }
 
 
+def _chunk_documents(article: dict[str, Any], chunks: list[str]) -> list[dict[str, Any]]:
+    """Build one index document per body chunk, each carrying the article's metadata."""
+    base = _transform_article_to_document(article)
+    return [
+        {
+            **base,
+            "id": f"{article['Id']}-{index}",
+            "parentId": article["Id"],
+            "chunkIndex": index,
+            "chunkCount": len(chunks),
+            "articleBody": chunk,
+        }
+        for index, chunk in enumerate(chunks)
+    ]
+
+
+async def _build_chunk_documents(
+    sf_client: Any,
+    articles: list[dict[str, Any]],
+    config: KnowledgeIndexConfig,
+) -> list[dict[str, Any]]:
+    """Fetch bodies for a batch of articles and split them into chunk documents (not yet embedded).
+
+    Articles without a body get a single chunk of their summary (or title),
+    so every article stays findable.
+    """
+    bodies = await asyncio.to_thread(fetch_article_bodies, sf_client, articles)
+    documents: list[dict[str, Any]] = []
+    for article in articles:
+        text = html_to_text(bodies.get(article["Id"]))
+        chunks = chunk_text(text, config.chunk_tokens, config.chunk_overlap_tokens) if text else []
+        documents.extend(_chunk_documents(article, chunks or [article.get("Summary") or article.get("Title") or ""]))
+    return documents
+
+
+async def _embed_documents(documents: list[dict[str, Any]], embedder: Embedder) -> None:
+    """Set ``contentVector`` on chunk documents with one embedder call."""
+    # The title gives each chunk its context in the embedding
+    inputs = [f"{doc['title'] or ''}\n{doc['articleBody']}" for doc in documents]
+    for doc, vector in zip(documents, await embedder.embed(inputs), strict=True):
+        doc["contentVector"] = vector
+
+
+def _content_hash(document: dict[str, Any], salt: str = "") -> str:
+    """Stable hash of a document's indexed content; ``salt`` identifies how vectors are made."""
+    content = {k: v for k, v in document.items() if k not in _UNHASHED_FIELDS}
+    payload = json.dumps(content, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.blake2b(f"{salt}\n{payload}".encode(), digest_size=16).hexdigest()
+
+
+def _delete_action(key: str) -> dict[str, Any]:
+    return {"@search.action": "delete", "id": key}
+
+
+class _IndexChanges:
+    """Diffs built documents against the manifest and collects what to record once the uploads land."""
+
+    def __init__(self, manifest: KnowledgeManifest, salt: str) -> None:
+        self._manifest = manifest
+        self._salt = salt
+        # key -> (article ID, content hash) for documents sent this run
+        self.upserts: dict[str, tuple[str, str]] = {}
+        self.deletes: set[str] = set()
+        self.unchanged = 0
+
+    def diff(
+        self, articles: list[dict[str, Any]], documents: list[dict[str, Any]]
+    ) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+        """Split a batch into the documents whose content changed and delete actions for stale keys."""
+        indexed = self._manifest.hashes(article["Id"] for article in articles)
+        changed: list[dict[str, Any]] = []
+        built: dict[str, set[str]] = {}
+        for doc in documents:
+            article_id = doc["parentId"]
+            built.setdefault(article_id, set()).add(doc["id"])
+            content_hash = _content_hash(doc, self._salt)
+            if indexed.get(article_id, {}).get(doc["id"]) == content_hash:
+                self.unchanged += 1
+                continue
+            self.upserts[doc["id"]] = (article_id, content_hash)
+            changed.append(doc)
+
+        stale: list[str] = []
+        for article in articles:
+            previous = indexed.get(article["Id"])
+            if previous is None:
+                # First time under the manifest: drop the single document indexed before chunking
+                stale.append(article["Id"])
+            else:
+                stale.extend(sorted(previous.keys() - built.get(article["Id"], set())))
+        self.deletes.update(stale)
+        return changed, [_delete_action(key) for key in stale]
+
+    def removed(self, online_ids: set[str]) -> list[dict[str, Any]]:
+        """Delete actions for every indexed document of articles no longer Online."""
+        gone = self._manifest.article_ids() - online_ids
+        keys = sorted(key for documents in self._manifest.hashes(gone).values() for key in documents)
+        self.deletes.update(keys)
+        return [_delete_action(key) for key in keys]
+
+    def commit(self, failed: list[DeadLetter]) -> None:
+        """Record what the index accepted; failed uploads and deletes are left for the next run to retry."""
+        failed_keys = {letter.id for letter in failed}
+        self._manifest.apply(
+            {key: value for key, value in self.upserts.items() if key not in failed_keys},
+            [key for key in self.deletes if key not in failed_keys],
+        )
+
+
 async def ensure_search_index(
     search_endpoint: str,
     search_api_key: str,
+    *,
+    schema: dict[str, Any] | None = None,
+    transport: httpx.AsyncBaseTransport | None = None,
 ) -> bool:
     """Create or update the Azure AI Search index for knowledge articles.
 
+    An existing index missing any of the schema's fields (e.g. one created
+    before chunk vectors) is updated in place; fields can be added but not
+    changed.
+
     Args:
         search_endpoint: Azure AI Search service endpoint.
         search_api_key: Azure AI Search admin API key.
+        schema: Index definition. Defaults to KNOWLEDGE_INDEX_SCHEMA.
+        transport: Optional httpx transport (used by tests to mock Azure AI Search).
 
     Returns:
         True if index was created/updated successfully, False otherwise.
     """
-    import httpx
-
-    url = f"{search_endpoint}/indexes/{KNOWLEDGE_INDEX_NAME}?api-version=2024-07-01"
+    schema = schema or KNOWLEDGE_INDEX_SCHEMA
+    url = f"{search_endpoint}/indexes/{KNOWLEDGE_INDEX_NAME}?api-version={SEARCH_API_VERSION}"
     headers = {
         "Content-Type": "application/json",
         "api-key": search_api_key,
     }
 
-    async with httpx.AsyncClient() as client:
+    async with httpx.AsyncClient(transport=transport) as client:
         # Check if index exists
         response = await client.get(url, headers=headers)
         if response.status_code == 404:
             # Create new index
-            create_url = f"{search_endpoint}/indexes?api-version=2024-07-01"
+            create_url = f"{search_endpoint}/indexes?api-version={SEARCH_API_VERSION}"
             response = await client.post(
                 create_url,
                 headers=headers,
-                json=KNOWLEDGE_INDEX_SCHEMA,
+                json=schema,
             )
             if response.status_code in (200, 201):
                 logger.info("Created search index: %s", KNOWLEDGE_INDEX_NAME)
@@ -191,67 +595,281 @@ async def ensure_search_index(
             logger.error("Failed to create index: %s", response.text)
             return False
         elif response.status_code == 200:
-            logger.info("Search index already exists: %s", KNOWLEDGE_INDEX_NAME)
-            return True
+            existing = {f.get("name") for f in json_codec.loads(response.content).get("fields", [])}
+            missing = [f["name"] for f in schema["fields"] if f["name"] not in existing]
+            if not missing:
+                logger.info("Search index already exists: %s", KNOWLEDGE_INDEX_NAME)
+                return True
+            response = await client.put(url, headers=headers, json=schema)
+            if response.status_code in (200, 201, 204):
+                logger.info("Added fields %s to search index %s", missing, KNOWLEDGE_INDEX_NAME)
+                return True
+            logger.error("Failed to update index: %s", response.text)
+            return False
         else:
             logger.error("Failed to check index: %s", response.text)
             return False
 
 
-async def upload_documents(
-    documents: list[dict[str, Any]],
+_BATCH_PREFIX = b'{"value":['
+_BATCH_SUFFIX = b"]}"
+
+
+class _Item(NamedTuple):
+    """An encoded index action with the document key and source article it carries."""
+
+    key: str
+    article_id: str
+    body: bytes
+    delete: bool = False
+
+    def dead_letter(self, status_code: int | None, error: str, attempts: int = 1) -> DeadLetter:
+        return DeadLetter(self.key, status_code, error, attempts, article_id=self.article_id)
+
+
+def _batch_body(items: list[_Item]) -> bytes:
+    return _BATCH_PREFIX + b",".join(item.body for item in items) + _BATCH_SUFFIX
+
+
+async def _encoded_batches(
+    documents: AsyncIterable[dict[str, Any]],
+    batch_size: int,
+    max_batch_bytes: int,
+    oversized: list[DeadLetter],
+) -> AsyncIterator[list[_Item]]:
+    """Group documents into index batches, encoding each document once.
+
+    A batch closes when it holds ``batch_size`` documents or the next
+    document would push the request body past ``max_batch_bytes``. A single
+    document too large to send on its own is appended to ``oversized``.
+    """
+    envelope = len(_BATCH_PREFIX) + len(_BATCH_SUFFIX)
+    batch: list[_Item] = []
+    size = envelope
+    async for doc in documents:
+        action = doc.get("@search.action", "mergeOrUpload")
+        item = _Item(
+            doc["id"],
+            doc.get("parentId") or doc["id"],
+            json_codec.dumps({**doc, "@search.action": action}),
+            action == "delete",
+        )
+        if envelope + len(item.body) > max_batch_bytes:
+            logger.error("Skipping document %s: %d bytes exceeds the upload limit", item.key, len(item.body))
+            oversized.append(item.dead_letter(None, f"Document is {len(item.body)} bytes, over the upload limit"))
+            continue
+        # One comma per document after the first
+        if batch and (len(batch) >= batch_size or size + len(item.body) + 1 > max_batch_bytes):
+            yield batch
+            batch, size = [], envelope
+        size += len(item.body) + (1 if batch else 0)
+        batch.append(item)
+    if batch:
+        yield batch
+
+
+def _retry_delay(attempt: int, retry_after: str | None = None) -> float:
+    """Seconds to wait before retry number ``attempt`` (1-based).
+
+    ``Retry-After`` (seconds or an HTTP date) wins when present; otherwise
+    full-jitter exponential backoff capped at RETRY_MAX_DELAY.
+    """
+    if retry_after:
+        delay: float | None
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            try:
+                delay = (parsedate_to_datetime(retry_after) - datetime.now(UTC)).total_seconds()
+            except (TypeError, ValueError):
+                delay = None
+        if delay is not None:
+            return min(max(delay, 0.0), RETRY_MAX_DELAY)
+    return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** (attempt - 1)))
+
+
+async def _upload_batch(
+    client: httpx.AsyncClient,
+    url: str,
+    headers: dict[str, str],
+    batch: list[_Item],
+    number: int,
+) -> UploadResult:
+    """Post one batch, re-sending only the transiently failed documents until they land or attempts run out."""
+    result = UploadResult()
+    pending = batch
+    # key -> (status code, error) for documents still to retry
+    failures: dict[str, tuple[int | None, str]] = {}
+    for attempt in range(1, MAX_UPLOAD_ATTEMPTS + 1):
+        retry_after = None
+        failures = {}
+        try:
+            response = await client.post(url, headers=headers, content=_batch_body(pending))
+        except httpx.TransportError as e:
+            failures = {item.key: (None, f"{type(e).__name__}: {e}") for item in pending}
+        else:
+            if response.status_code in (200, 207):
+                statuses = {r.get("key"): r for r in json_codec.loads(response.content).get("value", [])}
+                for item in pending:
+                    status = statuses.get(item.key, {})
+                    if status.get("status", False):
+                        if item.delete:
+                            result.deleted += 1
+                        else:
+                            result.uploaded += 1
+                        continue
+                    code = status.get("statusCode")
+                    error = status.get("errorMessage") or "Missing from index response"
+                    if status and code not in RETRYABLE_DOCUMENT_STATUSES:
+                        result.failed.append(item.dead_letter(code, error, attempt))
+                    else:
+                        failures[item.key] = (code, error)
+            elif response.status_code in RETRYABLE_BATCH_STATUSES:
+                retry_after = response.headers.get("Retry-After")
+                failures = {item.key: (response.status_code, response.text) for item in pending}
+            else:
+                logger.error("Batch %d upload failed: %s", number, response.text)
+                code, error = response.status_code, response.text
+                result.failed.extend(item.dead_letter(code, error, attempt) for item in pending)
+        if not failures:
+            break
+        pending = [item for item in pending if item.key in failures]
+        if attempt < MAX_UPLOAD_ATTEMPTS:
+            delay = _retry_delay(attempt, retry_after)
+            logger.warning("Batch %d: retrying %d documents in %.1fs", number, len(pending), delay)
+            await asyncio.sleep(delay)
+
+    if failures:
+        # pending holds exactly the documents that failed the last attempt
+        result.failed.extend(item.dead_letter(*failures[item.key], MAX_UPLOAD_ATTEMPTS) for item in pending)
+    logger.info("Uploaded batch %d: %d/%d succeeded", number, result.uploaded, len(batch))
+    return result
+
+
+async def _as_async_iterable(documents: Iterable[dict[str, Any]]) -> AsyncIterator[dict[str, Any]]:
+    """Adapt an in-memory document list for ``upload_document_stream``."""
+    for doc in documents:
+        yield doc
+
+
+async def _iter_chunks_in_thread(iterator: Iterator[T], chunk_size: int) -> AsyncIterator[list[T]]:
+    """Drain a blocking iterator in a worker thread, ``chunk_size`` items per hop.
+
+    Keeps the event loop free for the upload workers while the synchronous
+    Salesforce client waits on the next page.
+    """
+    while chunk := await asyncio.to_thread(lambda: list(islice(iterator, chunk_size))):
+        yield chunk
+
+
+async def upload_document_stream(
+    documents: AsyncIterable[dict[str, Any]],
     search_endpoint: str,
     search_api_key: str,
-    batch_size: int = 100,
-) -> int:
-    """Upload documents to Azure AI Search index in batches.
+    *,
+    batch_size: int = DEFAULT_UPLOAD_BATCH_SIZE,
+    max_batch_bytes: int = MAX_UPLOAD_BATCH_BYTES,
+    concurrency: int = DEFAULT_UPLOAD_CONCURRENCY,
+    transport: httpx.AsyncBaseTransport | None = None,
+) -> UploadResult:
+    """Upload a stream of documents to the Azure AI Search index.
+
+    Documents are batched as they arrive and handed to ``concurrency``
+    upload workers through a bounded queue, so a slow source and a slow
+    index overlap instead of adding up. If the source raises, batches
+    already queued are abandoned and the error propagates. Documents are
+    merged or uploaded unless they carry ``"@search.action": "delete"``.
 
     Args:
-        documents: List of documents to upload.
+        documents: Documents to upload, produced lazily.
         search_endpoint: Azure AI Search service endpoint.
         search_api_key: Azure AI Search admin API key.
-        batch_size: Number of documents per upload batch.
+        batch_size: Maximum number of documents per upload batch.
+        max_batch_bytes: Maximum encoded size of one upload request.
+        concurrency: Number of batches in flight at once.
+        transport: Optional httpx transport (used by tests to mock Azure AI Search).
 
     Returns:
-        Number of documents successfully uploaded.
+        The number of documents uploaded and deleted, and the documents that
+        failed after all retries.
     """
-    import httpx
-
-    url = f"{search_endpoint}/indexes/{KNOWLEDGE_INDEX_NAME}/docs/index?api-version=2024-07-01"
+    url = f"{search_endpoint}/indexes/{KNOWLEDGE_INDEX_NAME}/docs/index?api-version={SEARCH_API_VERSION}"
     headers = {
         "Content-Type": "application/json",
         "api-key": search_api_key,
     }
+    concurrency = max(concurrency, 1)
+    queue: asyncio.Queue[tuple[int, list[_Item]]] = asyncio.Queue(maxsize=UPLOAD_QUEUE_BATCHES)
+    total = UploadResult()
 
-    total_uploaded = 0
+    async def worker(client: httpx.AsyncClient) -> None:
+        while True:
+            number, batch = await queue.get()
+            try:
+                result = await _upload_batch(client, url, headers, batch, number)
+                total.uploaded += result.uploaded
+                total.deleted += result.deleted
+                total.failed.extend(result.failed)
+            except Exception as e:
+                logger.exception("Batch %d upload failed", number)
+                total.failed.extend(item.dead_letter(None, f"{type(e).__name__}: {e}") for item in batch)
+            finally:
+                queue.task_done()
 
-    async with httpx.AsyncClient() as client:
-        for i in range(0, len(documents), batch_size):
-            batch = documents[i : i + batch_size]
-            payload = {
-                "value": [
-                    {**doc, "@search.action": "mergeOrUpload"} for doc in batch
-                ]
-            }
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=UPLOAD_TIMEOUT, transport=transport) as client:
+        workers = [asyncio.create_task(worker(client)) for _ in range(concurrency)]
+        try:
+            number = 0
+            async for batch in _encoded_batches(documents, batch_size, max_batch_bytes, total.failed):
+                number += 1
+                await queue.put((number, batch))
+            await queue.join()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    return total
 
-            response = await client.post(url, headers=headers, json=payload)
-            if response.status_code in (200, 207):
-                result = response.json()
-                succeeded = sum(
-                    1 for r in result.get("value", []) if r.get("status", False)
-                )
-                total_uploaded += succeeded
-                logger.info(
-                    "Uploaded batch %d-%d: %d/%d succeeded",
-                    i,
-                    i + len(batch),
-                    succeeded,
-                    len(batch),
-                )
-            else:
-                logger.error("Batch upload failed: %s", response.text)
 
-    return total_uploaded
+async def upload_documents(
+    documents: Iterable[dict[str, Any]],
+    search_endpoint: str,
+    search_api_key: str,
+    batch_size: int = DEFAULT_UPLOAD_BATCH_SIZE,
+    *,
+    max_batch_bytes: int = MAX_UPLOAD_BATCH_BYTES,
+    concurrency: int = DEFAULT_UPLOAD_CONCURRENCY,
+    transport: httpx.AsyncBaseTransport | None = None,
+) -> int:
+    """Upload documents to Azure AI Search index in batches.
+
+    Convenience wrapper over ``upload_document_stream`` for documents
+    already in memory; use that directly to see which documents failed.
+
+    Args:
+        documents: Documents to upload.
+        search_endpoint: Azure AI Search service endpoint.
+        search_api_key: Azure AI Search admin API key.
+        batch_size: Maximum number of documents per upload batch.
+        max_batch_bytes: Maximum encoded size of one upload request.
+        concurrency: Number of batches in flight at once.
+        transport: Optional httpx transport (used by tests to mock Azure AI Search).
+
+    Returns:
+        Number of documents successfully uploaded.
+    """
+    result = await upload_document_stream(
+        _as_async_iterable(documents),
+        search_endpoint,
+        search_api_key,
+        batch_size=batch_size,
+        max_batch_bytes=max_batch_bytes,
+        concurrency=concurrency,
+        transport=transport,
+    )
+    return result.uploaded
 
 
 async def sync_knowledge_articles(
@@ -261,9 +879,27 @@ async def sync_knowledge_articles(
     search_api_key: str,
     full_sync: bool = False,
     state_file: str = ".knowledge_sync_state.json",
+    *,
+    manifest_file: str | None = None,
+    upload_concurrency: int = DEFAULT_UPLOAD_CONCURRENCY,
+    removal_check_interval: float = DEFAULT_REMOVAL_CHECK_INTERVAL,
+    embedder: Embedder | None = None,
+    index_config: KnowledgeIndexConfig | None = None,
+    transport: httpx.AsyncBaseTransport | None = None,
 ) -> SyncState:
     """Sync Salesforce Knowledge Articles to Azure AI Search.
 
+    Each page of articles has its bodies fetched and chunked; chunks whose
+    content hash differs from the manifest are embedded and uploaded while
+    later Salesforce pages are still being fetched (see
+    ``upload_document_stream``). Stale chunks are deleted from the index.
+
+    Articles archived, unpublished or superseded never appear in the delta
+    query, so they are found by listing every Online article ID. That costs
+    API calls in proportion to the size of the knowledge base, so it runs on
+    full syncs and otherwise at most once per ``removal_check_interval``;
+    removed articles can stay searchable for up to that long.
+
     Args:
         sf_instance_url: Salesforce instance URL.
         sf_access_token: Salesforce OAuth access token.
@@ -271,66 +907,169 @@ async def sync_knowledge_articles(
         search_api_key: Azure AI Search admin API key.
         full_sync: If True, ignore last sync timestamp and sync all articles.
         state_file: Path to the sync state file.
+        manifest_file: Path to the content-hash manifest. Defaults to a
+                       sqlite file beside ``state_file``.
+        upload_concurrency: Number of upload batches in flight at once.
+        removal_check_interval: Minimum seconds between removed-article checks
+                                on incremental syncs.
+        embedder: Chunk embedding model. Defaults to KNOWLEDGE_EMBEDDING_PROVIDER.
+        index_config: Chunking settings. Defaults to KNOWLEDGE_* environment variables.
+        transport: Optional httpx transport (used by tests to mock Azure AI Search).
 
     Returns:
-        Updated SyncState with sync results.
+        Updated SyncState with sync results; ``total_synced`` counts chunk documents uploaded.
     """
     from shared.salesforce_client import SalesforceClient
 
+    index_config = index_config or load_knowledge_index_config()
+    embedder = embedder or create_embedder(index_config)
     state = _load_sync_state(state_file)
 
     if full_sync:
-        state.last_sync_timestamp = None
+        state.high_water_mark = None
+        state.boundary = {}
         logger.info("Starting full sync of knowledge articles")
     else:
         logger.info(
             "Starting incremental sync since: %s",
-            state.last_sync_timestamp or "beginning",
+            state.high_water_mark or "beginning",
         )
 
     # Ensure search index exists
-    index_ready = await ensure_search_index(search_endpoint, search_api_key)
+    index_ready = await ensure_search_index(
+        search_endpoint, search_api_key, schema=knowledge_index_schema(embedder.dimensions), transport=transport
+    )
     if not index_ready:
-        state.errors.append("Failed to create/verify search index")
+        state.add_error("Failed to create/verify search index")
         _save_sync_state(state, state_file)
         return state
 
-    # Query Salesforce for knowledge articles
+    # Query Salesforce for knowledge articles; dead letters from earlier
+    # runs are re-fetched first (a full sync covers them anyway)
     sf_client = SalesforceClient(
         instance_url=sf_instance_url, access_token=sf_access_token
     )
-    query = _build_soql_query(state.last_sync_timestamp)
+    previous_failures = {} if full_sync else {letter.id: letter for letter in state.dead_letters}
+    replay_queries = _build_replay_queries(letter.source_id for letter in previous_failures.values())
+    delta_query = _build_soql_query(state.high_water_mark)
+    high_water = _HighWaterTracker(state.high_water_mark, state.boundary)
+    manifest = KnowledgeManifest(manifest_file or _manifest_path(state_file))
+    # Vectors from another model or size must not count as unchanged
+    changes = _IndexChanges(manifest, f"{type(embedder).__name__}:{embedder.dimensions}")
+    found = 0
+    started = datetime.now(UTC)
+    check_removals = full_sync or state.removal_check_due(removal_check_interval, started)
+    removals_checked = False
 
+    async def documents() -> AsyncIterator[dict[str, Any]]:
+        nonlocal found, removals_checked
+        seen: set[str] = set()
+        stage = "Salesforce query"
+        try:
+            for query in [*replay_queries, delta_query]:
+                async for records in _iter_chunks_in_thread(sf_client.iter_records(query), SOURCE_CHUNK_SIZE):
+                    articles = []
+                    for record in records:
+                        high_water.observe(record)
+                        if record["Id"] in seen or (query is delta_query and high_water.seen(record)):
+                            continue
+                        seen.add(record["Id"])
+                        articles.append(record)
+                    if not articles:
+                        continue
+                    found += len(articles)
+                    stage = "Article body fetch"
+                    built = await _build_chunk_documents(sf_client, articles, index_config)
+                    stage = "Manifest lookup"
+                    changed, stale = changes.diff(articles, built)
+                    if changed:
+                        stage = "Embedding"
+                        await _embed_documents(changed, embedder)
+                    stage = "Salesforce query"
+                    for doc in [*changed, *stale]:
+                        yield doc
+        except _SOURCE_ERRORS as e:
+            raise _SyncStageError(stage, e) from e
+
+        if not check_removals:
+            return
+        # Articles archived, unpublished or superseded never show up in the delta; find them by absence
+        try:
+            online: set[str] = set()
+            async for records in _iter_chunks_in_thread(
+                sf_client.iter_records(ONLINE_ARTICLE_IDS_QUERY.build()), SOURCE_CHUNK_SIZE
+            ):
+                online.update(record["Id"] for record in records)
+        except SalesforceClientError as e:
+            logger.warning("Skipping deletion of removed articles: %s", e)
+            state.add_error(f"Online article listing failed: {e}")
+            return
+        try:
+            removed = changes.removed(online)
+        except sqlite3.Error as e:
+            raise _SyncStageError("Manifest lookup", e) from e
+        removals_checked = True
+        for doc in removed:
+            yield doc
+
+    # Stream articles from Salesforce straight into the uploaders
     try:
-        results = sf_client.query_all(query)
-    except Exception as e:
-        state.errors.append(f"Salesforce query failed: {e}")
+        result = await upload_document_stream(
+            documents(),
+            search_endpoint,
+            search_api_key,
+            concurrency=upload_concurrency,
+            transport=transport,
+        )
+        changes.commit(result.failed)
+        if removals_checked:
+            state.last_removal_check = started.strftime("%Y-%m-%dT%H:%M:%S.000Z")
+    except (_SyncStageError, httpx.HTTPError, sqlite3.Error) as e:
+        if isinstance(e, _SyncStageError):
+            message = str(e)
+        elif isinstance(e, httpx.HTTPError):
+            message = f"Index upload failed: {e}"
+        else:
+            message = f"Manifest update failed: {e}"
+        logger.error("Knowledge sync aborted: %s", message)
+        state.add_error(message)
         _save_sync_state(state, state_file)
         return state
+    finally:
+        manifest.close()
+        sf_client.close()
+
+    logger.info(
+        "Found %d knowledge articles to sync: %d chunk documents unchanged, %d deleted",
+        found,
+        changes.unchanged,
+        result.deleted,
+    )
 
-    records = results.get("records", [])
-    logger.info("Found %d knowledge articles to sync", len(records))
+    now = datetime.now(UTC).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+    # Replayed articles that no longer match the query (archived, superseded) drop out here
+    for letter in result.failed:
+        if letter.id in previous_failures:
+            letter.attempts += previous_failures[letter.id].attempts
+        letter.failed_at = now
+    state.dead_letters = result.failed
+    if result.failed:
+        logger.warning("%d documents failed to index; they will be retried next run", len(result.failed))
 
-    if not records:
+    if not found:
         _save_sync_state(state, state_file)
         return state
 
-    # Transform and upload
-    documents = [_transform_article_to_document(r) for r in records]
-    uploaded = await upload_documents(
-        documents, search_endpoint, search_api_key
-    )
-
-    # Update state
-    state.total_synced += uploaded
-    state.last_sync_timestamp = datetime.now(UTC).strftime(
-        "%Y-%m-%dT%H:%M:%S.000Z"
-    )
+    # Update state; failed documents are dead-lettered, so the mark can move past them
+    state.total_synced += result.uploaded
+    state.last_sync_timestamp = now
+    high_water.advance(state)
 
     _save_sync_state(state, state_file)
     logger.info(
-        "Sync complete: %d articles uploaded, %d total synced",
-        uploaded,
+        "Sync complete: %d articles, %d chunk documents uploaded, %d total synced",
+        found,
+        result.uploaded,
         state.total_synced,
     )
 
@@ -0,0 +1,219 @@
+"""Precompiled mappers from raw Salesforce records to tool output dicts.
+
+Tools return plain dicts shaped like the response models in shared/models.py.
+Building a Pydantic model per record only to ``model_dump()`` it straight
+back dominates CPU for list-heavy tools, so a RecordMapper goes from the
+record to the same dict directly. Field sources and type conversions are
+resolved once, when the mapper is built, from the model's annotations:
+
+    ACCOUNT_MAPPER = RecordMapper(AccountSummary, {"id": "Id", "owner_name": "Owner.Name"})
+    ACCOUNT_MAPPER(record)   # {"id": "001...", "name": None, ..., "owner_name": "Jane"}
+
+Set MCP_STRICT_OUTPUT=true (tests, debugging) to also validate every mapped
+record against its model; output then matches ``model_dump()`` exactly or
+raises ``pydantic.ValidationError``.
+
+Without strict mode nothing is validated: numeric fields are coerced from
+ints and numeric strings, date/datetime fields from ISO strings, and any
+other value, including None for a required field or a string that does
+not parse, passes through unchanged.
+"""
+
+from __future__ import annotations
+
+import os
+import types
+import typing
+from collections.abc import Callable, Iterable, Mapping
+from datetime import date, datetime
+from typing import Any, Generic, TypeVar
+
+from pydantic import BaseModel
+
+from shared.records import CompactRecord, record_type_for
+
+M = TypeVar("M", bound=BaseModel)
+
+Record = dict[str, Any]
+# A field source: a record path ("Owner.Name"), a (path, default) pair used
+# when the value is missing, or a function of the whole record.
+Source = str | tuple[str, Any] | Callable[[Record], Any]
+
+
+def strict_output_enabled() -> bool:
+    """Whether mapped records are validated against their models (MCP_STRICT_OUTPUT)."""
+    return os.environ.get("MCP_STRICT_OUTPUT", "false").lower() in ("1", "true", "yes")
+
+
+def _path_getter(path: str, default: Any = None) -> Callable[[Record], Any]:
+    """Compile a dotted record path into a getter; relationship hops tolerate null parents."""
+    head, *rest = path.split(".")
+    if not rest:
+        return lambda record: record.get(head, default)
+
+    def get(record: Record) -> Any:
+        value: Any = record.get(head)
+        for key in rest:
+            if not isinstance(value, dict):
+                return default
+            value = value.get(key, default)
+        return value
+
+    return get
+
+
+def _to_float(value: Any) -> Any:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return value
+    return value
+
+
+def _to_int(value: Any) -> Any:
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            return value
+    return value
+
+
+def _to_date(value: Any) -> Any:
+    return date.fromisoformat(value) if isinstance(value, str) and value else value
+
+
+def _to_datetime(value: Any) -> Any:
+    return datetime.fromisoformat(value) if isinstance(value, str) and value else value
+
+
+_CONVERTERS: dict[Any, Callable[[Any], Any]] = {
+    float: _to_float,
+    int: _to_int,
+    date: _to_date,
+    datetime: _to_datetime,
+}
+
+
+def _converter_for(annotation: Any) -> Callable[[Any], Any] | None:
+    """Pick the coercion Pydantic would apply for a field type; None means pass through."""
+    if typing.get_origin(annotation) in (typing.Union, types.UnionType):
+        args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+        annotation = args[0] if len(args) == 1 else None
+    return _CONVERTERS.get(annotation)
+
+
+def _constant(value: Any) -> Callable[[Record], Any]:
+    """A field step that always yields ``value``."""
+
+    def get(_: Record) -> Any:
+        return value
+
+    return get
+
+
+def _from_factory(factory: Callable[[], Any]) -> Callable[[Record], Any]:
+    """A field step that calls ``factory`` per record, so mutable defaults are not shared."""
+
+    def get(_: Record) -> Any:
+        return factory()
+
+    return get
+
+
+def _compile_field(source: Source, annotation: Any) -> Callable[[Record], Any]:
+    if callable(source):
+        return source
+    getter = _path_getter(*source) if isinstance(source, tuple) else _path_getter(source)
+    convert = _converter_for(annotation)
+    if convert is None:
+        return getter
+    return lambda record: convert(getter(record))
+
+
+class RecordMapper(Generic[M]):
+    """Maps raw Salesforce records straight to ``model.model_dump()``-shaped dicts.
+
+    Model fields without a source get the model default (default factories
+    are called per record, so mutable defaults are not shared).
+    """
+
+    def __init__(self, model: type[M], sources: Mapping[str, Source], *, strict: bool | None = None) -> None:
+        """Compile the mapper.
+
+        Args:
+            model: Response model whose dump shape the output follows.
+            sources: Output field name -> where to read it from the record.
+            strict: Validate every record against the model. Defaults to MCP_STRICT_OUTPUT.
+
+        Raises:
+            ValueError: If a source names a field the model does not have, or a
+                required field has no source.
+        """
+        unknown = set(sources) - set(model.model_fields)
+        if unknown:
+            raise ValueError(f"{model.__name__} has no fields {sorted(unknown)}")
+
+        steps: list[tuple[str, Callable[[Record], Any]]] = []
+        for name, info in model.model_fields.items():
+            if name in sources:
+                steps.append((name, _compile_field(sources[name], info.annotation)))
+            elif info.is_required():
+                raise ValueError(f"{model.__name__}.{name} is required but has no source")
+            elif info.default_factory is not None:
+                steps.append((name, _from_factory(info.default_factory)))  # type: ignore[arg-type]
+            else:
+                steps.append((name, _constant(info.default)))
+
+        self._model = model
+        self._sources = dict(sources)
+        self._steps = tuple(steps)
+        self._strict = strict
+
+    @property
+    def model(self) -> type[M]:
+        """Response model this mapper follows."""
+        return self._model
+
+    @property
+    def sources(self) -> dict[str, Source]:
+        """Field sources this mapper was built from, for deriving variants."""
+        return dict(self._sources)
+
+    def __call__(self, record: Record, **overrides: Any) -> dict[str, Any]:
+        """Map one record; keyword arguments override mapped fields."""
+        out = {name: get(record) for name, get in self._steps}
+        if overrides:
+            out.update(overrides)
+        if self._strict if self._strict is not None else strict_output_enabled():
+            return self._model.model_validate(out).model_dump()
+        return out
+
+    def many(self, records: Iterable[Record]) -> list[dict[str, Any]]:
+        """Map a batch of records."""
+        strict = self._strict if self._strict is not None else strict_output_enabled()
+        steps = self._steps
+        rows = [{name: get(record) for name, get in steps} for record in records]
+        if strict:
+            return [self._model.model_validate(row).model_dump() for row in rows]
+        return rows
+
+    def records(self, records: Iterable[Record]) -> list[CompactRecord[M]]:
+        """Map a batch of records to compact slotted records (see shared/records.py).
+
+        Raises:
+            ValueError: If the model has no compact record type.
+        """
+        record_type = record_type_for(self._model)
+        strict = self._strict if self._strict is not None else strict_output_enabled()
+        if strict:
+            return [record_type.from_model(self._model.model_validate(row)) for row in self.many(records)]
+        getters = [get for _, get in self._steps]
+        return [record_type(*[get(record) for get in getters]) for record in records]
@@ -59,6 +59,8 @@ class PipelineSummary(BaseModel):
         description="Stage -> {count, value}"
     )
     at_risk_deals: list[OpportunitySummary]
+    total_at_risk: int = Field(default=0, description="At-risk deals in scope, including any not listed")
+    at_risk_has_more: bool = Field(default=False, description="True when at_risk_deals was capped")
     owner_breakdown: dict[str, dict[str, str | int | float]] | None = None
 
 
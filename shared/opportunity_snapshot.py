@@ -0,0 +1,391 @@
+"""Local columnar snapshot of open Opportunities, maintained from deltas.
+
+Portfolio-wide tools (pipeline summary, activity gaps, opportunity lists)
+would otherwise re-query Salesforce on every call. With the snapshot
+enabled (SF_OPP_SNAPSHOT_ENABLED=true), the first call loads every open
+Opportunity the user can see. After that, each refresh asks only for rows
+whose ``SystemModstamp`` moved past the high-water mark, including deleted
+rows via queryAll. Rows that closed or were deleted are dropped and the
+rest are upserted. Reads are NumPy masks over columns rebuilt after each
+change, so a whole-org summary takes milliseconds.
+
+Snapshots are kept per user, because record visibility follows each user's
+sharing rules. A snapshot is refreshed once it is older than
+``refresh_seconds``. If that refresh fails and the snapshot is older than
+``max_staleness_seconds``, ``view()`` returns None and the tools fall back
+to live SOQL.
+
+User fields (owner name, manager, active flag) change without touching
+the Opportunity's SystemModstamp. So they can lag until the deal itself is
+next modified, or until the snapshot is rebuilt.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+import numpy.typing as npt
+
+from shared.config import OpportunitySnapshotConfig, RiskThresholds, load_opportunity_snapshot_config
+from shared.risk_engine import OpportunityColumns, score_columns
+from shared.salesforce_client import SalesforceClientError
+from shared.soql import SoqlQuery, eq, gte
+from shared.telemetry import increment_counter
+
+if TYPE_CHECKING:
+    from shared.async_salesforce_client import AsyncSalesforceClient
+    from shared.salesforce_client import SalesforceClient
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FIELDS = (
+    "Id, Name, Amount, StageName, CloseDate, Probability, Owner.Name, Account.Name, LastActivityDate, "
+    "OwnerId, AccountId, IsClosed, IsDeleted, SystemModstamp, Owner.ManagerId, Owner.IsActive"
+)
+SNAPSHOT_QUERY = SoqlQuery("Opportunity").select(SNAPSHOT_FIELDS)
+OPEN_OPPORTUNITIES_QUERY = SNAPSHOT_QUERY.where(eq("IsClosed", False))
+
+# How far behind the refresh start the high-water mark is held (see _apply)
+HIGH_WATER_OVERLAP = timedelta(minutes=1)
+
+Record = dict[str, Any]
+
+
+def _owner(record: Record) -> dict[str, Any]:
+    owner = record.get("Owner")
+    return owner if isinstance(owner, dict) else {}
+
+
+def _id15(record_id: str | None) -> str:
+    """Case-sensitive 15-character form of a Salesforce ID, so 15- and 18-character IDs compare equal."""
+    return (record_id or "")[:15]
+
+
+def _codes(values: Iterable[str]) -> tuple[npt.NDArray[np.intp], list[str]]:
+    """Integer-code a column; returns (codes, distinct values in code order)."""
+    index: dict[str, int] = {}
+    codes = np.fromiter((index.setdefault(value, len(index)) for value in values), dtype=np.intp)
+    return codes, list(index)
+
+
+@dataclass(frozen=True)
+class SnapshotView:
+    """Immutable columnar view of the snapshot at one point in time.
+
+    ``records`` are the raw Salesforce records, ordered by CloseDate then Id,
+    and every column is aligned with them. ID columns hold 15-character IDs.
+    Query methods return raw records, which callers map exactly as they map
+    live query results.
+    """
+
+    records: list[Record]
+    risk: OpportunityColumns
+    owner_code: npt.NDArray[np.intp]
+    owner_ids: list[str]
+    owner_names: list[str | None]
+    account_id: npt.NDArray[np.str_]
+    manager_id: npt.NDArray[np.str_]
+    owner_active: npt.NDArray[np.bool_]
+
+    @classmethod
+    def build(cls, records: Iterable[Record]) -> SnapshotView:
+        """Build the columns from raw records."""
+        rows = sorted(records, key=lambda r: (r.get("CloseDate") or "", r["Id"]))
+        owner_code, owner_ids = _codes(_id15(r.get("OwnerId")) for r in rows)
+        owner_names: list[str | None] = [None] * len(owner_ids)
+        for code, row in zip(owner_code.tolist(), rows, strict=True):
+            if owner_names[code] is None:
+                owner_names[code] = _owner(row).get("Name")
+        return cls(
+            records=rows,
+            risk=OpportunityColumns.from_arrays(
+                close_date=[r.get("CloseDate") for r in rows],
+                last_activity_date=[r.get("LastActivityDate") for r in rows],
+                probability=[r.get("Probability") for r in rows],
+                amount=[r.get("Amount") for r in rows],
+                stage=[r.get("StageName") or "" for r in rows],
+            ),
+            owner_code=owner_code,
+            owner_ids=owner_ids,
+            owner_names=owner_names,
+            account_id=np.array([_id15(r.get("AccountId")) for r in rows], dtype=str),
+            manager_id=np.array([_id15(_owner(r).get("ManagerId")) for r in rows], dtype=str),
+            owner_active=np.array([bool(_owner(r).get("IsActive")) for r in rows], dtype=bool),
+        )
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def _take(self, mask: npt.NDArray[np.bool_], limit: int | None = None) -> list[Record]:
+        return [self.records[i] for i in np.flatnonzero(mask)[:limit].tolist()]
+
+    def scope(self, owner_id: str | None = None, manager_id: str | None = None) -> npt.NDArray[np.bool_]:
+        """Deals owned by ``owner_id``, or by ``manager_id``'s active direct reports, or all deals."""
+        if owner_id:
+            try:
+                owned: npt.NDArray[np.bool_] = self.owner_code == self.owner_ids.index(_id15(owner_id))
+            except ValueError:
+                return np.zeros(len(self), dtype=bool)
+            return owned
+        if manager_id:
+            mask: npt.NDArray[np.bool_] = (self.manager_id == _id15(manager_id)) & self.owner_active
+            return mask
+        return np.ones(len(self), dtype=bool)
+
+    def opportunities(
+        self,
+        *,
+        owner_id: str | None = None,
+        account_id: str | None = None,
+        stage: str | None = None,
+        close_date_from: date | None = None,
+        close_date_to: date | None = None,
+        limit: int | None = None,
+    ) -> list[Record]:
+        """Open deals matching the filters, by close date."""
+        mask = self.scope(owner_id)
+        if account_id:
+            mask &= self.account_id == _id15(account_id)
+        if stage:
+            names = self.risk.stage_names
+            if stage not in names:
+                return []
+            mask &= self.risk.stage_code == names.index(stage)
+        if close_date_from:
+            mask &= self.risk.close_date >= np.datetime64(close_date_from, "D")
+        if close_date_to:
+            mask &= self.risk.close_date <= np.datetime64(close_date_to, "D")
+        return self._take(mask, limit)
+
+    def pipeline(
+        self,
+        thresholds: RiskThresholds,
+        *,
+        owner_id: str | None = None,
+        manager_id: str | None = None,
+        today: date | None = None,
+    ) -> tuple[list[Record], list[Record]]:
+        """Stage/owner aggregate rows and at-risk candidates, shaped like the live pipeline queries.
+
+        Group rows carry ``stage``, ``ownerId``, ``ownerName``, ``dealCount``
+        and ``totalValue`` as the aggregate SOQL returns them; candidates are
+        the deals the engine flags that meet ``minimum_amount_for_risk``.
+        """
+        mask = self.scope(owner_id, manager_id)
+        index = np.flatnonzero(mask)
+        n_owners = max(len(self.owner_ids), 1)
+        keys = self.risk.stage_code[index] * n_owners + self.owner_code[index]
+        group_keys, inverse = np.unique(keys, return_inverse=True)
+        counts = np.bincount(inverse, minlength=len(group_keys))
+        amounts = np.nan_to_num(self.risk.amount[index])
+        values = np.bincount(inverse, weights=amounts, minlength=len(group_keys))
+        groups = [
+            {
+                "stage": self.risk.stage_names[key // n_owners],
+                "ownerId": self.owner_ids[key % n_owners],
+                "ownerName": self.owner_names[key % n_owners],
+                "dealCount": count,
+                "totalValue": value,
+            }
+            for key, count, value in zip(group_keys.tolist(), counts.tolist(), values.tolist(), strict=True)
+        ]
+
+        scores = score_columns(self.risk, thresholds, today)
+        candidates = mask & scores.at_risk
+        if thresholds.minimum_amount_for_risk > 0:
+            candidates &= scores.meets_minimum_amount
+        return groups, self._take(candidates)
+
+    def activity_gap_candidates(
+        self,
+        threshold_days: int,
+        *,
+        owner_id: str | None = None,
+        today: date | None = None,
+    ) -> list[Record]:
+        """Deals that are overdue, inactive beyond ``threshold_days``, or closing within a week."""
+        scores = score_columns(self.risk, RiskThresholds(), today)
+        # Overdue deals have negative days to close, so one bound covers both buckets
+        gaps = (scores.days_to_close <= 7) | ~scores.has_activity | (scores.days_since_activity > threshold_days)
+        return self._take(self.scope(owner_id) & gaps)
+
+
+class OpportunitySnapshot:
+    """One user's snapshot of open Opportunities, refreshed from SystemModstamp deltas."""
+
+    def __init__(
+        self,
+        config: OpportunitySnapshotConfig | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize an empty snapshot; the first ``view()`` or ``refresh()`` loads it.
+
+        Args:
+            config: Refresh and staleness settings. Defaults to SF_OPP_SNAPSHOT_* variables.
+            clock: Monotonic time source, injectable for tests.
+        """
+        self._config = config or load_opportunity_snapshot_config()
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._refreshing = threading.Lock()
+        self._records: dict[str, Record] = {}
+        self._high_water: datetime | None = None
+        self._refreshed_at: float | None = None
+        self._view: SnapshotView | None = None
+
+    def age_seconds(self) -> float | None:
+        """Seconds since the last successful refresh, or None before the first."""
+        refreshed_at = self._refreshed_at
+        return None if refreshed_at is None else self._clock() - refreshed_at
+
+    def _delta_soql(self) -> tuple[str, bool]:
+        """Return the SOQL for the next refresh and whether it must include deleted rows."""
+        if self._high_water is None:
+            return OPEN_OPPORTUNITIES_QUERY.build(), False
+        # >= because the literal has whole seconds; re-reading a row is harmless
+        return SNAPSHOT_QUERY.where(gte("SystemModstamp", self._high_water)).build(), True
+
+    def _apply(self, rows: Iterable[Record], started: datetime) -> int:
+        """Merge fetched rows into the snapshot; returns how many rows were seen.
+
+        The new high-water mark is the newest SystemModstamp seen, but never
+        later than the refresh start less HIGH_WATER_OVERLAP: a row changed
+        while earlier pages were being read may carry an older stamp than
+        rows read after it.
+        """
+        seen = 0
+        newest: str | None = None
+        with self._lock:
+            for row in rows:
+                seen += 1
+                if row.get("IsDeleted") or row.get("IsClosed"):
+                    self._records.pop(row["Id"], None)
+                else:
+                    self._records[row["Id"]] = row
+                stamp = row.get("SystemModstamp")
+                if stamp and (newest is None or stamp > newest):
+                    newest = stamp
+            if newest is not None:
+                self._high_water = min(datetime.fromisoformat(newest), started - HIGH_WATER_OVERLAP)
+            if seen or self._view is None:
+                self._view = SnapshotView.build(self._records.values())
+            self._refreshed_at = self._clock()
+        return seen
+
+    def refresh(self, sf: SalesforceClient) -> int:
+        """Load the snapshot, or apply changes since the last refresh.
+
+        Returns:
+            Number of rows fetched.
+
+        Raises:
+            SalesforceClientError: If the query fails; the snapshot is unchanged.
+        """
+        started = datetime.now(UTC)
+        soql, include_deleted = self._delta_soql()
+        rows = list(sf.iter_query(soql, include_deleted=include_deleted))
+        return self._apply(rows, started)
+
+    async def refresh_async(self, sf: AsyncSalesforceClient) -> int:
+        """Async counterpart of ``refresh``."""
+        started = datetime.now(UTC)
+        soql, include_deleted = self._delta_soql()
+        rows = [row async for row in sf.iter_query(soql, include_deleted=include_deleted)]
+        return self._apply(rows, started)
+
+    def _due(self) -> bool:
+        age = self.age_seconds()
+        return age is None or age >= self._config.refresh_seconds
+
+    def _current_or_none(self) -> SnapshotView | None:
+        """The current view if it is within the staleness bound, else None."""
+        age = self.age_seconds()
+        if age is not None and age <= self._config.max_staleness_seconds:
+            increment_counter("salesforce.snapshot.hits")
+            return self._view
+        increment_counter("salesforce.snapshot.fallback")
+        return None
+
+    def view(self, sf: SalesforceClient) -> SnapshotView | None:
+        """Return a current view, refreshing first if due; None means use live SOQL.
+
+        While another caller is refreshing, the current view is served if it
+        is within the staleness bound.
+        """
+        if not self._due():
+            increment_counter("salesforce.snapshot.hits")
+            return self._view
+        if not self._refreshing.acquire(blocking=False):
+            return self._current_or_none()
+        try:
+            self.refresh(sf)
+        except SalesforceClientError as e:
+            logger.warning("Opportunity snapshot refresh failed: %s", e.message)
+            return self._current_or_none()
+        finally:
+            self._refreshing.release()
+        increment_counter("salesforce.snapshot.hits")
+        return self._view
+
+    async def view_async(self, sf: AsyncSalesforceClient) -> SnapshotView | None:
+        """Async counterpart of ``view``."""
+        if not self._due():
+            increment_counter("salesforce.snapshot.hits")
+            return self._view
+        if not self._refreshing.acquire(blocking=False):
+            return self._current_or_none()
+        try:
+            await self.refresh_async(sf)
+        except SalesforceClientError as e:
+            logger.warning("Opportunity snapshot refresh failed: %s", e.message)
+            return self._current_or_none()
+        finally:
+            self._refreshing.release()
+        increment_counter("salesforce.snapshot.hits")
+        return self._view
+
+    def stats(self) -> dict[str, Any]:
+        """Size, age and high-water mark, for the metrics endpoint."""
+        return {
+            "records": len(self._records),
+            "age_seconds": self.age_seconds(),
+            "high_water": self._high_water.isoformat() if self._high_water else None,
+        }
+
+
+_snapshots: OrderedDict[tuple[str, str], OpportunitySnapshot] = OrderedDict()
+_snapshots_lock = threading.Lock()
+
+
+def get_opportunity_snapshot(sf: SalesforceClient | AsyncSalesforceClient) -> OpportunitySnapshot | None:
+    """Return the snapshot for the client's org and user, or None when snapshots are disabled.
+
+    The least recently used snapshot is dropped beyond SF_OPP_SNAPSHOT_MAX_SNAPSHOTS.
+    """
+    config = load_opportunity_snapshot_config()
+    if not config.enabled:
+        return None
+    key = (sf.instance_url.rstrip("/"), sf.user_key)
+    with _snapshots_lock:
+        snapshot = _snapshots.get(key)
+        if snapshot is None:
+            snapshot = _snapshots[key] = OpportunitySnapshot(config)
+            while len(_snapshots) > max(config.max_snapshots, 1):
+                _snapshots.popitem(last=False)
+        else:
+            _snapshots.move_to_end(key)
+        return snapshot
+
+
+def snapshot_stats() -> list[dict[str, Any]]:
+    """Stats for every live snapshot (users are not identified)."""
+    with _snapshots_lock:
+        return [snapshot.stats() for snapshot in _snapshots.values()]
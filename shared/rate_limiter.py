@@ -0,0 +1,282 @@
+"""Client-side request governor for Salesforce API calls.
+
+Combines a token bucket (sustained rate + burst) with a max-in-flight limit,
+applied at two scopes — the whole org and each individual user — so a burst
+of agent tool calls is smoothed out before it reaches Salesforce instead of
+tripping the org's concurrent-request cap. Excess requests queue for a
+bounded time; when the queue is full or the wait expires the caller gets the
+standard RATE_LIMIT_EXCEEDED error.
+
+One governor is shared by the sync and async clients, so both draw from the
+same budgets.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+from shared.config import RateLimitConfig, load_rate_limit_config
+from shared.salesforce_client import SalesforceClientError
+from shared.telemetry import record_metric
+
+logger = logging.getLogger(__name__)
+
+# Async waiters poll at most this often while blocked on an in-flight slot
+_ASYNC_POLL_SECONDS = 0.05
+
+# Idle per-user scopes are pruned once this many are tracked
+_MAX_TRACKED_SCOPES = 10_000
+
+
+@dataclass
+class _Scope:
+    """Token bucket and in-flight counter for one org or user."""
+
+    rate: float
+    capacity: int
+    max_in_flight: int
+    tokens: float = 0.0
+    updated_at: float = field(default_factory=time.monotonic)
+    in_flight: int = 0
+
+    def __post_init__(self) -> None:
+        self.tokens = float(self.capacity)
+
+    def refill(self, now: float) -> None:
+        elapsed = max(now - self.updated_at, 0.0)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated_at = max(now, self.updated_at)
+
+    def wait_hint(self) -> float:
+        """Seconds until this scope could admit a request (0 if it can now)."""
+        if self.in_flight >= self.max_in_flight:
+            return _ASYNC_POLL_SECONDS
+        if self.tokens < 1:
+            return (1 - self.tokens) / self.rate if self.rate > 0 else _ASYNC_POLL_SECONDS
+        return 0.0
+
+    @property
+    def idle(self) -> bool:
+        return self.in_flight == 0 and self.tokens >= self.capacity
+
+
+@dataclass
+class GovernorMetrics:
+    """Counters exposed for replica sizing."""
+
+    queue_depth: int = 0
+    max_queue_depth_seen: int = 0
+    admitted: int = 0
+    queued: int = 0
+    rejected_queue_full: int = 0
+    rejected_timeout: int = 0
+    total_wait_seconds: float = 0.0
+    max_wait_seconds_seen: float = 0.0
+
+
+class RequestGovernor:
+    """Token-bucket plus max-in-flight limiter keyed by org and user."""
+
+    def __init__(self, config: RateLimitConfig | None = None) -> None:
+        """Initialize the governor.
+
+        Args:
+            config: Governor settings. Defaults to values from SF_RATE_* env vars.
+        """
+        self._config = config or load_rate_limit_config()
+        self._orgs: dict[str, _Scope] = {}
+        self._users: dict[str, _Scope] = {}
+        self._metrics = GovernorMetrics()
+        self._cond = threading.Condition()
+
+    @property
+    def config(self) -> RateLimitConfig:
+        """Governor settings."""
+        return self._config
+
+    @contextmanager
+    def slot(self, org_key: str, user_key: str) -> Iterator[None]:
+        """Hold an org and user slot for the duration of one Salesforce request.
+
+        Blocks the calling thread while queued.
+
+        Raises:
+            SalesforceClientError: RATE_LIMIT_EXCEEDED if the queue is full or
+                the wait exceeds max_wait_seconds.
+        """
+        if not self._config.enabled:
+            yield
+            return
+
+        started = time.monotonic()
+        with self._cond:
+            hint = self._try_admit(org_key, user_key)
+            queued = bool(hint)
+            if queued:
+                self._enqueue(org_key)
+                try:
+                    while hint:
+                        remaining = self._remaining_wait(started)
+                        if remaining <= 0:
+                            self._reject_timeout(org_key, started)
+                        self._cond.wait(min(hint, remaining))
+                        hint = self._try_admit(org_key, user_key)
+                finally:
+                    self._dequeue()
+            self._record_admit(started, queued)
+
+        try:
+            yield
+        finally:
+            self._release(org_key, user_key)
+
+    @asynccontextmanager
+    async def slot_async(self, org_key: str, user_key: str) -> AsyncIterator[None]:
+        """Async counterpart of ``slot`` that yields to the event loop while queued."""
+        if not self._config.enabled:
+            yield
+            return
+
+        started = time.monotonic()
+        with self._cond:
+            hint = self._try_admit(org_key, user_key)
+            queued = bool(hint)
+            if queued:
+                self._enqueue(org_key)
+        try:
+            while hint:
+                remaining = self._remaining_wait(started)
+                if remaining <= 0:
+                    with self._cond:
+                        self._reject_timeout(org_key, started)
+                await asyncio.sleep(min(hint, remaining, _ASYNC_POLL_SECONDS))
+                with self._cond:
+                    hint = self._try_admit(org_key, user_key)
+                    if not hint:
+                        self._dequeue()
+        except BaseException:
+            if hint:
+                with self._cond:
+                    self._dequeue()
+            raise
+        with self._cond:
+            self._record_admit(started, queued)
+
+        try:
+            yield
+        finally:
+            self._release(org_key, user_key)
+
+    def metrics(self) -> dict[str, Any]:
+        """Return a snapshot of queue and wait-time metrics."""
+        with self._cond:
+            m = self._metrics
+            return {
+                "queue_depth": m.queue_depth,
+                "max_queue_depth_seen": m.max_queue_depth_seen,
+                "admitted": m.admitted,
+                "queued": m.queued,
+                "rejected_queue_full": m.rejected_queue_full,
+                "rejected_timeout": m.rejected_timeout,
+                "avg_wait_ms": round(m.total_wait_seconds / m.queued * 1000, 1) if m.queued else 0.0,
+                "max_wait_ms": round(m.max_wait_seconds_seen * 1000, 1),
+                "in_flight": {org: scope.in_flight for org, scope in self._orgs.items()},
+            }
+
+    # --- internals (caller holds self._cond) ---
+
+    def _scope(self, scopes: dict[str, _Scope], key: str, *, user: bool) -> _Scope:
+        scope = scopes.get(key)
+        if scope is None:
+            if len(scopes) >= _MAX_TRACKED_SCOPES:
+                for stale in [k for k, s in scopes.items() if s.idle]:
+                    del scopes[stale]
+            c = self._config
+            scope = scopes[key] = _Scope(
+                rate=c.user_requests_per_second if user else c.org_requests_per_second,
+                capacity=c.user_burst if user else c.org_burst,
+                max_in_flight=c.user_max_in_flight if user else c.org_max_in_flight,
+            )
+        return scope
+
+    def _try_admit(self, org_key: str, user_key: str) -> float:
+        """Take a token and slot from both scopes, or return how long to wait."""
+        now = time.monotonic()
+        org = self._scope(self._orgs, org_key, user=False)
+        user = self._scope(self._users, f"{org_key}|{user_key}", user=True)
+        org.refill(now)
+        user.refill(now)
+        hint = max(org.wait_hint(), user.wait_hint())
+        if hint:
+            return hint
+        org.tokens -= 1
+        user.tokens -= 1
+        org.in_flight += 1
+        user.in_flight += 1
+        return 0.0
+
+    def _release(self, org_key: str, user_key: str) -> None:
+        with self._cond:
+            self._orgs[org_key].in_flight -= 1
+            self._users[f"{org_key}|{user_key}"].in_flight -= 1
+            self._cond.notify_all()
+
+    def _enqueue(self, org_key: str) -> None:
+        m = self._metrics
+        if m.queue_depth >= self._config.max_queue_depth:
+            m.rejected_queue_full += 1
+            record_metric("salesforce.governor.rejected", 1, {"reason": "queue_full"})
+            raise SalesforceClientError(
+                "RATE_LIMIT_EXCEEDED",
+                "Too many Salesforce requests are queued. Please try again shortly.",
+                {"org": org_key, "queue_depth": m.queue_depth, "max_queue_depth": self._config.max_queue_depth},
+            )
+        m.queue_depth += 1
+        m.queued += 1
+        m.max_queue_depth_seen = max(m.max_queue_depth_seen, m.queue_depth)
+        record_metric("salesforce.governor.queue_depth", m.queue_depth)
+
+    def _dequeue(self) -> None:
+        self._metrics.queue_depth -= 1
+
+    def _remaining_wait(self, started: float) -> float:
+        return self._config.max_wait_seconds - (time.monotonic() - started)
+
+    def _reject_timeout(self, org_key: str, started: float) -> None:
+        self._metrics.rejected_timeout += 1
+        record_metric("salesforce.governor.rejected", 1, {"reason": "timeout"})
+        raise SalesforceClientError(
+            "RATE_LIMIT_EXCEEDED",
+            "Timed out waiting for Salesforce request capacity. Please try again shortly.",
+            {"org": org_key, "waited_seconds": round(time.monotonic() - started, 3)},
+        )
+
+    def _record_admit(self, started: float, queued: bool) -> None:
+        m = self._metrics
+        m.admitted += 1
+        if queued:
+            waited = time.monotonic() - started
+            m.total_wait_seconds += waited
+            m.max_wait_seconds_seen = max(m.max_wait_seconds_seen, waited)
+            record_metric("salesforce.governor.wait_ms", waited * 1000)
+
+
+_governor: RequestGovernor | None = None
+_governor_lock = threading.Lock()
+
+
+def get_governor() -> RequestGovernor:
+    """Return the process-wide request governor, creating it on first use."""
+    global _governor
+    if _governor is None:
+        with _governor_lock:
+            if _governor is None:
+                _governor = RequestGovernor()
+    return _governor
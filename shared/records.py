@@ -0,0 +1,214 @@
+"""Compact record types mirroring the response models in shared/models.py.
+
+A Pydantic model instance carries a ``__dict__``, a fields-set and its
+validator state; holding thousands of them (a pipeline scan, a knowledge
+sync run) costs several times the memory of the values themselves. The
+types here are ``__slots__`` dataclasses with the same fields in the same
+order, for bulk in-process use. Convert at the boundary:
+
+    record = OpportunityRecord.from_model(summary)
+    record.to_model()    # validated OpportunitySummary
+    record.to_dict()     # same shape as summary.model_dump()
+
+Records skip validation; build them with ``RecordMapper.records()`` or
+``from_model()`` rather than by hand.
+"""
+
+from __future__ import annotations
+
+import datetime as _dt
+from dataclasses import dataclass, fields
+from typing import Any, ClassVar, Generic, TypeVar
+
+from pydantic import BaseModel
+
+from shared.models import (
+    AccountSummary,
+    ActivitySummary,
+    CaseSummary,
+    ContactSummary,
+    KnowledgeArticle,
+    LeadSummary,
+    OpportunitySummary,
+    TeamMember,
+)
+
+M = TypeVar("M", bound=BaseModel)
+R = TypeVar("R", bound="CompactRecord[Any]")
+
+
+class CompactRecord(Generic[M]):
+    """Base for slotted records; ``model`` is the Pydantic model they mirror."""
+
+    __slots__ = ()
+    model: ClassVar[type[BaseModel]]
+
+    @classmethod
+    def field_names(cls) -> tuple[str, ...]:
+        """Field names, in model order."""
+        return tuple(f.name for f in fields(cls))  # type: ignore[arg-type]
+
+    @classmethod
+    def from_model(cls: type[R], instance: BaseModel) -> R:
+        """Copy a model instance into a record."""
+        return cls(*(getattr(instance, name) for name in cls.field_names()))
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the record as a ``model_dump()``-shaped dict."""
+        return {name: getattr(self, name) for name in self.field_names()}
+
+    def to_model(self) -> M:
+        """Validate the record into its Pydantic model."""
+        instance: M = self.model.model_validate(self.to_dict())  # type: ignore[assignment]
+        return instance
+
+
+@dataclass(slots=True)
+class AccountRecord(CompactRecord[AccountSummary]):
+    """Compact AccountSummary."""
+
+    model: ClassVar[type[BaseModel]] = AccountSummary
+
+    id: str
+    name: str
+    industry: str | None
+    type: str | None
+    annual_revenue: float | None
+    billing_city: str | None
+    billing_state: str | None
+    owner_name: str | None
+    description: str | None
+
+
+@dataclass(slots=True)
+class ContactRecord(CompactRecord[ContactSummary]):
+    """Compact ContactSummary."""
+
+    model: ClassVar[type[BaseModel]] = ContactSummary
+
+    id: str
+    name: str
+    title: str | None
+    email: str | None
+    phone: str | None
+    role: str | None
+
+
+@dataclass(slots=True)
+class OpportunityRecord(CompactRecord[OpportunitySummary]):
+    """Compact OpportunitySummary."""
+
+    model: ClassVar[type[BaseModel]] = OpportunitySummary
+
+    id: str
+    name: str
+    amount: float | None
+    stage: str
+    close_date: _dt.date
+    probability: float | None
+    owner_name: str | None
+    account_name: str | None
+    last_activity_date: _dt.date | None
+    risk_flags: list[str]
+
+
+@dataclass(slots=True)
+class CaseRecord(CompactRecord[CaseSummary]):
+    """Compact CaseSummary."""
+
+    model: ClassVar[type[BaseModel]] = CaseSummary
+
+    id: str
+    case_number: str
+    subject: str
+    description: str | None
+    status: str
+    priority: str
+    type: str | None
+    created_date: _dt.datetime
+    owner_name: str | None
+    account_name: str | None
+    recent_comments: list[str]
+
+
+@dataclass(slots=True)
+class KnowledgeArticleRecord(CompactRecord[KnowledgeArticle]):
+    """Compact KnowledgeArticle."""
+
+    model: ClassVar[type[BaseModel]] = KnowledgeArticle
+
+    id: str
+    title: str
+    summary: str | None
+    url_name: str | None
+    last_published: _dt.datetime | None
+    article_type: str | None
+    body: str | None
+
+
+@dataclass(slots=True)
+class ActivityRecord(CompactRecord[ActivitySummary]):
+    """Compact ActivitySummary."""
+
+    model: ClassVar[type[BaseModel]] = ActivitySummary
+
+    id: str
+    type: str
+    subject: str
+    date: _dt.date | None
+    status: str | None
+    owner_name: str | None
+
+
+@dataclass(slots=True)
+class LeadRecord(CompactRecord[LeadSummary]):
+    """Compact LeadSummary."""
+
+    model: ClassVar[type[BaseModel]] = LeadSummary
+
+    id: str
+    name: str
+    company: str
+    status: str
+    lead_source: str | None
+    email: str | None
+    owner_name: str | None
+
+
+@dataclass(slots=True)
+class TeamMemberRecord(CompactRecord[TeamMember]):
+    """Compact TeamMember."""
+
+    model: ClassVar[type[BaseModel]] = TeamMember
+
+    id: str
+    name: str
+    is_active: bool
+    profile_name: str | None
+
+
+_RECORD_TYPES: dict[type[BaseModel], type[CompactRecord[Any]]] = {
+    record_type.model: record_type
+    for record_type in (
+        AccountRecord,
+        ContactRecord,
+        OpportunityRecord,
+        CaseRecord,
+        KnowledgeArticleRecord,
+        ActivityRecord,
+        LeadRecord,
+        TeamMemberRecord,
+    )
+}
+
+
+def record_type_for(model: type[BaseModel]) -> type[CompactRecord[Any]]:
+    """Return the compact record type mirroring ``model``.
+
+    Raises:
+        ValueError: If ``model`` has no compact equivalent.
+    """
+    try:
+        return _RECORD_TYPES[model]
+    except KeyError:
+        raise ValueError(f"No compact record type for {model.__name__}") from None
@@ -7,16 +7,60 @@ Per research.md Section 5.
 
 from __future__ import annotations
 
+import codecs
+import csv
+import hashlib
+import json
 import logging
+import re
+import threading
 import time
+from collections.abc import Collection, Iterable, Iterator, Mapping
+from contextlib import AbstractContextManager, contextmanager, nullcontext
 from dataclasses import dataclass, field
-from typing import Any
+from typing import TYPE_CHECKING, Any
+from urllib.parse import quote_plus
 
+import requests
 from simple_salesforce import Salesforce, SalesforceError
 
+from shared import json_codec
+from shared.cache import CACHE_BACKEND_ERRORS, CacheBackend, create_cache_backend, pack, unpack
+from shared.config import QueryCacheConfig, load_query_cache_config
+from shared.singleflight import SingleFlight
+from shared.soql import normalize_records
+from shared.telemetry import increment_counter
+
+if TYPE_CHECKING:
+    from shared.rate_limiter import RequestGovernor
+
 # Maximum records returned by any single query to prevent memory issues
 MAX_QUERY_RESULTS = 2000
 
+# Salesforce returns query results in pages of up to 2000 records; smaller
+# pages can be requested via Sforce-Query-Options down to 200.
+QUERY_PAGE_SIZE = 2000
+MIN_QUERY_BATCH_SIZE = 200
+
+# Bulk API 2.0 query jobs cost a handful of API calls regardless of size, so
+# they win over REST pagination (one call per 2000 rows) for large extracts.
+BULK_QUERY_THRESHOLD = 10_000
+BULK_RESULTS_PAGE_SIZE = 50_000
+BULK_POLL_INTERVAL_SECONDS = 1.0
+BULK_MAX_POLL_INTERVAL_SECONDS = 10.0
+BULK_TIMEOUT_SECONDS = 900.0
+BULK_STREAM_CHUNK_BYTES = 64 * 1024
+# Failures that another query path would only repeat, at the cost of more API calls
+NO_FALLBACK_ERROR_CODES = frozenset({"RATE_LIMIT_EXCEEDED", "AUTH_ERROR"})
+# Salesforce errorCodes a relationship subquery hits when the child object or
+# field is missing or not visible to the user; the parent query alone may work
+RELATIONSHIP_ERROR_CODES = ("INVALID_FIELD", "INVALID_TYPE", "INSUFFICIENT_ACCESS")
+
+# Composite Batch carries up to 25 independent subrequests; Composite allows
+# at most 5 query subrequests per request. Either costs one API call.
+COMPOSITE_BATCH_MAX_SUBREQUESTS = 25
+COMPOSITE_MAX_QUERIES = 5
+
 logger = logging.getLogger(__name__)
 
 # Rate limit thresholds
@@ -26,16 +70,57 @@ API_VERSION = "62.0"
 
 @dataclass
 class ApiUsageTracker:
-    """Track Salesforce API usage per session."""
+    """Track Salesforce API usage for an org.
+
+    Counts calls locally and is corrected from the authoritative figures
+    Salesforce reports — the ``Sforce-Limit-Info`` response header and the
+    ``DailyApiRequests`` entry of the ``/limits`` resource. Thread-safe, so
+    one tracker can be shared by every client talking to the same org.
+    """
 
     calls_made: int = 0
     session_start: float = field(default_factory=time.time)
     daily_limit: int = 100_000  # Default Enterprise edition
     warning_threshold: float = RATE_LIMIT_WARNING_PERCENT
+    last_synced: float = 0.0
+    _last_refresh_attempt: float = field(default=0.0, repr=False, compare=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
 
     def record_call(self) -> None:
         """Record an API call."""
-        self.calls_made += 1
+        with self._lock:
+            self.calls_made += 1
+
+    def sync(self, used: int, total: int) -> None:
+        """Overwrite local counters with usage reported by Salesforce.
+
+        Args:
+            used: API requests consumed in the rolling 24h window
+            total: Org's daily API request allocation
+        """
+        with self._lock:
+            self.calls_made = used
+            if total > 0:
+                self.daily_limit = total
+            self.last_synced = time.time()
+
+    def claim_refresh(self, interval_seconds: float) -> bool:
+        """Return True if the caller should refresh from ``/limits`` now.
+
+        At most one caller per interval is told to refresh, so concurrent
+        tool calls do not stampede the limits endpoint.
+        """
+        now = time.time()
+        with self._lock:
+            if now - max(self.last_synced, self._last_refresh_attempt) < interval_seconds:
+                return False
+            self._last_refresh_attempt = now
+            return True
+
+    @property
+    def remaining(self) -> int:
+        """API requests left in the daily allocation."""
+        return max(self.daily_limit - self.calls_made, 0)
 
     @property
     def usage_percent(self) -> float:
@@ -57,12 +142,209 @@ class ApiUsageTracker:
         return {
             "calls_made": self.calls_made,
             "daily_limit": self.daily_limit,
+            "remaining": self.remaining,
             "usage_percent": round(self.usage_percent, 1),
             "is_warning": self.is_warning,
             "is_exceeded": self.is_exceeded,
         }
 
 
+_org_usage_trackers: dict[str, ApiUsageTracker] = {}
+_org_usage_lock = threading.Lock()
+
+
+def get_org_usage_tracker(instance_url: str) -> ApiUsageTracker:
+    """Return the process-wide usage tracker for a Salesforce org.
+
+    The daily API allocation is per org, so every client for the same
+    instance URL shares one tracker regardless of which user it acts for.
+    """
+    key = instance_url.rstrip("/")
+    with _org_usage_lock:
+        tracker = _org_usage_trackers.get(key)
+        if tracker is None:
+            tracker = _org_usage_trackers[key] = ApiUsageTracker()
+        return tracker
+
+
+def sync_usage_from_header(usage: ApiUsageTracker, limit_info: str | None) -> None:
+    """Update a tracker from a raw ``Sforce-Limit-Info`` header value, if present."""
+    if not limit_info:
+        return
+    api_usage = Salesforce.parse_api_usage(limit_info).get("api-usage")
+    if api_usage is not None:
+        usage.sync(api_usage.used, api_usage.total)
+
+
+# sObjects a SOQL/SOSL statement reads from: FROM clauses (including
+# relationship subqueries) and SOSL RETURNING object lists.
+_FROM_RE = re.compile(r"\bFROM\s+(\w+)", re.IGNORECASE)
+_RETURNING_RE = re.compile(r"\bRETURNING\s+(.+)$", re.IGNORECASE | re.DOTALL)
+_RETURNING_OBJECT_RE = re.compile(r"(?:^|,)\s*(\w+)")
+_PAREN_RE = re.compile(r"\([^()]*\)")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _relationship_to_sobject(name: str) -> str:
+    """Map a child relationship name (``Contacts``, ``Opportunities``) to its sObject."""
+    if name.endswith("ies"):
+        return name[:-3] + "y"
+    if name.endswith("s") and not name.endswith("ss"):
+        return name[:-1]
+    return name
+
+
+def referenced_sobjects(statement: str) -> frozenset[str]:
+    """Return the sObjects a SOQL or SOSL statement reads from."""
+    names = set(_FROM_RE.findall(statement))
+    returning = _RETURNING_RE.search(statement)
+    if returning:
+        clause = returning.group(1)
+        while _PAREN_RE.search(clause):
+            clause = _PAREN_RE.sub("", clause)
+        names.update(_RETURNING_OBJECT_RE.findall(clause))
+    return frozenset(names | {_relationship_to_sobject(n) for n in names})
+
+
+class QueryCache:
+    """Read-through cache of SOQL/SOSL results keyed by statement and user.
+
+    Entries are keyed on the whitespace-normalized statement plus a token
+    fingerprint, so users never see each other's (sharing-rule filtered)
+    results. Each entry expires after the shortest TTL of the sObjects it
+    reads and is tagged with those sObjects, so a write to one drops every
+    entry that reads it. Storage is delegated to a CacheBackend (memory,
+    sqlite or Redis); backend failures degrade to cache misses.
+    """
+
+    def __init__(self, config: QueryCacheConfig | None = None, backend: CacheBackend | None = None) -> None:
+        """Initialize the cache.
+
+        Args:
+            config: Cache settings. Defaults to values from SF_QUERY_CACHE_* env vars.
+            backend: Storage backend. Defaults to the one named in config.
+        """
+        self._config = config or load_query_cache_config()
+        self._backend = backend or create_cache_backend(
+            self._config.backend,
+            max_entries=self._config.max_entries,
+            sqlite_path=self._config.sqlite_path,
+            redis_url=self._config.redis_url,
+        )
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._errors = 0
+
+    @property
+    def backend(self) -> CacheBackend:
+        """Storage backend."""
+        return self._backend
+
+    @staticmethod
+    def normalize(statement: str) -> str:
+        """Collapse whitespace so formatting differences share a cache entry."""
+        return _WHITESPACE_RE.sub(" ", statement).strip()
+
+    def ttl_for(self, sobjects: frozenset[str]) -> float:
+        """Return the TTL for a statement reading the given sObjects."""
+        ttls = self._config.ttl_seconds
+        known = [ttls[name] for name in sobjects if name in ttls]
+        return min(known) if known else self._config.default_ttl_seconds
+
+    def _key(self, user_key: str, kind: str, statement: str) -> str:
+        raw = f"{user_key}\x1f{kind}\x1f{self.normalize(statement)}"
+        return "q:" + hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+    def get(self, user_key: str, kind: str, statement: str) -> list[dict[str, Any]] | None:
+        """Return cached records for a statement, or None on a miss."""
+        if not self._config.enabled:
+            return None
+        try:
+            data = self._backend.get(self._key(user_key, kind, statement))
+            records: list[dict[str, Any]] | None = unpack(data) if data is not None else None
+        except CACHE_BACKEND_ERRORS:
+            logger.warning("Query cache read failed; treating as miss", exc_info=True)
+            records = None
+            with self._lock:
+                self._errors += 1
+        with self._lock:
+            if records is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        increment_counter("salesforce.cache.hits" if records is not None else "salesforce.cache.misses")
+        return records
+
+    def put(self, user_key: str, kind: str, statement: str, records: list[dict[str, Any]]) -> None:
+        """Store the records returned for a statement."""
+        if not self._config.enabled:
+            return
+        sobjects = referenced_sobjects(statement)
+        ttl = self.ttl_for(sobjects)
+        if ttl <= 0:
+            return
+        try:
+            self._backend.set(self._key(user_key, kind, statement), pack(records), ttl, sobjects)
+        except CACHE_BACKEND_ERRORS:
+            logger.warning("Query cache write failed", exc_info=True)
+            with self._lock:
+                self._errors += 1
+
+    def invalidate(self, sobject: str) -> int:
+        """Drop every entry that reads the given sObject, for all users.
+
+        Returns:
+            Number of entries dropped.
+        """
+        try:
+            dropped = self._backend.invalidate_tag(sobject)
+        except CACHE_BACKEND_ERRORS:
+            logger.warning("Query cache invalidation failed for %s", sobject, exc_info=True)
+            with self._lock:
+                self._errors += 1
+            return 0
+        if dropped:
+            logger.debug("Invalidated %d cached %s queries", dropped, sobject)
+        return dropped
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._backend.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Return hit/miss counts, hit ratio and size."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            stats: dict[str, Any] = {
+                "backend": self._config.backend,
+                "hits": self._hits,
+                "misses": self._misses,
+                "errors": self._errors,
+                "hit_ratio": round(self._hits / lookups, 3) if lookups else 0.0,
+                "max_entries": self._config.max_entries,
+            }
+        try:
+            stats["entries"] = self._backend.size()
+        except CACHE_BACKEND_ERRORS:
+            stats["entries"] = None
+        return stats
+
+
+_query_cache: QueryCache | None = None
+_query_cache_lock = threading.Lock()
+
+
+def get_query_cache() -> QueryCache:
+    """Return the process-wide query cache, creating it on first use."""
+    global _query_cache
+    if _query_cache is None:
+        with _query_cache_lock:
+            if _query_cache is None:
+                _query_cache = QueryCache()
+    return _query_cache
+
+
 class SalesforceClientError(Exception):
     """Base error for Salesforce client operations."""
 
@@ -100,6 +382,12 @@ class SalesforceClient:
         instance_url: str,
         access_token: str,
         api_version: str = API_VERSION,
+        *,
+        session: requests.Session | None = None,
+        usage_tracker: ApiUsageTracker | None = None,
+        limits_refresh_seconds: float | None = None,
+        governor: RequestGovernor | None = None,
+        query_cache: QueryCache | None = None,
     ) -> None:
         """Initialize client with per-user credentials.
 
@@ -107,17 +395,39 @@ class SalesforceClient:
             instance_url: Salesforce instance URL
             access_token: OAuth access token for the user
             api_version: Salesforce REST API version
+            session: Optional pre-configured requests session (e.g. a keep-alive
+                     connection pool shared via the client registry)
+            usage_tracker: Optional shared tracker (e.g. the org-wide tracker from
+                           get_org_usage_tracker). Defaults to a private tracker.
+            limits_refresh_seconds: If set, re-read DailyApiRequests from the
+                                    /limits resource at most this often.
+            governor: Optional request governor that queues calls against
+                      per-org and per-user rate and concurrency budgets.
+            query_cache: Optional read-through cache for query and search
+                         results, invalidated by this client's writes.
         """
         self._instance_url = instance_url
         self._access_token = access_token
         self._api_version = api_version
-        self._usage = ApiUsageTracker()
+        self._usage = usage_tracker if usage_tracker is not None else ApiUsageTracker()
+        self._limits_refresh_seconds = limits_refresh_seconds
+        self._governor = governor
+        self._user_key = token_fingerprint(access_token)
+        self._cache = query_cache
+        # Identical queries/searches issued concurrently share one API call
+        self._flights = SingleFlight()
+        self._describes: dict[str, dict[str, Any]] = {}
+
+        sf_kwargs: dict[str, Any] = {}
+        if session is not None:
+            sf_kwargs["session"] = session
 
         try:
             self._sf = Salesforce(
                 instance_url=instance_url,
                 session_id=access_token,
                 version=api_version,
+                **sf_kwargs,
             )
         except SalesforceError as e:
             raise SalesforceClientError("AUTH_ERROR", f"Failed to connect to Salesforce: {e}") from e
@@ -127,23 +437,109 @@ class SalesforceClient:
         """Access the API usage tracker."""
         return self._usage
 
+    @property
+    def instance_url(self) -> str:
+        """Salesforce instance URL this client is bound to."""
+        return self._instance_url
+
+    @property
+    def user_key(self) -> str:
+        """Stable, non-reversible identity of the user this client acts for."""
+        return self._user_key
+
+    def ping(self, timeout: float = 5.0) -> bool:
+        """Check that the underlying HTTP connection to Salesforce is usable.
+
+        Hits the unauthenticated API versions listing, which does not count
+        against the org's daily API limit.
+
+        Args:
+            timeout: Request timeout in seconds.
+
+        Returns:
+            True if Salesforce responded successfully.
+        """
+        try:
+            response = self._sf.session.get(f"{self._instance_url}/services/data/", timeout=timeout)
+            return bool(response.status_code == 200)
+        except requests.RequestException:
+            logger.debug("Salesforce health check failed for %s", self._instance_url, exc_info=True)
+            return False
+
+    def close(self) -> None:
+        """Close the underlying HTTP session and release pooled connections."""
+        try:
+            self._sf.session.close()
+        except Exception:
+            logger.debug("Error closing Salesforce session", exc_info=True)
+
+    def refresh_limits(self) -> dict[str, Any]:
+        """Re-seed the usage tracker from the org's ``/limits`` resource.
+
+        Failures are logged and ignored; the tracker keeps its last figures.
+
+        Returns:
+            Current usage status dict.
+        """
+        try:
+            limits = self._sf.limits()
+            daily = limits.get("DailyApiRequests") or {}
+            total = int(daily["Max"])
+            self._usage.sync(total - int(daily["Remaining"]), total)
+        except (SalesforceError, requests.RequestException, KeyError, TypeError, ValueError):
+            logger.warning("Failed to refresh Salesforce API limits for %s", self._instance_url, exc_info=True)
+        return self._usage.get_status()
+
     def _check_rate_limit(self) -> dict[str, Any] | None:
         """Check rate limit status and return warning if needed."""
-        if self._usage.is_exceeded:
-            raise SalesforceClientError(
-                "RATE_LIMIT_EXCEEDED",
-                "Salesforce API daily limit exceeded. Please try again later.",
-                self._usage.get_status(),
-            )
-        if self._usage.is_warning:
-            return {
-                "warning": {
-                    "code": "RATE_LIMIT_WARNING",
-                    "message": f"API usage at {self._usage.usage_percent:.0f}% of daily limit.",
-                    "details": self._usage.get_status(),
-                }
-            }
-        return None
+        if self._limits_refresh_seconds is not None and self._usage.claim_refresh(self._limits_refresh_seconds):
+            self.refresh_limits()
+        return check_rate_limit(self._usage)
+
+    @contextmanager
+    def _slot(self) -> Iterator[None]:
+        """Hold a governor slot for one request and count the call once it has been sent.
+
+        Requests the governor rejects never reach Salesforce, so they are not
+        counted against the daily usage estimate.
+        """
+        governor_slot: AbstractContextManager[None] = (
+            nullcontext()
+            if self._governor is None
+            else self._governor.slot(self._instance_url.rstrip("/"), self._user_key)
+        )
+        with governor_slot:
+            try:
+                yield
+            finally:
+                self._usage.record_call()
+
+    def _cache_get(self, kind: str, statement: str) -> list[dict[str, Any]] | None:
+        """Return cached results for this user, if a cache is configured."""
+        if self._cache is None:
+            return None
+        return self._cache.get(self._user_key, kind, statement)
+
+    def _cache_put(self, kind: str, statement: str, records: list[dict[str, Any]]) -> None:
+        if self._cache is not None:
+            self._cache.put(self._user_key, kind, statement, records)
+
+    def _invalidate(self, sobject: str) -> None:
+        if self._cache is not None:
+            self._cache.invalidate(sobject)
+
+    def _flight_key(self, kind: str, statement: str) -> tuple[str, str, str]:
+        """Identity under which identical concurrent reads are coalesced."""
+        return (self._user_key, kind, QueryCache.normalize(statement))
+
+    def _sync_usage(self, source: Any) -> None:
+        """Correct the tracker from the Sforce-Limit-Info usage simple-salesforce last parsed."""
+        api_usage = getattr(source, "api_usage", None)
+        if not isinstance(api_usage, Mapping):
+            return
+        usage = api_usage.get("api-usage")
+        if usage is not None and isinstance(usage.used, int):
+            self._usage.sync(usage.used, usage.total)
 
     def query(self, soql: str) -> list[dict[str, Any]]:
         """Execute a SOQL query and return records.
@@ -157,41 +553,73 @@ class SalesforceClient:
         Raises:
             SalesforceClientError: On query failure or rate limiting.
         """
-        self._check_rate_limit()
-        self._usage.record_call()
+        cached = self._cache_get("query", soql)
+        if cached is not None:
+            return cached
+        return self._flights.do(self._flight_key("query", soql), lambda: self._run_query(soql))
+
+    def _run_query(self, soql: str) -> list[dict[str, Any]]:
+        result = self._get_json("query/", params={"q": soql})
+        records: list[dict[str, Any]] = strip_attributes(result.get("records", []))
+        self._cache_put("query", soql, records)
+        return records
+
+    def iter_query(
+        self,
+        soql: str,
+        *,
+        max_results: int | None = None,
+        include_deleted: bool = False,
+    ) -> Iterator[dict[str, Any]]:
+        """Stream the records of a SOQL query, following pagination lazily.
 
-        try:
-            result = self._sf.query(soql)
-            records: list[dict[str, Any]] = result.get("records", [])
-            # Strip Salesforce metadata attributes
-            for record in records:
-                record.pop("attributes", None)
-                # Recursively strip from nested objects
-                for _key, value in list(record.items()):
-                    if isinstance(value, dict):
-                        value.pop("attributes", None)
-                    elif isinstance(value, list):
-                        for item in value:
-                            if isinstance(item, dict):
-                                item.pop("attributes", None)
-            return records
-        except SalesforceError as e:
-            error_msg = str(e)
-            if "INSUFFICIENT_ACCESS" in error_msg or "INVALID_SESSION_ID" in error_msg:
-                raise SalesforceClientError("AUTH_ERROR", f"Authentication failed: {error_msg}") from e
-            if "REQUEST_LIMIT_EXCEEDED" in error_msg:
-                raise SalesforceClientError("RATE_LIMIT_EXCEEDED", "Salesforce API rate limit exceeded.") from e
-            if "QUERY_TOO_COMPLICATED" in error_msg:
-                raise SalesforceClientError(
-                    "QUERY_TOO_COMPLEX",
-                    "Query is too complex. Try adding filters to narrow results.",
-                ) from e
-            raise SalesforceClientError("SF_API_ERROR", f"SOQL query failed: {error_msg}") from e
+        Each page is fetched only when the previous one has been consumed, and
+        fetching stops as soon as max_results records have been yielded, so a
+        large result is never held in memory and unused pages are never
+        requested. Every page counts as one API call.
+
+        Args:
+            soql: SOQL query string
+            max_results: Stop after this many records (default: no cap).
+            include_deleted: Use queryAll to include deleted/archived records.
+
+        Yields:
+            Record dicts with ``attributes`` stripped.
+
+        Raises:
+            SalesforceClientError: On query failure or rate limiting.
+        """
+        if max_results is not None and max_results <= 0:
+            return
+
+        # Ask for smaller pages when only a few records are wanted
+        kwargs: dict[str, Any] = {}
+        if max_results is not None and max_results < QUERY_PAGE_SIZE:
+            batch_size = max(max_results, MIN_QUERY_BATCH_SIZE)
+            kwargs["headers"] = {"Sforce-Query-Options": f"batchSize={batch_size}"}
+
+        yielded = 0
+        next_url: str | None = None
+        while True:
+            if next_url is None:
+                page = self._get_json("queryAll/" if include_deleted else "query/", params={"q": soql}, **kwargs)
+            else:
+                page = self._get_json(next_url)
+
+            for record in strip_attributes(page.get("records", [])):
+                yield record
+                yielded += 1
+                if max_results is not None and yielded >= max_results:
+                    return
+
+            next_url = page.get("nextRecordsUrl")
+            if page.get("done") or not next_url:
+                return
 
     def query_all(self, soql: str, *, max_results: int = MAX_QUERY_RESULTS) -> list[dict[str, Any]]:
         """Execute a SOQL query and return all records (handles pagination).
 
-        Results are capped at max_results to prevent memory issues.
+        Built on ``iter_query``, so pages beyond max_results are never fetched.
 
         Args:
             soql: SOQL query string
@@ -200,23 +628,280 @@ class SalesforceClient:
         Returns:
             List of all record dicts.
         """
-        self._check_rate_limit()
-        self._usage.record_call()
+        cache_kind = f"query_all:{max_results}"
+        cached = self._cache_get(cache_kind, soql)
+        if cached is not None:
+            return cached
+
+        records = list(self.iter_query(soql, max_results=max_results))
+        self._cache_put(cache_kind, soql, records)
+        return records
+
+    def query_batch(
+        self,
+        queries: Mapping[str, str],
+        *,
+        optional: Collection[str] = (),
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Run independent SOQL queries in a single Composite Batch round trip.
+
+        Each query returns its first page, like ``query``. Results are read from
+        and written to the query cache per query, so only misses are sent, and
+        one request costs one API call however many queries it carries.
+
+        Args:
+            queries: SOQL keyed by a caller-chosen name.
+            optional: Names whose failure yields an empty list instead of raising.
+
+        Returns:
+            Records keyed by query name.
+
+        Raises:
+            SalesforceClientError: If the request fails or a non-optional query fails.
+        """
+        results: dict[str, list[dict[str, Any]]] = {}
+        pending: dict[str, str] = {}
+        for name, soql in queries.items():
+            cached = self._cache_get("query", soql)
+            if cached is None:
+                pending[name] = soql
+            else:
+                results[name] = cached
+
+        names = list(pending)
+        for start in range(0, len(names), COMPOSITE_BATCH_MAX_SUBREQUESTS):
+            chunk = names[start:start + COMPOSITE_BATCH_MAX_SUBREQUESTS]
+            response = self._rest_call(
+                "POST",
+                "composite/batch",
+                json=composite_batch_payload([pending[name] for name in chunk], self._api_version),
+            )
+            body = json_codec.loads(response.content)
+            for name, item in zip(chunk, body.get("results", []), strict=False):
+                try:
+                    records = subrequest_records(item.get("statusCode", 500), item.get("result"))
+                except SalesforceClientError:
+                    if name not in optional:
+                        raise
+                    logger.debug("Optional batched query %r failed", name, exc_info=True)
+                    records = []
+                else:
+                    self._cache_put("query", pending[name], records)
+                results[name] = records
+
+        return {name: results.get(name, []) for name in queries}
+
+    def query_composite(
+        self,
+        queries: Mapping[str, str],
+        *,
+        optional: Collection[str] = (),
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Run chained SOQL queries in a single Composite round trip.
+
+        Queries run in order and later ones may reference earlier results with
+        ``@{name.records[0].Id}``, so a lookup and its dependent query cost one
+        request. A query whose reference cannot be resolved (e.g. the lookup
+        matched nothing) fails like any other subrequest.
+
+        Args:
+            queries: SOQL keyed by reference ID, in execution order (at most 5).
+            optional: Names whose failure yields an empty list instead of raising.
+
+        Returns:
+            First-page records keyed by reference ID.
+
+        Raises:
+            SalesforceClientError: If the request fails or a non-optional query fails.
+        """
+        body = json_codec.loads(
+            self._rest_call("POST", "composite", json=composite_payload(queries, self._api_version)).content
+        )
+        results: dict[str, list[dict[str, Any]]] = {}
+        for item in body.get("compositeResponse", []):
+            name = item.get("referenceId", "")
+            try:
+                results[name] = subrequest_records(item.get("httpStatusCode", 500), item.get("body"))
+            except SalesforceClientError:
+                if name not in optional:
+                    raise
+                logger.debug("Optional composite query %r failed", name, exc_info=True)
+                results[name] = []
+        return {name: results.get(name, []) for name in queries}
+
+    def count_query(self, soql: str) -> int | None:
+        """Estimate the rows a SOQL query returns with a ``SELECT COUNT()`` probe.
+
+        Args:
+            soql: SOQL query string
+
+        Returns:
+            Row count, or None if the query cannot be converted or counted.
+
+        Raises:
+            SalesforceClientError: For rate-limit, auth and transport failures;
+                only a probe Salesforce rejects as a query yields None.
+        """
+        count_soql = to_count_query(soql)
+        if count_soql is None:
+            return None
 
         try:
-            result = self._sf.query_all(soql)
-            records: list[dict[str, Any]] = result.get("records", [])
-            for record in records:
-                record.pop("attributes", None)
-            # Safety cap to prevent OOM on large orgs
-            if len(records) > max_results:
-                logger.warning(
-                    "query_all returned %d records, capping to %d", len(records), max_results
+            result = self._get_json("query/", params={"q": count_soql})
+        except SalesforceClientError as e:
+            # Only a rejected probe falls back; rate, auth and concurrency limits still apply
+            if not isinstance(e.__cause__, SalesforceError) or e.code in NO_FALLBACK_ERROR_CODES:
+                raise
+            logger.debug("COUNT() probe failed for: %s", count_soql, exc_info=True)
+            return None
+        total = result.get("totalSize")
+        return int(total) if isinstance(total, int) else None
+
+    def bulk_query(
+        self,
+        soql: str,
+        *,
+        include_deleted: bool = False,
+        page_size: int = BULK_RESULTS_PAGE_SIZE,
+        poll_interval: float = BULK_POLL_INTERVAL_SECONDS,
+        timeout: float = BULK_TIMEOUT_SECONDS,
+    ) -> Iterator[dict[str, Any]]:
+        """Run a Bulk API 2.0 query job and stream its CSV results as records.
+
+        Creates the job, polls until it completes, then downloads result
+        chunks of up to page_size rows, parsing each as it streams in. Columns
+        such as ``Owner.Name`` are nested into ``{"Owner": {"Name": ...}}`` and
+        empty cells become None; all other values are strings.
+
+        Args:
+            soql: SOQL query string
+            include_deleted: Run a queryAll job to include deleted/archived records.
+            page_size: Maximum rows per result chunk.
+            poll_interval: Initial seconds between job status checks (backs off).
+            timeout: Give up if the job has not completed after this many seconds.
+
+        Yields:
+            Record dicts.
+
+        Raises:
+            SalesforceClientError: If the job fails, is aborted, or times out.
+        """
+        job = json_codec.loads(
+            self._rest_call(
+                "POST",
+                "jobs/query",
+                json={"operation": "queryAll" if include_deleted else "query", "query": soql},
+            ).content
+        )
+        job_id = job["id"]
+        logger.info("Started Bulk API query job %s", job_id)
+
+        deadline = time.monotonic() + timeout
+        delay = poll_interval
+        while job.get("state") not in ("JobComplete", "Failed", "Aborted"):
+            if time.monotonic() >= deadline:
+                self._abort_bulk_job(job_id)
+                raise SalesforceClientError(
+                    "SF_API_ERROR", f"Bulk query job {job_id} did not complete within {timeout:.0f}s"
                 )
-                records = records[:max_results]
-            return records
+            time.sleep(delay)
+            delay = min(delay * 2, BULK_MAX_POLL_INTERVAL_SECONDS)
+            job = self._get_json(f"jobs/query/{job_id}")
+
+        if job["state"] != "JobComplete":
+            raise SalesforceClientError(
+                "SF_API_ERROR",
+                f"Bulk query job {job_id} {job['state'].lower()}: {job.get('errorMessage', 'unknown error')}",
+            )
+
+        locator: str | None = None
+        while True:
+            params: dict[str, Any] = {"maxRecords": page_size}
+            if locator:
+                params["locator"] = locator
+            response = self._rest_call(
+                "GET", f"jobs/query/{job_id}/results", params=params, headers={"Accept": "text/csv"}, stream=True
+            )
+            try:
+                lines = iter_text_lines(response.iter_content(chunk_size=BULK_STREAM_CHUNK_BYTES))
+                for row in csv.DictReader(lines):
+                    yield nest_csv_row(row)
+            finally:
+                response.close()
+
+            locator = response.headers.get("Sforce-Locator")
+            if not locator or locator == "null":
+                return
+
+    def iter_records(
+        self,
+        soql: str,
+        *,
+        bulk_threshold: int = BULK_QUERY_THRESHOLD,
+        include_deleted: bool = False,
+    ) -> Iterator[dict[str, Any]]:
+        """Stream all records of a query via Bulk API 2.0 or REST, whichever is cheaper.
+
+        A ``COUNT()`` probe estimates the result size; at or above
+        bulk_threshold rows the query runs as a bulk job, otherwise through
+        REST pagination. If the bulk job cannot be started or fails before
+        yielding anything (e.g. the object is not supported by Bulk API), the
+        query falls back to REST. Rate-limit and auth errors are raised
+        rather than retried through REST.
+
+        Args:
+            soql: SOQL query string
+            bulk_threshold: Minimum estimated rows to use Bulk API.
+            include_deleted: Include deleted/archived records.
+
+        Yields:
+            Record dicts. Bulk results carry string values (see ``bulk_query``).
+        """
+        estimate = self.count_query(soql)
+        if estimate is None or estimate < bulk_threshold:
+            yield from self.iter_query(soql, include_deleted=include_deleted)
+            return
+
+        logger.info("Using Bulk API for ~%d rows", estimate)
+        yielded = False
+        try:
+            for record in self.bulk_query(soql, include_deleted=include_deleted):
+                yielded = True
+                yield record
+        except SalesforceClientError as e:
+            if yielded or e.code in NO_FALLBACK_ERROR_CODES:
+                raise
+            logger.warning("Bulk query failed before returning rows; falling back to REST", exc_info=True)
+            yield from self.iter_query(soql, include_deleted=include_deleted)
+
+    def _rest_call(self, method: str, path: str, *, operation: str = "query", **kwargs: Any) -> requests.Response:
+        """Send one REST request through the authenticated session.
+
+        ``path`` is relative to the versioned base URL, or an absolute
+        ``/services/...`` path such as a query's ``nextRecordsUrl``.
+        """
+        url = f"https://{self._sf.sf_instance}{path}" if path.startswith("/") else self._sf.base_url + path
+        self._check_rate_limit()
+        try:
+            with self._slot():
+                response: requests.Response = self._sf._call_salesforce(method, url, name=path, **kwargs)
+            self._sync_usage(self._sf)
+            return response
         except SalesforceError as e:
-            raise SalesforceClientError("SF_API_ERROR", f"SOQL query failed: {e}") from e
+            raise map_salesforce_error(str(e), operation=operation) from e
+        except requests.RequestException as e:
+            raise SalesforceClientError("SF_API_ERROR", f"Salesforce request failed: {e}") from e
+
+    def _get_json(self, path: str, *, operation: str = "query", **kwargs: Any) -> dict[str, Any]:
+        """GET a REST resource and decode its JSON body with the fast codec."""
+        body: dict[str, Any] = json_codec.loads(self._rest_call("GET", path, operation=operation, **kwargs).content)
+        return body
+
+    def _abort_bulk_job(self, job_id: str) -> None:
+        try:
+            self._rest_call("PATCH", f"jobs/query/{job_id}", json={"state": "Aborted"})
+        except SalesforceClientError:
+            logger.warning("Failed to abort Bulk API query job %s", job_id, exc_info=True)
 
     def search(self, sosl: str) -> list[dict[str, Any]]:
         """Execute a SOSL search and return results.
@@ -227,17 +912,16 @@ class SalesforceClient:
         Returns:
             List of search result records.
         """
-        self._check_rate_limit()
-        self._usage.record_call()
+        cached = self._cache_get("search", sosl)
+        if cached is not None:
+            return cached
+        return self._flights.do(self._flight_key("search", sosl), lambda: self._run_search(sosl))
 
-        try:
-            result = self._sf.search(sosl)
-            records: list[dict[str, Any]] = result.get("searchRecords", [])
-            for record in records:
-                record.pop("attributes", None)
-            return records
-        except SalesforceError as e:
-            raise SalesforceClientError("SF_API_ERROR", f"SOSL search failed: {e}") from e
+    def _run_search(self, sosl: str) -> list[dict[str, Any]]:
+        result = self._get_json("search/", operation="search", params={"q": sosl})
+        records: list[dict[str, Any]] = strip_attributes(result.get("searchRecords", []))
+        self._cache_put("search", sosl, records)
+        return records
 
     def create_record(
         self,
@@ -267,23 +951,17 @@ class SalesforceClient:
             )
 
         self._check_rate_limit()
-        self._usage.record_call()
 
         try:
             sf_object = getattr(self._sf, sobject)
-            result: dict[str, Any] = sf_object.create(data)
+            with self._slot():
+                result: dict[str, Any] = sf_object.create(data)
+            self._sync_usage(sf_object)
+            self._invalidate(sobject)
             logger.info("Created %s record: %s", sobject, result.get("id"))
             return result
         except SalesforceError as e:
-            error_msg = str(e)
-            if "INSUFFICIENT_ACCESS" in error_msg:
-                raise SalesforceClientError(
-                    "PERMISSION_DENIED",
-                    f"Insufficient permissions to create {sobject}: {error_msg}",
-                ) from e
-            raise SalesforceClientError(
-                "SF_API_ERROR", f"Failed to create {sobject}: {error_msg}"
-            ) from e
+            raise map_salesforce_error(str(e), operation="create", sobject=sobject) from e
 
     def update_record(
         self,
@@ -315,26 +993,34 @@ class SalesforceClient:
             )
 
         self._check_rate_limit()
-        self._usage.record_call()
 
         try:
             sf_object = getattr(self._sf, sobject)
-            sf_object.update(record_id, data)
+            with self._slot():
+                sf_object.update(record_id, data)
+            self._sync_usage(sf_object)
+            self._invalidate(sobject)
             logger.info("Updated %s record: %s", sobject, record_id)
             return True
         except SalesforceError as e:
-            error_msg = str(e)
-            if "NOT_FOUND" in error_msg or "ENTITY_IS_DELETED" in error_msg:
-                raise SalesforceClientError("NOT_FOUND", f"{sobject} record {record_id} not found.") from e
-            if "INSUFFICIENT_ACCESS" in error_msg:
-                raise SalesforceClientError(
-                    "PERMISSION_DENIED",
-                    f"Insufficient permissions to update {sobject}: {error_msg}",
-                ) from e
-            raise SalesforceClientError(
-                "SF_API_ERROR", f"Failed to update {sobject}: {error_msg}"
+            raise map_salesforce_error(
+                str(e), operation="update", sobject=sobject, record_id=record_id
             ) from e
 
+    def describe(self, sobject: str) -> dict[str, Any]:
+        """Return an object's describe metadata, fetched once per client.
+
+        Args:
+            sobject: Salesforce object API name
+
+        Returns:
+            The describe result (``fields``, ``name``, ...).
+        """
+        cached = self._describes.get(sobject)
+        if cached is None:
+            cached = self._describes[sobject] = self._get_json(f"sobjects/{sobject}/describe/", operation="describe")
+        return cached
+
     def get_record(self, sobject: str, record_id: str) -> dict[str, Any]:
         """Retrieve a single record by ID.
 
@@ -346,18 +1032,233 @@ class SalesforceClient:
             Record dict.
         """
         self._check_rate_limit()
-        self._usage.record_call()
 
         try:
             sf_object = getattr(self._sf, sobject)
-            result: dict[str, Any] = sf_object.get(record_id)
+            with self._slot():
+                result: dict[str, Any] = sf_object.get(record_id)
+            self._sync_usage(sf_object)
             result.pop("attributes", None)
             return result
         except SalesforceError as e:
-            error_msg = str(e)
-            if "NOT_FOUND" in error_msg:
-                raise SalesforceClientError("NOT_FOUND", f"{sobject} record {record_id} not found.") from e
-            raise SalesforceClientError("SF_API_ERROR", f"Failed to retrieve {sobject}: {error_msg}") from e
+            raise map_salesforce_error(
+                str(e), operation="get", sobject=sobject, record_id=record_id
+            ) from e
+
+
+_COMPOSITE_REFERENCE_RE = re.compile(r"(@\{[^}]+\})")
+_SELECT_FIELDS_RE = re.compile(r"^\s*SELECT\s+.+?\s+FROM\s+", re.IGNORECASE | re.DOTALL)
+_TRAILING_CLAUSES_RE = re.compile(
+    r"\s+(ORDER\s+BY|LIMIT|OFFSET|FOR\s+(VIEW|REFERENCE|UPDATE))\b.*$", re.IGNORECASE | re.DOTALL
+)
+
+
+def to_count_query(soql: str) -> str | None:
+    """Rewrite a flat SOQL query as ``SELECT COUNT() FROM ...`` for row estimation.
+
+    Returns None for queries the rewrite cannot handle safely (subqueries,
+    aggregates, GROUP BY).
+    """
+    if "(SELECT" in soql.upper().replace(" ", "") or re.search(r"\bGROUP\s+BY\b", soql, re.IGNORECASE):
+        return None
+    match = _SELECT_FIELDS_RE.match(soql)
+    if match is None or "(" in match.group(0):
+        return None
+    rest = _TRAILING_CLAUSES_RE.sub("", soql[match.end():])
+    return f"SELECT COUNT() FROM {rest.strip()}"
+
+
+def composite_query_url(soql: str, api_version: str, *, absolute: bool = True) -> str:
+    """Build the subrequest URL for a SOQL query inside a Composite request.
+
+    ``@{reference}`` tokens are left unencoded so Salesforce can substitute
+    earlier results into them. Composite takes absolute paths, Composite
+    Batch paths relative to ``/services/data``.
+    """
+    parts = _COMPOSITE_REFERENCE_RE.split(soql)
+    q = "".join(part if i % 2 else quote_plus(part) for i, part in enumerate(parts))
+    prefix = f"/services/data/v{api_version}" if absolute else f"v{api_version}"
+    return f"{prefix}/query?q={q}"
+
+
+def composite_payload(queries: Mapping[str, str], api_version: str) -> dict[str, Any]:
+    """Build a ``/composite`` request body running the queries in order."""
+    if len(queries) > COMPOSITE_MAX_QUERIES:
+        raise ValueError(f"Composite requests support at most {COMPOSITE_MAX_QUERIES} queries")
+    return {
+        "allOrNone": False,
+        "compositeRequest": [
+            {"method": "GET", "url": composite_query_url(soql, api_version), "referenceId": name}
+            for name, soql in queries.items()
+        ],
+    }
+
+
+def composite_batch_payload(soqls: list[str], api_version: str) -> dict[str, Any]:
+    """Build a ``/composite/batch`` request body running the queries independently."""
+    return {
+        "haltOnError": False,
+        "batchRequests": [
+            {"method": "GET", "url": composite_query_url(soql, api_version, absolute=False)}
+            for soql in soqls
+        ],
+    }
+
+
+def subrequest_records(status: int, body: Any) -> list[dict[str, Any]]:
+    """Extract query records from one Composite subresponse.
+
+    Raises:
+        SalesforceClientError: If the subrequest failed.
+    """
+    if status >= 300:
+        raise map_salesforce_error(f"{status} {json.dumps(body)}", operation="query")
+    return strip_attributes(body.get("records", []) if isinstance(body, dict) else [])
+
+
+def iter_text_lines(chunks: Iterable[bytes], encoding: str = "utf-8") -> Iterator[str]:
+    """Decode a byte stream into lines that keep their line endings.
+
+    Suitable as input to ``csv.reader``, which needs the original newlines to
+    parse quoted fields spanning several lines.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    pending = ""
+    for chunk in chunks:
+        pending += decoder.decode(chunk)
+        lines = pending.splitlines(keepends=True)
+        # The last piece may be an incomplete line; keep it for the next chunk
+        pending = lines.pop() if lines and not lines[-1].endswith(("\n", "\r")) else ""
+        yield from lines
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+def nest_csv_row(row: dict[str, str]) -> dict[str, Any]:
+    """Convert a Bulk API CSV row to the REST record shape.
+
+    Dotted relationship columns become nested dicts and empty cells become None.
+    """
+    record: dict[str, Any] = {}
+    for column, value in row.items():
+        target = record
+        *parents, leaf = column.split(".")
+        for parent in parents:
+            child = target.get(parent)
+            if not isinstance(child, dict):
+                child = target[parent] = {}
+            target = child
+        target[leaf] = value if value != "" else None
+    return record
+
+
+def check_rate_limit(usage: ApiUsageTracker) -> dict[str, Any] | None:
+    """Raise if the daily API limit is exhausted, or return a warning near it.
+
+    Shared by the sync and async clients so both enforce the same policy.
+
+    Args:
+        usage: Usage tracker to evaluate.
+
+    Returns:
+        A RATE_LIMIT_WARNING payload when above the warning threshold, else None.
+
+    Raises:
+        SalesforceClientError: With code RATE_LIMIT_EXCEEDED when the limit is reached.
+    """
+    if usage.is_exceeded:
+        raise SalesforceClientError(
+            "RATE_LIMIT_EXCEEDED",
+            "Salesforce API daily limit exceeded. Please try again later.",
+            usage.get_status(),
+        )
+    if usage.is_warning:
+        return {
+            "warning": {
+                "code": "RATE_LIMIT_WARNING",
+                "message": f"API usage at {usage.usage_percent:.0f}% of daily limit.",
+                "details": usage.get_status(),
+            }
+        }
+    return None
+
+
+def strip_attributes(records: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Strip Salesforce ``attributes`` metadata from records in place.
+
+    Nested parent objects are stripped too, and relationship subquery
+    envelopes are flattened to plain record lists (see ``normalize_records``).
+    """
+    return normalize_records(records)
+
+
+def map_salesforce_error(
+    error_msg: str,
+    *,
+    operation: str,
+    sobject: str = "",
+    record_id: str = "",
+) -> SalesforceClientError:
+    """Translate a raw Salesforce error message into a SalesforceClientError.
+
+    Salesforce reports failures as an ``errorCode`` embedded in the response
+    body, so classification works on the message text regardless of whether
+    it came from simple-salesforce or a direct HTTP response.
+
+    Args:
+        error_msg: Error text including the Salesforce errorCode.
+        operation: One of 'query', 'search', 'create', 'update', 'get'.
+        sobject: Salesforce object type for record operations.
+        record_id: Record ID for update/get operations.
+
+    Returns:
+        SalesforceClientError with the MCP error code for the failure.
+    """
+    if "REQUEST_LIMIT_EXCEEDED" in error_msg:
+        return SalesforceClientError("RATE_LIMIT_EXCEEDED", "Salesforce API rate limit exceeded.")
+    if "INVALID_SESSION_ID" in error_msg:
+        return SalesforceClientError("AUTH_ERROR", f"Authentication failed: {error_msg}")
+
+    if operation in ("query", "search"):
+        if "INSUFFICIENT_ACCESS" in error_msg:
+            return SalesforceClientError("AUTH_ERROR", f"Authentication failed: {error_msg}")
+        if "QUERY_TOO_COMPLICATED" in error_msg:
+            return SalesforceClientError(
+                "QUERY_TOO_COMPLEX",
+                "Query is too complex. Try adding filters to narrow results.",
+            )
+        label = "SOQL query" if operation == "query" else "SOSL search"
+        return SalesforceClientError("SF_API_ERROR", f"{label} failed: {error_msg}")
+
+    if operation in ("update", "get") and ("NOT_FOUND" in error_msg or "ENTITY_IS_DELETED" in error_msg):
+        return SalesforceClientError("NOT_FOUND", f"{sobject} record {record_id} not found.")
+    if operation in ("create", "update") and "INSUFFICIENT_ACCESS" in error_msg:
+        return SalesforceClientError(
+            "PERMISSION_DENIED",
+            f"Insufficient permissions to {operation} {sobject}: {error_msg}",
+        )
+
+    verb = {"create": "create", "update": "update", "get": "retrieve"}.get(operation, operation)
+    return SalesforceClientError("SF_API_ERROR", f"Failed to {verb} {sobject}: {error_msg}")
+
+
+def is_relationship_error(error: SalesforceClientError) -> bool:
+    """Whether a query failed because a relationship subquery is unavailable to the user.
+
+    Rate limits, expired sessions and transport failures are not; retrying
+    the query without the subquery would only fail again.
+    """
+    return any(code in error.message for code in RELATIONSHIP_ERROR_CODES)
+
+
+def token_fingerprint(access_token: str) -> str:
+    """Return a stable, non-reversible identity for an access token.
+
+    Used wherever a per-user key is needed (client registry, caches) so raw
+    tokens are never kept as dictionary keys or written to logs.
+    """
+    return hashlib.sha256(access_token.encode("utf-8")).hexdigest()[:16]
 
 
 def create_client(instance_url: str, access_token: str) -> SalesforceClient:
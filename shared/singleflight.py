@@ -0,0 +1,120 @@
+"""Single-flight coalescing of identical concurrent calls.
+
+When several callers ask for the same thing at once (e.g. a dashboard and a
+few agent threads all running the pipeline summary), only the first caller,
+the leader, does the work; the rest wait for and share its outcome, result
+or exception. Followers get a deep copy of the result so no caller can
+mutate another's records. Once the leader finishes the key is released, so
+later calls start a fresh flight (or hit the result cache).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import threading
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, TypeVar
+
+from shared.telemetry import increment_counter
+
+T = TypeVar("T")
+
+
+class _Call:
+    """One in-flight call: its outcome and the event followers wait on."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Thread-safe single-flight group for blocking calls."""
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """Run ``fn`` unless an identical call is in flight; then share its outcome.
+
+        Args:
+            key: Identity of the call; equal keys are coalesced.
+            fn: The work to run if this caller becomes the leader.
+
+        Returns:
+            The leader's result (a deep copy of it for followers).
+
+        Raises:
+            Whatever ``fn`` raised, for the leader and every follower.
+        """
+        with self._lock:
+            existing = self._calls.get(key)
+            if existing is None:
+                call = self._calls[key] = _Call()
+
+        if existing is not None:
+            increment_counter("salesforce.singleflight.coalesced")
+            existing.done.wait()
+            if existing.error is not None:
+                raise existing.error
+            shared: T = copy.deepcopy(existing.result)
+            return shared
+
+        try:
+            result = fn()
+            call.result = result
+            return result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self) -> int:
+        """Number of distinct calls currently running."""
+        with self._lock:
+            return len(self._calls)
+
+
+class AsyncSingleFlight:
+    """Single-flight group for coroutines on one event loop.
+
+    The leader's work runs as its own task, so a caller that is cancelled
+    while waiting does not cancel the call for the others.
+    """
+
+    def __init__(self) -> None:
+        self._tasks: dict[Hashable, asyncio.Task[Any]] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Await ``fn()`` unless an identical call is in flight; then share its outcome.
+
+        Args:
+            key: Identity of the call; equal keys are coalesced.
+            fn: Coroutine factory run if this caller becomes the leader.
+
+        Returns:
+            The leader's result (a deep copy of it for followers).
+        """
+        task = self._tasks.get(key)
+        leader = task is None
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._tasks[key] = task
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+        else:
+            increment_counter("salesforce.singleflight.coalesced")
+
+        result: T = await asyncio.shield(task)
+        return result if leader else copy.deepcopy(result)
+
+    def in_flight(self) -> int:
+        """Number of distinct calls currently running."""
+        return len(self._tasks)
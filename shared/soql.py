@@ -0,0 +1,369 @@
+"""SOQL query builder and result normalizer.
+
+Queries are immutable values assembled from field lists and typed filters:
+
+    CASE_BY_ID = SoqlQuery("Case").select("Id, Subject").limit(1)   # static part, built once
+    soql = CASE_BY_ID.where(id_eq("Id", case_id)).build()
+
+Filter helpers (``eq``, ``id_eq``, ``in_``, ``like_contains`` ...) render
+values as properly escaped SOQL literals and validate record IDs, raising
+``InvalidSoqlValueError`` for input that cannot be used safely. Rendering is
+canonical — fields, AND-ed conditions and IN lists are de-duplicated and
+sorted — so the same logical query always yields byte-identical SOQL, which
+is what lets result caching and request coalescing hit.
+
+Parent-child relationship subqueries (``with_children``) bring a record and
+its related rows back in one query; ``normalize_records`` flattens the nested
+``{"records": [...]}`` envelopes Salesforce returns for them.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable
+from dataclasses import dataclass, replace
+from datetime import UTC, date, datetime
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any
+
+from shared.models import ErrorResponse
+
+# Record IDs are 15 or 18 alphanumeric characters. The check exists to keep
+# input out of the SOQL grammar, so any alphanumeric token up to 18 passes.
+_ID_RE = re.compile(r"^[a-zA-Z0-9]{1,18}$")
+
+_OPERATORS = frozenset({"=", "!=", "<", "<=", ">", ">=", "LIKE", "IN", "NOT IN", "INCLUDES", "EXCLUDES"})
+
+# Backslash escapes recognised inside SOQL string literals
+_STRING_ESCAPES = str.maketrans(
+    {
+        "\\": "\\\\",
+        "'": "\\'",
+        '"': '\\"',
+        "\n": "\\n",
+        "\r": "\\r",
+        "\t": "\\t",
+        "\b": "\\b",
+        "\f": "\\f",
+    }
+)
+_LIKE_ESCAPES = str.maketrans({"%": "\\%", "_": "\\_"})
+
+# Characters with meaning in a SOSL FIND clause
+_SOSL_RESERVED_RE = re.compile(r"([?&|!{}\[\]()^~*:\\\"'+\-])")
+
+
+class InvalidSoqlValueError(ValueError):
+    """Raised when a value cannot be rendered safely into SOQL."""
+
+    def to_error_response(self) -> dict[str, Any]:
+        """Convert to the standard INVALID_INPUT error response dict."""
+        return ErrorResponse(code="INVALID_INPUT", message=str(self)).model_dump()
+
+
+class RawSoql(str):
+    """A trusted SOQL fragment rendered verbatim, e.g. a date literal like ``LAST_N_DAYS:30``."""
+
+    __slots__ = ()
+
+
+# --- Literals ---
+
+
+def quote(value: str) -> str:
+    """Render a string as an escaped, single-quoted SOQL literal."""
+    return f"'{value.translate(_STRING_ESCAPES)}'"
+
+
+def literal(value: object) -> str:
+    """Render a Python value as a SOQL literal.
+
+    Strings are quoted and escaped; booleans and None become ``true``,
+    ``false`` and ``null``; dates and datetimes use SOQL's ISO formats
+    (datetimes in UTC); ``RawSoql`` passes through unchanged.
+
+    Raises:
+        InvalidSoqlValueError: For values with no SOQL literal form.
+    """
+    if isinstance(value, RawSoql):
+        return str(value)
+    if isinstance(value, str):
+        return quote(value)
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, (float, Decimal)):
+        if value != value or value in (float("inf"), float("-inf")):
+            raise InvalidSoqlValueError(f"{value!r} is not a valid SOQL number")
+        # SOQL has no exponent notation; str() uses it for 1e-07 or Decimal("1E-7")
+        text = format(Decimal(str(value)) if isinstance(value, float) else value, "f")
+        return text.rstrip("0").rstrip(".") if "." in text else text
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(UTC)
+        return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+    if isinstance(value, date):
+        return value.isoformat()
+    raise InvalidSoqlValueError(f"Cannot use {type(value).__name__} value in SOQL")
+
+
+def validate_id(value: str, name: str = "ID") -> str:
+    """Return value if it is shaped like a Salesforce record ID.
+
+    Raises:
+        InvalidSoqlValueError: If value is not an alphanumeric token of at most 18 characters.
+    """
+    if not isinstance(value, str) or not _ID_RE.match(value):
+        raise InvalidSoqlValueError(f"Invalid Salesforce {name}: {value!r}")
+    return value
+
+
+def parse_date(value: str | date, name: str = "date") -> date:
+    """Parse a ``YYYY-MM-DD`` string into a date.
+
+    Raises:
+        InvalidSoqlValueError: If value is not an ISO date.
+    """
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError) as e:
+        raise InvalidSoqlValueError(f"Invalid {name} {value!r}: expected YYYY-MM-DD") from e
+
+
+def sosl_escape(text: str) -> str:
+    """Escape SOSL reserved characters in a FIND search term."""
+    return _SOSL_RESERVED_RE.sub(r"\\\1", text)
+
+
+# --- Filters ---
+
+
+def condition(field_name: str, op: str, value: Any) -> str:
+    """Render ``field op value`` with the value as an escaped literal."""
+    op = op.upper()
+    if op not in _OPERATORS:
+        raise InvalidSoqlValueError(f"Unsupported SOQL operator {op!r}")
+    if op in ("IN", "NOT IN", "INCLUDES", "EXCLUDES"):
+        return f"{field_name} {op} {_literal_list(value)}"
+    return f"{field_name} {op} {literal(value)}"
+
+
+def eq(field_name: str, value: Any) -> str:
+    """``field = value``."""
+    return condition(field_name, "=", value)
+
+
+def ne(field_name: str, value: Any) -> str:
+    """``field != value``."""
+    return condition(field_name, "!=", value)
+
+
+def lt(field_name: str, value: Any) -> str:
+    """``field < value``."""
+    return condition(field_name, "<", value)
+
+
+def gt(field_name: str, value: Any) -> str:
+    """``field > value``."""
+    return condition(field_name, ">", value)
+
+
+def lte(field_name: str, value: Any) -> str:
+    """``field <= value``."""
+    return condition(field_name, "<=", value)
+
+
+def gte(field_name: str, value: Any) -> str:
+    """``field >= value``."""
+    return condition(field_name, ">=", value)
+
+
+def in_(field_name: str, values: Iterable[Any]) -> str:
+    """``field IN (...)`` with the values de-duplicated and sorted."""
+    return condition(field_name, "IN", values)
+
+
+def id_eq(field_name: str, record_id: str) -> str:
+    """``field = 'id'`` after validating the ID."""
+    return eq(field_name, validate_id(record_id, field_name))
+
+
+def id_in(field_name: str, record_ids: Iterable[str]) -> str:
+    """``field IN ('id', ...)`` after validating every ID."""
+    return in_(field_name, [validate_id(record_id, field_name) for record_id in record_ids])
+
+
+def in_subquery(field_name: str, subquery: SoqlQuery) -> str:
+    """``field IN (SELECT ...)`` semi-join."""
+    return f"{field_name} IN ({subquery.build()})"
+
+
+def like_contains(field_name: str, text: str) -> str:
+    """``field LIKE '%text%'`` with ``%`` and ``_`` in text matched literally."""
+    return f"{field_name} LIKE '%{text.translate(_STRING_ESCAPES).translate(_LIKE_ESCAPES)}%'"
+
+
+def any_of(*conditions: str) -> str:
+    """OR the conditions together, parenthesised, in canonical order."""
+    unique = sorted(set(conditions))
+    if len(unique) == 1:
+        return unique[0]
+    return f"({' OR '.join(unique)})"
+
+
+def all_of(*conditions: str) -> str:
+    """AND the conditions together, parenthesised, in canonical order (for use inside ``any_of``)."""
+    unique = sorted(set(conditions))
+    if len(unique) == 1:
+        return unique[0]
+    return f"({' AND '.join(unique)})"
+
+
+def _literal_list(values: Iterable[Any]) -> str:
+    if isinstance(values, (str, bytes)):
+        raise InvalidSoqlValueError("IN filters take a collection of values, not a string")
+    rendered = sorted({literal(v) for v in values})
+    if not rendered:
+        raise InvalidSoqlValueError("IN filters need at least one value")
+    return f"({', '.join(rendered)})"
+
+
+# --- Queries ---
+
+
+@dataclass(frozen=True)
+class SoqlQuery:
+    """An immutable SOQL SELECT statement; every builder method returns a new query.
+
+    Build the static part (fields, FROM, ORDER BY, LIMIT) once at module
+    level and add per-call filters with ``where``. For a relationship
+    subquery, ``sobject`` is the child relationship name (e.g.
+    ``CaseComments``), not the child object name.
+    """
+
+    sobject: str
+    fields: tuple[str, ...] = ()
+    subqueries: tuple[SoqlQuery, ...] = ()
+    conditions: tuple[str, ...] = ()
+    group: tuple[str, ...] = ()
+    order: str = ""
+    row_limit: int | None = None
+
+    def select(self, *fields: str) -> SoqlQuery:
+        """Add fields; each argument may be a single field or a comma-separated list."""
+        names = [name.strip() for spec in fields for name in spec.split(",") if name.strip()]
+        return replace(self, fields=(*self.fields, *names))
+
+    def with_children(self, subquery: SoqlQuery) -> SoqlQuery:
+        """Add a parent-child relationship subquery to the SELECT list.
+
+        Raises:
+            ValueError: If the subquery has subqueries of its own (SOQL allows one level).
+        """
+        if subquery.subqueries:
+            raise ValueError("SOQL relationship subqueries cannot be nested")
+        return replace(self, subqueries=(*self.subqueries, subquery))
+
+    def where(self, *conditions: str) -> SoqlQuery:
+        """Add WHERE conditions, combined with AND.
+
+        Pass conditions built with the filter helpers; plain strings are
+        taken as trusted SOQL.
+        """
+        return replace(self, conditions=(*self.conditions, *conditions))
+
+    def group_by(self, *fields: str) -> SoqlQuery:
+        """Set the GROUP BY fields."""
+        return replace(self, group=fields)
+
+    def order_by(self, clause: str) -> SoqlQuery:
+        """Set the ORDER BY clause (e.g. ``"CreatedDate DESC"``)."""
+        return replace(self, order=clause)
+
+    def limit(self, row_limit: int) -> SoqlQuery:
+        """Set the LIMIT clause."""
+        return replace(self, row_limit=int(row_limit))
+
+    def build(self) -> str:
+        """Render the statement as canonical SOQL."""
+        select_list = _select_list(self.sobject, self.fields, self.subqueries)
+        return " ".join([f"SELECT {select_list} FROM {self.sobject}", *self._clauses()])
+
+    def returning(self) -> str:
+        """Render as a SOSL ``RETURNING`` object clause: ``sobject(fields WHERE ... LIMIT n)``."""
+        select_list = _select_list(self.sobject, self.fields, self.subqueries)
+        return f"{self.sobject}({' '.join([select_list, *self._clauses()])})"
+
+    def _clauses(self) -> list[str]:
+        parts: list[str] = []
+        if self.conditions:
+            parts.append("WHERE " + " AND ".join(sorted(set(self.conditions))))
+        if self.group:
+            parts.append("GROUP BY " + ", ".join(self.group))
+        if self.order:
+            parts.append(f"ORDER BY {self.order}")
+        if self.row_limit is not None:
+            parts.append(f"LIMIT {self.row_limit}")
+        return parts
+
+    def __str__(self) -> str:
+        return self.build()
+
+
+@lru_cache(maxsize=512)
+def _select_list(sobject: str, fields: tuple[str, ...], subqueries: tuple[SoqlQuery, ...]) -> str:
+    """Render the SELECT list; memoized, since it is the static part of most queries."""
+    unique: dict[str, str] = {}
+    for name in fields:
+        unique.setdefault(name.lower(), name)
+    select_list = [unique[key] for key in sorted(unique)]
+    select_list.extend(f"({subquery.build()})" for subquery in subqueries)
+    if not select_list:
+        raise ValueError(f"SOQL query on {sobject} selects no fields")
+    return ", ".join(select_list)
+
+
+# --- Results ---
+
+
+def normalize_records(records: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Strip ``attributes`` and flatten child-relationship envelopes, in place.
+
+    Parent relationships (``Owner``, ``Account.Owner``) stay nested dicts;
+    child relationships become plain lists of records. Works at any depth
+    in a single pass over the result.
+
+    Returns:
+        The same list, for chaining.
+    """
+    for record in records:
+        _normalize_record(record)
+    return records
+
+
+def _normalize_record(record: dict[str, Any]) -> None:
+    record.pop("attributes", None)
+    for key, value in record.items():
+        if isinstance(value, dict):
+            children = value.get("records")
+            if isinstance(children, list):
+                # Reassigning an existing key is safe while iterating items()
+                record[key] = normalize_records(children)
+            else:
+                _normalize_record(value)
+        elif isinstance(value, list):
+            for item in value:
+                if isinstance(item, dict):
+                    _normalize_record(item)
+
+
+def child_records(record: dict[str, Any], relationship: str) -> list[dict[str, Any]]:
+    """Return a normalized record's child rows, treating a null relationship as empty."""
+    children = record.get(relationship)
+    return children if isinstance(children, list) else []
@@ -13,6 +13,7 @@ logger = logging.getLogger(__name__)
 
 _tracer = None
 _meter = None
+_instruments: dict[str, Any] = {}
 
 
 def setup_telemetry(service_name: str) -> None:
@@ -73,6 +74,42 @@ def log_tool_invocation(tool_name: str, params: dict[str, Any], success: bool, d
                 span.set_attribute(f"mcp.tool.param.{key}", str(value))
 
 
+def record_metric(name: str, value: float, attributes: dict[str, Any] | None = None) -> None:
+    """Record a value on a named histogram metric.
+
+    Instruments are created lazily on first use. No-op when telemetry is disabled.
+
+    Args:
+        name: Metric name (e.g., 'salesforce.governor.wait_ms').
+        value: Value to record.
+        attributes: Optional metric dimensions.
+    """
+    if _meter is None:
+        return
+
+    histogram = _instruments.get(name)
+    if histogram is None:
+        histogram = _instruments[name] = _meter.create_histogram(name)
+    histogram.record(value, attributes=attributes or {})
+
+
+def increment_counter(name: str, amount: int = 1, attributes: dict[str, Any] | None = None) -> None:
+    """Add to a named counter metric. No-op when telemetry is disabled.
+
+    Args:
+        name: Metric name (e.g., 'salesforce.cache.hits').
+        amount: Amount to add.
+        attributes: Optional metric dimensions.
+    """
+    if _meter is None:
+        return
+
+    counter = _instruments.get(name)
+    if counter is None:
+        counter = _instruments[name] = _meter.create_counter(name)
+    counter.add(amount, attributes=attributes or {})
+
+
 def log_write_back_audit(
     tool_name: str,
     object_type: str,
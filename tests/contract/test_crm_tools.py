@@ -6,10 +6,13 @@ These are synchronous tests using unittest.mock to substitute the SalesforceClie
 
 from __future__ import annotations
 
-from unittest.mock import MagicMock, patch
+from collections import OrderedDict
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from shared.config import RiskThresholds
+
 # --- Fixtures ---
 
 @pytest.fixture
@@ -54,6 +57,16 @@ OPPORTUNITY_RECORD = {
     "LastActivityDate": "2025-01-15",
 }
 
+PIPELINE_GROUP = {
+    "stage": "Proposal/Price Quote",
+    "ownerId": "005000000000001",
+    "ownerName": "Jane Smith",
+    "dealCount": 1,
+    "totalValue": 250000.0,
+}
+
+AT_RISK_GROUP = {"ownerId": "005000000000001", "ownerName": "Jane Smith", "dealCount": 1}
+
 TASK_RECORD = {
     "Id": "00T000000000001",
     "Subject": "Follow up call",
@@ -156,6 +169,16 @@ class TestGetAccount:
 
         assert "code" in result or "error" in result or result.get("code") == "NOT_FOUND"
 
+    @patch("mcp_servers.salesforce_crm.tools.accounts._get_sf_client")
+    def test_get_account_rejects_malformed_id(self, mock_get_client, mock_sf_client):
+        mock_get_client.return_value = mock_sf_client
+
+        from mcp_servers.salesforce_crm.tools.accounts import get_account
+
+        result = get_account(account_id="001' OR Name != '")
+        assert result["code"] == "INVALID_INPUT"
+        mock_sf_client.query.assert_not_called()
+
     def test_get_account_no_input(self):
         from mcp_servers.salesforce_crm.tools.accounts import get_account
 
@@ -203,9 +226,8 @@ class TestGetContactsForAccount:
     @patch("mcp_servers.salesforce_crm.tools.contacts._get_sf_client")
     def test_get_contacts(self, mock_get_client, mock_sf_client):
         mock_get_client.return_value = mock_sf_client
-        mock_sf_client.query.side_effect = [
-            [CONTACT_RECORD],  # Contact query
-            [{"ContactId": "003000000000001", "Role": "Decision Maker"}],  # Roles query
+        mock_sf_client.query.return_value = [
+            {**CONTACT_RECORD, "OpportunityContactRoles": [{"Role": "Decision Maker"}]},
         ]
 
         from mcp_servers.salesforce_crm.tools.contacts import get_contacts_for_account
@@ -216,6 +238,43 @@ class TestGetContactsForAccount:
         assert result["total_count"] == 1
         assert result["contacts"][0]["name"] == "John Doe"
         assert result["contacts"][0]["role"] == "Decision Maker"
+        soql = mock_sf_client.query.call_args[0][0]
+        assert "(SELECT Role FROM OpportunityContactRoles " in soql
+        assert mock_sf_client.query.call_count == 1
+
+    @patch("mcp_servers.salesforce_crm.tools.contacts._get_sf_client")
+    def test_get_contacts_without_role_access(self, mock_get_client, mock_sf_client):
+        from shared.salesforce_client import SalesforceClientError
+
+        mock_get_client.return_value = mock_sf_client
+        mock_sf_client.query.side_effect = [
+            SalesforceClientError("AUTH_ERROR", "INSUFFICIENT_ACCESS on OpportunityContactRole"),
+            [CONTACT_RECORD],
+        ]
+
+        from mcp_servers.salesforce_crm.tools.contacts import get_contacts_for_account
+
+        result = get_contacts_for_account(account_id="001000000000001")
+
+        assert result["total_count"] == 1
+        assert result["contacts"][0]["role"] is None
+        assert "OpportunityContactRoles" not in mock_sf_client.query.call_args[0][0]
+
+    @patch("mcp_servers.salesforce_crm.tools.contacts._get_sf_client")
+    def test_get_contacts_auth_error_is_not_retried(self, mock_get_client, mock_sf_client):
+        from shared.salesforce_client import SalesforceClientError
+
+        mock_get_client.return_value = mock_sf_client
+        mock_sf_client.query.side_effect = SalesforceClientError(
+            "AUTH_ERROR", "Authentication failed: INVALID_SESSION_ID"
+        )
+
+        from mcp_servers.salesforce_crm.tools.contacts import get_contacts_for_account
+
+        result = get_contacts_for_account(account_id="001000000000001")
+
+        assert result["error"]["code"] == "AUTH_ERROR"
+        assert mock_sf_client.query.call_count == 1
 
 
 # --- Opportunity Tools ---
@@ -262,15 +321,12 @@ class TestGetPipelineSummary:
     @patch("mcp_servers.salesforce_crm.tools.opportunities._get_sf_client")
     def test_pipeline_summary_single_owner(self, mock_get_client, mock_thresholds, mock_sf_client):
         mock_get_client.return_value = mock_sf_client
-        mock_sf_client.query.return_value = [OPPORTUNITY_RECORD]
-        mock_thresholds.return_value = {
-            "stage_stagnation_days": 30,
-            "inactivity_days": 14,
-            "low_probability_threshold": 30,
-            "overdue_close_date": {"enabled": True},
-            "late_stages": ["Negotiation/Review"],
-            "minimum_amount_for_risk": 10000,
+        mock_sf_client.query_batch.return_value = {
+            "groups": [PIPELINE_GROUP],
+            "at_risk_groups": [AT_RISK_GROUP],
+            "candidates": [OPPORTUNITY_RECORD],
         }
+        mock_thresholds.return_value = RiskThresholds(late_stages=("Negotiation/Review",))
 
         from mcp_servers.salesforce_crm.tools.opportunities import get_pipeline_summary
 
@@ -280,30 +336,175 @@ class TestGetPipelineSummary:
         assert result["total_value"] == 250000.0
         assert "Proposal/Price Quote" in result["by_stage"]
         assert isinstance(result["at_risk_deals"], list)
+        aggregate_soql = mock_sf_client.query_batch.call_args[0][0]["groups"]
+        assert "GROUP BY StageName, OwnerId" in aggregate_soql
+        assert "LIMIT" not in aggregate_soql
+
+    @patch("mcp_servers.salesforce_crm.tools.opportunities._load_risk_thresholds")
+    @patch("mcp_servers.salesforce_crm.tools.opportunities._get_sf_client")
+    def test_pipeline_summary_counts_beyond_detail_rows(self, mock_get_client, mock_thresholds, mock_sf_client):
+        mock_get_client.return_value = mock_sf_client
+        mock_sf_client.query_batch.return_value = {
+            "groups": [
+                {**PIPELINE_GROUP, "dealCount": 180, "totalValue": 9000000.0},
+                {**PIPELINE_GROUP, "stage": "Prospecting", "dealCount": 320, "totalValue": 4000000.0},
+            ],
+            "at_risk_groups": [{**AT_RISK_GROUP, "dealCount": 240}],
+            "candidates": [OPPORTUNITY_RECORD],
+        }
+        mock_thresholds.return_value = RiskThresholds(minimum_amount_for_risk=10000)
+
+        from mcp_servers.salesforce_crm.tools.opportunities import get_pipeline_summary
+
+        result = get_pipeline_summary(owner_id="005000000000001")
+
+        assert result["total_deals"] == 500
+        assert result["total_value"] == 13000000.0
+        assert result["by_stage"]["Prospecting"] == {"count": 320, "value": 4000000.0}
+        assert len(result["at_risk_deals"]) == 1
+        assert result["total_at_risk"] == 240
+        assert result["at_risk_has_more"] is True
+        queries = mock_sf_client.query_batch.call_args[0][0]
+        candidates_soql = queries["candidates"]
+        assert "Amount >= 10000" in candidates_soql
+        assert "LastActivityDate = null" in candidates_soql
+        assert candidates_soql.endswith("LIMIT 200")
+        assert "COUNT(Id)" in queries["at_risk_groups"]
+        assert "Amount >= 10000" in queries["at_risk_groups"]
 
     @patch("mcp_servers.salesforce_crm.tools.opportunities._load_risk_thresholds")
     @patch("mcp_servers.salesforce_crm.tools.opportunities._get_sf_client")
     def test_pipeline_summary_manager(self, mock_get_client, mock_thresholds, mock_sf_client):
         mock_get_client.return_value = mock_sf_client
-        mock_sf_client.query.side_effect = [
-            [{"Id": "005000000000001"}],  # Team members
-            [OPPORTUNITY_RECORD],  # Opportunities
-        ]
-        mock_thresholds.return_value = {
-            "stage_stagnation_days": 30,
-            "inactivity_days": 14,
-            "low_probability_threshold": 30,
-            "overdue_close_date": {"enabled": True},
-            "late_stages": [],
-            "minimum_amount_for_risk": 10000,
+        mock_sf_client.query_batch.return_value = {
+            "groups": [PIPELINE_GROUP],  # Stage/owner aggregates
+            "at_risk_groups": [{**AT_RISK_GROUP, "dealCount": 3}],  # At-risk counts per owner
+            "candidates": [OPPORTUNITY_RECORD],  # At-risk candidates
         }
+        mock_thresholds.return_value = RiskThresholds(late_stages=())
 
         from mcp_servers.salesforce_crm.tools.opportunities import get_pipeline_summary
 
         result = get_pipeline_summary(manager_id="005000000000099")
 
         assert result["total_deals"] == 1
-        assert result["owner_breakdown"] is not None
+        assert result["owner_breakdown"]["Jane Smith"]["deal_count"] == 1
+        assert result["owner_breakdown"]["Jane Smith"]["at_risk_count"] == 3
+        assert "OwnerId IN (SELECT Id FROM User WHERE IsActive = true AND ManagerId = '005000000000099')" in (
+            mock_sf_client.query_batch.call_args[0][0]["groups"]
+        )
+        mock_sf_client.query.assert_not_called()
+
+    @patch("mcp_servers.salesforce_crm.tools.opportunities._load_risk_thresholds")
+    @patch("mcp_servers.salesforce_crm.tools.opportunities._get_sf_client")
+    def test_pipeline_summary_from_snapshot(self, mock_get_client, mock_thresholds, mock_sf_client, monkeypatch):
+        from shared import opportunity_snapshot
+
+        monkeypatch.setenv("SF_OPP_SNAPSHOT_ENABLED", "true")
+        monkeypatch.setattr(opportunity_snapshot, "_snapshots", OrderedDict())
+        mock_get_client.return_value = mock_sf_client
+        mock_sf_client.instance_url = "https://test.my.salesforce.com"
+        mock_sf_client.user_key = "005000000000001"
+        mock_sf_client.iter_query.return_value = iter([{**OPPORTUNITY_RECORD, "OwnerId": "005000000000001AAA"}])
+        mock_thresholds.return_value = RiskThresholds()
+
+        from mcp_servers.salesforce_crm.tools.opportunities import get_pipeline_summary
+
+        result = get_pipeline_summary(owner_id="005000000000001")
+
+        assert result["total_deals"] == 1
+        assert result["total_value"] == 250000.0
+        assert result["by_stage"]["Proposal/Price Quote"] == {"count": 1, "value": 250000.0}
+        mock_sf_client.query_batch.assert_not_called()
+
+
+# --- Case Tools ---
+
+class TestGetCase:
+    """Contract tests for get_case tool."""
+
+    @patch("mcp_servers.salesforce_crm.tools.cases._get_sf_client")
+    def test_get_case_without_comment_access(self, mock_get_client, mock_sf_client):
+        from shared.salesforce_client import SalesforceClientError
+
+        mock_get_client.return_value = mock_sf_client
+        mock_sf_client.query.side_effect = [
+            SalesforceClientError("SF_API_ERROR", "SOQL query failed: INVALID_TYPE: CaseComments"),
+            [CASE_RECORD],
+        ]
+
+        from mcp_servers.salesforce_crm.tools.cases import get_case
+
+        result = get_case(case_number="00012345")
+
+        assert "case" in result
+        assert "CaseComments" not in mock_sf_client.query.call_args[0][0]
+
+    @patch("mcp_servers.salesforce_crm.tools.cases._get_sf_client")
+    def test_get_case_auth_error_is_not_retried(self, mock_get_client, mock_sf_client):
+        from shared.salesforce_client import SalesforceClientError
+
+        mock_get_client.return_value = mock_sf_client
+        mock_sf_client.query.side_effect = SalesforceClientError(
+            "AUTH_ERROR", "Authentication failed: INVALID_SESSION_ID"
+        )
+
+        from mcp_servers.salesforce_crm.tools.cases import get_case
+
+        result = get_case(case_number="00012345")
+
+        assert result["error"]["code"] == "AUTH_ERROR"
+        assert mock_sf_client.query.call_count == 1
+
+
+class TestGetCaseQueueSummary:
+    """Contract tests for get_case_queue_summary tool."""
+
+    @patch("mcp_servers.salesforce_crm.tools.cases._get_sf_client")
+    def test_case_queue_summary_from_aggregates(self, mock_get_client, mock_sf_client):
+        mock_get_client.return_value = mock_sf_client
+        mock_sf_client.query_batch.return_value = {
+            "groups": [  # Status/priority groups
+                {"status": "New", "priority": "High", "caseCount": 400},
+                {"status": "Working", "priority": "High", "caseCount": 250},
+                {"status": "Working", "priority": "Low", "caseCount": 350},
+            ],
+            "0-24h": [{"caseCount": 100}],  # Created within 24h
+            "1-3d": [{"caseCount": 300}],  # Within 3d
+            "3-7d": [{"caseCount": 600}],  # Within 7d
+            "7-14d": [{"caseCount": 900}],  # Within 14d
+        }
+
+        from mcp_servers.salesforce_crm.tools.cases import get_case_queue_summary
+
+        result = get_case_queue_summary(queue_name="Tier 1 Support")
+
+        assert result["total_open"] == 1000
+        assert result["by_status"] == {"New": 400, "Working": 600}
+        assert result["by_priority"] == {"High": 650, "Low": 350}
+        assert result["aging_distribution"] == {
+            "0-24h": 100, "1-3d": 200, "3-7d": 300, "7-14d": 300, "14d+": 100,
+        }
+        assert result["sla_breached_count"] == 100
+        assert result["sla_compliance_pct"] == 90.0
+        mock_sf_client.query_batch.assert_called_once()
+        mock_sf_client.query.assert_not_called()
+        soqls = list(mock_sf_client.query_batch.call_args[0][0].values())
+        assert "GROUP BY Status, Priority" in soqls[0]
+        assert all("LIMIT" not in soql for soql in soqls)
+        assert all("CreatedDate >= " in soql for soql in soqls[1:])
+
+    @patch("mcp_servers.salesforce_crm.tools.cases.datetime")
+    def test_case_aging_cutoffs_are_not_rounded(self, mock_datetime):
+        from datetime import UTC, datetime
+
+        from mcp_servers.salesforce_crm.tools.cases import _case_queue_queries
+
+        mock_datetime.now.return_value = datetime(2025, 6, 15, 12, 34, 56, tzinfo=UTC)
+
+        queries = _case_queue_queries(None, "Tier 1 Support")
+
+        assert "CreatedDate >= 2025-06-14T12:34:56Z" in queries["0-24h"]
 
 
 # --- Activity Tools ---
@@ -314,10 +515,7 @@ class TestGetRecentActivities:
     @patch("mcp_servers.salesforce_crm.tools.activities._get_sf_client")
     def test_get_recent_activities(self, mock_get_client, mock_sf_client):
         mock_get_client.return_value = mock_sf_client
-        mock_sf_client.query.side_effect = [
-            [TASK_RECORD],  # Tasks
-            [EVENT_RECORD],  # Events
-        ]
+        mock_sf_client.query_batch.return_value = {"tasks": [TASK_RECORD], "events": [EVENT_RECORD]}
 
         from mcp_servers.salesforce_crm.tools.activities import get_recent_activities
 
@@ -364,6 +562,26 @@ class TestCreateTask:
 
 # --- Output Schema Validation ---
 
+class TestGetLeads:
+    """Contract tests for get_leads tool."""
+
+    @patch("mcp_servers.salesforce_crm.tools.leads._get_sf_client")
+    def test_get_leads(self, mock_get_client, mock_sf_client):
+        mock_get_client.return_value = mock_sf_client
+        mock_sf_client.query.return_value = [LEAD_RECORD]
+
+        from mcp_servers.salesforce_crm.tools.leads import get_leads
+
+        result = get_leads(status="Working")
+
+        assert result["total_count"] == 1
+        lead = result["leads"][0]
+        assert lead["name"] == "Alice Johnson"
+        assert lead["company"] == "Widgets Inc"
+        assert lead["owner_name"] == "Jane Smith"
+        assert "Status = 'Working'" in mock_sf_client.query.call_args[0][0]
+
+
 class TestOutputSchemas:
     """Verify output shapes match contract definitions."""
 
@@ -403,7 +621,7 @@ class TestOutputSchemas:
     @patch("mcp_servers.salesforce_crm.tools.contacts._get_sf_client")
     def test_contacts_output_shape(self, mock_get_client, mock_sf_client):
         mock_get_client.return_value = mock_sf_client
-        mock_sf_client.query.side_effect = [[CONTACT_RECORD], []]
+        mock_sf_client.query.return_value = [CONTACT_RECORD]
 
         from mcp_servers.salesforce_crm.tools.contacts import get_contacts_for_account
 
@@ -429,7 +647,7 @@ class TestOutputSchemas:
     @patch("mcp_servers.salesforce_crm.tools.activities._get_sf_client")
     def test_activities_output_shape(self, mock_get_client, mock_sf_client):
         mock_get_client.return_value = mock_sf_client
-        mock_sf_client.query.side_effect = [[TASK_RECORD], [EVENT_RECORD]]
+        mock_sf_client.query_batch.return_value = {"tasks": [TASK_RECORD], "events": [EVENT_RECORD]}
 
         from mcp_servers.salesforce_crm.tools.activities import get_recent_activities
 
@@ -437,3 +655,55 @@ class TestOutputSchemas:
 
         assert "activities" in result
         assert "total_count" in result
+
+
+# --- Native-async variants ---
+
+class TestAsyncVariants:
+    """Async tool variants return the same shapes as their sync counterparts."""
+
+    @patch("mcp_servers.salesforce_crm.tools.accounts._get_async_sf_client")
+    async def test_get_account_async(self, mock_get_client, mock_sf_client):
+        mock_get_client.return_value = mock_sf_client
+        mock_sf_client.query = AsyncMock(return_value=[ACCOUNT_RECORD])
+
+        from mcp_servers.salesforce_crm.tools.accounts import get_account_async
+
+        result = await get_account_async(account_id="001000000000001")
+
+        assert result["match_count"] == 1
+        assert result["account"]["name"] == "Acme Corp"
+
+    def test_register_async_variants_swaps_tools(self):
+        import asyncio
+
+        from mcp_servers.salesforce_crm import server
+        from mcp_servers.salesforce_crm.tools import users
+
+        server._register_async_variants(users)
+        try:
+            tool = server.mcp._tool_manager.get_tool("get_team_members")
+            assert tool.is_async
+            assert tool.description == users.get_team_members.__doc__.strip().replace("\n    ", "\n")
+        finally:
+            server.mcp.remove_tool("get_team_members")
+            server.mcp.add_tool(users.get_team_members)
+        assert asyncio.iscoroutinefunction(users.get_team_members_async)
+
+    def test_server_starts_with_async_tools_enabled(self):
+        import os
+        import subprocess
+        import sys
+
+        script = (
+            "from mcp_servers.salesforce_crm import server\n"
+            "server._register_tools()\n"
+            "tools = {t.name: t for t in server.mcp._tool_manager.list_tools()}\n"
+            "assert not any(name.startswith('_') for name in tools)\n"
+            "for name in ('get_opportunities', 'get_pipeline_summary', 'get_deal_activity_gaps'):\n"
+            "    assert tools[name].is_async, name\n"
+        )
+        env = {**os.environ, "MCP_ASYNC_TOOLS": "true"}
+        proc = subprocess.run([sys.executable, "-c", script], env=env, capture_output=True, text=True, timeout=60)
+
+        assert proc.returncode == 0, proc.stderr
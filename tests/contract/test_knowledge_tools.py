@@ -176,6 +176,47 @@ class TestGetArticleById:
         assert article["id"] == "ka0000000000001AAA"
         assert article["title"] == "How to Reset API Key"
 
+    def test_body_read_from_article_type_rich_text_fields(self, mock_sf_client):
+        """The body comes from the article type's rich-text fields, queried by ID."""
+        from mcp_servers.salesforce_knowledge.tools.articles import get_article_by_id
+
+        mock_sf_client.describe.return_value = {
+            "fields": [
+                {"name": "Title", "type": "string"},
+                {"name": "Steps__c", "type": "textarea", "extraTypeInfo": "richtextarea"},
+                {"name": "Notes__c", "type": "textarea", "extraTypeInfo": "plaintextarea"},
+            ]
+        }
+        mock_sf_client.query.side_effect = [
+            [SAMPLE_ARTICLES[0]],
+            [{"Id": "ka0000000000001AAA", "Steps__c": "<ol><li>Open <b>Settings</b></li><li>Reset</li></ol>"}],
+        ]
+
+        result = get_article_by_id(article_id="ka0000000000001AAA")
+
+        assert result["article"]["body"] == "- Open Settings\n- Reset"
+        mock_sf_client.describe.assert_called_once_with("How_To__kav")
+        body_soql = mock_sf_client.query.call_args_list[1][0][0]
+        assert body_soql == "SELECT Id, Steps__c FROM How_To__kav WHERE Id IN ('ka0000000000001AAA')"
+
+    def test_body_fetch_failure_returns_article_without_body(self, mock_sf_client):
+        """An unreadable rich-text field leaves the body out instead of failing the lookup."""
+        from mcp_servers.salesforce_knowledge.tools.articles import get_article_by_id
+        from shared.salesforce_client import SalesforceClientError
+
+        mock_sf_client.describe.return_value = {
+            "fields": [{"name": "Steps__c", "type": "textarea", "extraTypeInfo": "richtextarea"}]
+        }
+        mock_sf_client.query.side_effect = [
+            [SAMPLE_ARTICLES[0]],
+            SalesforceClientError("SF_API_ERROR", "SOQL query failed: INVALID_FIELD: Steps__c"),
+        ]
+
+        result = get_article_by_id(article_id="ka0000000000001AAA")
+
+        assert result["article"]["id"] == "ka0000000000001AAA"
+        assert not result["article"].get("body")
+
     def test_article_not_found(self, mock_sf_client):
         """Returns NOT_FOUND error for missing article."""
         from mcp_servers.salesforce_knowledge.tools.articles import get_article_by_id
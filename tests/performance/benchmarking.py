@@ -0,0 +1,28 @@
+"""Timing helpers shared by the performance micro-benchmarks."""
+
+from __future__ import annotations
+
+import os
+import time
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+
+ROUNDS = 5
+
+# Wall-clock comparisons are flaky on loaded CI runners, so they only run when asked for
+requires_benchmarks = pytest.mark.skipif(
+    not os.environ.get("RUN_BENCHMARKS"),
+    reason="RUN_BENCHMARKS not set — timing comparisons are opt-in",
+)
+
+
+def best_of(fn: Callable[[], Any], rounds: int = ROUNDS) -> float:
+    """Return the fastest of ``rounds`` timed calls to ``fn``, in seconds."""
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
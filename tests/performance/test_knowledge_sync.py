@@ -0,0 +1,58 @@
+"""Benchmark: sequential vs pipelined knowledge index uploads.
+
+Azure AI Search latency is simulated with a fixed per-request delay, so the
+numbers show how much of it the upload workers overlap.
+
+Usage:
+    python -m tests.performance.test_knowledge_sync
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+from shared.knowledge_sync import upload_documents
+from tests.performance.benchmarking import requires_benchmarks
+from tests.unit.test_knowledge_sync import SEARCH_ENDPOINT, FakeSearch, _doc
+
+DOCUMENT_COUNT = 2_000
+REQUEST_LATENCY = 0.02
+DOCUMENTS = [_doc(n, body="Knowledge article body. " * 40) for n in range(DOCUMENT_COUNT)]
+
+
+async def _upload(concurrency: int) -> float:
+    search = FakeSearch(delay=REQUEST_LATENCY)
+    start = time.perf_counter()
+    uploaded = await upload_documents(
+        DOCUMENTS, SEARCH_ENDPOINT, "key", concurrency=concurrency, transport=search.transport()
+    )
+    elapsed = time.perf_counter() - start
+    assert uploaded == DOCUMENT_COUNT
+    return elapsed
+
+
+class TestKnowledgeUploadBenchmark:
+    async def test_pipelined_upload_indexes_every_document(self) -> None:
+        search = FakeSearch()
+        uploaded = await upload_documents(
+            DOCUMENTS, SEARCH_ENDPOINT, "key", concurrency=4, transport=search.transport()
+        )
+        assert uploaded == DOCUMENT_COUNT
+        assert sorted(doc["id"] for batch in search.batches for doc in batch) == sorted(d["id"] for d in DOCUMENTS)
+
+    @requires_benchmarks
+    async def test_pipelined_upload_beats_sequential(self) -> None:
+        sequential = await _upload(1)
+        pipelined = await _upload(4)
+        assert pipelined < sequential / 2
+
+
+if __name__ == "__main__":
+    sequential = asyncio.run(_upload(1))
+    pipelined = asyncio.run(_upload(4))
+    print(
+        f"upload {DOCUMENT_COUNT} docs at {REQUEST_LATENCY * 1000:.0f} ms/request: "
+        f"sequential {sequential * 1000:7.1f} ms, 4 workers {pipelined * 1000:7.1f} ms "
+        f"({sequential / pipelined:.1f}x)"
+    )
@@ -0,0 +1,69 @@
+"""Memory benchmark: bytes per record, Pydantic models vs compact records.
+
+Usage:
+    python -m tests.performance.test_memory
+"""
+
+from __future__ import annotations
+
+import gc
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+
+from mcp_servers.salesforce_crm.tools.accounts import ACCOUNT_MAPPER
+from mcp_servers.salesforce_crm.tools.opportunities import OPPORTUNITY_MAPPER
+from shared.mappers import RecordMapper
+from tests.performance.test_serialization import ACCOUNT_RECORDS, OPPORTUNITY_RECORDS
+
+
+def _bytes_per_record(build: Callable[[], list[Any]], count: int) -> float:
+    """Bytes allocated, and still held, per record by ``build()``."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        held = build()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    assert len(held) == count
+    return (after - before) / count
+
+
+def _compare(mapper: RecordMapper, records: list[dict[str, Any]]) -> tuple[float, float]:
+    """Return (model bytes/record, compact bytes/record) for one batch of mapped rows."""
+    rows = mapper.many(records)
+    model = mapper.model
+    record_type = type(mapper.records(records[:1])[0])
+    models = _bytes_per_record(lambda: [model.model_validate(row) for row in rows], len(rows))
+    compact = _bytes_per_record(lambda: [record_type(**row) for row in rows], len(rows))
+    return models, compact
+
+
+class TestRecordMemory:
+    @pytest.fixture(autouse=True)
+    def _fast_path(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.delenv("MCP_STRICT_OUTPUT", raising=False)
+
+    def test_opportunity_records_are_smaller(self) -> None:
+        models, compact = _compare(OPPORTUNITY_MAPPER, OPPORTUNITY_RECORDS)
+        assert compact * 2 < models
+
+    def test_account_records_are_smaller(self) -> None:
+        models, compact = _compare(ACCOUNT_MAPPER, ACCOUNT_RECORDS)
+        assert compact * 2 < models
+
+
+if __name__ == "__main__":
+    for label, mapper, records in (
+        ("opportunities", OPPORTUNITY_MAPPER, OPPORTUNITY_RECORDS),
+        ("accounts", ACCOUNT_MAPPER, ACCOUNT_RECORDS),
+    ):
+        models, compact = _compare(mapper, records)
+        print(
+            f"{label:>14}: model {models:6.0f} B/record, compact {compact:6.0f} B/record "
+            f"({models / compact:.1f}x) for {len(records)} records"
+        )
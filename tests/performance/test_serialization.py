@@ -0,0 +1,130 @@
+"""Micro-benchmark: record mapping fast path vs Pydantic model round-trip.
+
+Usage:
+    python -m tests.performance.test_serialization
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import date
+from typing import Any
+
+import pytest
+
+from mcp_servers.salesforce_crm.tools.accounts import ACCOUNT_MAPPER
+from mcp_servers.salesforce_crm.tools.opportunities import OPPORTUNITY_MAPPER
+from shared.mappers import RecordMapper
+from shared.models import AccountSummary, OpportunitySummary
+from tests.performance.benchmarking import best_of, requires_benchmarks
+
+RECORD_COUNT = 2000
+
+OPPORTUNITY_RECORDS = [
+    {
+        "Id": f"006{i:012d}",
+        "Name": f"Deal {i}",
+        "Amount": 1000.0 * i,
+        "StageName": "Proposal/Price Quote",
+        "CloseDate": "2025-03-15",
+        "Probability": 60.0,
+        "Owner": {"Name": "Jane Smith"},
+        "Account": {"Name": "Acme Corp"},
+        "LastActivityDate": "2025-01-15",
+    }
+    for i in range(RECORD_COUNT)
+]
+
+ACCOUNT_RECORDS = [
+    {
+        "Id": f"001{i:012d}",
+        "Name": f"Account {i}",
+        "Industry": "Technology",
+        "Type": "Customer",
+        "AnnualRevenue": 5000000.0,
+        "BillingCity": "San Francisco",
+        "BillingState": "CA",
+        "Owner": {"Name": "Jane Smith"},
+        "Description": None,
+    }
+    for i in range(RECORD_COUNT)
+]
+
+
+def _opportunity_via_model(record: dict[str, Any]) -> dict[str, Any]:
+    """The pre-mapper path: build the model field by field, then dump it."""
+    owner = record.get("Owner") or {}
+    account = record.get("Account") or {}
+    close_date_str = record.get("CloseDate", "")
+    last_activity_str = record.get("LastActivityDate")
+    return OpportunitySummary(
+        id=record["Id"],
+        name=record["Name"],
+        amount=record.get("Amount"),
+        stage=record.get("StageName", ""),
+        close_date=date.fromisoformat(close_date_str) if close_date_str else date.today(),
+        probability=record.get("Probability"),
+        owner_name=owner.get("Name") if isinstance(owner, dict) else None,
+        account_name=account.get("Name") if isinstance(account, dict) else None,
+        last_activity_date=date.fromisoformat(last_activity_str) if last_activity_str else None,
+        risk_flags=[],
+    ).model_dump()
+
+
+def _account_via_model(record: dict[str, Any]) -> dict[str, Any]:
+    """The pre-mapper path: build the model field by field, then dump it."""
+    owner = record.get("Owner") or {}
+    return AccountSummary(
+        id=record["Id"],
+        name=record["Name"],
+        industry=record.get("Industry"),
+        type=record.get("Type"),
+        annual_revenue=record.get("AnnualRevenue"),
+        billing_city=record.get("BillingCity"),
+        billing_state=record.get("BillingState"),
+        owner_name=owner.get("Name") if isinstance(owner, dict) else None,
+        description=record.get("Description"),
+    ).model_dump()
+
+
+def _compare(
+    mapper: RecordMapper,
+    via_model: Callable[[dict[str, Any]], dict[str, Any]],
+    records: list[dict[str, Any]],
+) -> tuple[float, float]:
+    """Return (model round-trip seconds, mapper seconds) for one batch."""
+    return best_of(lambda: [via_model(r) for r in records]), best_of(lambda: mapper.many(records))
+
+
+class TestMappingBenchmark:
+    @pytest.fixture(autouse=True)
+    def _fast_path(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.delenv("MCP_STRICT_OUTPUT", raising=False)
+
+    def test_opportunity_fast_path_matches_model_round_trip(self) -> None:
+        assert OPPORTUNITY_MAPPER.many(OPPORTUNITY_RECORDS) == [_opportunity_via_model(r) for r in OPPORTUNITY_RECORDS]
+
+    def test_account_fast_path_matches_model_round_trip(self) -> None:
+        assert ACCOUNT_MAPPER.many(ACCOUNT_RECORDS) == [_account_via_model(r) for r in ACCOUNT_RECORDS]
+
+    @requires_benchmarks
+    def test_opportunity_fast_path_beats_model_round_trip(self) -> None:
+        slow, fast = _compare(OPPORTUNITY_MAPPER, _opportunity_via_model, OPPORTUNITY_RECORDS)
+        assert fast < slow
+
+    @requires_benchmarks
+    def test_account_fast_path_beats_model_round_trip(self) -> None:
+        slow, fast = _compare(ACCOUNT_MAPPER, _account_via_model, ACCOUNT_RECORDS)
+        assert fast < slow
+
+
+if __name__ == "__main__":
+    for label, mapper, via_model, records in (
+        ("opportunities", OPPORTUNITY_MAPPER, _opportunity_via_model, OPPORTUNITY_RECORDS),
+        ("accounts", ACCOUNT_MAPPER, _account_via_model, ACCOUNT_RECORDS),
+    ):
+        slow, fast = _compare(mapper, via_model, records)
+        print(
+            f"{label:>14}: model round-trip {slow * 1000:7.2f} ms, "
+            f"mapper {fast * 1000:7.2f} ms ({slow / fast:.1f}x) for {len(records)} records"
+        )
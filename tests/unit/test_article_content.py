@@ -0,0 +1,128 @@
+"""Unit tests for shared/article_content.py."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from shared.article_content import (
+    chunk_text,
+    count_tokens,
+    fetch_article_bodies,
+    fetch_article_bodies_async,
+    html_to_text,
+    rich_text_fields,
+)
+
+FAQ_DESCRIBE = {
+    "fields": [
+        {"name": "Id", "type": "id"},
+        {"name": "Question__c", "type": "textarea", "extraTypeInfo": "richtextarea"},
+        {"name": "Internal_Notes__c", "type": "textarea", "extraTypeInfo": "plaintextarea"},
+        {"name": "Answer__c", "type": "textarea", "extraTypeInfo": "richtextarea"},
+    ]
+}
+
+
+class TestHtmlToText:
+    def test_keeps_block_structure(self) -> None:
+        html = (
+            "<h2>Reset&nbsp;your key</h2><p>Open <b>Settings</b> &amp; click\n  <i>Reset</i>.</p>"
+            "<ul><li>Old keys stop working</li><li>Update clients</li></ul>Done<br>Thanks"
+        )
+        assert html_to_text(html) == (
+            "Reset your key\nOpen Settings & click Reset.\n- Old keys stop working\n- Update clients\nDone\nThanks"
+        )
+
+    def test_drops_scripts_styles_and_comments(self) -> None:
+        html = "<style>p {color: red}</style><p>Visible<!-- hidden --></p><script>alert('x')</script>"
+        assert html_to_text(html) == "Visible"
+
+    def test_streams_pieces_split_mid_tag(self) -> None:
+        assert html_to_text(["<p>Hel", "lo <b", ">world</b></p><p>again</p>"]) == "Hello world\nagain"
+
+    def test_empty(self) -> None:
+        assert html_to_text(None) == ""
+        assert html_to_text("") == ""
+
+
+class TestChunkText:
+    def test_short_text_is_one_chunk(self) -> None:
+        assert chunk_text("One paragraph.\nAnother.", max_tokens=50, overlap_tokens=0) == ["One paragraph.\nAnother."]
+
+    def test_chunks_respect_token_budget_and_overlap(self) -> None:
+        text = " ".join(f"Sentence number {i} is here." for i in range(60))
+        chunks = chunk_text(text, max_tokens=40, overlap_tokens=8)
+
+        assert len(chunks) > 1
+        assert all(count_tokens(chunk) <= 40 for chunk in chunks)
+        # Every chunk after the first starts with the last sentence of the previous one
+        for previous, current in zip(chunks, chunks[1:], strict=False):
+            assert current.split("\n")[0] == previous.split("\n")[-1]
+        assert "Sentence number 59 is here." in chunks[-1]
+
+    def test_prefers_paragraph_breaks(self) -> None:
+        paragraphs = ["alpha " * 10, "beta " * 10, "gamma " * 10]
+        chunks = chunk_text("\n".join(paragraphs), max_tokens=15, overlap_tokens=0)
+        assert chunks == [p.strip() for p in paragraphs]
+
+    def test_splits_overlong_sentence(self) -> None:
+        chunks = chunk_text("word " * 95, max_tokens=30, overlap_tokens=0)
+        assert [count_tokens(chunk) for chunk in chunks] == [30, 30, 30, 5]
+
+    def test_rejects_overlap_not_below_budget(self) -> None:
+        with pytest.raises(ValueError):
+            chunk_text("text", max_tokens=10, overlap_tokens=10)
+
+
+class FakeClient:
+    def __init__(self) -> None:
+        self.describes: list[str] = []
+        self.queries: list[str] = []
+
+    def describe(self, sobject: str) -> dict[str, Any]:
+        self.describes.append(sobject)
+        return FAQ_DESCRIBE if sobject == "FAQ__kav" else {"fields": []}
+
+    def query(self, soql: str) -> list[dict[str, Any]]:
+        self.queries.append(soql)
+        return [
+            {"Id": "ka1", "Question__c": "<p>Why?</p>", "Answer__c": "<p>Because.</p>"},
+            {"Id": "ka2", "Question__c": None, "Answer__c": "<p>Only answer</p>"},
+        ]
+
+
+class AsyncFakeClient(FakeClient):
+    async def describe(self, sobject: str) -> dict[str, Any]:  # type: ignore[override]
+        return FakeClient.describe(self, sobject)
+
+    async def query(self, soql: str) -> list[dict[str, Any]]:  # type: ignore[override]
+        return FakeClient.query(self, soql)
+
+
+ARTICLES = [
+    {"Id": "ka1", "ArticleType": "FAQ__kav"},
+    {"Id": "ka2", "ArticleType": "FAQ__kav"},
+    {"Id": "ka3", "ArticleType": "Plain__kav"},
+    {"Id": "ka4", "ArticleType": "Account' OR Name != '"},
+]
+
+
+class TestFetchArticleBodies:
+    def test_rich_text_fields_in_describe_order(self) -> None:
+        assert rich_text_fields(FAQ_DESCRIBE) == ("Question__c", "Answer__c")
+
+    def test_one_query_per_article_type(self) -> None:
+        sf = FakeClient()
+        bodies = fetch_article_bodies(sf, ARTICLES)
+
+        assert bodies == {"ka1": "<p>Why?</p>\n<p>Because.</p>", "ka2": "<p>Only answer</p>"}
+        # Malformed article types are never described or queried
+        assert sf.describes == ["FAQ__kav", "Plain__kav"]
+        assert sf.queries == ["SELECT Answer__c, Id, Question__c FROM FAQ__kav WHERE Id IN ('ka1', 'ka2')"]
+
+    async def test_async_matches_sync(self) -> None:
+        assert await fetch_article_bodies_async(AsyncFakeClient(), ARTICLES) == fetch_article_bodies(
+            FakeClient(), ARTICLES
+        )
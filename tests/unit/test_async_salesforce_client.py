@@ -0,0 +1,230 @@
+"""Unit tests for shared/async_salesforce_client.py."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+
+import httpx
+import pytest
+
+from shared.async_salesforce_client import AsyncSalesforceClient
+from shared.cache import SqliteCacheBackend
+from shared.config import QueryCacheConfig, RateLimitConfig
+from shared.rate_limiter import RequestGovernor
+from shared.salesforce_client import (
+    ApiUsageTracker,
+    QueryCache,
+    SalesforceClientError,
+    WriteBackConfirmationError,
+)
+
+INSTANCE_URL = "https://test.salesforce.com"
+
+
+def _client(handler) -> AsyncSalesforceClient:
+    return AsyncSalesforceClient(INSTANCE_URL, "token", transport=httpx.MockTransport(handler))
+
+
+class TestAsyncSalesforceClient:
+    async def test_query_success(self) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            assert request.url.path == "/services/data/v62.0/query/"
+            assert request.url.params["q"] == "SELECT Id FROM Account"
+            assert request.headers["Authorization"] == "Bearer token"
+            return httpx.Response(
+                200,
+                json={"records": [{"attributes": {"type": "Account"}, "Id": "001XXX", "Owner": {"attributes": {}}}]},
+            )
+
+        async with _client(handler) as client:
+            records = await client.query("SELECT Id FROM Account")
+
+        assert records == [{"Id": "001XXX", "Owner": {}}]
+        assert client.usage.calls_made == 1
+
+    async def test_in_flight_counts_open_requests(self) -> None:
+        seen: list[int] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(client.in_flight)
+            return httpx.Response(200, json={"records": []})
+
+        async with _client(handler) as client:
+            await client.query("SELECT Id FROM Account")
+
+        assert seen == [1]
+        assert client.in_flight == 0
+
+    async def test_query_all_follows_next_records_url(self) -> None:
+        pages = {
+            "/services/data/v62.0/query/": {
+                "records": [{"Id": "1"}, {"Id": "2"}],
+                "nextRecordsUrl": "/services/data/v62.0/query/01g-2000",
+            },
+            "/services/data/v62.0/query/01g-2000": {"records": [{"Id": "3"}]},
+        }
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, json=pages[request.url.path])
+
+        async with _client(handler) as client:
+            records = await client.query_all("SELECT Id FROM Account")
+            capped = await client.query_all("SELECT Id FROM Account", max_results=1)
+
+        assert [r["Id"] for r in records] == ["1", "2", "3"]
+        assert [r["Id"] for r in capped] == ["1"]
+
+    async def test_iter_query_stops_before_next_page(self) -> None:
+        requested: list[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requested.append(request.url.path)
+            return httpx.Response(
+                200,
+                json={"done": False, "nextRecordsUrl": "/services/data/v62.0/query/01g-2000", "records": [{"Id": "1"}]},
+            )
+
+        async with _client(handler) as client:
+            records = [r async for r in client.iter_query("SELECT Id FROM Account", max_results=1)]
+
+        assert records == [{"Id": "1"}]
+        assert requested == ["/services/data/v62.0/query/"]
+
+    async def test_query_batch_one_round_trip(self) -> None:
+        requested: list[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requested.append(request.url.path)
+            assert len(json.loads(request.content)["batchRequests"]) == 2
+            return httpx.Response(
+                200,
+                json={
+                    "results": [
+                        {"statusCode": 200, "result": {"records": [{"attributes": {}, "Id": "00T1"}]}},
+                        {"statusCode": 200, "result": {"records": []}},
+                    ]
+                },
+            )
+
+        async with _client(handler) as client:
+            results = await client.query_batch({"tasks": "SELECT Id FROM Task", "events": "SELECT Id FROM Event"})
+
+        assert results == {"tasks": [{"Id": "00T1"}], "events": []}
+        assert requested == ["/services/data/v62.0/composite/batch"]
+        assert client.usage.calls_made == 1
+
+    async def test_identical_concurrent_queries_coalesced(self) -> None:
+        requested: list[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requested.append(request.url.params["q"])
+            return httpx.Response(200, json={"records": [{"Id": "001XXX"}]})
+
+        async with _client(handler) as client:
+            first, second, other = await asyncio.gather(
+                client.query("SELECT Id FROM Account"),
+                client.query("SELECT Id  FROM Account"),
+                client.query("SELECT Id FROM Contact"),
+            )
+
+        assert first == second == [{"Id": "001XXX"}]
+        assert first is not second
+        assert sorted(requested) == ["SELECT Id FROM Account", "SELECT Id FROM Contact"]
+        assert client.usage.calls_made == 2
+
+    async def test_query_auth_error(self) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(401, json=[{"errorCode": "INVALID_SESSION_ID", "message": "Session expired"}])
+
+        async with _client(handler) as client:
+            with pytest.raises(SalesforceClientError) as exc_info:
+                await client.query("SELECT Id FROM Account")
+        assert exc_info.value.code == "AUTH_ERROR"
+
+    async def test_query_rate_limit_exceeded(self) -> None:
+        async with _client(lambda request: httpx.Response(200, json={})) as client:
+            client._usage = ApiUsageTracker(daily_limit=0)
+            with pytest.raises(SalesforceClientError) as exc_info:
+                await client.query("SELECT Id FROM Account")
+        assert exc_info.value.code == "RATE_LIMIT_EXCEEDED"
+
+    async def test_create_record_requires_confirmation(self) -> None:
+        async with _client(lambda request: httpx.Response(500)) as client:
+            with pytest.raises(WriteBackConfirmationError):
+                await client.create_record("Case", {"Subject": "Test"})
+
+    async def test_create_record_confirmed(self) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            assert request.method == "POST"
+            assert json.loads(request.content) == {"Subject": "Test"}
+            return httpx.Response(201, json={"id": "500XXX", "success": True, "errors": []})
+
+        async with _client(handler) as client:
+            result = await client.create_record("Case", {"Subject": "Test"}, confirmed=True)
+        assert result["id"] == "500XXX"
+
+    async def test_update_record_not_found(self) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            assert request.method == "PATCH"
+            return httpx.Response(404, json=[{"errorCode": "NOT_FOUND", "message": "Not found"}])
+
+        async with _client(handler) as client:
+            with pytest.raises(SalesforceClientError) as exc_info:
+                await client.update_record("Case", "500XXX", {"Status": "Working"}, confirmed=True)
+        assert exc_info.value.code == "NOT_FOUND"
+
+    async def test_search(self) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(
+                200,
+                json={"searchRecords": [{"attributes": {"type": "KnowledgeArticleVersion"}, "Id": "kaXXX"}]},
+            )
+
+        async with _client(handler) as client:
+            records = await client.search("FIND {test}")
+        assert records == [{"Id": "kaXXX"}]
+
+    async def test_rejected_by_governor_is_not_counted(self) -> None:
+        governor = RequestGovernor(RateLimitConfig(org_max_in_flight=0, max_queue_depth=0))
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            raise AssertionError("request should not be sent")
+
+        transport = httpx.MockTransport(handler)
+        async with AsyncSalesforceClient(INSTANCE_URL, "token", transport=transport, governor=governor) as client:
+            with pytest.raises(SalesforceClientError) as exc_info:
+                await client.query("SELECT Id FROM Account")
+
+        assert exc_info.value.code == "RATE_LIMIT_EXCEEDED"
+        assert client.usage.calls_made == 0
+
+    async def test_usage_synced_from_limit_header(self) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, json={"records": []}, headers={"Sforce-Limit-Info": "api-usage=90/100"})
+
+        async with _client(handler) as client:
+            await client.query("SELECT Id FROM Account")
+        assert client.usage.calls_made == 90
+        assert client.usage.is_warning
+
+    async def test_blocking_cache_backend_runs_off_the_event_loop(self, tmp_path) -> None:
+        threads: list[int] = []
+
+        class RecordingBackend(SqliteCacheBackend):
+            def get(self, key: str) -> bytes | None:
+                threads.append(threading.get_ident())
+                return super().get(key)
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, json={"records": [{"Id": "001XXX"}]})
+
+        cache = QueryCache(QueryCacheConfig(), RecordingBackend(str(tmp_path / "cache.db"), 100))
+        transport = httpx.MockTransport(handler)
+        async with AsyncSalesforceClient(INSTANCE_URL, "token", transport=transport, query_cache=cache) as client:
+            await client.query("SELECT Id FROM Account")
+            assert await client.query("SELECT Id FROM Account") == [{"Id": "001XXX"}]
+
+        assert client.usage.calls_made == 1
+        assert threads and threading.get_ident() not in threads
@@ -0,0 +1,201 @@
+"""Unit tests for shared/cache.py."""
+
+from __future__ import annotations
+
+import socketserver
+import threading
+import time
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+
+from shared.cache import (
+    CacheBackend,
+    MemoryCacheBackend,
+    RedisCacheBackend,
+    RedisProtocolError,
+    SqliteCacheBackend,
+    create_cache_backend,
+    pack,
+    unpack,
+)
+from shared.config import QueryCacheConfig
+from shared.salesforce_client import QueryCache
+
+
+class _FakeRedisHandler(socketserver.StreamRequestHandler):
+    """Implements the subset of RESP commands RedisCacheBackend uses."""
+
+    def handle(self) -> None:
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            args = [self.rfile.read(int(self.rfile.readline()[1:-2]) + 2)[:-2] for _ in range(int(line[1:-2]))]
+            self.wfile.write(self._dispatch(args[0].upper(), args[1:]))
+
+    def _dispatch(self, command: bytes, args: list[bytes]) -> bytes:
+        store: dict[bytes, Any] = self.server.store  # type: ignore[attr-defined]
+        expiry: dict[bytes, float] = self.server.expiry  # type: ignore[attr-defined]
+        now = time.monotonic()
+        for key in [k for k, t in expiry.items() if t <= now]:
+            store.pop(key, None)
+            expiry.pop(key)
+
+        if command == b"PING":
+            return b"+PONG\r\n"
+        if command == b"GET":
+            value = store.get(args[0])
+            return b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value)
+        if command == b"SET":
+            if self.server.oom:  # type: ignore[attr-defined]
+                return b"-OOM command not allowed when used memory > 'maxmemory'\r\n"
+            store[args[0]] = args[1]
+            expiry[args[0]] = now + int(args[3]) / 1000
+            return b"+OK\r\n"
+        if command == b"SADD":
+            store.setdefault(args[0], set()).add(args[1])
+            return b":1\r\n"
+        if command == b"PEXPIRE":
+            expiry[args[0]] = now + int(args[1]) / 1000
+            return b":1\r\n"
+        if command == b"SMEMBERS":
+            members = store.get(args[0], set())
+            return b"*%d\r\n" % len(members) + b"".join(b"$%d\r\n%s\r\n" % (len(m), m) for m in members)
+        if command == b"DEL":
+            removed = sum(1 for key in args if store.pop(key, None) is not None)
+            return b":%d\r\n" % removed
+        if command == b"SCAN":
+            keys = [k for k in store if k.startswith(args[2].rstrip(b"*"))]
+            return b"*2\r\n$1\r\n0\r\n*%d\r\n" % len(keys) + b"".join(b"$%d\r\n%s\r\n" % (len(k), k) for k in keys)
+        return b"-ERR unknown command\r\n"
+
+
+@pytest.fixture
+def fake_redis_server() -> Iterator[socketserver.ThreadingTCPServer]:
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _FakeRedisHandler)
+    server.daemon_threads = True
+    server.store = {}  # type: ignore[attr-defined]
+    server.expiry = {}  # type: ignore[attr-defined]
+    server.oom = False  # type: ignore[attr-defined]
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def fake_redis_url(fake_redis_server: socketserver.ThreadingTCPServer) -> str:
+    return f"redis://127.0.0.1:{fake_redis_server.server_address[1]}/0"
+
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+def backend(request: pytest.FixtureRequest, tmp_path, fake_redis_url: str) -> Iterator[CacheBackend]:
+    backend = create_cache_backend(
+        request.param,
+        max_entries=100,
+        sqlite_path=str(tmp_path / "cache.db"),
+        redis_url=fake_redis_url,
+    )
+    yield backend
+    backend.close()
+
+
+class TestSerialization:
+    def test_round_trip(self) -> None:
+        records = [{"Id": "001", "Amount": 1.5, "IsClosed": False, "Owner": {"Name": "Ana"}, "Tags": None}]
+        assert unpack(pack(records)) == records
+
+
+class TestCacheBackends:
+    def test_set_get(self, backend: CacheBackend) -> None:
+        backend.set("k1", b"value", 60, ["Account"])
+        assert backend.get("k1") == b"value"
+        assert backend.get("missing") is None
+
+    def test_expired_entry_misses(self, backend: CacheBackend) -> None:
+        backend.set("k1", b"value", 0.01)
+        time.sleep(0.03)
+        assert backend.get("k1") is None
+
+    def test_invalidate_tag(self, backend: CacheBackend) -> None:
+        backend.set("k1", b"a", 60, ["Account", "Contact"])
+        backend.set("k2", b"b", 60, ["User"])
+
+        assert backend.invalidate_tag("Contact") == 1
+        assert backend.get("k1") is None
+        assert backend.get("k2") == b"b"
+
+    def test_clear(self, backend: CacheBackend) -> None:
+        backend.set("k1", b"a", 60)
+        backend.clear()
+        assert backend.get("k1") is None
+
+
+class TestBoundedBackends:
+    def test_memory_lru(self) -> None:
+        backend = MemoryCacheBackend(max_entries=2)
+        backend.set("a", b"1", 60)
+        backend.set("b", b"2", 60)
+        backend.get("a")
+        backend.set("c", b"3", 60)
+
+        assert backend.get("b") is None
+        assert backend.get("a") == b"1"
+
+    def test_sqlite_bound_and_shared_file(self, tmp_path) -> None:
+        path = str(tmp_path / "cache.db")
+        writer = SqliteCacheBackend(path, max_entries=2)
+        for key in ("a", "b", "c"):
+            writer.set(key, key.encode(), 60)
+
+        reader = SqliteCacheBackend(path, max_entries=2)
+        assert reader.get("a") is None
+        assert reader.get("c") == b"c"
+        assert reader.size() == 2
+
+
+class TestRedisBackend:
+    def test_ping(self, fake_redis_url: str) -> None:
+        assert RedisCacheBackend(fake_redis_url).ping()
+
+    def test_error_reply_mid_pipeline_keeps_replies_in_step(
+        self, fake_redis_server: socketserver.ThreadingTCPServer, fake_redis_url: str
+    ) -> None:
+        backend = RedisCacheBackend(fake_redis_url)
+        backend.set("k1", b"v1", 60, tags=["Account"])
+
+        fake_redis_server.oom = True  # type: ignore[attr-defined]
+        with pytest.raises(RedisProtocolError, match="OOM"):
+            backend.set("k2", b"v2", 60, tags=["Account", "Contact"])
+        fake_redis_server.oom = False  # type: ignore[attr-defined]
+
+        assert backend.get("k1") == b"v1"
+        assert backend.get("k2") is None
+        assert backend.ping()
+
+    def test_unreachable_server_raises_os_error(self) -> None:
+        backend = RedisCacheBackend("redis://127.0.0.1:1", timeout=0.2)
+        with pytest.raises(OSError):
+            backend.get("k1")
+
+
+class TestQueryCacheWithBackend:
+    def test_shared_backend_serves_other_replica(self, fake_redis_url: str) -> None:
+        replica_a = QueryCache(QueryCacheConfig(), RedisCacheBackend(fake_redis_url))
+        replica_b = QueryCache(QueryCacheConfig(), RedisCacheBackend(fake_redis_url))
+
+        replica_a.put("user", "query", "SELECT Id FROM Account", [{"Id": "001"}])
+        assert replica_b.get("user", "query", "SELECT Id FROM Account") == [{"Id": "001"}]
+
+        replica_b.invalidate("Account")
+        assert replica_a.get("user", "query", "SELECT Id FROM Account") is None
+
+    def test_backend_failure_is_a_miss(self) -> None:
+        cache = QueryCache(QueryCacheConfig(), RedisCacheBackend("redis://127.0.0.1:1", timeout=0.2))
+
+        cache.put("user", "query", "SELECT Id FROM Account", [])
+        assert cache.get("user", "query", "SELECT Id FROM Account") is None
+        assert cache.stats()["errors"] == 2
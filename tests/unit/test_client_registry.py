@@ -0,0 +1,152 @@
+"""Unit tests for shared/client_registry.py."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from shared.client_registry import ClientRegistry, _TrackedSession
+from shared.config import SalesforcePoolConfig
+from shared.salesforce_client import SalesforceClient
+
+INSTANCE_URL = "https://test.salesforce.com"
+
+
+@pytest.fixture
+def mock_sf_class():
+    with patch("shared.salesforce_client.Salesforce") as sf_class:
+        sf_class.side_effect = lambda **kwargs: MagicMock(session=kwargs.get("session"))
+        yield sf_class
+
+
+@contextmanager
+def _request_in_flight(client: SalesforceClient) -> Iterator[None]:
+    """Hold a request open on the client's pooled session."""
+    session = client._sf.session
+    session.in_flight += 1
+    try:
+        yield
+    finally:
+        session.in_flight -= 1
+
+
+class TestClientRegistry:
+    def test_reuses_client_for_same_credentials(self, mock_sf_class: MagicMock) -> None:
+        registry = ClientRegistry(SalesforcePoolConfig())
+
+        first = registry.get_client(INSTANCE_URL, "token-a")
+        second = registry.get_client(INSTANCE_URL + "/", "token-a")
+
+        assert first is second
+        assert mock_sf_class.call_count == 1
+
+    def test_separate_clients_per_token(self, mock_sf_class: MagicMock) -> None:
+        registry = ClientRegistry(SalesforcePoolConfig())
+
+        first = registry.get_client(INSTANCE_URL, "token-a")
+        second = registry.get_client(INSTANCE_URL, "token-b")
+
+        assert first is not second
+        assert registry.stats()["clients"] == 2
+
+    def test_session_uses_configured_pool_size(self, mock_sf_class: MagicMock) -> None:
+        registry = ClientRegistry(SalesforcePoolConfig(pool_maxsize=7))
+
+        registry.get_client(INSTANCE_URL, "token-a")
+
+        session = mock_sf_class.call_args.kwargs["session"]
+        assert session.get_adapter(INSTANCE_URL)._pool_maxsize == 7
+
+    def test_idle_clients_are_evicted(self, mock_sf_class: MagicMock) -> None:
+        registry = ClientRegistry(SalesforcePoolConfig(idle_timeout_seconds=10))
+
+        with patch("shared.client_registry.time.monotonic", return_value=100.0):
+            first = registry.get_client(INSTANCE_URL, "token-a")
+        with patch("shared.client_registry.time.monotonic", return_value=200.0):
+            assert registry.evict_idle() == 1
+            second = registry.get_client(INSTANCE_URL, "token-a")
+
+        assert first is not second
+
+    def test_max_clients_evicts_least_recently_used(self, mock_sf_class: MagicMock) -> None:
+        registry = ClientRegistry(SalesforcePoolConfig(max_clients=2))
+
+        registry.get_client(INSTANCE_URL, "token-a")
+        registry.get_client(INSTANCE_URL, "token-b")
+        registry.get_client(INSTANCE_URL, "token-c")
+
+        assert registry.stats()["clients"] == 2
+
+    def test_unhealthy_client_is_rebuilt(self, mock_sf_class: MagicMock) -> None:
+        registry = ClientRegistry(SalesforcePoolConfig(health_check_interval_seconds=0))
+
+        first = registry.get_client(INSTANCE_URL, "token-a")
+        with patch.object(first, "ping", return_value=False):
+            second = registry.get_client(INSTANCE_URL, "token-a")
+
+        assert first is not second
+        assert registry.stats()["clients"] == 1
+
+    def test_idle_eviction_skips_clients_with_requests_in_flight(self, mock_sf_class: MagicMock) -> None:
+        registry = ClientRegistry(SalesforcePoolConfig(idle_timeout_seconds=10))
+
+        with patch("shared.client_registry.time.monotonic", return_value=100.0):
+            first = registry.get_client(INSTANCE_URL, "token-a")
+        with _request_in_flight(first), patch("shared.client_registry.time.monotonic", return_value=200.0):
+            assert registry.evict_idle() == 0
+            assert registry.stats()["clients"] == 1
+
+        with patch("shared.client_registry.time.monotonic", return_value=200.0):
+            assert registry.evict_idle() == 1
+
+    def test_unhealthy_client_in_use_is_closed_once_drained(self, mock_sf_class: MagicMock) -> None:
+        registry = ClientRegistry(SalesforcePoolConfig(health_check_interval_seconds=0))
+
+        first = registry.get_client(INSTANCE_URL, "token-a")
+        with patch.object(first, "close") as close, patch.object(first, "ping", return_value=False):
+            with _request_in_flight(first):
+                second = registry.get_client(INSTANCE_URL, "token-a")
+                registry.evict_idle()
+                close.assert_not_called()
+                assert registry.stats()["retired_clients"] == 1
+            registry.evict_idle()
+
+        close.assert_called_once()
+        assert second is not first
+        assert registry.stats()["retired_clients"] == 0
+
+    def test_health_check_returns_client_rebuilt_by_another_checkout(self, mock_sf_class: MagicMock) -> None:
+        registry = ClientRegistry(SalesforcePoolConfig(health_check_interval_seconds=0))
+        first = registry.get_client(INSTANCE_URL, "token-a")
+        rebuilt: list[object] = []
+
+        def slow_ping() -> bool:
+            # A concurrent checkout sees the failure and rebuilds the entry first
+            with patch.object(first, "ping", return_value=False):
+                rebuilt.append(registry.get_client(INSTANCE_URL, "token-a"))
+            return True
+
+        with patch.object(first, "ping", side_effect=slow_ping):
+            second = registry.get_client(INSTANCE_URL, "token-a")
+
+        assert second is rebuilt[0]
+        assert second is not first
+
+
+class TestTrackedSession:
+    def test_counts_requests_in_flight(self) -> None:
+        session = _TrackedSession()
+        seen: list[int] = []
+
+        def send(*args: object, **kwargs: object) -> MagicMock:
+            seen.append(session.in_flight)
+            return MagicMock()
+
+        with patch("requests.Session.request", side_effect=send):
+            session.get("https://test.salesforce.com/services/data/")
+
+        assert seen == [1]
+        assert session.in_flight == 0
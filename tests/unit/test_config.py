@@ -0,0 +1,93 @@
+"""Unit tests for risk threshold loading in shared/config.py."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from shared.config import (
+    DEFAULT_RISK_THRESHOLDS_PATH,
+    RiskThresholds,
+    RiskThresholdsLoader,
+    load_risk_thresholds,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _write(path: Path, text: str, mtime_ns: int) -> None:
+    path.write_text(text)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+class TestLoadRiskThresholds:
+    def test_project_file(self) -> None:
+        thresholds = load_risk_thresholds(DEFAULT_RISK_THRESHOLDS_PATH)
+        assert thresholds == RiskThresholds()
+        assert thresholds.late_stages == ("Negotiation/Review", "Proposal/Price Quote")
+
+    def test_flat_mapping_and_legacy_overdue_key(self, tmp_path: Path) -> None:
+        path = tmp_path / "risk.yaml"
+        path.write_text("inactivity_days: 7\noverdue_close_date:\n  enabled: false\n")
+
+        thresholds = load_risk_thresholds(path)
+
+        assert thresholds.inactivity_days == 7
+        assert thresholds.overdue_enabled is False
+
+    def test_missing_file_gives_defaults(self, tmp_path: Path) -> None:
+        assert load_risk_thresholds(tmp_path / "missing.yaml") == RiskThresholds()
+
+
+class TestRiskThresholdsLoader:
+    @pytest.fixture
+    def path(self, tmp_path: Path) -> Path:
+        path = tmp_path / "risk.yaml"
+        _write(path, "risk_thresholds:\n  inactivity_days: 7\n", 1_000_000_000)
+        return path
+
+    def test_parses_once_between_checks(self, path: Path) -> None:
+        clock = FakeClock()
+        loader = RiskThresholdsLoader(path, check_interval_seconds=5.0, clock=clock)
+
+        first = loader.get()
+        path.unlink()
+        clock.now = 4.0
+
+        assert first.inactivity_days == 7
+        assert loader.get() is first
+
+    def test_reloads_when_file_changes(self, path: Path) -> None:
+        clock = FakeClock()
+        loader = RiskThresholdsLoader(path, check_interval_seconds=5.0, clock=clock)
+        first = loader.get()
+
+        clock.now = 6.0
+        assert loader.get() is first  # unchanged file is not re-parsed
+
+        _write(path, "risk_thresholds:\n  inactivity_days: 21\n", 2_000_000_000)
+        clock.now = 12.0
+        assert loader.get().inactivity_days == 21
+
+    def test_bad_edit_keeps_last_good(self, path: Path) -> None:
+        clock = FakeClock()
+        loader = RiskThresholdsLoader(path, check_interval_seconds=0.0, clock=clock)
+        assert loader.get().inactivity_days == 7
+
+        _write(path, "risk_thresholds: [unclosed\n", 2_000_000_000)
+        assert loader.get().inactivity_days == 7
+
+    def test_missing_file_falls_back_to_defaults(self, path: Path) -> None:
+        loader = RiskThresholdsLoader(path, check_interval_seconds=0.0)
+        assert loader.get().inactivity_days == 7
+
+        path.unlink()
+        assert loader.get() == RiskThresholds()
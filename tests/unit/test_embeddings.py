@@ -0,0 +1,86 @@
+"""Unit tests for shared/embeddings.py."""
+
+from __future__ import annotations
+
+import json
+import math
+
+import httpx
+import pytest
+
+from shared.config import KnowledgeIndexConfig
+from shared.embeddings import AzureOpenAIEmbedder, HashingEmbedder, create_embedder
+
+
+def _cosine(a: list[float], b: list[float]) -> float:
+    return sum(x * y for x, y in zip(a, b, strict=True))
+
+
+class TestHashingEmbedder:
+    async def test_deterministic_normalized_vectors(self) -> None:
+        embedder = HashingEmbedder(64)
+        first, again, empty = await embedder.embed(["Reset the API key", "reset the api KEY", ""])
+
+        assert len(first) == 64
+        assert first == again
+        assert math.isclose(math.sqrt(sum(v * v for v in first)), 1.0)
+        assert empty == [0.0] * 64
+
+    async def test_shared_words_score_higher(self) -> None:
+        query, related, unrelated = await HashingEmbedder(512).embed(
+            ["reset api key", "how to reset your api key", "quarterly sales forecast"]
+        )
+        assert _cosine(query, related) > _cosine(query, unrelated)
+
+
+class TestAzureOpenAIEmbedder:
+    async def test_batches_requests_and_orders_by_index(self) -> None:
+        requests: list[dict] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            assert request.url.path == "/openai/deployments/embed/embeddings"
+            assert request.headers["api-key"] == "secret"
+            body = json.loads(request.content)
+            requests.append(body)
+            data = [{"index": i, "embedding": [float(len(text)), 0.0]} for i, text in enumerate(body["input"])]
+            return httpx.Response(200, json={"data": list(reversed(data))})
+
+        embedder = AzureOpenAIEmbedder(
+            "https://aoai.example.com/", "embed", "secret", 2, batch_size=2, transport=httpx.MockTransport(handler)
+        )
+        vectors = await embedder.embed(["a", "bb", "ccc"])
+
+        assert vectors == [[1.0, 0.0], [2.0, 0.0], [3.0, 0.0]]
+        assert [r["input"] for r in requests] == [["a", "bb"], ["ccc"]]
+        assert requests[0]["dimensions"] == 2
+
+    async def test_raises_on_error(self) -> None:
+        embedder = AzureOpenAIEmbedder(
+            "https://aoai.example.com",
+            "embed",
+            "secret",
+            2,
+            transport=httpx.MockTransport(lambda r: httpx.Response(429)),
+        )
+        with pytest.raises(httpx.HTTPStatusError):
+            await embedder.embed(["a"])
+
+
+class TestCreateEmbedder:
+    def test_providers(self, caplog: pytest.LogCaptureFixture) -> None:
+        hashing = KnowledgeIndexConfig(embedding_provider="hashing", embedding_dimensions=8)
+        assert isinstance(create_embedder(hashing), HashingEmbedder)
+        assert create_embedder(hashing).dimensions == 8
+        assert "not semantic embeddings" in caplog.text
+        azure = KnowledgeIndexConfig(azure_openai_endpoint="https://x", azure_openai_api_key="k")
+        assert isinstance(create_embedder(azure), AzureOpenAIEmbedder)
+
+    def test_default_requires_azure_openai_settings(self) -> None:
+        with pytest.raises(ValueError, match="AZURE_OPENAI_ENDPOINT"):
+            create_embedder(KnowledgeIndexConfig())
+
+    def test_rejects_unknown_or_incomplete(self) -> None:
+        with pytest.raises(ValueError):
+            create_embedder(KnowledgeIndexConfig(embedding_provider="nope"))
+        with pytest.raises(ValueError):
+            create_embedder(KnowledgeIndexConfig(embedding_provider="azure_openai"))
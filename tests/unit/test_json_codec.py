@@ -0,0 +1,61 @@
+"""Unit tests for shared/json_codec.py."""
+
+from __future__ import annotations
+
+from datetime import UTC, date, datetime
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+
+from shared import json_codec
+from shared.models import AccountSummary
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def codec(request: pytest.FixtureRequest):
+    """Run each test against both the orjson and the stdlib backend."""
+    if request.param == "orjson":
+        if not json_codec.fast_codec_available():
+            pytest.skip("orjson not installed")
+        yield json_codec
+    else:
+        with patch.object(json_codec, "orjson", None):
+            yield json_codec
+
+
+class TestJsonCodec:
+    def test_round_trip(self, codec) -> None:
+        value = {"records": [{"Id": "001", "Amount": 1.5, "IsClosed": False, "Name": "Café"}], "done": True}
+        assert codec.loads(codec.dumps(value)) == value
+
+    def test_dates_and_decimals(self, codec) -> None:
+        value = {
+            "close_date": date(2026, 3, 31),
+            "at": datetime(2026, 3, 31, 12, 0, tzinfo=UTC),
+            "amount": Decimal("12.50"),
+            "tags": {"b", "a"},
+        }
+        assert codec.loads(codec.dumps(value)) == {
+            "close_date": "2026-03-31",
+            "at": "2026-03-31T12:00:00+00:00",
+            "amount": 12.5,
+            "tags": ["a", "b"],
+        }
+
+    def test_models(self, codec) -> None:
+        account = AccountSummary(id="001", name="Acme")
+        assert codec.loads(codec.dumps({"account": account}))["account"] == account.model_dump()
+
+    def test_indent(self, codec) -> None:
+        assert codec.dumps({"a": 1}, indent=True) == b'{\n  "a": 1\n}'
+
+    def test_compact_output_matches(self, codec) -> None:
+        assert codec.dumps({"a": [1, None], "b": "é"}) == '{"a":[1,null],"b":"é"}'.encode()
+
+    def test_loads_memoryview(self, codec) -> None:
+        assert codec.loads(memoryview(b'{"a": 1}')) == {"a": 1}
+
+    def test_unsupported_type_raises(self, codec) -> None:
+        with pytest.raises(TypeError):
+            codec.dumps({"a": object()})
@@ -0,0 +1,40 @@
+"""Unit tests for shared/knowledge_manifest.py."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from shared import knowledge_manifest
+from shared.knowledge_manifest import KnowledgeManifest
+
+
+@pytest.fixture
+def path(tmp_path: Path) -> str:
+    return str(tmp_path / "manifest.sqlite3")
+
+
+class TestKnowledgeManifest:
+    def test_records_hashes_by_article(self, path: str) -> None:
+        with KnowledgeManifest(path) as manifest:
+            manifest.apply({"ka1-0": ("ka1", "h0"), "ka1-1": ("ka1", "h1"), "ka2-0": ("ka2", "h2")})
+
+            assert manifest.hashes(["ka1", "ka3"]) == {"ka1": {"ka1-0": "h0", "ka1-1": "h1"}}
+            assert manifest.article_ids() == {"ka1", "ka2"}
+            assert len(manifest) == 3
+
+    def test_upserts_and_deletes_persist(self, path: str) -> None:
+        with KnowledgeManifest(path) as manifest:
+            manifest.apply({"ka1-0": ("ka1", "h0"), "ka1-1": ("ka1", "h1")})
+            manifest.apply({"ka1-0": ("ka1", "new")}, ["ka1-1", "missing"])
+
+        with KnowledgeManifest(path) as manifest:
+            assert manifest.hashes(["ka1"]) == {"ka1": {"ka1-0": "new"}}
+
+    def test_lookups_are_chunked(self, path: str, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(knowledge_manifest, "LOOKUP_CHUNK", 3)
+        with KnowledgeManifest(path) as manifest:
+            manifest.apply({f"ka{n}-0": (f"ka{n}", str(n)) for n in range(10)})
+
+            assert len(manifest.hashes(f"ka{n}" for n in range(10))) == 10
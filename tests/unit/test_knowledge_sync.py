@@ -0,0 +1,758 @@
+"""Unit tests for shared/knowledge_sync.py."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import re
+from collections.abc import Iterator, Sequence
+from pathlib import Path
+from typing import Any
+
+import httpx
+import pytest
+
+from shared import knowledge_sync
+from shared.config import KnowledgeIndexConfig
+from shared.embeddings import HashingEmbedder
+from shared.knowledge_manifest import KnowledgeManifest
+from shared.knowledge_sync import (
+    KNOWLEDGE_INDEX_SCHEMA,
+    MAX_STATE_ERRORS,
+    SyncState,
+    _as_async_iterable,
+    _build_soql_query,
+    _content_hash,
+    _load_sync_state,
+    _parse_stamp,
+    _retry_delay,
+    _transform_article_to_document,
+    ensure_search_index,
+    knowledge_index_schema,
+    sync_knowledge_articles,
+    upload_document_stream,
+    upload_documents,
+)
+from shared.salesforce_client import SalesforceClientError, nest_csv_row
+
+SEARCH_ENDPOINT = "https://search.example.net"
+
+
+def _doc(n: int, body: str = "") -> dict[str, Any]:
+    return {"id": f"ka{n:05d}", "title": f"Article {n}", "articleBody": body}
+
+
+class CountingEmbedder(HashingEmbedder):
+    texts = 0
+
+    async def embed(self, texts: Sequence[str]) -> list[list[float]]:
+        self.texts += len(texts)
+        return await super().embed(texts)
+
+
+class FakeSearch:
+    """Azure AI Search stand-in that records uploads and peak concurrency."""
+
+    def __init__(self, *, delay: float = 0.0, index_status: int = 200) -> None:
+        self.delay = delay
+        self.index_status = index_status
+        self.batches: list[list[dict[str, Any]]] = []
+        self.body_sizes: list[int] = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        if not request.url.path.endswith("/docs/index"):
+            return httpx.Response(self.index_status, json={})
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            body = await request.aread()
+            docs = json.loads(body)["value"]
+            self.batches.append(docs)
+            self.body_sizes.append(len(body))
+            return httpx.Response(200, json={"value": [{"key": d["id"], "status": True} for d in docs]})
+        finally:
+            self.in_flight -= 1
+
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self)
+
+
+class TestUploadDocuments:
+    async def test_batches_by_count(self) -> None:
+        search = FakeSearch()
+        uploaded = await upload_documents(
+            [_doc(n) for n in range(250)], SEARCH_ENDPOINT, "key", transport=search.transport()
+        )
+
+        assert uploaded == 250
+        assert sorted(len(batch) for batch in search.batches) == [50, 100, 100]
+        assert all(doc["@search.action"] == "mergeOrUpload" for batch in search.batches for doc in batch)
+
+    async def test_batches_by_encoded_size(self) -> None:
+        search = FakeSearch()
+        docs = [_doc(n, body="x" * 1000) for n in range(20)]
+        uploaded = await upload_documents(
+            docs, SEARCH_ENDPOINT, "key", max_batch_bytes=5000, transport=search.transport()
+        )
+
+        assert uploaded == 20
+        assert len(search.batches) > 4
+        assert max(search.body_sizes) <= 5000
+        assert sorted(doc["id"] for batch in search.batches for doc in batch) == [d["id"] for d in docs]
+
+    async def test_skips_document_larger_than_request_limit(self) -> None:
+        search = FakeSearch()
+        docs = [_doc(1), _doc(2, body="x" * 10_000), _doc(3)]
+        uploaded = await upload_documents(
+            docs, SEARCH_ENDPOINT, "key", max_batch_bytes=5000, transport=search.transport()
+        )
+
+        assert uploaded == 2
+        assert [doc["id"] for doc in search.batches[0]] == ["ka00001", "ka00003"]
+
+    async def test_uploads_batches_concurrently(self) -> None:
+        search = FakeSearch(delay=0.02)
+        uploaded = await upload_documents(
+            [_doc(n) for n in range(40)],
+            SEARCH_ENDPOINT,
+            "key",
+            batch_size=5,
+            concurrency=4,
+            transport=search.transport(),
+        )
+
+        assert uploaded == 40
+        assert search.peak_in_flight == 4
+
+    async def test_transport_error_is_retried(self) -> None:
+        calls = 0
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                raise httpx.ConnectError("connection reset")
+            docs = json.loads(request.content)["value"]
+            return httpx.Response(200, json={"value": [{"key": d["id"], "status": True} for d in docs]})
+
+        uploaded = await upload_documents(
+            [_doc(n) for n in range(30)],
+            SEARCH_ENDPOINT,
+            "key",
+            batch_size=10,
+            concurrency=1,
+            transport=httpx.MockTransport(handler),
+        )
+
+        assert uploaded == 30
+        assert calls == 4
+
+
+@pytest.fixture
+def no_backoff(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(knowledge_sync, "RETRY_BASE_DELAY", 0.0)
+
+
+@pytest.mark.usefixtures("no_backoff")
+class TestUploadRetries:
+    async def test_partial_failure_resends_only_failed_documents(self) -> None:
+        sent: list[list[str]] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            keys = [d["id"] for d in json.loads(request.content)["value"]]
+            sent.append(keys)
+            value = []
+            for key in keys:
+                if key == "ka00001" and len(sent) == 1:
+                    value.append({"key": key, "status": False, "statusCode": 503, "errorMessage": "busy"})
+                elif key == "ka00002":
+                    value.append({"key": key, "status": False, "statusCode": 400, "errorMessage": "bad field"})
+                else:
+                    value.append({"key": key, "status": True, "statusCode": 201})
+            return httpx.Response(207, json={"value": value})
+
+        result = await upload_document_stream(
+            _as_async_iterable([_doc(n) for n in range(4)]),
+            SEARCH_ENDPOINT,
+            "key",
+            transport=httpx.MockTransport(handler),
+        )
+
+        assert sent == [["ka00000", "ka00001", "ka00002", "ka00003"], ["ka00001"]]
+        assert result.uploaded == 3
+        assert [(d.id, d.status_code, d.error) for d in result.failed] == [("ka00002", 400, "bad field")]
+
+    async def test_throttled_batch_honors_retry_after(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        delays: list[float] = []
+        real_sleep = asyncio.sleep
+
+        async def sleep(delay: float) -> None:
+            delays.append(delay)
+            await real_sleep(0)
+
+        monkeypatch.setattr(knowledge_sync.asyncio, "sleep", sleep)
+        responses = iter(
+            [
+                httpx.Response(429, headers={"Retry-After": "7"}),
+                httpx.Response(503, text="unavailable"),
+                httpx.Response(200, json={"value": [{"key": "ka00000", "status": True}]}),
+            ]
+        )
+
+        result = await upload_document_stream(
+            _as_async_iterable([_doc(0)]),
+            SEARCH_ENDPOINT,
+            "key",
+            transport=httpx.MockTransport(lambda request: next(responses)),
+        )
+
+        assert result.uploaded == 1
+        assert result.failed == []
+        assert delays == [7.0, 0.0]
+
+    async def test_exhausted_retries_become_dead_letters(self) -> None:
+        calls = 0
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal calls
+            calls += 1
+            return httpx.Response(503, text="unavailable")
+
+        result = await upload_document_stream(
+            _as_async_iterable([_doc(0), _doc(1)]),
+            SEARCH_ENDPOINT,
+            "key",
+            transport=httpx.MockTransport(handler),
+        )
+
+        assert calls == knowledge_sync.MAX_UPLOAD_ATTEMPTS
+        assert result.uploaded == 0
+        assert [(d.id, d.status_code, d.attempts) for d in result.failed] == [
+            ("ka00000", 503, knowledge_sync.MAX_UPLOAD_ATTEMPTS),
+            ("ka00001", 503, knowledge_sync.MAX_UPLOAD_ATTEMPTS),
+        ]
+
+    async def test_rejected_batch_is_not_retried(self) -> None:
+        calls = 0
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal calls
+            calls += 1
+            return httpx.Response(400, text="malformed")
+
+        result = await upload_document_stream(
+            _as_async_iterable([_doc(0)]), SEARCH_ENDPOINT, "key", transport=httpx.MockTransport(handler)
+        )
+
+        assert calls == 1
+        assert [(d.id, d.status_code, d.error) for d in result.failed] == [("ka00000", 400, "malformed")]
+
+
+class TestRetryDelay:
+    def test_retry_after_seconds_and_date(self) -> None:
+        assert _retry_delay(1, "3") == 3.0
+        assert _retry_delay(1, "3600") == knowledge_sync.RETRY_MAX_DELAY
+        assert _retry_delay(1, "Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+    def test_jittered_exponential_backoff(self) -> None:
+        for attempt in range(1, 10):
+            cap = min(knowledge_sync.RETRY_MAX_DELAY, knowledge_sync.RETRY_BASE_DELAY * 2 ** (attempt - 1))
+            assert all(0 <= _retry_delay(attempt, "soon") <= cap for _ in range(20))
+
+
+def _uploads(batch: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    return [doc for doc in batch if doc["@search.action"] == "mergeOrUpload"]
+
+
+def _deletes(batches: list[list[dict[str, Any]]]) -> list[str]:
+    return sorted(doc["id"] for batch in batches for doc in batch if doc["@search.action"] == "delete")
+
+
+class FakeSalesforceClient:
+    records: list[dict[str, Any]] = []
+    bodies: dict[str, str] = {}
+    error: Exception | None = None
+    queries: list[str] = []
+
+    closed = 0
+
+    def __init__(self, instance_url: str, access_token: str) -> None:
+        pass
+
+    def close(self) -> None:
+        type(self).closed += 1
+
+    def iter_records(self, soql: str) -> Iterator[dict[str, Any]]:
+        self.queries.append(soql)
+        if "Id IN" in soql:
+            yield from (r for r in self.records if f"'{r['Id']}'" in soql)
+            return
+        mark = re.search(r"SystemModstamp >= (\S+)", soql)
+        for record in self.records:
+            if mark is None or _parse_stamp(record["SystemModstamp"]) >= _parse_stamp(mark.group(1)):
+                yield record
+        if self.error is not None:
+            raise self.error
+
+    def describe(self, sobject: str) -> dict[str, Any]:
+        return {"fields": [{"name": "Details__c", "type": "textarea", "extraTypeInfo": "richtextarea"}]}
+
+    def query(self, soql: str) -> list[dict[str, Any]]:
+        return [{"Id": key, "Details__c": html} for key, html in self.bodies.items() if f"'{key}'" in soql]
+
+
+def _article(n: int, stamp: str | None = None) -> dict[str, Any]:
+    return {
+        "Id": f"ka{n:05d}",
+        "KnowledgeArticleId": f"kA{n:05d}",
+        "Title": f"Article {n}",
+        "SystemModstamp": stamp or f"2025-01-01T00:00:{n:02d}.500+0000",
+    }
+
+
+class TestSyncKnowledgeArticles:
+    @pytest.fixture(autouse=True)
+    def _fake_salesforce(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr("shared.salesforce_client.SalesforceClient", FakeSalesforceClient)
+        monkeypatch.setattr(knowledge_sync, "SOURCE_CHUNK_SIZE", 7)
+        monkeypatch.setattr(knowledge_sync, "create_embedder", lambda config: HashingEmbedder(16))
+        FakeSalesforceClient.records = [_article(n) for n in range(30)]
+        FakeSalesforceClient.bodies = {}
+        FakeSalesforceClient.error = None
+        FakeSalesforceClient.queries = []
+        FakeSalesforceClient.closed = 0
+
+    async def test_streams_articles_into_index(self, tmp_path: Path) -> None:
+        search = FakeSearch()
+        state_file = str(tmp_path / "state.json")
+
+        state = await sync_knowledge_articles(
+            "https://sf", "token", SEARCH_ENDPOINT, "key", state_file=state_file, transport=search.transport()
+        )
+
+        assert state.total_synced == 30
+        assert state.errors == []
+        assert state.last_sync_timestamp is not None
+        assert state.high_water_mark == "2025-01-01T00:00:29Z"
+        assert state.boundary == {"ka00029": "2025-01-01T00:00:29.500+0000"}
+        assert FakeSalesforceClient.closed == 1
+        assert json.loads(Path(state_file).read_text())["total_synced"] == 30
+        # Documents indexed before chunking were keyed by the bare article Id
+        assert _deletes(search.batches) == [f"ka{n:05d}" for n in range(30)]
+
+    async def test_article_bodies_become_embedded_chunks(self, tmp_path: Path) -> None:
+        search = FakeSearch()
+        FakeSalesforceClient.records = [
+            {**_article(1), "ArticleType": "Knowledge__kav", "Summary": "How to reset"},
+            {**_article(2), "ArticleType": "Knowledge__kav", "Summary": "No body here"},
+        ]
+        FakeSalesforceClient.bodies = {"ka00001": "".join(f"<p>Step {n} of the reset.</p>" for n in range(20))}
+
+        state = await sync_knowledge_articles(
+            "https://sf",
+            "token",
+            SEARCH_ENDPOINT,
+            "key",
+            state_file=str(tmp_path / "state.json"),
+            transport=search.transport(),
+            embedder=HashingEmbedder(16),
+            index_config=KnowledgeIndexConfig(chunk_tokens=30, chunk_overlap_tokens=8),
+        )
+
+        docs = {doc["id"]: doc for batch in search.batches for doc in _uploads(batch)}
+        first = [docs[key] for key in sorted(docs) if docs[key]["parentId"] == "ka00001"]
+        assert len(first) > 1
+        assert [doc["chunkIndex"] for doc in first] == list(range(len(first)))
+        assert {doc["chunkCount"] for doc in first} == {len(first)}
+        assert first[0]["articleBody"].startswith("Step 0 of the reset.")
+        assert all(len(doc["contentVector"]) == 16 for doc in docs.values())
+        # Articles without a body are indexed from their summary
+        assert docs["ka00002-0"]["articleBody"] == "No body here"
+        assert docs["ka00002-0"]["chunkCount"] == 1
+        assert state.total_synced == len(docs)
+
+    async def test_unchanged_articles_are_not_embedded_or_reuploaded(self, tmp_path: Path) -> None:
+        search = FakeSearch()
+        embedder = CountingEmbedder(8)
+
+        async def run() -> SyncState:
+            return await sync_knowledge_articles(
+                "https://sf",
+                "token",
+                SEARCH_ENDPOINT,
+                "key",
+                full_sync=True,
+                state_file=str(tmp_path / "state.json"),
+                transport=search.transport(),
+                embedder=embedder,
+            )
+
+        await run()
+        uploads, embedded = len(search.batches), embedder.texts
+        # Metadata that is not indexed moves, content does not
+        FakeSalesforceClient.records = [
+            {**record, "LastModifiedDate": "2026-01-01T00:00:00.000+0000"} for record in FakeSalesforceClient.records
+        ]
+        state = await run()
+
+        assert len(search.batches) == uploads
+        assert embedder.texts == embedded
+        assert state.total_synced == 30
+        assert len(KnowledgeManifest(str(tmp_path / "state.manifest.sqlite3"))) == 30
+
+        # A changed summary is re-embedded and re-uploaded on its own
+        FakeSalesforceClient.records[4] = {**FakeSalesforceClient.records[4], "Summary": "Now with a summary"}
+        state = await run()
+        assert [doc["id"] for doc in search.batches[-1]] == ["ka00004-0"]
+        assert embedder.texts == embedded + 1
+        assert state.total_synced == 31
+
+    async def test_shrunk_article_deletes_stale_chunks(self, tmp_path: Path) -> None:
+        search = FakeSearch()
+        FakeSalesforceClient.records = [{**_article(1), "ArticleType": "Knowledge__kav"}]
+        FakeSalesforceClient.bodies = {"ka00001": "".join(f"<p>Step {n} of the reset.</p>" for n in range(20))}
+
+        async def run() -> SyncState:
+            return await sync_knowledge_articles(
+                "https://sf",
+                "token",
+                SEARCH_ENDPOINT,
+                "key",
+                full_sync=True,
+                state_file=str(tmp_path / "state.json"),
+                transport=search.transport(),
+                embedder=HashingEmbedder(8),
+                index_config=KnowledgeIndexConfig(chunk_tokens=30, chunk_overlap_tokens=0),
+            )
+
+        await run()
+        chunk_count = search.batches[-1][0]["chunkCount"]
+        assert chunk_count > 2
+        search.batches.clear()
+
+        FakeSalesforceClient.bodies = {"ka00001": "<p>Step 0 of the reset.</p><p>Step 1 changed.</p>"}
+        await run()
+
+        assert [doc["id"] for doc in _uploads(search.batches[0])] == ["ka00001-0"]
+        assert _deletes(search.batches) == sorted(f"ka00001-{n}" for n in range(1, chunk_count))
+
+    async def test_removed_articles_are_deleted(self, tmp_path: Path) -> None:
+        search = FakeSearch()
+        state_file = str(tmp_path / "state.json")
+
+        async def run() -> SyncState:
+            return await sync_knowledge_articles(
+                "https://sf",
+                "token",
+                SEARCH_ENDPOINT,
+                "key",
+                state_file=state_file,
+                removal_check_interval=0,
+                transport=search.transport(),
+            )
+
+        await run()
+        search.batches.clear()
+        # Archived, or superseded by a new version with a new version Id
+        del FakeSalesforceClient.records[5]
+        FakeSalesforceClient.records.append({**_article(5, "2025-01-01T00:01:00.000+0000"), "Id": "ka99005"})
+        state = await run()
+
+        assert _deletes(search.batches) == ["ka00005-0", "ka99005"]
+        assert [doc["id"] for batch in search.batches for doc in _uploads(batch)] == ["ka99005-0"]
+        manifest = KnowledgeManifest(str(tmp_path / "state.manifest.sqlite3"))
+        assert "ka00005" not in manifest.article_ids()
+        assert "ka99005" in manifest.article_ids()
+        assert state.errors == []
+
+    async def test_removal_check_runs_at_most_once_per_interval(self, tmp_path: Path) -> None:
+        state_file = str(tmp_path / "state.json")
+        listing = knowledge_sync.ONLINE_ARTICLE_IDS_QUERY.build()
+
+        async def run(**kwargs: Any) -> SyncState:
+            FakeSalesforceClient.queries = []
+            return await sync_knowledge_articles(
+                "https://sf",
+                "token",
+                SEARCH_ENDPOINT,
+                "key",
+                state_file=state_file,
+                transport=FakeSearch().transport(),
+                **kwargs,
+            )
+
+        state = await run()
+        assert listing in FakeSalesforceClient.queries
+        assert state.last_removal_check is not None
+
+        state = await run()
+        assert listing not in FakeSalesforceClient.queries
+
+        await run(full_sync=True)
+        assert listing in FakeSalesforceClient.queries
+
+        Path(state_file).write_text(json.dumps({**state.to_dict(), "last_removal_check": "2025-01-01T00:00:00.000Z"}))
+        await run()
+        assert listing in FakeSalesforceClient.queries
+
+    async def test_online_listing_failure_skips_deletes(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        search = FakeSearch()
+        iter_records = FakeSalesforceClient.iter_records
+
+        def failing_listing(self: FakeSalesforceClient, soql: str) -> Iterator[dict[str, Any]]:
+            if soql == knowledge_sync.ONLINE_ARTICLE_IDS_QUERY.build():
+                raise SalesforceClientError("SF_API_ERROR", "timeout")
+            return iter_records(self, soql)
+
+        monkeypatch.setattr(FakeSalesforceClient, "iter_records", failing_listing)
+        state = await sync_knowledge_articles(
+            "https://sf",
+            "token",
+            SEARCH_ENDPOINT,
+            "key",
+            state_file=str(tmp_path / "state.json"),
+            transport=search.transport(),
+        )
+
+        assert state.total_synced == 30
+        assert state.high_water_mark == "2025-01-01T00:00:29Z"
+        assert state.errors == ["Online article listing failed: timeout"]
+
+    async def test_incremental_runs_resume_from_observed_modstamp(self, tmp_path: Path) -> None:
+        search = FakeSearch()
+        state_file = str(tmp_path / "state.json")
+        FakeSalesforceClient.records = [_article(1), _article(2, "2025-01-01T00:00:05.100+0000")]
+
+        async def run() -> SyncState:
+            return await sync_knowledge_articles(
+                "https://sf", "token", SEARCH_ENDPOINT, "key", state_file=state_file, transport=search.transport()
+            )
+
+        await run()
+        # Nothing changed: the boundary record matches the mark again but is skipped
+        FakeSalesforceClient.queries = []
+        state = await run()
+        assert "SystemModstamp >= 2025-01-01T00:00:05Z" in FakeSalesforceClient.queries[0]
+        assert state.total_synced == 2
+
+        # An edit landing in the same second as the mark, and one edited again, are both picked up
+        FakeSalesforceClient.records = [
+            _article(1),
+            {**_article(2, "2025-01-01T00:00:05.900+0000"), "Title": "Article 2, revised"},
+            _article(3, "2025-01-01T00:00:05.200+0000"),
+        ]
+        state = await run()
+        assert [doc["parentId"] for doc in _uploads(search.batches[-1])] == ["ka00002", "ka00003"]
+        assert state.total_synced == 4
+        assert state.high_water_mark == "2025-01-01T00:00:05Z"
+        assert state.boundary == {
+            "ka00002": "2025-01-01T00:00:05.900+0000",
+            "ka00003": "2025-01-01T00:00:05.200+0000",
+        }
+
+    async def test_full_sync_ignores_high_water_mark(self, tmp_path: Path) -> None:
+        state_file = str(tmp_path / "state.json")
+        Path(state_file).write_text(json.dumps({"high_water_mark": "2030-01-01T00:00:00Z"}))
+
+        state = await sync_knowledge_articles(
+            "https://sf",
+            "token",
+            SEARCH_ENDPOINT,
+            "key",
+            full_sync=True,
+            state_file=state_file,
+            transport=FakeSearch().transport(),
+        )
+
+        assert "SystemModstamp >=" not in FakeSalesforceClient.queries[0]
+        assert state.total_synced == 30
+
+    async def test_source_failure_keeps_sync_timestamp(self, tmp_path: Path) -> None:
+        FakeSalesforceClient.error = SalesforceClientError("INVALID_SESSION_ID", "session expired")
+        search = FakeSearch()
+
+        state = await sync_knowledge_articles(
+            "https://sf",
+            "token",
+            SEARCH_ENDPOINT,
+            "key",
+            state_file=str(tmp_path / "state.json"),
+            transport=search.transport(),
+        )
+
+        assert state.last_sync_timestamp is None
+        assert state.high_water_mark is None
+        assert state.errors == ["Salesforce query failed: session expired"]
+        assert FakeSalesforceClient.closed == 1
+
+    async def test_embedding_failure_is_labelled_by_stage(self, tmp_path: Path) -> None:
+        class FailingEmbedder(HashingEmbedder):
+            async def embed(self, texts: Sequence[str]) -> list[list[float]]:
+                raise httpx.ConnectError("embedding endpoint unreachable")
+
+        state = await sync_knowledge_articles(
+            "https://sf",
+            "token",
+            SEARCH_ENDPOINT,
+            "key",
+            state_file=str(tmp_path / "state.json"),
+            transport=FakeSearch().transport(),
+            embedder=FailingEmbedder(),
+        )
+
+        assert state.last_sync_timestamp is None
+        assert state.errors == ["Embedding failed: embedding endpoint unreachable"]
+
+    async def test_persisted_errors_are_capped(self, tmp_path: Path) -> None:
+        state_file = tmp_path / "state.json"
+        state_file.write_text(json.dumps({"errors": [f"old {n}" for n in range(MAX_STATE_ERRORS + 5)]}))
+        FakeSalesforceClient.error = SalesforceClientError("SF_API_ERROR", "boom")
+
+        state = await sync_knowledge_articles(
+            "https://sf",
+            "token",
+            SEARCH_ENDPOINT,
+            "key",
+            state_file=str(state_file),
+            transport=FakeSearch().transport(),
+        )
+
+        assert len(state.errors) == MAX_STATE_ERRORS
+        assert state.errors[-1] == "Salesforce query failed: boom"
+        assert state.errors[0] == "old 6"
+        assert _load_sync_state(str(state_file)).errors == state.errors
+
+    @pytest.mark.usefixtures("no_backoff")
+    async def test_failed_documents_are_dead_lettered_and_replayed(self, tmp_path: Path) -> None:
+        state_file = str(tmp_path / "state.json")
+        reject = {"ka00003-0"}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if not request.url.path.endswith("/docs/index"):
+                return httpx.Response(200, json={})
+            docs = json.loads(request.content)["value"]
+            return httpx.Response(
+                207,
+                json={
+                    "value": [
+                        {"key": d["id"], "status": d["id"] not in reject, "statusCode": 503, "errorMessage": "busy"}
+                        for d in docs
+                    ]
+                },
+            )
+
+        transport = httpx.MockTransport(handler)
+        state = await sync_knowledge_articles(
+            "https://sf", "token", SEARCH_ENDPOINT, "key", state_file=state_file, transport=transport
+        )
+
+        assert state.total_synced == 29
+        assert [(d.id, d.article_id, d.status_code, d.attempts) for d in state.dead_letters] == [
+            ("ka00003-0", "ka00003", 503, knowledge_sync.MAX_UPLOAD_ATTEMPTS)
+        ]
+        assert _load_sync_state(state_file).dead_letters == state.dead_letters
+
+        # Next run: nothing new upstream, the dead letter is re-fetched by ID and lands
+        FakeSalesforceClient.queries = []
+        reject.clear()
+        state = await sync_knowledge_articles(
+            "https://sf", "token", SEARCH_ENDPOINT, "key", state_file=state_file, transport=transport
+        )
+
+        assert "Id IN ('ka00003')" in FakeSalesforceClient.queries[0]
+        assert state.total_synced == 30
+        assert state.dead_letters == []
+
+
+class TestContentHash:
+    def test_ignores_field_order_modified_date_and_vector(self) -> None:
+        doc = {"id": "ka1-0", "title": "Reset", "lastModifiedDate": "2025-01-01T00:00:00Z"}
+        reordered = {"lastModifiedDate": "2026-01-01T00:00:00Z", "title": "Reset", "id": "ka1-0", "contentVector": [1]}
+
+        assert _content_hash(doc) == _content_hash(reordered)
+        assert _content_hash(doc) != _content_hash({**doc, "title": "Reset v2"})
+        assert _content_hash(doc, "HashingEmbedder:8") != _content_hash(doc, "HashingEmbedder:16")
+
+
+class TestTransformArticle:
+    def test_bulk_record_matches_rest_record(self) -> None:
+        rest = {
+            "Id": "ka1",
+            "Title": "Reset password",
+            "Summary": None,
+            "LastModifiedDate": "2025-01-01T00:00:00.000+0000",
+            "LastPublishedDate": "2025-01-01T00:00:00.000+0000",
+            "VersionNumber": 3,
+        }
+        bulk = nest_csv_row(
+            {
+                "Id": "ka1",
+                "Title": "Reset password",
+                "Summary": "",
+                "LastModifiedDate": "2025-01-01T00:00:00.000Z",
+                "LastPublishedDate": "2025-01-01T00:00:00.000Z",
+                "VersionNumber": "3",
+            }
+        )
+
+        document = _transform_article_to_document(bulk)
+
+        assert document["versionNumber"] == 3
+        assert document == _transform_article_to_document(rest)
+        assert _content_hash(document) == _content_hash(_transform_article_to_document(rest))
+
+
+class TestEnsureSearchIndex:
+    async def _ensure(self, existing: dict[str, Any] | None) -> list[tuple[str, dict[str, Any] | None]]:
+        calls: list[tuple[str, dict[str, Any] | None]] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append((request.method, json.loads(request.content) if request.content else None))
+            if request.method == "GET":
+                return httpx.Response(404) if existing is None else httpx.Response(200, json=existing)
+            return httpx.Response(201 if request.method == "POST" else 204)
+
+        assert await ensure_search_index(SEARCH_ENDPOINT, "key", transport=httpx.MockTransport(handler))
+        return calls
+
+    async def test_creates_missing_index(self) -> None:
+        calls = await self._ensure(None)
+        assert calls[1] == ("POST", KNOWLEDGE_INDEX_SCHEMA)
+
+    async def test_adds_chunk_fields_to_existing_index(self) -> None:
+        legacy = {"fields": [f for f in KNOWLEDGE_INDEX_SCHEMA["fields"] if f["name"] != "contentVector"]}
+        calls = await self._ensure(legacy)
+        assert calls[1] == ("PUT", KNOWLEDGE_INDEX_SCHEMA)
+
+    async def test_leaves_current_index_alone(self) -> None:
+        assert [method for method, _ in await self._ensure(KNOWLEDGE_INDEX_SCHEMA)] == ["GET"]
+
+    def test_vector_field_matches_embedding_dimensions(self) -> None:
+        vector = next(f for f in knowledge_index_schema(256)["fields"] if f["name"] == "contentVector")
+        assert vector["dimensions"] == 256
+        assert vector["vectorSearchProfile"] == "knowledge-hnsw"
+
+
+class TestSyncState:
+    def test_round_trips_dead_letters(self) -> None:
+        state = SyncState.from_dict(
+            {
+                "last_sync_timestamp": "2025-01-01T00:00:00.000Z",
+                "dead_letters": [{"id": "ka1", "status_code": 400, "error": "bad", "attempts": 2}],
+            }
+        )
+
+        assert SyncState.from_dict(state.to_dict()) == state
+        assert state.dead_letters[0].attempts == 2
+        assert SyncState.from_dict({}).dead_letters == []
+
+    def test_legacy_state_resumes_from_last_sync_timestamp(self) -> None:
+        state = SyncState.from_dict({"last_sync_timestamp": "2025-01-01T00:00:00.000Z"})
+
+        assert state.high_water_mark == "2025-01-01T00:00:00.000Z"
+        assert _build_soql_query(state.high_water_mark).endswith(
+            "AND SystemModstamp >= 2025-01-01T00:00:00Z ORDER BY SystemModstamp ASC"
+        )
@@ -0,0 +1,97 @@
+"""Unit tests for shared/mappers.py."""
+
+from __future__ import annotations
+
+from datetime import UTC, date, datetime
+
+import pytest
+from pydantic import ValidationError
+
+from mcp_servers.salesforce_crm.tools.activities import EVENT_MAPPER, TASK_MAPPER
+from mcp_servers.salesforce_crm.tools.cases import CASE_MAPPER
+from mcp_servers.salesforce_crm.tools.opportunities import OPPORTUNITY_MAPPER
+from mcp_servers.salesforce_knowledge.tools.articles import ARTICLE_WITH_BODY_MAPPER
+from shared.mappers import RecordMapper
+from shared.models import AccountSummary, CaseSummary, OpportunitySummary
+
+OPPORTUNITY_RECORD = {
+    "Id": "006000000000001",
+    "Name": "Acme - Enterprise License",
+    "Amount": 250000,
+    "StageName": "Proposal/Price Quote",
+    "CloseDate": "2025-03-15",
+    "Probability": 60,
+    "Owner": {"Name": "Jane Smith"},
+    "Account": None,
+    "LastActivityDate": None,
+}
+
+CASE_RECORD = {
+    "Id": "500000000000001",
+    "CaseNumber": "00012345",
+    "Subject": "Login issues",
+    "Status": "New",
+    "Priority": "High",
+    "CreatedDate": "2025-02-01T10:00:00.000+0000",
+    "Owner": {"Name": "Agent Smith"},
+    "CaseComments": [{"CommentBody": "Reset sent"}, {"CommentBody": None}],
+}
+
+
+class TestRecordMapper:
+    @pytest.mark.parametrize(
+        ("mapper", "record"),
+        [
+            (OPPORTUNITY_MAPPER, OPPORTUNITY_RECORD),
+            (CASE_MAPPER, CASE_RECORD),
+            (TASK_MAPPER, {"Id": "00T1", "Subject": "Call", "ActivityDate": "2025-02-01", "Status": "Open"}),
+            (EVENT_MAPPER, {"Id": "00U1", "Subject": "Demo", "Owner": None}),
+            (ARTICLE_WITH_BODY_MAPPER, {"Id": "ka0", "Title": "Reset", "ArticleBody": "<p>Do <b>this</b></p>"}),
+        ],
+    )
+    def test_matches_model_dump(self, mapper: RecordMapper, record: dict) -> None:
+        fast = mapper(record)
+        assert fast == mapper.model.model_validate(fast).model_dump()
+        assert [type(v) for v in fast.values()] == [
+            type(v) for v in mapper.model.model_validate(fast).model_dump().values()
+        ]
+
+    def test_converts_types_like_pydantic(self) -> None:
+        opp = OPPORTUNITY_MAPPER(OPPORTUNITY_RECORD)
+        assert opp["amount"] == 250000.0 and isinstance(opp["amount"], float)
+        assert opp["close_date"] == date(2025, 3, 15)
+        assert opp["account_name"] is None
+        assert opp["risk_flags"] == []
+        assert opp["risk_flags"] is not OPPORTUNITY_MAPPER(OPPORTUNITY_RECORD)["risk_flags"]
+
+        case = CASE_MAPPER(CASE_RECORD)
+        assert case["created_date"] == datetime(2025, 2, 1, 10, tzinfo=UTC)
+        assert case["recent_comments"] == ["Reset sent"]
+
+    def test_coerces_numeric_strings_and_passes_through_the_rest(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.delenv("MCP_STRICT_OUTPUT", raising=False)
+        opp = OPPORTUNITY_MAPPER({**OPPORTUNITY_RECORD, "Amount": "1250.5", "Probability": "n/a"})
+        assert opp["amount"] == 1250.5
+        assert opp["probability"] == "n/a"
+
+    def test_overrides(self) -> None:
+        assert TASK_MAPPER({"Id": "00T1"}, subject="Override")["subject"] == "Override"
+
+    def test_strict_mode_validates(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.delenv("MCP_STRICT_OUTPUT", raising=False)
+        mapper = RecordMapper(AccountSummary, {"id": "Id", "name": "Name"})
+        assert mapper({"Id": "001A"})["name"] is None
+
+        monkeypatch.setenv("MCP_STRICT_OUTPUT", "true")
+        with pytest.raises(ValidationError):
+            mapper({"Id": "001A"})
+        with pytest.raises(ValidationError):
+            mapper.many([{"Id": "001A"}])
+
+    def test_invalid_sources_rejected(self) -> None:
+        with pytest.raises(ValueError):
+            RecordMapper(AccountSummary, {"id": "Id", "name": "Name", "nickname": "Nickname"})
+        with pytest.raises(ValueError):
+            RecordMapper(CaseSummary, {"id": "Id"})
+        with pytest.raises(ValueError):
+            RecordMapper(OpportunitySummary, {"id": "Id", "name": "Name", "stage": "StageName"})
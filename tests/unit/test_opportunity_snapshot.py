@@ -0,0 +1,203 @@
+"""Unit tests for shared/opportunity_snapshot.py."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from datetime import date, timedelta
+from typing import Any
+
+import pytest
+
+from mcp_servers.salesforce_crm.tools.opportunities import _activity_gaps_result, _pipeline_result
+from shared import opportunity_snapshot
+from shared.config import OpportunitySnapshotConfig, RiskThresholds
+from shared.opportunity_snapshot import OpportunitySnapshot, SnapshotView, get_opportunity_snapshot
+from shared.salesforce_client import SalesforceClientError
+
+TODAY = date.today()
+OWNER_A = "005000000000001AAA"
+OWNER_B = "005000000000002AAA"
+MANAGER = "005000000000099AAA"
+
+
+def _opp(n: int, **overrides: Any) -> dict[str, Any]:
+    record = {
+        "Id": f"006{n:012d}AAA",
+        "Name": f"Deal {n}",
+        "Amount": 50000.0,
+        "StageName": "Prospecting",
+        "CloseDate": (TODAY + timedelta(days=30 + n)).isoformat(),
+        "Probability": 60.0,
+        "Owner": {"Name": "Jane Smith", "ManagerId": MANAGER, "IsActive": True},
+        "Account": {"Name": "Acme"},
+        "LastActivityDate": (TODAY - timedelta(days=1)).isoformat(),
+        "OwnerId": OWNER_A,
+        "AccountId": "001000000000001AAA",
+        "IsClosed": False,
+        "IsDeleted": False,
+        "SystemModstamp": f"2025-01-01T00:00:{n:02d}.000+0000",
+    }
+    record.update(overrides)
+    return record
+
+
+class FakeClient:
+    """Stands in for SalesforceClient.iter_query, serving one programmed page per call."""
+
+    instance_url = "https://test.my.salesforce.com"
+    user_key = "user-a"
+
+    def __init__(self, *pages: list[dict[str, Any]] | Exception) -> None:
+        self.pages = list(pages)
+        self.calls: list[tuple[str, bool]] = []
+
+    def iter_query(self, soql: str, *, include_deleted: bool = False) -> Iterator[dict[str, Any]]:
+        self.calls.append((soql, include_deleted))
+        page = self.pages.pop(0)
+        if isinstance(page, Exception):
+            raise page
+        yield from page
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.fixture
+def snapshot(clock: FakeClock) -> OpportunitySnapshot:
+    config = OpportunitySnapshotConfig(enabled=True, refresh_seconds=60, max_staleness_seconds=300)
+    return OpportunitySnapshot(config, clock=clock)
+
+
+class TestOpportunitySnapshot:
+    def test_initial_load_then_deltas(self, snapshot: OpportunitySnapshot, clock: FakeClock) -> None:
+        sf = FakeClient(
+            [_opp(1), _opp(2), _opp(3)],
+            [
+                _opp(1, IsClosed=True, SystemModstamp="2025-01-02T00:00:00.000+0000"),
+                _opp(2, IsDeleted=True, SystemModstamp="2025-01-02T00:00:00.000+0000"),
+                _opp(3, Amount=1.0, SystemModstamp="2025-01-02T00:00:00.000+0000"),
+                _opp(4, SystemModstamp="2025-01-02T00:00:01.000+0000"),
+            ],
+        )
+
+        view = snapshot.view(sf)
+        assert len(view) == 3
+        assert sf.calls[0] == (
+            "SELECT Account.Name, AccountId, Amount, CloseDate, Id, IsClosed, IsDeleted, LastActivityDate, Name, "
+            "Owner.IsActive, Owner.ManagerId, Owner.Name, OwnerId, Probability, StageName, SystemModstamp "
+            "FROM Opportunity WHERE IsClosed = false",
+            False,
+        )
+
+        clock.now = 30.0
+        assert snapshot.view(sf) is view  # not due yet, no query
+
+        clock.now = 61.0
+        view = snapshot.view(sf)
+        assert sf.calls[1][0].endswith("WHERE SystemModstamp >= 2025-01-01T00:00:03Z")
+        assert sf.calls[1][1] is True
+        assert [r["Id"] for r in view.records] == ["006000000000003AAA", "006000000000004AAA"]
+        assert view.records[0]["Amount"] == 1.0
+
+    def test_failed_refresh_serves_view_within_staleness(self, snapshot: OpportunitySnapshot, clock: FakeClock) -> None:
+        error = SalesforceClientError("SF_API_ERROR", "boom")
+        sf = FakeClient([_opp(1)], error, error)
+        view = snapshot.view(sf)
+
+        clock.now = 120.0
+        assert snapshot.view(sf) is view
+
+        clock.now = 301.0
+        assert snapshot.view(sf) is None
+
+    def test_first_load_failure_falls_back(self, snapshot: OpportunitySnapshot) -> None:
+        sf = FakeClient(SalesforceClientError("SF_API_ERROR", "boom"))
+        assert snapshot.view(sf) is None
+
+    async def test_async_view(self, snapshot: OpportunitySnapshot) -> None:
+        class AsyncFakeClient:
+            async def iter_query(self, soql: str, *, include_deleted: bool = False):
+                for record in (_opp(1), _opp(2)):
+                    yield record
+
+        view = await snapshot.view_async(AsyncFakeClient())
+        assert len(view) == 2
+
+
+class TestSnapshotView:
+    @pytest.fixture
+    def view(self) -> SnapshotView:
+        return SnapshotView.build(
+            [
+                _opp(3, StageName="Negotiation/Review", Amount=None),
+                _opp(1, CloseDate=(TODAY - timedelta(days=2)).isoformat()),
+                _opp(2, OwnerId=OWNER_B, Owner={"Name": "Raj Patel", "ManagerId": None, "IsActive": True}),
+                _opp(4, LastActivityDate=None, Probability=10.0),
+                _opp(5, Owner={"Name": "Jane Smith", "ManagerId": MANAGER, "IsActive": False}, OwnerId=OWNER_B[:15]),
+            ]
+        )
+
+    def test_opportunities_filters(self, view: SnapshotView) -> None:
+        ids = lambda records: [r["Id"][3:15].lstrip("0") for r in records]  # noqa: E731
+
+        assert ids(view.opportunities()) == ["1", "2", "3", "4", "5"]
+        assert ids(view.opportunities(limit=2)) == ["1", "2"]
+        assert ids(view.opportunities(owner_id=OWNER_B[:15])) == ["2", "5"]
+        assert ids(view.opportunities(owner_id="005000000000077")) == []
+        assert ids(view.opportunities(stage="Negotiation/Review")) == ["3"]
+        assert ids(view.opportunities(stage="Closed Won")) == []
+        assert ids(view.opportunities(close_date_from=TODAY, close_date_to=TODAY + timedelta(days=33))) == ["2", "3"]
+
+    def test_pipeline_matches_live_query_semantics(self, view: SnapshotView) -> None:
+        thresholds = RiskThresholds()
+        groups, candidates = view.pipeline(thresholds, manager_id=MANAGER[:15], today=TODAY)
+        result = _pipeline_result(groups, candidates, thresholds, MANAGER)
+
+        # Deal 5's owner is inactive and deal 2's owner has no manager
+        assert result["total_deals"] == 3
+        assert result["total_value"] == 100000.0
+        assert result["by_stage"]["Negotiation/Review"] == {"count": 1, "value": 0.0}
+        # Overdue deal 1 and no-activity deal 4 are at risk; deal 3 has no amount
+        assert sorted(d["name"] for d in result["at_risk_deals"]) == ["Deal 1", "Deal 4"]
+        assert result["owner_breakdown"]["Jane Smith"]["at_risk_count"] == 2
+
+    def test_activity_gap_candidates_cover_every_bucket(self, view: SnapshotView) -> None:
+        expected = _activity_gaps_result(view.records, RiskThresholds(), 14, 50)
+        actual = _activity_gaps_result(view.activity_gap_candidates(14, today=TODAY), RiskThresholds(), 14, 50)
+        assert actual == expected
+        assert actual["summary"] == {"overdue": 1, "inactive": 1, "approaching": 0}
+
+
+class TestSnapshotRegistry:
+    @pytest.fixture(autouse=True)
+    def _clear(self, monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+        opportunity_snapshot._snapshots.clear()
+        yield
+        opportunity_snapshot._snapshots.clear()
+
+    def test_disabled_by_default(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.delenv("SF_OPP_SNAPSHOT_ENABLED", raising=False)
+        assert get_opportunity_snapshot(FakeClient()) is None
+
+    def test_one_snapshot_per_user_with_lru_bound(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("SF_OPP_SNAPSHOT_ENABLED", "true")
+        monkeypatch.setenv("SF_OPP_SNAPSHOT_MAX_SNAPSHOTS", "2")
+        clients = [FakeClient() for _ in range(3)]
+        for n, client in enumerate(clients):
+            client.user_key = f"user-{n}"
+
+        first = get_opportunity_snapshot(clients[0])
+        assert get_opportunity_snapshot(clients[0]) is first
+        get_opportunity_snapshot(clients[1])
+        get_opportunity_snapshot(clients[2])
+        assert get_opportunity_snapshot(clients[0]) is not first
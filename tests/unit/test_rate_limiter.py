@@ -0,0 +1,137 @@
+"""Unit tests for shared/rate_limiter.py."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+
+from shared.config import RateLimitConfig
+from shared.rate_limiter import RequestGovernor
+from shared.salesforce_client import SalesforceClientError
+
+ORG = "https://test.salesforce.com"
+
+
+def _governor(**overrides) -> RequestGovernor:
+    settings = {
+        "org_requests_per_second": 1000.0,
+        "org_burst": 1000,
+        "org_max_in_flight": 100,
+        "user_requests_per_second": 1000.0,
+        "user_burst": 1000,
+        "user_max_in_flight": 100,
+        "max_queue_depth": 10,
+        "max_wait_seconds": 1.0,
+    }
+    settings.update(overrides)
+    return RequestGovernor(RateLimitConfig(**settings))
+
+
+class TestRequestGovernor:
+    def test_admits_within_budget(self) -> None:
+        governor = _governor()
+
+        with governor.slot(ORG, "user-a"):
+            assert governor.metrics()["in_flight"] == {ORG: 1}
+
+        metrics = governor.metrics()
+        assert metrics["admitted"] == 1
+        assert metrics["queued"] == 0
+        assert metrics["in_flight"] == {ORG: 0}
+
+    def test_queue_full_returns_rate_limit_error(self) -> None:
+        governor = _governor(user_max_in_flight=1, max_queue_depth=0)
+
+        with (
+            governor.slot(ORG, "user-a"),
+            pytest.raises(SalesforceClientError) as exc_info,
+            governor.slot(ORG, "user-a"),
+        ):
+            pass
+
+        assert exc_info.value.code == "RATE_LIMIT_EXCEEDED"
+        assert governor.metrics()["rejected_queue_full"] == 1
+
+    def test_wait_timeout_returns_rate_limit_error(self) -> None:
+        governor = _governor(org_max_in_flight=1, max_wait_seconds=0.05)
+
+        with (
+            governor.slot(ORG, "user-a"),
+            pytest.raises(SalesforceClientError) as exc_info,
+            governor.slot(ORG, "user-b"),
+        ):
+            pass
+
+        assert exc_info.value.code == "RATE_LIMIT_EXCEEDED"
+        metrics = governor.metrics()
+        assert metrics["rejected_timeout"] == 1
+        assert metrics["queue_depth"] == 0
+
+    def test_queued_request_admitted_on_release(self) -> None:
+        governor = _governor(user_max_in_flight=1)
+        holding = threading.Event()
+        release = threading.Event()
+
+        def holder() -> None:
+            with governor.slot(ORG, "user-a"):
+                holding.set()
+                release.wait()
+
+        thread = threading.Thread(target=holder)
+        thread.start()
+        holding.wait()
+        threading.Timer(0.05, release.set).start()
+
+        with governor.slot(ORG, "user-a"):
+            pass
+        thread.join()
+
+        metrics = governor.metrics()
+        assert metrics["queued"] == 1
+        assert metrics["max_queue_depth_seen"] == 1
+        assert metrics["max_wait_ms"] > 0
+
+    def test_users_are_limited_independently(self) -> None:
+        governor = _governor(user_max_in_flight=1, max_queue_depth=0)
+
+        with governor.slot(ORG, "user-a"), governor.slot(ORG, "user-b"):
+            assert governor.metrics()["in_flight"] == {ORG: 2}
+
+    def test_token_bucket_paces_requests(self) -> None:
+        governor = _governor(user_requests_per_second=20.0, user_burst=1)
+
+        with governor.slot(ORG, "user-a"):
+            pass
+        with governor.slot(ORG, "user-a"):
+            pass
+
+        assert governor.metrics()["queued"] == 1
+
+    def test_disabled_governor_is_passthrough(self) -> None:
+        governor = _governor(enabled=False, org_max_in_flight=0)
+
+        with governor.slot(ORG, "user-a"):
+            pass
+
+        assert governor.metrics()["admitted"] == 0
+
+    async def test_async_slot_waits_for_capacity(self) -> None:
+        governor = _governor(org_max_in_flight=1)
+
+        async def hold() -> None:
+            async with governor.slot_async(ORG, "user-a"):
+                await asyncio.sleep(0.05)
+
+        async def follow() -> None:
+            await asyncio.sleep(0)
+            async with governor.slot_async(ORG, "user-b"):
+                pass
+
+        await asyncio.gather(hold(), follow())
+
+        metrics = governor.metrics()
+        assert metrics["admitted"] == 2
+        assert metrics["queued"] == 1
+        assert metrics["queue_depth"] == 0
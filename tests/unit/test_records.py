@@ -0,0 +1,63 @@
+"""Unit tests for shared/records.py."""
+
+from __future__ import annotations
+
+from datetime import date
+
+import pytest
+
+from mcp_servers.salesforce_crm.tools.cases import CASE_MAPPER
+from mcp_servers.salesforce_crm.tools.opportunities import OPPORTUNITY_MAPPER
+from shared.models import ErrorResponse, OpportunitySummary
+from shared.records import _RECORD_TYPES, CompactRecord, OpportunityRecord, record_type_for
+
+OPPORTUNITY_RECORD = {
+    "Id": "006000000000001",
+    "Name": "Acme - Enterprise License",
+    "Amount": 250000,
+    "StageName": "Proposal/Price Quote",
+    "CloseDate": "2025-03-15",
+    "Probability": 60,
+    "Owner": {"Name": "Jane Smith"},
+    "Account": None,
+    "LastActivityDate": None,
+}
+
+
+class TestCompactRecords:
+    @pytest.mark.parametrize("record_type", list(_RECORD_TYPES.values()), ids=lambda t: t.__name__)
+    def test_fields_mirror_model(self, record_type: type[CompactRecord]) -> None:
+        assert record_type.field_names() == tuple(record_type.model.model_fields)
+        assert not hasattr(record_type.__new__(record_type), "__dict__")
+
+    def test_model_round_trip(self) -> None:
+        summary = OpportunitySummary(
+            id="006A", name="Deal", stage="Prospecting", close_date=date(2025, 3, 15), risk_flags=["stale"]
+        )
+        record = OpportunityRecord.from_model(summary)
+
+        assert record.to_dict() == summary.model_dump()
+        assert record.to_model() == summary
+
+    def test_mapper_records_match_mapped_dicts(self) -> None:
+        records = OPPORTUNITY_MAPPER.records([OPPORTUNITY_RECORD])
+
+        assert isinstance(records[0], OpportunityRecord)
+        assert records[0].to_dict() == OPPORTUNITY_MAPPER(OPPORTUNITY_RECORD)
+        assert records[0].amount == 250000.0
+
+    def test_mapper_records_strict(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("MCP_STRICT_OUTPUT", "true")
+        record = {
+            "Id": "500A",
+            "CaseNumber": "1",
+            "Subject": "S",
+            "Status": "New",
+            "Priority": "Low",
+            "CreatedDate": "2025-02-01T10:00:00+00:00",
+        }
+        assert CASE_MAPPER.records([record])[0].to_dict() == CASE_MAPPER(record)
+
+    def test_unknown_model(self) -> None:
+        with pytest.raises(ValueError, match="ErrorResponse"):
+            record_type_for(ErrorResponse)
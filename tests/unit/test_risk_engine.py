@@ -0,0 +1,100 @@
+"""Unit tests for shared/risk_engine.py.
+
+The columnar engine must agree with the per-record reference,
+``_apply_risk_flags`` in the opportunity tools, on every deal.
+"""
+
+from __future__ import annotations
+
+import random
+from datetime import date, timedelta
+from typing import Any
+
+import numpy as np
+import pytest
+
+from mcp_servers.salesforce_crm.tools.opportunities import _apply_risk_flags
+from shared.config import RiskThresholds
+from shared.risk_engine import OpportunityColumns, apply_risk_flags, score_columns
+
+TODAY = date(2025, 6, 15)
+STAGES = ["Prospecting", "Qualification", "Proposal/Price Quote", "Negotiation/Review"]
+
+
+def _random_opportunities(count: int, seed: int = 7) -> list[dict[str, Any]]:
+    rng = random.Random(seed)
+    opps = []
+    for i in range(count):
+        opps.append(
+            {
+                "id": f"006{i:012d}",
+                "name": f"Deal {i}",
+                "amount": rng.choice([None, 5000.0, 25000.0, 250000.0]),
+                "stage": rng.choice(STAGES),
+                "close_date": TODAY + timedelta(days=rng.randint(-60, 90)),
+                "probability": rng.choice([None, 10.0, 29.5, 30.0, 60.0, 90.0]),
+                "owner_name": "Jane Smith",
+                "account_name": None,
+                "last_activity_date": rng.choice([None, TODAY - timedelta(days=rng.randint(0, 60))]),
+                "risk_flags": [],
+            }
+        )
+    return opps
+
+
+class TestRiskEngineEquivalence:
+    @pytest.mark.parametrize(
+        "thresholds",
+        [
+            RiskThresholds(),
+            RiskThresholds(overdue_enabled=False, late_stages=()),
+            RiskThresholds(inactivity_days=0, low_probability_threshold=100, stage_stagnation_days=365),
+        ],
+        ids=["defaults", "overdue-off", "aggressive"],
+    )
+    def test_flags_match_reference(self, thresholds: RiskThresholds) -> None:
+        reference = [_apply_risk_flags(dict(opp), thresholds, TODAY) for opp in _random_opportunities(2000)]
+        vectorized = _random_opportunities(2000)
+        scores = apply_risk_flags(vectorized, thresholds, TODAY)
+
+        assert [opp["risk_flags"] for opp in vectorized] == [opp["risk_flags"] for opp in reference]
+        assert scores.at_risk.tolist() == [bool(opp["risk_flags"]) for opp in reference]
+
+    def test_day_counts(self) -> None:
+        opps = _random_opportunities(200)
+        scores = apply_risk_flags(opps, RiskThresholds(), TODAY)
+
+        assert scores.days_to_close.tolist() == [(opp["close_date"] - TODAY).days for opp in opps]
+        assert [
+            days if has else None
+            for days, has in zip(scores.days_since_activity.tolist(), scores.has_activity.tolist(), strict=True)
+        ] == [(TODAY - opp["last_activity_date"]).days if opp["last_activity_date"] else None for opp in opps]
+
+
+class TestOpportunityColumns:
+    def test_from_arrays(self) -> None:
+        columns = OpportunityColumns.from_arrays(
+            close_date=np.array(["2025-06-01", "2025-07-01"], dtype="datetime64[D]"),
+            last_activity_date=[None, "2025-06-10"],
+            probability=[20, None],
+            amount=[50000, 5000],
+            stage=["Negotiation/Review", "Prospecting"],
+        )
+        scores = score_columns(columns, RiskThresholds(), TODAY)
+
+        assert len(columns) == 2
+        assert scores.overdue.tolist() == [True, False]
+        assert scores.no_activity.tolist() == [True, False]
+        assert scores.low_probability.tolist() == [True, False]
+        assert scores.meets_minimum_amount.tolist() == [True, False]
+        assert scores.flag_lists() == [["Overdue close date", "No recorded activity", "Low probability (20.0%)"], []]
+
+    def test_mismatched_lengths(self) -> None:
+        with pytest.raises(ValueError, match="differ in length"):
+            OpportunityColumns.from_arrays(
+                close_date=["2025-06-01"], last_activity_date=[], probability=[], amount=[], stage=[]
+            )
+
+    def test_empty(self) -> None:
+        scores = apply_risk_flags([], RiskThresholds(), TODAY)
+        assert scores.flag_lists() == []
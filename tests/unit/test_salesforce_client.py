@@ -2,19 +2,42 @@
 
 from __future__ import annotations
 
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
 from unittest.mock import MagicMock, patch
 
 import pytest
+import requests
+import responses
 from simple_salesforce import SalesforceError
+from simple_salesforce.util import Usage
 
+from shared.config import QueryCacheConfig, RateLimitConfig
+from shared.rate_limiter import RequestGovernor
 from shared.salesforce_client import (
     ApiUsageTracker,
+    QueryCache,
     SalesforceClient,
     SalesforceClientError,
     WriteBackConfirmationError,
+    get_org_usage_tracker,
+    iter_text_lines,
+    nest_csv_row,
+    referenced_sobjects,
+    to_count_query,
 )
 
 
+def _json_response(body: Any) -> requests.Response:
+    """A REST response as ``Salesforce._call_salesforce`` returns it."""
+    response = requests.Response()
+    response.status_code = 200
+    response._content = json.dumps(body).encode()
+    return response
+
+
 class TestApiUsageTracker:
     def test_initial_state(self) -> None:
         tracker = ApiUsageTracker()
@@ -48,6 +71,79 @@ class TestApiUsageTracker:
         assert status["calls_made"] == 1
         assert status["daily_limit"] == 100
         assert status["usage_percent"] == 1.0
+        assert status["remaining"] == 99
+
+    def test_sync_overrides_local_count(self) -> None:
+        tracker = ApiUsageTracker()
+        tracker.record_call()
+        tracker.sync(used=14_000, total=15_000)
+        assert tracker.calls_made == 14_000
+        assert tracker.daily_limit == 15_000
+        assert tracker.remaining == 1_000
+        assert tracker.is_warning
+
+    def test_claim_refresh_once_per_interval(self) -> None:
+        tracker = ApiUsageTracker()
+        assert tracker.claim_refresh(60)
+        assert not tracker.claim_refresh(60)
+
+    def test_org_tracker_shared_per_instance(self) -> None:
+        first = get_org_usage_tracker("https://org-a.salesforce.com")
+        assert get_org_usage_tracker("https://org-a.salesforce.com/") is first
+        assert get_org_usage_tracker("https://org-b.salesforce.com") is not first
+
+
+class TestQueryCache:
+    def test_referenced_sobjects(self) -> None:
+        soql = "SELECT Id, (SELECT Id FROM Contacts) FROM Account WHERE Id = '001'"
+        assert {"Account", "Contact"} <= referenced_sobjects(soql)
+        sosl = "FIND {acme} RETURNING KnowledgeArticleVersion(Id, Title), Account(Id)"
+        assert referenced_sobjects(sosl) == {"KnowledgeArticleVersion", "Account"}
+
+    def test_hit_after_put_ignores_whitespace(self) -> None:
+        cache = QueryCache(QueryCacheConfig())
+        cache.put("user", "query", "SELECT Id FROM User", [{"Id": "005"}])
+
+        assert cache.get("user", "query", "SELECT  Id\n FROM User") == [{"Id": "005"}]
+        assert cache.get("other-user", "query", "SELECT Id FROM User") is None
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_returns_copies(self) -> None:
+        cache = QueryCache(QueryCacheConfig())
+        cache.put("user", "query", "SELECT Id FROM User", [{"Id": "005"}])
+
+        cache.get("user", "query", "SELECT Id FROM User")[0]["Id"] = "mutated"
+
+        assert cache.get("user", "query", "SELECT Id FROM User") == [{"Id": "005"}]
+
+    def test_ttl_uses_shortest_object(self) -> None:
+        cache = QueryCache(QueryCacheConfig(ttl_seconds={"User": 900.0, "Opportunity": 30.0}))
+        assert cache.ttl_for(frozenset({"User", "Opportunity"})) == 30.0
+        assert cache.ttl_for(frozenset({"Widget__c"})) == 60.0
+
+    def test_expired_entries_miss(self) -> None:
+        cache = QueryCache(QueryCacheConfig(ttl_seconds={"Opportunity": 30.0}))
+        with patch("shared.salesforce_client.time.monotonic", return_value=100.0):
+            cache.put("user", "query", "SELECT Id FROM Opportunity", [])
+        with patch("shared.salesforce_client.time.monotonic", return_value=131.0):
+            assert cache.get("user", "query", "SELECT Id FROM Opportunity") is None
+
+    def test_lru_bound(self) -> None:
+        cache = QueryCache(QueryCacheConfig(max_entries=2))
+        for n in range(3):
+            cache.put("user", "query", f"SELECT Id FROM User LIMIT {n}", [])
+
+        assert cache.stats()["entries"] == 2
+        assert cache.get("user", "query", "SELECT Id FROM User LIMIT 0") is None
+
+    def test_invalidate_by_sobject(self) -> None:
+        cache = QueryCache(QueryCacheConfig())
+        cache.put("user", "query", "SELECT Id, (SELECT Id FROM Cases) FROM Account", [])
+        cache.put("user", "query", "SELECT Id FROM User", [])
+
+        assert cache.invalidate("Case") == 1
+        assert cache.stats()["entries"] == 1
 
 
 class TestSalesforceClientError:
@@ -92,11 +188,9 @@ class TestSalesforceClient:
     @patch("shared.salesforce_client.Salesforce")
     def test_query_success(self, mock_sf_class: MagicMock) -> None:
         mock_sf = MagicMock()
-        mock_sf.query.return_value = {
-            "records": [
-                {"attributes": {"type": "Account"}, "Id": "001XXX", "Name": "Acme"}
-            ]
-        }
+        mock_sf._call_salesforce.return_value = _json_response(
+            {"records": [{"attributes": {"type": "Account"}, "Id": "001XXX", "Name": "Acme"}]}
+        )
         mock_sf_class.return_value = mock_sf
 
         client = SalesforceClient("https://test.salesforce.com", "token")
@@ -107,10 +201,41 @@ class TestSalesforceClient:
         assert "attributes" not in results[0]
         assert client.usage.calls_made == 1
 
+    @patch("shared.salesforce_client.Salesforce")
+    def test_identical_concurrent_queries_coalesced(self, mock_sf_class: MagicMock) -> None:
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_query(*args: Any, **kwargs: Any) -> requests.Response:
+            started.set()
+            release.wait(timeout=5)
+            return _json_response({"records": [{"attributes": {"type": "Account"}, "Id": "001XXX"}]})
+
+        mock_sf = MagicMock()
+        mock_sf._call_salesforce.side_effect = slow_query
+        mock_sf_class.return_value = mock_sf
+        client = SalesforceClient("https://test.salesforce.com", "token")
+
+        joined = threading.Semaphore(0)
+        with (
+            patch("shared.singleflight.increment_counter", side_effect=lambda *_: joined.release()),
+            ThreadPoolExecutor(max_workers=3) as pool,
+        ):
+            leader = pool.submit(client.query, "SELECT Id FROM Account")
+            started.wait(timeout=5)
+            followers = [pool.submit(client.query, "SELECT Id  FROM Account") for _ in range(2)]
+            assert joined.acquire(timeout=5) and joined.acquire(timeout=5)
+            release.set()
+            results = [leader.result(timeout=5), *(f.result(timeout=5) for f in followers)]
+
+        assert all(r == [{"Id": "001XXX"}] for r in results)
+        assert mock_sf._call_salesforce.call_count == 1
+        assert client.usage.calls_made == 1
+
     @patch("shared.salesforce_client.Salesforce")
     def test_query_auth_error(self, mock_sf_class: MagicMock) -> None:
         mock_sf = MagicMock()
-        mock_sf.query.side_effect = SalesforceError(
+        mock_sf._call_salesforce.side_effect = SalesforceError(
             "https://test.salesforce.com", 401, "query", b"INVALID_SESSION_ID"
         )
         mock_sf_class.return_value = mock_sf
@@ -174,11 +299,9 @@ class TestSalesforceClient:
     @patch("shared.salesforce_client.Salesforce")
     def test_search(self, mock_sf_class: MagicMock) -> None:
         mock_sf = MagicMock()
-        mock_sf.search.return_value = {
-            "searchRecords": [
-                {"attributes": {"type": "KnowledgeArticleVersion"}, "Id": "kaXXX", "Title": "Article"}
-            ]
-        }
+        mock_sf._call_salesforce.return_value = _json_response(
+            {"searchRecords": [{"attributes": {"type": "KnowledgeArticleVersion"}, "Id": "kaXXX", "Title": "Article"}]}
+        )
         mock_sf_class.return_value = mock_sf
 
         client = SalesforceClient("https://test.salesforce.com", "token")
@@ -186,3 +309,336 @@ class TestSalesforceClient:
 
         assert len(results) == 1
         assert "attributes" not in results[0]
+        assert mock_sf._call_salesforce.call_args.kwargs["params"] == {
+            "q": "FIND {test} RETURNING KnowledgeArticleVersion(Id, Title)"
+        }
+
+    @patch("shared.salesforce_client.Salesforce")
+    def test_query_syncs_usage_from_limit_header(self, mock_sf_class: MagicMock) -> None:
+        mock_sf = MagicMock()
+        mock_sf._call_salesforce.return_value = _json_response({"records": []})
+        mock_sf.api_usage = {"api-usage": Usage(used=4_200, total=5_000)}
+        mock_sf_class.return_value = mock_sf
+
+        client = SalesforceClient("https://test.salesforce.com", "token")
+        client.query("SELECT Id FROM Account")
+
+        assert client.usage.calls_made == 4_200
+        assert client.usage.remaining == 800
+
+    @patch("shared.salesforce_client.Salesforce")
+    def test_limits_refresh_seeds_shared_tracker(self, mock_sf_class: MagicMock) -> None:
+        mock_sf = MagicMock()
+        mock_sf._call_salesforce.return_value = _json_response({"records": []})
+        mock_sf.limits.return_value = {"DailyApiRequests": {"Max": 1_000, "Remaining": 0}}
+        mock_sf_class.return_value = mock_sf
+        tracker = ApiUsageTracker()
+
+        client = SalesforceClient(
+            "https://test.salesforce.com", "token", usage_tracker=tracker, limits_refresh_seconds=300
+        )
+        with pytest.raises(SalesforceClientError) as exc_info:
+            client.query("SELECT Id FROM Account")
+
+        assert exc_info.value.code == "RATE_LIMIT_EXCEEDED"
+        assert client.usage is tracker
+        mock_sf._call_salesforce.assert_not_called()
+
+    @patch("shared.salesforce_client.Salesforce")
+    def test_query_rejected_by_governor(self, mock_sf_class: MagicMock) -> None:
+        mock_sf = MagicMock()
+        mock_sf_class.return_value = mock_sf
+        governor = RequestGovernor(RateLimitConfig(org_max_in_flight=0, max_queue_depth=0))
+
+        client = SalesforceClient("https://test.salesforce.com", "token", governor=governor)
+        with pytest.raises(SalesforceClientError) as exc_info:
+            client.query("SELECT Id FROM Account")
+
+        assert exc_info.value.code == "RATE_LIMIT_EXCEEDED"
+        mock_sf._call_salesforce.assert_not_called()
+        assert client.usage.calls_made == 0
+
+    @patch("shared.salesforce_client.Salesforce")
+    def test_query_cache_hit_and_write_invalidation(self, mock_sf_class: MagicMock) -> None:
+        mock_sf = MagicMock()
+        mock_sf._call_salesforce.return_value = _json_response({"records": [{"Id": "500XXX"}]})
+        mock_sf.Case.create.return_value = {"id": "500YYY", "success": True}
+        mock_sf_class.return_value = mock_sf
+
+        client = SalesforceClient(
+            "https://test.salesforce.com", "token", query_cache=QueryCache(QueryCacheConfig())
+        )
+        client.query("SELECT Id FROM Case")
+        client.query("SELECT Id FROM Case")
+        assert mock_sf._call_salesforce.call_count == 1
+        assert client.usage.calls_made == 1
+
+        client.create_record("Case", {"Subject": "New"}, confirmed=True)
+        client.query("SELECT Id FROM Case")
+        assert mock_sf._call_salesforce.call_count == 2
+
+    @patch("shared.salesforce_client.Salesforce")
+    def test_iter_query_streams_pages_lazily(self, mock_sf_class: MagicMock) -> None:
+        mock_sf = MagicMock()
+        mock_sf.sf_instance = "test.salesforce.com"
+        mock_sf._call_salesforce.side_effect = [
+            _json_response(
+                {
+                    "done": False,
+                    "nextRecordsUrl": "/services/data/v62.0/query/01g-2000",
+                    "records": [{"attributes": {"type": "Account"}, "Id": "1"}, {"Id": "2"}],
+                }
+            ),
+            _json_response({"done": True, "records": [{"Id": "3"}]}),
+        ]
+        mock_sf_class.return_value = mock_sf
+
+        client = SalesforceClient("https://test.salesforce.com", "token")
+        records = client.iter_query("SELECT Id FROM Account")
+
+        assert next(records) == {"Id": "1"}
+        assert mock_sf._call_salesforce.call_count == 1
+        assert [r["Id"] for r in records] == ["2", "3"]
+        assert mock_sf._call_salesforce.call_args.args == (
+            "GET",
+            "https://test.salesforce.com/services/data/v62.0/query/01g-2000",
+        )
+        assert client.usage.calls_made == 2
+
+    @patch("shared.salesforce_client.Salesforce")
+    def test_query_all_stops_fetching_at_max_results(self, mock_sf_class: MagicMock) -> None:
+        mock_sf = MagicMock()
+        mock_sf._call_salesforce.return_value = _json_response(
+            {
+                "done": False,
+                "nextRecordsUrl": "/services/data/v62.0/query/01g-2000",
+                "records": [{"Id": str(n)} for n in range(5)],
+            }
+        )
+        mock_sf_class.return_value = mock_sf
+
+        client = SalesforceClient("https://test.salesforce.com", "token")
+        records = client.query_all("SELECT Id FROM Account", max_results=3)
+
+        assert [r["Id"] for r in records] == ["0", "1", "2"]
+        assert mock_sf._call_salesforce.call_count == 1
+        assert mock_sf._call_salesforce.call_args.kwargs["headers"] == {"Sforce-Query-Options": "batchSize=200"}
+
+
+BASE_URL = "https://test.salesforce.com/services/data/v62.0/"
+
+
+class TestBulkQuery:
+    """Bulk API 2.0 path, exercised against HTTP mocks of the real endpoints."""
+
+    @pytest.fixture(autouse=True)
+    def no_sleep(self):
+        with patch("shared.salesforce_client.time.sleep"):
+            yield
+
+    @responses.activate
+    def test_bulk_job_streams_csv_pages(self) -> None:
+        responses.post(BASE_URL + "jobs/query", json={"id": "750XX", "state": "UploadComplete"})
+        responses.get(BASE_URL + "jobs/query/750XX", json={"id": "750XX", "state": "InProgress"})
+        responses.get(BASE_URL + "jobs/query/750XX", json={"id": "750XX", "state": "JobComplete"})
+        responses.get(
+            BASE_URL + "jobs/query/750XX/results",
+            body='"Id","Owner.Name","Summary"\n"001","Ana","multi\nline"\n',
+            headers={"Sforce-Locator": "MjAwMDA"},
+            match=[responses.matchers.query_param_matcher({"maxRecords": "50000"})],
+        )
+        responses.get(
+            BASE_URL + "jobs/query/750XX/results",
+            body='"Id","Owner.Name","Summary"\n"002","",""\n',
+            headers={"Sforce-Locator": "null"},
+            match=[responses.matchers.query_param_matcher({"maxRecords": "50000", "locator": "MjAwMDA"})],
+        )
+
+        client = SalesforceClient("https://test.salesforce.com", "token")
+        records = list(client.bulk_query("SELECT Id, Owner.Name, Summary FROM Account"))
+
+        assert records == [
+            {"Id": "001", "Owner": {"Name": "Ana"}, "Summary": "multi\nline"},
+            {"Id": "002", "Owner": {"Name": None}, "Summary": None},
+        ]
+        assert client.usage.calls_made == 5
+
+    @responses.activate
+    def test_failed_job_raises(self) -> None:
+        responses.post(BASE_URL + "jobs/query", json={"id": "750XX", "state": "UploadComplete"})
+        responses.get(
+            BASE_URL + "jobs/query/750XX",
+            json={"id": "750XX", "state": "Failed", "errorMessage": "INVALID_FIELD"},
+        )
+
+        client = SalesforceClient("https://test.salesforce.com", "token")
+        with pytest.raises(SalesforceClientError, match="INVALID_FIELD"):
+            list(client.bulk_query("SELECT Bogus FROM Account"))
+
+    @responses.activate
+    def test_iter_records_uses_rest_below_threshold(self) -> None:
+        responses.get(
+            BASE_URL + "query/",
+            json={"totalSize": 1, "done": True, "records": []},
+            match=[responses.matchers.query_param_matcher({"q": "SELECT COUNT() FROM Account"})],
+        )
+        responses.get(
+            BASE_URL + "query/",
+            json={"totalSize": 1, "done": True, "records": [{"attributes": {}, "Id": "001"}]},
+            match=[responses.matchers.query_param_matcher({"q": "SELECT Id FROM Account"})],
+        )
+
+        client = SalesforceClient("https://test.salesforce.com", "token")
+        assert list(client.iter_records("SELECT Id FROM Account")) == [{"Id": "001"}]
+
+    @responses.activate
+    def test_iter_records_falls_back_to_rest_when_bulk_unsupported(self) -> None:
+        responses.get(
+            BASE_URL + "query/",
+            json={"totalSize": 50_000, "done": True, "records": []},
+            match=[responses.matchers.query_param_matcher({"q": "SELECT COUNT() FROM KnowledgeArticleVersion"})],
+        )
+        responses.post(
+            BASE_URL + "jobs/query",
+            status=400,
+            json=[{"errorCode": "API_ERROR", "message": "Entity is not supported by the Bulk API"}],
+        )
+        responses.get(
+            BASE_URL + "query/",
+            json={"totalSize": 1, "done": True, "records": [{"Id": "ka0"}]},
+            match=[responses.matchers.query_param_matcher({"q": "SELECT Id FROM KnowledgeArticleVersion"})],
+        )
+
+        client = SalesforceClient("https://test.salesforce.com", "token")
+        assert list(client.iter_records("SELECT Id FROM KnowledgeArticleVersion")) == [{"Id": "ka0"}]
+
+    @responses.activate
+    def test_count_probe_over_limit_raises_instead_of_falling_back(self) -> None:
+        responses.get(
+            BASE_URL + "query/",
+            status=403,
+            json=[{"errorCode": "REQUEST_LIMIT_EXCEEDED", "message": "TotalRequests Limit exceeded."}],
+        )
+
+        client = SalesforceClient("https://test.salesforce.com", "token")
+        with pytest.raises(SalesforceClientError) as exc_info:
+            list(client.iter_records("SELECT Id FROM Account"))
+
+        assert exc_info.value.code == "RATE_LIMIT_EXCEEDED"
+        assert len(responses.calls) == 1
+
+    @responses.activate
+    def test_rejected_count_probe_falls_back_to_rest(self) -> None:
+        responses.get(
+            BASE_URL + "query/",
+            status=400,
+            json=[{"errorCode": "MALFORMED_QUERY", "message": "COUNT() not supported"}],
+            match=[responses.matchers.query_param_matcher({"q": "SELECT COUNT() FROM Account"})],
+        )
+        responses.get(
+            BASE_URL + "query/",
+            json={"totalSize": 1, "done": True, "records": [{"Id": "001"}]},
+            match=[responses.matchers.query_param_matcher({"q": "SELECT Id FROM Account"})],
+        )
+
+        client = SalesforceClient("https://test.salesforce.com", "token")
+        assert list(client.iter_records("SELECT Id FROM Account")) == [{"Id": "001"}]
+
+
+class TestCompositeQueries:
+    """Composite and Composite Batch requests, one HTTP round trip each."""
+
+    @responses.activate
+    def test_query_batch_single_request(self) -> None:
+        responses.post(
+            BASE_URL + "composite/batch",
+            json={
+                "hasErrors": True,
+                "results": [
+                    {"statusCode": 200, "result": {"done": True, "records": [{"attributes": {}, "Id": "00T1"}]}},
+                    {"statusCode": 400, "result": [{"errorCode": "INVALID_TYPE", "message": "sObject type 'Event'"}]},
+                ],
+            },
+        )
+
+        client = SalesforceClient("https://test.salesforce.com", "token")
+        results = client.query_batch(
+            {"tasks": "SELECT Id FROM Task", "events": "SELECT Id FROM Event"}, optional=("events",)
+        )
+
+        assert results == {"tasks": [{"Id": "00T1"}], "events": []}
+        assert client.usage.calls_made == 1
+        body = json.loads(responses.calls[0].request.body)
+        assert body["batchRequests"][0] == {"method": "GET", "url": "v62.0/query?q=SELECT+Id+FROM+Task"}
+
+    @responses.activate
+    def test_query_batch_required_failure_raises(self) -> None:
+        responses.post(
+            BASE_URL + "composite/batch",
+            json={"results": [{"statusCode": 400, "result": [{"errorCode": "QUERY_TOO_COMPLICATED"}]}]},
+        )
+
+        client = SalesforceClient("https://test.salesforce.com", "token")
+        with pytest.raises(SalesforceClientError) as exc_info:
+            client.query_batch({"contacts": "SELECT Id FROM Contact"})
+        assert exc_info.value.code == "QUERY_TOO_COMPLEX"
+
+    def test_query_batch_sends_only_cache_misses(self) -> None:
+        cache = QueryCache(QueryCacheConfig())
+        client = SalesforceClient("https://test.salesforce.com", "token", query_cache=cache)
+        cache.put(client._user_key, "query", "SELECT Id FROM Task", [{"Id": "00T1"}])
+
+        with responses.RequestsMock() as rsps:
+            rsps.post(
+                BASE_URL + "composite/batch",
+                json={"results": [{"statusCode": 200, "result": {"records": [{"Id": "00U1"}]}}]},
+            )
+            results = client.query_batch({"tasks": "SELECT Id FROM Task", "events": "SELECT Id FROM Event"})
+            assert len(json.loads(rsps.calls[0].request.body)["batchRequests"]) == 1
+
+        assert results == {"tasks": [{"Id": "00T1"}], "events": [{"Id": "00U1"}]}
+
+    @responses.activate
+    def test_query_composite_chains_references(self) -> None:
+        responses.post(
+            BASE_URL + "composite",
+            json={
+                "compositeResponse": [
+                    {"referenceId": "case", "httpStatusCode": 200, "body": {"records": [{"Id": "500A"}]}},
+                    {"referenceId": "comments", "httpStatusCode": 200, "body": {"records": [{"CommentBody": "x"}]}},
+                ]
+            },
+        )
+
+        client = SalesforceClient("https://test.salesforce.com", "token")
+        results = client.query_composite({
+            "case": "SELECT Id FROM Case WHERE CaseNumber = '001'",
+            "comments": "SELECT CommentBody FROM CaseComment WHERE ParentId = '@{case.records[0].Id}'",
+        })
+
+        assert results == {"case": [{"Id": "500A"}], "comments": [{"CommentBody": "x"}]}
+        subrequests = json.loads(responses.calls[0].request.body)["compositeRequest"]
+        assert subrequests[1]["referenceId"] == "comments"
+        assert subrequests[1]["url"].startswith("/services/data/v62.0/query?q=")
+        assert subrequests[1]["url"].endswith("%27@{case.records[0].Id}%27")
+
+
+class TestSoqlHelpers:
+    def test_to_count_query(self) -> None:
+        soql = "SELECT Id, Title FROM KnowledgeArticleVersion WHERE PublishStatus = 'Online' ORDER BY Title LIMIT 5"
+        assert to_count_query(soql) == "SELECT COUNT() FROM KnowledgeArticleVersion WHERE PublishStatus = 'Online'"
+        assert to_count_query("SELECT Id, (SELECT Id FROM Contacts) FROM Account") is None
+        assert to_count_query("SELECT StageName, COUNT(Id) FROM Opportunity GROUP BY StageName") is None
+
+    def test_nest_csv_row(self) -> None:
+        assert nest_csv_row({"Id": "1", "Account.Owner.Name": "Ana", "Amount": ""}) == {
+            "Id": "1",
+            "Account": {"Owner": {"Name": "Ana"}},
+            "Amount": None,
+        }
+
+    def test_iter_text_lines_across_chunks(self) -> None:
+        data = '"a","b"\n"1","x\ny"\n"2","é'.encode()
+        chunks = [data[:-1], data[-1:], b'z"\n']  # split the multi-byte é across chunks
+
+        assert list(iter_text_lines(chunks)) == ['"a","b"\n', '"1","x\n', 'y"\n', '"2","éz"\n']
@@ -0,0 +1,103 @@
+"""Unit tests for shared/singleflight.py."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+from shared.singleflight import AsyncSingleFlight, SingleFlight
+
+
+class TestSingleFlight:
+    def test_concurrent_callers_share_one_call(self) -> None:
+        flights = SingleFlight()
+        release = threading.Event()
+        calls = 0
+
+        def work() -> list[dict[str, str]]:
+            nonlocal calls
+            calls += 1
+            release.wait(timeout=5)
+            return [{"Id": "001A"}]
+
+        joined = threading.Semaphore(0)
+        with (
+            patch("shared.singleflight.increment_counter", side_effect=lambda *_: joined.release()),
+            ThreadPoolExecutor(max_workers=4) as pool,
+        ):
+            futures = [pool.submit(flights.do, "q", work) for _ in range(4)]
+            for _ in range(3):
+                assert joined.acquire(timeout=5)
+            release.set()
+            results = [f.result(timeout=5) for f in futures]
+
+        assert calls == 1
+        assert all(r == [{"Id": "001A"}] for r in results)
+        # Followers get copies, so one caller's mutations don't leak into another's
+        results[0][0]["Id"] = "changed"
+        assert sum(r[0]["Id"] == "001A" for r in results) == 3
+        assert flights.in_flight() == 0
+
+    def test_error_propagates_and_key_is_released(self) -> None:
+        flights = SingleFlight()
+
+        def fail() -> None:
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            flights.do("q", fail)
+        assert flights.do("q", lambda: 2) == 2
+
+    def test_distinct_keys_run_separately(self) -> None:
+        flights = SingleFlight()
+        assert flights.do("a", lambda: 1) == 1
+        assert flights.do("b", lambda: 2) == 2
+
+
+class TestAsyncSingleFlight:
+    async def test_concurrent_awaiters_share_one_call(self) -> None:
+        flights = AsyncSingleFlight()
+        calls = 0
+
+        async def work() -> list[dict[str, str]]:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return [{"Id": "001A"}]
+
+        results = await asyncio.gather(*(flights.do("q", work) for _ in range(5)))
+
+        assert calls == 1
+        assert all(r == [{"Id": "001A"}] for r in results)
+        assert len({id(r) for r in results}) == 5
+        assert flights.in_flight() == 0
+
+    async def test_cancelled_follower_does_not_cancel_leader(self) -> None:
+        flights = AsyncSingleFlight()
+
+        async def work() -> int:
+            await asyncio.sleep(0.01)
+            return 7
+
+        leader = asyncio.ensure_future(flights.do("q", work))
+        follower = asyncio.ensure_future(flights.do("q", work))
+        await asyncio.sleep(0)
+        follower.cancel()
+
+        assert await leader == 7
+        with pytest.raises(asyncio.CancelledError):
+            await follower
+
+    async def test_error_propagates_to_all(self) -> None:
+        flights = AsyncSingleFlight()
+
+        async def fail() -> None:
+            await asyncio.sleep(0)
+            raise RuntimeError("boom")
+
+        results = await asyncio.gather(flights.do("q", fail), flights.do("q", fail), return_exceptions=True)
+        assert all(isinstance(r, RuntimeError) for r in results)
@@ -0,0 +1,160 @@
+"""Unit tests for shared/soql.py."""
+
+from __future__ import annotations
+
+from datetime import UTC, date, datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+
+from shared.salesforce_client import strip_attributes
+from shared.soql import (
+    InvalidSoqlValueError,
+    SoqlQuery,
+    any_of,
+    child_records,
+    eq,
+    gte,
+    id_eq,
+    id_in,
+    in_,
+    like_contains,
+    literal,
+    normalize_records,
+    parse_date,
+    sosl_escape,
+)
+
+
+class TestLiterals:
+    def test_string_escaping(self) -> None:
+        assert literal("O'Brien \\ co\n") == "'O\\'Brien \\\\ co\\n'"
+        assert literal("line\nbreak") == "'line\\nbreak'"
+
+    def test_typed_values(self) -> None:
+        assert literal(None) == "null"
+        assert literal(True) == "true"
+        assert literal(10000) == "10000"
+        assert literal(10000.0) == "10000"
+        assert literal(12.5) == "12.5"
+        assert literal(1e-07) == "0.0000001"
+        assert literal(1e20) == "100000000000000000000"
+        assert literal(Decimal("1E-7")) == "0.0000001"
+        assert literal(Decimal("2.50")) == "2.5"
+        assert literal(Decimal("1E+3")) == "1000"
+        assert literal(date(2025, 3, 15)) == "2025-03-15"
+        assert literal(datetime(2025, 3, 15, 8, 30, tzinfo=timezone(timedelta(hours=2)))) == "2025-03-15T06:30:00Z"
+        assert literal(datetime(2025, 3, 15, 6, 30, tzinfo=UTC)) == "2025-03-15T06:30:00Z"
+
+    def test_non_finite_number_rejected(self) -> None:
+        with pytest.raises(InvalidSoqlValueError):
+            literal(float("nan"))
+
+    def test_id_validation(self) -> None:
+        assert id_eq("OwnerId", "005000000000001AAA") == "OwnerId = '005000000000001AAA'"
+        for bad in ("001' OR Name != '", "", "0" * 19, "001 000"):
+            with pytest.raises(InvalidSoqlValueError) as exc_info:
+                id_eq("OwnerId", bad)
+            assert exc_info.value.to_error_response()["code"] == "INVALID_INPUT"
+
+    def test_parse_date(self) -> None:
+        assert parse_date("2025-03-15") == date(2025, 3, 15)
+        with pytest.raises(InvalidSoqlValueError):
+            parse_date("2025-03-15 OR IsClosed = true")
+
+    def test_like_contains_matches_wildcards_literally(self) -> None:
+        assert like_contains("Name", "100%_o'k") == "Name LIKE '%100\\%\\_o\\'k%'"
+
+    def test_sosl_escape(self) -> None:
+        assert sosl_escape("a-b {c}") == "a\\-b \\{c\\}"
+
+
+class TestCanonicalOrdering:
+    def test_in_list_deduped_and_sorted(self) -> None:
+        assert in_("StageName", ["b", "a", "b"]) == "StageName IN ('a', 'b')"
+        assert id_in("Id", ["002", "001", "002"]) == "Id IN ('001', '002')"
+        with pytest.raises(InvalidSoqlValueError):
+            in_("StageName", [])
+
+    def test_same_logical_query_same_text(self) -> None:
+        first = (
+            SoqlQuery("Opportunity")
+            .select("Name, Id")
+            .where(eq("IsClosed", False), gte("Amount", 10000), any_of(eq("A", 1), eq("B", 2)))
+        )
+        second = (
+            SoqlQuery("Opportunity")
+            .select("Id", "Name", "id")
+            .where(any_of(eq("B", 2), eq("A", 1)), gte("Amount", 10000), eq("IsClosed", False), eq("IsClosed", False))
+        )
+        assert first.build() == second.build()
+        assert first.build() == (
+            "SELECT Id, Name FROM Opportunity WHERE (A = 1 OR B = 2) AND Amount >= 10000 AND IsClosed = false"
+        )
+
+    def test_builder_is_immutable(self) -> None:
+        base = SoqlQuery("Account").select("Id")
+        base.where(eq("Name", "x")).limit(1)
+        assert base.build() == "SELECT Id FROM Account"
+
+    def test_returning_clause(self) -> None:
+        query = SoqlQuery("KnowledgeArticleVersion").select("Title, Id").where(eq("Language", "en_US")).limit(5)
+        assert query.returning() == "KnowledgeArticleVersion(Id, Title WHERE Language = 'en_US' LIMIT 5)"
+
+
+class TestSoqlQuery:
+    def test_build_with_subquery(self) -> None:
+        query = (
+            SoqlQuery("Case")
+            .select("Id, Subject", "Owner.Name")
+            .with_children(SoqlQuery("CaseComments").select("CommentBody").order_by("CreatedDate DESC").limit(5))
+            .where("Id = '500A'", "IsClosed = false")
+            .limit(1)
+        )
+
+        assert str(query) == (
+            "SELECT Id, Owner.Name, Subject, "
+            "(SELECT CommentBody FROM CaseComments ORDER BY CreatedDate DESC LIMIT 5) "
+            "FROM Case WHERE Id = '500A' AND IsClosed = false LIMIT 1"
+        )
+
+    def test_nested_subquery_rejected(self) -> None:
+        inner = SoqlQuery("Contacts").select("Id").with_children(SoqlQuery("Cases").select("Id"))
+        with pytest.raises(ValueError):
+            SoqlQuery("Account").select("Id").with_children(inner)
+
+    def test_empty_select_rejected(self) -> None:
+        with pytest.raises(ValueError):
+            SoqlQuery("Account").build()
+
+
+class TestNormalizeRecords:
+    def test_flattens_child_envelopes(self) -> None:
+        records = [
+            {
+                "attributes": {"type": "Case"},
+                "Id": "500A",
+                "Owner": {"attributes": {"type": "User"}, "Name": "Ana", "Manager": {"attributes": {}, "Name": "Bo"}},
+                "CaseComments": {
+                    "totalSize": 1,
+                    "done": True,
+                    "records": [{"attributes": {"type": "CaseComment"}, "CommentBody": "hi"}],
+                },
+                "Tasks": None,
+            }
+        ]
+
+        assert normalize_records(records) == [
+            {
+                "Id": "500A",
+                "Owner": {"Name": "Ana", "Manager": {"Name": "Bo"}},
+                "CaseComments": [{"CommentBody": "hi"}],
+                "Tasks": None,
+            }
+        ]
+        assert child_records(records[0], "CaseComments") == [{"CommentBody": "hi"}]
+        assert child_records(records[0], "Tasks") == []
+
+    def test_strip_attributes_flattens_subqueries(self) -> None:
+        records = [{"Id": "003A", "OpportunityContactRoles": {"done": True, "records": [{"Role": "Buyer"}]}}]
+        assert strip_attributes(records)[0]["OpportunityContactRoles"] == [{"Role": "Buyer"}]